@@ -0,0 +1,50 @@
+"""add_inference_job_batching_columns
+
+Revision ID: 3f6b2c8d1e47
+Revises: cb98f58d3be7
+Create Date: 2025-06-20 10:12:41.308114
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3f6b2c8d1e47"
+down_revision: Union[str, None] = "cb98f58d3be7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "inference_jobs",
+        sa.Column(
+            "batch_id",
+            sa.String(),
+            nullable=True,
+            comment="Groups jobs predicted together (a batch request or coalesced single jobs)",
+        ),
+    )
+    op.add_column(
+        "inference_jobs",
+        sa.Column(
+            "prediction_queued_at",
+            sa.DateTime(timezone=True),
+            nullable=True,
+            comment="Set when the job's features are available and its prediction task is queued",
+        ),
+    )
+    op.create_index(
+        op.f("ix_inference_jobs_batch_id"), "inference_jobs", ["batch_id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_inference_jobs_batch_id"), table_name="inference_jobs")
+    op.drop_column("inference_jobs", "prediction_queued_at")
+    op.drop_column("inference_jobs", "batch_id")
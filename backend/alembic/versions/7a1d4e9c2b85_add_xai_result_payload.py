@@ -0,0 +1,36 @@
+"""add_xai_result_payload
+
+Revision ID: 7a1d4e9c2b85
+Revises: 3f6b2c8d1e47
+Create Date: 2025-06-24 09:41:17.552091
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7a1d4e9c2b85"
+down_revision: Union[str, None] = "3f6b2c8d1e47"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "xai_results",
+        sa.Column(
+            "result_payload",
+            sa.LargeBinary(),
+            nullable=True,
+            comment="Compressed full result of large explanations; result_data then holds a preview",
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("xai_results", "result_payload")
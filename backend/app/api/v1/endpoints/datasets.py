@@ -180,7 +180,6 @@ async def create_dataset_endpoint(
         task = backend_celery_app.send_task(
             task_name,
             args=[db_dataset.id],  # Pass the dataset ID to the task
-            queue="dataset",
         )
         logger.info(
             f"Dispatched task '{task_name}' for dataset ID {db_dataset.id}, task ID: {task.id}"
@@ -304,7 +303,6 @@ async def delete_dataset_endpoint(
             backend_celery_app.send_task(
                 task_name,
                 args=[storage_uri_to_delete],
-                queue="dataset",  # Or a dedicated 'cleanup' queue
             )
             logger.info(
                 f"Queued task '{task_name}' to delete object: {storage_uri_to_delete}"
@@ -327,7 +325,6 @@ async def delete_dataset_endpoint(
             backend_celery_app.send_task(
                 task_name,
                 args=[background_uri_to_delete],
-                queue="dataset",
             )
             logger.info(
                 f"Queued task '{task_name}' to delete background data object: {background_uri_to_delete}"
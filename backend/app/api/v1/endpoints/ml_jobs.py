@@ -124,12 +124,12 @@ async def submit_training_job(
 
     # --- Dispatch Celery Task ---
     task_name = "tasks.train_model"  # Must match the name in @shared_task in ml worker
-    ml_queue = "ml_queue"  # The queue the ML worker listens to
 
     try:
-        task = backend_celery_app.send_task(task_name, args=[db_job.id], queue=ml_queue)
+        # Routed to the ML batch queue (shared/celery_config/routing.py)
+        task = backend_celery_app.send_task(task_name, args=[db_job.id])
         logger.info(
-            f"Dispatched task '{task_name}' to queue '{ml_queue}' for job ID {db_job.id}, task ID: {task.id}"
+            f"Dispatched task '{task_name}' for job ID {db_job.id}, task ID: {task.id}"
         )
 
         # --- Update Job with Task ID ---
@@ -458,16 +458,14 @@ async def submit_hp_search_job(
         )
 
     task_name = "tasks.hyperparameter_search"  # Must match worker task name
-    ml_queue = "ml_queue"
 
     try:
         task = backend_celery_app.send_task(
             task_name,
             args=[db_job.id],  # Pass the correct HPSearchJob ID (new or existing)
-            queue=ml_queue,
         )
         logger.info(
-            f"Dispatched task '{task_name}' to queue '{ml_queue}' for job ID {db_job.id}, task ID: {task.id}"
+            f"Dispatched task '{task_name}' for job ID {db_job.id}, task ID: {task.id}"
         )
 
         # --- Update Job with Task ID (even for continued jobs, update with the latest task ID) ---
@@ -610,6 +608,24 @@ async def trigger_manual_inference(
     )
 
 
+@router.post(
+    "/infer/batch",
+    response_model=schemas.BatchInferenceTriggerResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Trigger Inference for Many Commits",
+    description="Predicts a list or author-date range of already-ingested commits with one model load and one vectorised prediction.",
+)
+async def trigger_batch_inference(
+    request_body: schemas.BatchInferenceRequest,
+    inference_service: InferenceService = Depends(InferenceService),
+):
+    """Creates one InferenceJob per commit and dispatches a single batch prediction task."""
+    logger.info(
+        f"API: Received batch inference request for repo {request_body.repo_id}, model {request_body.ml_model_id}"
+    )
+    return await inference_service.trigger_batch_inference(request_body)
+
+
 @router.get(
     "/infer/{job_id}",
     response_model=schemas.InferenceJobRead,
@@ -175,7 +175,6 @@ async def trigger_ingest_task(
         task = backend_celery_app.send_task(
             task_name,
             args=[db_repo.id, str(db_repo.git_url)],  # Positional arguments
-            queue="ingestion",
             # kwargs={'repo_id': db_repo.id, 'git_url': str(db_repo.git_url)} # Alternatively, use keyword arguments
         )
         logger.info(
@@ -1,11 +1,11 @@
 # backend/app/api/v1/endpoints/xai.py
 import logging
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 
 from app.services.xai_service import XAIService
-from shared.schemas.xai_job import XAIResultRead, XAITriggerResponse
+from shared.schemas.xai_job import XAIResultPage, XAIResultRead, XAITriggerResponse
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -52,6 +52,51 @@ async def get_all_xai_results_for_job(
         )
 
 
+@router.get(
+    "/xai-results/{xai_result_id}/instances",
+    response_model=XAIResultPage,
+    summary="Page through the instances of an XAI result",
+    description="Returns a page of the explained instances of a successful XAI result. SHAP and LIME instances list their features by decreasing importance; feature_limit keeps only the top-k.",
+)
+async def get_xai_result_instances(
+    xai_result_id: int,
+    skip: int = Query(0, ge=0, description="Number of instances to skip"),
+    limit: int = Query(50, ge=1, le=500, description="Maximum instances to return"),
+    feature_skip: int = Query(
+        0, ge=0, description="Number of top features to skip per instance"
+    ),
+    feature_limit: Optional[int] = Query(
+        None, ge=1, le=1000, description="Top-k features per instance (all if unset)"
+    ),
+    xai_service: XAIService = Depends(XAIService),
+):
+    """
+    Endpoint to retrieve a page of instances of one XAI result.
+    """
+    logger.info(
+        f"API: Getting instances {skip}-{skip + limit} of XAIResult {xai_result_id}"
+    )
+    try:
+        return await xai_service.get_explanation_page(
+            xai_result_id=xai_result_id,
+            skip=skip,
+            limit=limit,
+            feature_skip=feature_skip,
+            feature_limit=feature_limit,
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(
+            f"API: Unexpected error paging XAIResult {xai_result_id}: {e}",
+            exc_info=True,
+        )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An unexpected error occurred while retrieving the XAI result.",
+        )
+
+
 @router.post(
     "/inference-jobs/{inference_job_id}/xai-results/trigger",
     response_model=XAITriggerResponse,
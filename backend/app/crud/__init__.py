@@ -32,12 +32,14 @@ from .crud_hp_search_job import (
 )
 from .crud_inference_job import (
     create_inference_job,
+    create_inference_jobs_bulk,
     delete_inference_job,
     get_all_for_commit,
     get_inference_job,
     get_inference_job_by_task_id,
     get_inference_jobs,
     get_inference_jobs_by_repository,
+    set_task_id_for_batch,
     update_inference_job,
 )
 from .crud_ml_model import (
@@ -63,6 +65,7 @@ from .crud_xai_result import (
     create_xai_result,
     delete_xai_result,
     get_xai_result,
+    get_xai_result_with_payload,
     get_xai_results_by_job_id,
     update_xai_result,
 )
@@ -87,10 +90,12 @@ __all__ = [
     "get_hp_search_jobs",
     "update_hp_search_job",
     "create_inference_job",
+    "create_inference_jobs_bulk",
     "delete_inference_job",
     "get_inference_job",
     "get_inference_job_by_task_id",
     "get_inference_jobs",
+    "set_task_id_for_batch",
     "update_inference_job",
     "create_ml_model",
     "delete_ml_model",
@@ -110,6 +115,7 @@ __all__ = [
     "create_xai_result",
     "delete_xai_result",
     "get_xai_result",
+    "get_xai_result_with_payload",
     "get_xai_results_by_job_id",
     "update_xai_result",
     "get_training_jobs_by_repository",
@@ -2,7 +2,7 @@
 import logging
 from typing import Any, Dict, List, Optional, Sequence, Tuple
 
-from sqlalchemy import asc, cast, desc, func, select
+from sqlalchemy import asc, cast, desc, func, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 from sqlalchemy.types import Integer as SAInteger
@@ -159,6 +159,36 @@ async def create_inference_job(
     return db_obj
 
 
+async def create_inference_jobs_bulk(
+    db: AsyncSession, *, objs_in: Sequence[InferenceJobCreate]
+) -> List[int]:
+    """Create many inference job records with one multi-row INSERT. Returns IDs in order."""
+    if not objs_in:
+        return []
+    stmt = (
+        insert(InferenceJob)
+        .values([obj.model_dump() for obj in objs_in])
+        .returning(InferenceJob.id)
+    )
+    result = await db.execute(stmt)
+    job_ids = list(result.scalars().all())
+    await db.commit()
+    logger.info(f"Created {len(job_ids)} Inference Jobs in bulk")
+    return job_ids
+
+
+async def set_task_id_for_batch(
+    db: AsyncSession, *, batch_id: str, celery_task_id: str
+) -> None:
+    """Record the Celery task responsible for every job of a batch."""
+    await db.execute(
+        update(InferenceJob)
+        .where(InferenceJob.batch_id == batch_id)
+        .values(celery_task_id=celery_task_id)
+    )
+    await db.commit()
+
+
 async def update_inference_job(
     db: AsyncSession,
     *,
@@ -4,6 +4,7 @@ from typing import Any, Dict, Optional, Sequence
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
 
 # Import models and schemas
 from shared.db.models.xai_result import XAIResult
@@ -19,6 +20,18 @@ async def get_xai_result(db: AsyncSession, xai_result_id: int) -> Optional[XAIRe
     return result.scalars().first()
 
 
+async def get_xai_result_with_payload(
+    db: AsyncSession, xai_result_id: int
+) -> Optional[XAIResult]:
+    """Get a single XAI result by ID, including its compressed result payload."""
+    result = await db.execute(
+        select(XAIResult)
+        .options(undefer(XAIResult.result_payload))
+        .filter(XAIResult.id == xai_result_id)
+    )
+    return result.scalars().first()
+
+
 async def get_xai_results_by_job_id(
     db: AsyncSession,
     *,
@@ -92,7 +92,6 @@ class CommitService:
         task = self.celery_app.send_task(
             "tasks.ingest_features_for_inference",
             args=[None, repo_id, commit_hash],
-            queue="ingestion",
         )
 
         # Update the placeholder with the new task ID
@@ -1,6 +1,8 @@
 # backend/services/inference_service.py
 import logging
-from typing import Tuple
+import uuid
+from datetime import datetime, timezone
+from typing import List, Tuple
 
 from app import crud
 from app.core.celery_app import backend_celery_app
@@ -8,10 +10,12 @@ from app.core.celery_app import backend_celery_app
 # Import TaskStatusService if it exists, otherwise use AsyncResult directly for now
 from celery import Celery
 from fastapi import Depends, HTTPException, status
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from shared import schemas
 from shared.core.config import settings
+from shared.db.models import CommitGuruMetric
 from shared.db_session import get_async_db_session
 from shared.exceptions import ConflictError, InternalError, NotFoundError
 from shared.schemas.enums import JobStatusEnum
@@ -19,6 +23,9 @@ from shared.schemas.enums import JobStatusEnum
 logger = logging.getLogger(__name__)
 logger.setLevel(settings.LOG_LEVEL.upper())
 
+# Upper bound on commits per batch inference request
+MAX_BATCH_INFERENCE_COMMITS = 20_000
+
 
 class InferenceService:
     """
@@ -110,10 +117,11 @@ class InferenceService:
 
         # --- Dispatch Feature Extraction Task ---
         task_name = "tasks.ingest_features_for_inference"  # Task in ingestion worker
-        args = [job_id, repo_id, commit_hash]
+        # The trigger source sets the priority of the prediction task
+        args = [job_id, repo_id, commit_hash, trigger_source]
         task_id = None
         try:
-            task = self.celery_app.send_task(task_name, args=args, queue="ingestion")
+            task = self.celery_app.send_task(task_name, args=args)
             if not task or not task.id:
                 raise InternalError("Celery dispatch returned invalid task object.")
             task_id = task.id
@@ -168,6 +176,150 @@ class InferenceService:
 
         return job_id, task_id
 
+    async def _resolve_batch_commits(
+        self, request: schemas.BatchInferenceRequest
+    ) -> List[str]:
+        """Commit hashes of the request that already have ingested metrics, in author-date order."""
+        stmt = select(CommitGuruMetric.commit_hash).where(
+            CommitGuruMetric.repository_id == request.repo_id
+        )
+        if request.commit_hashes:
+            stmt = stmt.where(CommitGuruMetric.commit_hash.in_(request.commit_hashes))
+        if request.start_date is not None:
+            stmt = stmt.where(
+                CommitGuruMetric.author_date_unix_timestamp
+                >= int(request.start_date.timestamp())
+            )
+        if request.end_date is not None:
+            stmt = stmt.where(
+                CommitGuruMetric.author_date_unix_timestamp
+                <= int(request.end_date.timestamp())
+            )
+        stmt = stmt.order_by(CommitGuruMetric.author_date_unix_timestamp).limit(
+            MAX_BATCH_INFERENCE_COMMITS + 1
+        )
+        result = await self.db.execute(stmt)
+        return list(dict.fromkeys(result.scalars().all()))
+
+    async def trigger_batch_inference(
+        self, request: schemas.BatchInferenceRequest
+    ) -> schemas.BatchInferenceTriggerResponse:
+        """
+        Creates one InferenceJob per commit (sharing a batch_id) and dispatches a
+        single batch prediction task. Commits must already be ingested: the batch
+        reads their stored metrics instead of running per-commit feature extraction.
+        """
+        logger.info(
+            f"Service: Starting batch inference for Repo={request.repo_id}, Model={request.ml_model_id}"
+        )
+
+        # --- Validation ---
+        try:
+            repo = await crud.crud_repository.get_repository(
+                self.db, repo_id=request.repo_id
+            )
+            if not repo:
+                raise NotFoundError(f"Repository {request.repo_id} not found.")
+
+            model = await crud.crud_ml_model.get_ml_model(
+                self.db, model_id=request.ml_model_id
+            )
+            if not model:
+                raise NotFoundError(f"ML Model {request.ml_model_id} not found.")
+            if not model.s3_artifact_path:
+                raise ConflictError(
+                    f"ML Model {request.ml_model_id} is not ready (missing artifact path)."
+                )
+
+            commit_hashes = await self._resolve_batch_commits(request)
+            if request.commit_hashes:
+                missing = set(request.commit_hashes) - set(commit_hashes)
+                if missing:
+                    raise ConflictError(
+                        f"{len(missing)} commit(s) have no ingested metrics, e.g. {sorted(missing)[:5]}."
+                    )
+            if not commit_hashes:
+                raise NotFoundError("No ingested commits match the batch request.")
+            if len(commit_hashes) > MAX_BATCH_INFERENCE_COMMITS:
+                raise ConflictError(
+                    f"Batch exceeds {MAX_BATCH_INFERENCE_COMMITS} commits; narrow the range."
+                )
+        except NotFoundError as e:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail=str(e)
+            ) from e
+        except ConflictError as e:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT, detail=str(e)
+            ) from e
+        except Exception as e:
+            logger.error(f"Unexpected validation error: {e}", exc_info=True)
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Validation error.",
+            ) from e
+
+        # --- Create Job Records ---
+        batch_id = uuid.uuid4().hex
+        queued_at = datetime.now(timezone.utc)
+        try:
+            job_ids = await crud.crud_inference_job.create_inference_jobs_bulk(
+                self.db,
+                objs_in=[
+                    schemas.InferenceJobCreate(
+                        ml_model_id=request.ml_model_id,
+                        input_reference={
+                            "commit_hash": commit_hash,
+                            "repo_id": request.repo_id,
+                            "trigger_source": "batch",
+                            "run_xai": request.run_xai,
+                        },
+                        status=JobStatusEnum.PENDING,
+                        batch_id=batch_id,
+                        prediction_queued_at=queued_at,
+                    )
+                    for commit_hash in commit_hashes
+                ],
+            )
+            logger.info(
+                f"Service: Created {len(job_ids)} InferenceJobs for batch {batch_id}"
+            )
+        except Exception as e:
+            logger.error(
+                f"Service: Failed to create batch InferenceJob records: {e}",
+                exc_info=True,
+            )
+            await self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to create job records.",
+            ) from e
+
+        # --- Dispatch Batch Prediction Task ---
+        task_name = "tasks.batch_inference_predict"
+        try:
+            task = self.celery_app.send_task(task_name, args=[batch_id])
+            if not task or not task.id:
+                raise InternalError("Celery dispatch returned invalid task object.")
+            await crud.crud_inference_job.set_task_id_for_batch(
+                self.db, batch_id=batch_id, celery_task_id=task.id
+            )
+        except Exception as e:
+            logger.error(
+                f"Service: Failed to dispatch/link Celery task '{task_name}' for batch {batch_id}: {e}",
+                exc_info=True,
+            )
+            await self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to dispatch background task.",
+            ) from e
+
+        logger.info(f"Service: Dispatched batch prediction task {task.id}")
+        return schemas.BatchInferenceTriggerResponse(
+            batch_id=batch_id, inference_job_ids=job_ids, task_id=task.id
+        )
+
     async def get_inference_status(self, job_id: int) -> schemas.InferenceJobRead:
         """Gets the combined status (DB + Celery) for an inference job."""
         logger.debug(f"Service: Getting status for InferenceJob {job_id}")
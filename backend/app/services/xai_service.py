@@ -19,6 +19,7 @@ from shared.schemas.enums import (
     XAIStatusEnum,
     XAITypeEnum,
 )
+from shared.utils.xai_result_storage import read_xai_result_page
 
 logger = logging.getLogger(__name__)
 logger.setLevel(settings.LOG_LEVEL.upper())
@@ -85,9 +86,8 @@ class XAIService:
         task_name = "tasks.orchestrate_xai"  # Task in ML worker
         args = [inference_job_id]
         try:
-            task = self.celery_app.send_task(
-                task_name, args=args, queue="ml_queue"
-            )  # Use ML queue for orchestrator
+            # Routed to the XAI queue (shared/celery_config/routing.py)
+            task = self.celery_app.send_task(task_name, args=args)
             if not task or not task.id:
                 raise InternalError(
                     "Celery dispatch returned invalid task object for XAI orchestration."
@@ -127,6 +127,55 @@ class XAIService:
 
         return response_data
 
+    async def get_explanation_page(
+        self,
+        xai_result_id: int,
+        skip: int = 0,
+        limit: int = 50,
+        feature_skip: int = 0,
+        feature_limit: Optional[int] = None,
+    ) -> schemas.XAIResultPage:
+        """
+        Returns a page of the instances of a successful XAI result, each with
+        its most important features first, without sending the whole result.
+        """
+        logger.debug(
+            f"Service: Getting instances {skip}-{skip + limit} of XAIResult {xai_result_id}"
+        )
+        db_xai = await crud.crud_xai_result.get_xai_result_with_payload(
+            self.db, xai_result_id=xai_result_id
+        )
+        if not db_xai:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"XAI Result {xai_result_id} not found.",
+            )
+        if db_xai.status != XAIStatusEnum.SUCCESS:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"XAI Result {xai_result_id} is not in SUCCESS state (current: {db_xai.status.value}).",
+            )
+
+        total_instances, instances = read_xai_result_page(
+            db_xai.xai_type,
+            db_xai.result_data,
+            db_xai.result_payload,
+            skip=skip,
+            limit=limit,
+            feature_skip=feature_skip,
+            feature_limit=feature_limit,
+        )
+        return schemas.XAIResultPage(
+            xai_result_id=db_xai.id,
+            xai_type=db_xai.xai_type,
+            total_instances=total_instances,
+            skip=skip,
+            limit=limit,
+            feature_skip=feature_skip,
+            feature_limit=feature_limit,
+            instances=instances,
+        )
+
     async def get_all_explanations_for_job(
         self,
         inference_job_id: int,
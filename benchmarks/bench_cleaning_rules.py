@@ -0,0 +1,109 @@
+# benchmarks/bench_cleaning_rules.py
+"""
+Sequential batch-safe cleaning rules vs. the compiled single-pass rule set.
+
+Reports time per batch and the number of DataFrame copies each approach makes
+(the sequential chain copies once per rule that drops rows; the compiled set
+copies at most once).
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+from _common import best_of, use_worker
+
+use_worker("dataset")
+
+from services.cleaning_rules.compiler import compile_rules  # noqa: E402
+from services.cleaning_rules.implementations import (  # noqa: E402
+    FilterLargeCommits,
+    RemoveCommentOnlyChange,
+    RemoveDataClass,
+    RemoveDeadCode,
+    RemoveEmptyClass,
+    RemoveMarginalChange,
+    RemoveMinimalChange,
+    RemoveNoAddedLines,
+    RemoveNoCodeChange,
+    RemoveTrivialGetSet,
+    RemoveTrivialMethodChange,
+    RemoveTypeExceptionFiles,
+)
+
+from shared.db import CK_METRIC_COLUMNS  # noqa: E402
+
+RULES = [
+    (RemoveEmptyClass(), {}),
+    (RemoveTrivialGetSet(), {}),
+    (RemoveNoAddedLines(), {}),
+    (RemoveCommentOnlyChange(), {}),
+    (RemoveTrivialMethodChange(), {"min_line_change": 10}),
+    (RemoveTypeExceptionFiles(), {}),
+    (RemoveDeadCode(), {}),
+    (RemoveDataClass(), {}),
+    (RemoveNoCodeChange(), {}),
+    (RemoveMarginalChange(), {"threshold": 15}),
+    (RemoveMinimalChange(), {"threshold": 5}),
+    (FilterLargeCommits(), {"max_files_changed": 10}),
+]
+
+
+def make_batch(rows: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    metrics = [c for c in CK_METRIC_COLUMNS if c not in ("file", "class_name", "type_")]
+    data = {c: rng.integers(0, 30, rows).astype(float) for c in metrics}
+    data.update({f"d_{c}": rng.integers(-3, 4, rows).astype(float) for c in metrics})
+    data["file"] = rng.choice(["A.java", "BType.java", "CException.java"], rows)
+    data["la"] = rng.integers(0, 50, rows).astype(float)
+    data["ld"] = rng.integers(0, 50, rows).astype(float)
+    data["changed_file_count"] = rng.integers(1, 30, rows)
+    data["is_buggy"] = rng.random(rows) < 0.3
+    df = pd.DataFrame(data)
+    df.loc[df.sample(frac=0.05, random_state=seed).index, "d_wmc"] = np.nan
+    return df
+
+
+def run_sequential(batch: pd.DataFrame):
+    current, copies = batch, 0
+    for rule, params in RULES:
+        result = rule.apply(current, params, {})
+        copies += result is not current
+        current = result
+    return current, copies
+
+
+def run_compiled(compiled, batch: pd.DataFrame):
+    result, _ = compiled.apply(batch)
+    return result, int(result is not batch)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000, help="Rows per batch.")
+    parser.add_argument("--batches", type=int, default=20)
+    args = parser.parse_args()
+
+    batches = [make_batch(args.rows, seed) for seed in range(args.batches)]
+    compiled = compile_rules(RULES, {})
+
+    seq_time, seq_out = best_of(lambda: [run_sequential(b) for b in batches])
+    cmp_time, cmp_out = best_of(lambda: [run_compiled(compiled, b) for b in batches])
+
+    for (seq_df, _), (cmp_df, _) in zip(seq_out, cmp_out):
+        pd.testing.assert_frame_equal(seq_df, cmp_df)
+
+    seq_copies = sum(c for _, c in seq_out) / len(batches)
+    cmp_copies = sum(c for _, c in cmp_out) / len(batches)
+    print(f"{len(RULES)} rules, {args.batches} batches x {args.rows} rows")
+    print(
+        f"sequential: {1000 * seq_time / len(batches):8.3f} ms/batch, {seq_copies:.1f} copies/batch"
+    )
+    print(
+        f"compiled:   {1000 * cmp_time / len(batches):8.3f} ms/batch, {cmp_copies:.1f} copies/batch"
+    )
+    print(f"speed-up:   {seq_time / cmp_time:.2f}x (outputs identical)")
+
+
+if __name__ == "__main__":
+    main()
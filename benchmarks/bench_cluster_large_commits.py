@@ -0,0 +1,111 @@
+# benchmarks/bench_cluster_large_commits.py
+"""
+ClusterLargeCommits on a synthetic many-large-commits history.
+
+Compares the legacy serial per-commit loop (copy group, impute, KMeans,
+per-group aggregation) with the rule's vectorised implementation in-process
+(n_jobs=1) and on a process pool (n_jobs=-1), and checks that the pooled
+output is identical to the in-process output for the same seed.
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+from _common import best_of, use_worker
+
+use_worker("dataset")
+
+from services.cleaning_rules.implementations import (  # noqa: E402
+    DEFAULT_INFO_COLUMNS,
+    ClusterLargeCommits,
+)
+from sklearn.cluster import KMeans  # noqa: E402
+
+FEATURES = [f"f{i}" for i in range(40)]
+
+
+def make_history(commits: int, min_rows: int, max_rows: int, seed: int):
+    rng = np.random.default_rng(seed)
+    sizes = rng.integers(min_rows, max_rows, commits)
+    # Small commits provide the target cluster count (their average file count)
+    small = rng.integers(1, 8, commits * 4)
+    counts = np.concatenate([sizes, small])
+    commit_of_row = np.repeat(np.arange(len(counts)), counts)
+    rows = len(commit_of_row)
+    df = pd.DataFrame(rng.normal(size=(rows, len(FEATURES))), columns=FEATURES)
+    df.loc[df.sample(frac=0.02, random_state=seed).index, "f0"] = np.nan
+    df["commit_hash"] = np.char.add("c", commit_of_row.astype(str))
+    df["changed_file_count"] = counts[commit_of_row]
+    df["file"] = np.char.add("File", np.arange(rows).astype(str))
+    df["is_buggy"] = rng.random(rows) < 0.3
+    return df.sample(frac=1.0, random_state=seed).reset_index(drop=True)
+
+
+def legacy_cluster(df, threshold, config):
+    """The serial per-commit loop this rule used before vectorisation."""
+    df_below = df[df["changed_file_count"] <= threshold].copy()
+    df_above = df[df["changed_file_count"] > threshold].copy()
+    avg_count = max(int(round(df_below["changed_file_count"].mean())), 1)
+    features = config["feature_columns"]
+    reduced = [df_below]
+    for _, group in df_above.groupby("commit_hash"):
+        if group.shape[0] <= avg_count:
+            reduced.append(group)
+            continue
+        group = group.copy()
+        for feature in features:
+            group[feature] = group[feature].fillna(group[feature].mean()).fillna(0)
+        group["cluster"] = KMeans(
+            n_clusters=min(avg_count, group.shape[0]), random_state=42, n_init="auto"
+        ).fit_predict(group[features])
+        agg = {}
+        for col in group.columns:
+            if col == "cluster":
+                continue
+            if col == "commit_hash" or col in DEFAULT_INFO_COLUMNS:
+                agg[col] = "first"
+            elif col == "is_buggy":
+                agg[col] = lambda s: s.astype(float).mean() >= 0.5
+            elif pd.api.types.is_numeric_dtype(group[col].dtype):
+                agg[col] = "mean"
+            else:
+                agg[col] = "first"
+        reduced.append(group.groupby("cluster").agg(agg).reset_index(drop=True))
+    return pd.concat(reduced, ignore_index=True, sort=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--commits", type=int, default=300)
+    parser.add_argument("--min-rows", type=int, default=50)
+    parser.add_argument("--max-rows", type=int, default=400)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    df = make_history(args.commits, args.min_rows, args.max_rows, seed=0)
+    config = {"feature_columns": FEATURES, "target_column": "is_buggy"}
+    rule = ClusterLargeCommits()
+    print(f"{len(df)} rows, {args.commits} large commits, {len(FEATURES)} features")
+
+    legacy_time, legacy_out = best_of(
+        lambda: legacy_cluster(df, 10, config), args.repeat
+    )
+    serial_time, serial_out = best_of(
+        lambda: rule.apply(df, {"threshold": 10, "n_jobs": 1}, config), args.repeat
+    )
+    pool_time, pool_out = best_of(
+        lambda: rule.apply(df, {"threshold": 10, "n_jobs": -1}, config), args.repeat
+    )
+    pd.testing.assert_frame_equal(serial_out, pool_out)
+
+    print(f"legacy loop:          {legacy_time:8.3f} s -> {len(legacy_out)} rows")
+    print(f"vectorised, n_jobs=1: {serial_time:8.3f} s -> {len(serial_out)} rows")
+    print(f"vectorised, pool:     {pool_time:8.3f} s -> {len(pool_out)} rows")
+    print(
+        f"speed-up vs legacy:   {legacy_time / pool_time:.2f}x (pool == serial output)"
+    )
+
+
+if __name__ == "__main__":
+    main()
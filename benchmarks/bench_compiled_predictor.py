@@ -0,0 +1,93 @@
+# benchmarks/bench_compiled_predictor.py
+"""
+Inference latency of compiled tree ensembles versus the native estimators.
+
+Fits scikit-learn random forest and gradient boosting models on synthetic
+commit features. For inputs of 1, 20 and 1000 rows, it compares the native path
+used by the strategies (predict + predict_proba on a DataFrame) with
+CompiledTreeEnsemble.predict_result. Also checks that the probabilities
+agree. Times are per call, best of --repeat rounds of --calls calls.
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+from _common import use_worker
+
+use_worker("ml")
+
+from services.compiled_predictor import compile_tree_ensemble  # noqa: E402
+from sklearn.ensemble import (  # noqa: E402
+    GradientBoostingClassifier,
+    RandomForestClassifier,
+)
+
+
+def make_data(rows: int, features: int, seed: int):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(
+        rng.normal(size=(rows, features)), columns=[f"f{i}" for i in range(features)]
+    )
+    y = (X["f0"] + X["f1"] * X["f2"] + rng.normal(size=rows) > 0).astype(int)
+    return X, y
+
+
+def per_call(fn, calls: int, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        best = min(best, (time.perf_counter() - start) / calls)
+    return best
+
+
+def native_predict(model, X):
+    return {
+        "predictions": model.predict(X).tolist(),
+        "probabilities": model.predict_proba(X).tolist(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--train-rows", type=int, default=5000)
+    parser.add_argument("--features", type=int, default=60)
+    parser.add_argument("--trees", type=int, default=100)
+    parser.add_argument("--calls", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    X, y = make_data(args.train_rows, args.features, seed=0)
+    models = {
+        "random forest": RandomForestClassifier(
+            n_estimators=args.trees, max_depth=12, n_jobs=1, random_state=0
+        ),
+        "gradient boosting": GradientBoostingClassifier(
+            n_estimators=args.trees, max_depth=3, random_state=0
+        ),
+    }
+    for name, model in models.items():
+        model.fit(X, y)
+        compiled = compile_tree_ensemble(model, X)
+        print(
+            f"{name}: {compiled.n_trees} trees, {len(compiled.left)} nodes, depth {compiled.depth}"
+        )
+        for rows in (1, 20, 1000):
+            X_new, _ = make_data(rows, args.features, seed=rows)
+            np.testing.assert_allclose(
+                compiled.predict_proba(X_new), model.predict_proba(X_new), atol=1e-9
+            )
+            calls = max(args.calls // (10 if rows >= 1000 else 1), 1)
+            native = per_call(lambda: native_predict(model, X_new), calls, args.repeat)
+            fast = per_call(lambda: compiled.predict_result(X_new), calls, args.repeat)
+            print(
+                f"  {rows:>5} rows: native {native * 1e3:8.3f} ms  "
+                f"compiled {fast * 1e3:8.3f} ms  {native / fast:6.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
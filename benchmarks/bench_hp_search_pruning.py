@@ -0,0 +1,126 @@
+# benchmarks/bench_hp_search_pruning.py
+"""
+HP search wall time with fold-level pruning vs the legacy single report.
+
+The legacy objective ran all CV folds through cross_val_score and reported
+one value at step 0, so MedianPruner could only judge a trial after it had
+paid for every fold. The current Objective reports the running mean after
+each fold. Both run the same seeded TPE study with a MedianPruner on a fixed
+synthetic dataset, and the script prints wall time, pruned trial count and
+best value for each.
+"""
+
+import argparse
+import logging
+import time
+
+import numpy as np
+import pandas as pd
+from _common import use_worker
+
+use_worker("ml")
+
+import optuna  # noqa: E402
+from services.hp_search_objective import Objective  # noqa: E402
+from sklearn.model_selection import cross_val_score  # noqa: E402
+
+from shared.schemas.enums import ModelTypeEnum  # noqa: E402
+
+
+class LegacyObjective(Objective):
+    """All folds at once, one report at step 0 (the previous behaviour)."""
+
+    def _cross_validate_with_pruning(self, trial, model_instance):
+        scores = cross_val_score(
+            estimator=model_instance,
+            X=self.X,
+            y=self.y,
+            cv=self.cv_splits,
+            scoring=self.scorer,
+            n_jobs=-1,
+            error_score="raise",
+        )
+        trial.report(float(np.mean(scores)), step=0)
+        if trial.should_prune():
+            raise optuna.TrialPruned()
+        return scores.tolist()
+
+
+def make_dataset(rows: int, features: int, seed: int):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(
+        rng.normal(size=(rows, features)), columns=[f"f{i}" for i in range(features)]
+    )
+    signal = X["f0"] + 0.5 * X["f1"] * X["f2"] - 0.3 * X["f3"]
+    y = (signal + rng.normal(scale=1.0, size=rows) > 0.8).astype(int)
+    return X, y
+
+
+def run_study(objective_cls, X, y, args):
+    job_config = {
+        "random_seed": args.seed,
+        "optuna_config": {"hp_search_cv_folds": args.folds},
+    }
+    hp_space = [
+        {"param_name": "n_estimators", "suggest_type": "int", "low": 10, "high": 150},
+        {"param_name": "max_depth", "suggest_type": "int", "low": 1, "high": 16},
+        {
+            "param_name": "min_samples_leaf",
+            "suggest_type": "int",
+            "low": 1,
+            "high": 200,
+            "log": True,
+        },
+    ]
+    objective = objective_cls(
+        X,
+        y,
+        model_type_enum=ModelTypeEnum.SKLEARN_RANDOMFOREST,
+        hp_space_config=hp_space,
+        base_job_config=job_config,
+        artifact_service=None,
+    )
+    study = optuna.create_study(
+        direction="maximize",
+        sampler=optuna.samplers.TPESampler(seed=args.seed),
+        pruner=optuna.pruners.MedianPruner(n_startup_trials=5),
+    )
+    start = time.perf_counter()
+    study.optimize(objective, n_trials=args.trials)
+    elapsed = time.perf_counter() - start
+    pruned = len(study.get_trials(states=(optuna.trial.TrialState.PRUNED,)))
+    return elapsed, pruned, study.best_value
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=5_000)
+    parser.add_argument("--features", type=int, default=20)
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--trials", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    logging.getLogger("services").setLevel(logging.WARNING)
+
+    X, y = make_dataset(args.rows, args.features, args.seed)
+    print(
+        f"{args.rows} rows x {args.features} features, {args.folds}-fold CV, "
+        f"{args.trials} TPE trials, MedianPruner(n_startup_trials=5)"
+    )
+    baseline = None
+    for label, objective_cls in (
+        ("legacy (report once)", LegacyObjective),
+        ("fold-level reporting", Objective),
+    ):
+        elapsed, pruned, best = run_study(objective_cls, X, y, args)
+        baseline = baseline or elapsed
+        print(
+            f"{label:<22} {elapsed:8.2f} s  pruned {pruned:>3}/{args.trials}  "
+            f"best {best:.4f}  {baseline / elapsed:5.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
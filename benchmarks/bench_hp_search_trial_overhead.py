@@ -0,0 +1,98 @@
+# benchmarks/bench_hp_search_trial_overhead.py
+"""
+Per-trial overhead of the HP search Objective on a large feature matrix.
+
+The legacy trial re-created StratifiedKFold splits and handed the pandas X/y
+to cross_val_score(n_jobs=-1), which slices (and, with several cores, pickles
+to each joblib worker) the float64 DataFrame on every trial. The current
+Objective converts X to one contiguous float32 matrix and computes the fold
+indices once per study, and every trial slices that matrix. A GaussianNB
+keeps model fitting cheap so the per-trial data handling dominates. With a
+single core joblib runs the legacy folds in-process, so the pickling cost of
+the legacy path is not included here.
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+from _common import best_of, use_worker
+
+use_worker("ml")
+
+import optuna  # noqa: E402
+from services.hp_search_objective import Objective  # noqa: E402
+from sklearn.model_selection import StratifiedKFold, cross_val_score  # noqa: E402
+from sklearn.naive_bayes import GaussianNB  # noqa: E402
+
+from shared.schemas.enums import ModelTypeEnum  # noqa: E402
+
+
+def legacy_trial(objective, model):
+    """What one trial did before: fresh splitter, DataFrame through cross_val_score."""
+    cv_splitter = StratifiedKFold(
+        n_splits=objective.cv_folds, shuffle=True, random_state=objective.cv_random_seed
+    )
+    return cross_val_score(
+        estimator=model,
+        X=objective.X,
+        y=objective.y,
+        cv=cv_splitter,
+        scoring=objective.scorer,
+        n_jobs=-1,
+        error_score="raise",
+    ).tolist()
+
+
+def main():
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--features", type=int, default=40)
+    parser.add_argument("--folds", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(
+        rng.normal(size=(args.rows, args.features)),
+        columns=[f"f{i}" for i in range(args.features)],
+    )
+    y = pd.Series((X["f0"] + rng.normal(size=args.rows) > 0).astype(int))
+
+    objective = Objective(
+        X,
+        y,
+        model_type_enum=ModelTypeEnum.SKLEARN_LOGISTICREGRESSION,
+        hp_space_config=[],
+        base_job_config={
+            "random_seed": 0,
+            "optuna_config": {"hp_search_cv_folds": args.folds},
+        },
+        artifact_service=None,
+    )
+    model = GaussianNB()
+    study = optuna.create_study(direction="maximize")
+
+    print(
+        f"{args.rows} rows x {args.features} features, {args.folds}-fold CV; "
+        f"DataFrame {X.memory_usage().sum() / 1e6:.0f} MB, "
+        f"float32 matrix {objective.X_matrix.nbytes / 1e6:.0f} MB"
+    )
+    legacy_time, legacy_scores = best_of(
+        lambda: legacy_trial(objective, model), args.repeat
+    )
+    new_time, new_scores = best_of(
+        lambda: objective._cross_validate_with_pruning(study.ask(), model),
+        args.repeat,
+    )
+    # float32 inputs shift a handful of borderline predictions
+    np.testing.assert_allclose(new_scores, legacy_scores, atol=1e-4)
+    print(
+        f"legacy trial {legacy_time:7.3f} s   precomputed folds + float32 matrix "
+        f"{new_time:7.3f} s   {legacy_time / new_time:5.2f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+# benchmarks/bench_inference_queue_latency.py
+"""
+Inference latency under load while an HP search is running, with the shared
+ML queue versus the dedicated worker pools.
+
+Runs real Celery workers on the in-memory transport, in a fresh process per
+topology, with stand-in tasks that sleep instead of touching the database:
+the HP search task holds its worker slot for --hp-search-seconds, inference
+tasks for --predict-ms. After the HP search starts, single-commit predictions arrive
+as a Poisson process at --rate per second for --duration seconds.
+
+"shared" is the previous topology: predictions go to ml_queue and one worker
+with concurrency 1 and the default prefetch consumes ml_queue and xai_queue.
+"pools" routes by task name (shared/celery_config/routing.py) to the ML
+pools in WORKER_POOLS, with the pool's concurrency and prefetch.
+Reports p50/p95/max latency from sending a prediction to its completion.
+The memory transport ignores message priorities, so webhook priority
+ordering (a RabbitMQ priority queue) is not exercised here.
+"""
+
+import argparse
+import multiprocessing
+import threading
+import time
+from contextlib import ExitStack
+
+import numpy as np
+from _common import use_worker
+
+use_worker("ml")
+
+from celery.contrib.testing.worker import start_worker  # noqa: E402
+
+from shared.celery_config.app import create_celery_app  # noqa: E402
+from shared.celery_config.routing import (  # noqa: E402
+    ML_QUEUE,
+    WORKER_POOLS,
+    XAI_QUEUE,
+)
+
+latencies = []
+latencies_lock = threading.Lock()
+
+
+def create_app(hp_search_seconds: float, predict_seconds: float):
+    app = create_celery_app(main_name="bench_inference_queue")
+    # The broker URL passed by create_celery_app takes precedence over
+    # broker_url, but not over the read/write URLs. The memory transport polls
+    # its queues, once a second by default.
+    app.conf.update(
+        broker_read_url="memory://",
+        broker_write_url="memory://",
+        broker_transport_options={"polling_interval": 0.005},
+        result_backend=None,
+    )
+
+    @app.task(name="tasks.hyperparameter_search")
+    def hyperparameter_search(job_id):
+        time.sleep(hp_search_seconds)
+
+    @app.task(name="tasks.inference_predict")
+    def inference_predict(job_id, sent_at):
+        time.sleep(predict_seconds)
+        with latencies_lock:
+            latencies.append(time.perf_counter() - sent_at)
+
+    return app
+
+
+def run(topology, args, queue):
+    if topology == "shared":
+        workers = [("ml", [ML_QUEUE, XAI_QUEUE], 1, 4)]
+        predict_options = {"queue": ML_QUEUE}
+    else:
+        workers = [
+            (name, list(pool.queues), pool.concurrency, pool.prefetch_multiplier)
+            for name, pool in WORKER_POOLS.items()
+            if name != "ml"
+        ]
+        predict_options = {}
+
+    rng = np.random.default_rng(0)
+    app = create_app(args.hp_search_seconds, args.predict_ms / 1000)
+    with ExitStack() as stack:
+        # One solo worker per process of the pool, each with its own app (queue
+        # selection and prefetch are app settings) and the pool's prefetch: the
+        # thread pool defers acks to the consumer loop, which stalls the
+        # memory transport once the prefetch is used up. The memory
+        # transport's queues are shared by the whole process.
+        for name, queues, concurrency, prefetch in workers:
+            for i in range(concurrency):
+                stack.enter_context(
+                    start_worker(
+                        create_app(args.hp_search_seconds, args.predict_ms / 1000),
+                        pool="solo",
+                        perform_ping_check=False,
+                        shutdown_timeout=args.hp_search_seconds + 30,
+                        hostname=f"{name}-{i}@bench",
+                        queues=queues,
+                        prefetch_multiplier=prefetch,
+                    )
+                )
+        app.send_task("tasks.hyperparameter_search", args=[1])
+        time.sleep(0.2)  # Let the HP search start
+
+        sent = 0
+        end = time.perf_counter() + args.duration
+        while time.perf_counter() < end:
+            time.sleep(rng.exponential(1 / args.rate))
+            app.send_task(
+                "tasks.inference_predict",
+                args=[sent, time.perf_counter()],
+                **predict_options,
+            )
+            sent += 1
+        deadline = time.perf_counter() + args.hp_search_seconds + 30
+        while len(latencies) < sent and time.perf_counter() < deadline:
+            time.sleep(0.05)
+
+    queue.put((sent, list(latencies)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--hp-search-seconds", type=float, default=10.0)
+    parser.add_argument("--predict-ms", type=float, default=50.0)
+    parser.add_argument("--rate", type=float, default=10.0)
+    parser.add_argument("--duration", type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(
+        f"HP search {args.hp_search_seconds:.0f}s, predictions {args.predict_ms:.0f} ms "
+        f"at {args.rate:.0f}/s for {args.duration:.0f}s"
+    )
+    # Celery's worker state is per process, so each topology gets a fresh one
+    context = multiprocessing.get_context("spawn")
+    for topology in ("shared", "pools"):
+        queue = context.Queue()
+        process = context.Process(target=run, args=(topology, args, queue))
+        process.start()
+        sent, values = queue.get()
+        process.join()
+        values = np.array(values) * 1000
+        print(
+            f"{topology:>7}: {len(values)}/{sent} predictions, latency p50 "
+            f"{np.percentile(values, 50):7.0f} ms, p95 {np.percentile(values, 95):7.0f} ms, "
+            f"max {values.max():7.0f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
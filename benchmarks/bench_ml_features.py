@@ -0,0 +1,209 @@
+# benchmarks/bench_ml_features.py
+"""
+MLFeatureRepository feature retrieval for 1, 100 and 10k commits.
+
+Compares the legacy per-commit path (three ORM queries per commit, getattr
+row conversion, column-by-column deltas and an iterrows() rebuild) with the
+set-based get_features_for_commits, which builds target/parent joins and d_*
+deltas in one SQL statement. Both run against a synthetic in-memory SQLite
+database, so the savings in database round trips are understated compared
+with a networked PostgreSQL. Legacy timings for sizes above --legacy-max are
+extrapolated from a sample of --legacy-max commits.
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+from _common import best_of, use_worker
+
+use_worker("ml")
+
+from sqlalchemy import ARRAY, create_engine, event, insert, select  # noqa: E402
+from sqlalchemy.ext.compiler import compiles  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from shared.db import CK_METRIC_COLUMNS, COMMIT_GURU_METRIC_COLUMNS  # noqa: E402
+from shared.db.base_class import Base  # noqa: E402
+from shared.db.models import CKMetric, CommitGuruMetric  # noqa: E402
+from shared.repositories.ml_feature_repository import (  # noqa: E402
+    MLFeatureRepository,
+)
+
+
+# PostgreSQL-only pieces the statement and models rely on
+@compiles(ARRAY, "sqlite")
+def _array_as_json(type_, compiler, **kw):
+    return "JSON"
+
+
+def _split_part(value, delimiter, index):
+    parts = (value or "").split(delimiter)
+    return parts[index - 1] if index <= len(parts) else ""
+
+
+def make_database(commits: int, classes: int, seed: int):
+    """Linear history of `commits` commits (+ one root), `classes` CK rows each."""
+    engine = create_engine("sqlite://")
+    event.listen(
+        engine,
+        "connect",
+        lambda conn, _: conn.create_function("split_part", 3, _split_part),
+    )
+    # github_issues are selectin-loaded with every CommitGuruMetric entity
+    Base.metadata.create_all(
+        engine,
+        tables=[
+            Base.metadata.tables[name]
+            for name in (
+                "ck_metrics",
+                "commit_guru_metrics",
+                "github_issues",
+                "commit_github_issue_association",
+            )
+        ],
+    )
+
+    rng = np.random.default_rng(seed)
+    hashes = [f"{i:040x}" for i in range(commits + 1)]
+    numeric = [c for c in CK_METRIC_COLUMNS if c not in ("file", "class_name", "type_")]
+    guru_rows = [
+        {
+            "repository_id": 1,
+            "commit_hash": h,
+            "parent_hashes": hashes[i - 1] if i else None,
+            "is_buggy": bool(rng.random() < 0.3),
+            "la": float(rng.integers(0, 500)),
+            "ld": float(rng.integers(0, 200)),
+            "nf": float(rng.integers(1, 20)),
+        }
+        for i, h in enumerate(hashes)
+    ]
+    values = rng.integers(0, 100, size=(len(hashes) * classes, len(numeric)))
+    ck_rows = []
+    for i, h in enumerate(hashes):
+        for k in range(classes):
+            row = dict(zip(numeric, values[i * classes + k].tolist()))
+            row.update(
+                repository_id=1,
+                commit_hash=h,
+                file=f"src/File{k}.java",
+                class_name=f"pkg.Class{k}",
+                type_="class",
+            )
+            ck_rows.append(row)
+    with engine.begin() as conn:
+        conn.execute(insert(CommitGuruMetric), guru_rows)
+        conn.execute(insert(CKMetric), ck_rows)
+    return sessionmaker(bind=engine), hashes[1:]
+
+
+def legacy_features_for_commit(session_factory, repo_id, commit_hash):
+    """The per-commit implementation get_features_for_commit used before."""
+    with session_factory() as session:
+        target_cgm = session.execute(
+            select(CommitGuruMetric).where(
+                CommitGuruMetric.repository_id == repo_id,
+                CommitGuruMetric.commit_hash == commit_hash,
+            )
+        ).scalar_one_or_none()
+        if not target_cgm:
+            return None
+        guru_features = {
+            col: getattr(target_cgm, col, None) for col in COMMIT_GURU_METRIC_COLUMNS
+        }
+        target_ck = session.execute(
+            select(CKMetric).where(
+                CKMetric.repository_id == repo_id, CKMetric.commit_hash == commit_hash
+            )
+        ).scalars()
+        target_list = []
+        for m in target_ck:
+            record = {col: getattr(m, col, None) for col in CK_METRIC_COLUMNS}
+            record["merge_key_file"] = m.file
+            record["merge_key_class"] = m.class_name
+            record["class"] = m.class_name
+            record["type"] = m.type_
+            target_list.append(record)
+        if not target_list or not target_cgm.parent_hashes:
+            return None
+        parent_hash = target_cgm.parent_hashes.split()[0]
+        parent_ck = session.execute(
+            select(CKMetric).where(
+                CKMetric.repository_id == repo_id, CKMetric.commit_hash == parent_hash
+            )
+        ).scalars()
+        parent_list = []
+        for m in parent_ck:
+            record = {col: getattr(m, col, None) for col in CK_METRIC_COLUMNS}
+            record["merge_key_file"] = m.file
+            record["merge_key_class"] = m.class_name
+            parent_list.append(record)
+
+    merged = pd.merge(
+        pd.DataFrame(target_list),
+        pd.DataFrame(parent_list).rename(
+            columns={col: f"parent_{col}" for col in CK_METRIC_COLUMNS}
+        ),
+        on=["merge_key_file", "merge_key_class"],
+        how="left",
+    )
+    for col in CK_METRIC_COLUMNS:
+        target = pd.to_numeric(merged[col], errors="coerce")
+        parent = pd.to_numeric(merged[f"parent_{col}"], errors="coerce")
+        merged[f"d_{col}"] = target - parent
+        merged.loc[target.isna() | parent.isna(), f"d_{col}"] = np.nan
+    final_df = pd.DataFrame(
+        [{**guru_features, **row.to_dict()} for _, row in merged.iterrows()]
+    )
+    return final_df.drop(
+        columns=[
+            c
+            for c in final_df.columns
+            if c.startswith("parent_") or c.startswith("merge_key_")
+        ]
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 100, 10_000])
+    parser.add_argument("--classes", type=int, default=8)
+    parser.add_argument("--legacy-max", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    session_factory, hashes = make_database(max(args.sizes), args.classes, seed=0)
+    repo = MLFeatureRepository(session_factory)
+    print(
+        f"{len(hashes)} commits x {args.classes} classes, {len(CK_METRIC_COLUMNS)} CK metrics"
+    )
+
+    for size in args.sizes:
+        subset = hashes[:size]
+        sample = subset[: args.legacy_max]
+        legacy_time, legacy_out = best_of(
+            lambda: [legacy_features_for_commit(session_factory, 1, h) for h in sample],
+            1 if size > args.legacy_max else args.repeat,
+        )
+        legacy_time *= size / len(sample)
+        new_time, new_out = best_of(
+            lambda: repo.get_features_for_commits(1, subset), args.repeat
+        )
+
+        expected = pd.concat(legacy_out, ignore_index=True)
+        got = new_out[new_out["commit_hash"].isin(sample)].reset_index(drop=True)
+        pd.testing.assert_frame_equal(
+            got, expected, check_dtype=False, check_like=False
+        )
+
+        estimate = " (est.)" if size > args.legacy_max else ""
+        print(
+            f"{size:>6} commits: legacy {legacy_time:8.3f} s{estimate:<7} "
+            f"set-based {new_time:8.3f} s -> {len(new_out)} rows, "
+            f"{legacy_time / new_time:6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
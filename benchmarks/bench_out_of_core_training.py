@@ -0,0 +1,128 @@
+# benchmarks/bench_out_of_core_training.py
+"""
+Peak memory of out-of-core training versus the in-memory training path.
+
+Writes a synthetic commit-metrics dataset to Parquet in row groups. Each mode
+then trains the same model in a fresh process. "in-memory" loads the table
+into pandas, prepares X/y the way TrainingJobHandler does and calls
+strategy.train. "out-of-core" streams the row groups through
+ParquetTrainingData and strategy.train_out_of_core. Reports wall time, the
+process's peak RSS above its post-import baseline, and the held-out ROC AUC.
+"""
+
+import argparse
+import multiprocessing
+import resource
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+from _common import use_worker
+
+use_worker("ml")
+
+from shared.schemas.enums import ModelTypeEnum  # noqa: E402
+
+MODELS = {
+    "xgboost": (ModelTypeEnum.XGBOOST_CLASSIFIER, {"n_estimators": 50}),
+    "lightgbm": (
+        ModelTypeEnum.LIGHTGBM_CLASSIFIER,
+        {"n_estimators": 50, "verbose": -1},
+    ),
+    "sgd": (ModelTypeEnum.SKLEARN_SGDCLASSIFIER, {}),
+}
+
+
+def write_dataset(path: Path, rows: int, features: int, row_group_size: int):
+    columns = [f"metric_{i}" for i in range(features)]
+    schema = pa.schema(
+        [(name, pa.float64()) for name in columns]
+        + [("file", pa.string()), ("is_buggy", pa.bool_())]
+    )
+    rng = np.random.default_rng(0)
+    with pq.ParquetWriter(path, schema) as writer:
+        for start in range(0, rows, row_group_size):
+            n = min(row_group_size, rows - start)
+            values = rng.normal(size=(n, features))
+            values[rng.random(size=values.shape) < 0.01] = np.nan
+            label = np.nan_to_num(values[:, 0]) + 0.5 * np.nan_to_num(values[:, 1])
+            batch = {name: values[:, j] for j, name in enumerate(columns)}
+            batch["file"] = [f"src/F{start + i}.java" for i in range(n)]
+            batch["is_buggy"] = label + rng.normal(size=n) > 0
+            writer.write_table(pa.table(batch, schema=schema))
+    return columns
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_mode(mode, model, path, features, queue):
+    from services.factories.model_strategy_factory import create_model_strategy
+    from services.out_of_core import ParquetTrainingData
+
+    model_type, hyperparams = MODELS[model]
+    job_config = {"random_seed": 1, "eval_test_split_size": 0.2}
+    strategy = create_model_strategy(model_type, dict(hyperparams), job_config, None)
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    if mode == "in-memory":
+        df = pq.read_table(path, columns=features + ["is_buggy"]).to_pandas()
+        X = df[features].copy().fillna(0)
+        y = df["is_buggy"].copy().astype(int)
+        del df
+        result = strategy.train(X, y)
+    else:
+        data = ParquetTrainingData(
+            pq.ParquetFile(path), features, "is_buggy", random_seed=1
+        )
+        result = strategy.train_out_of_core(data)
+    queue.put(
+        (
+            time.perf_counter() - start,
+            peak_rss_mb() - baseline,
+            result.metrics.get("roc_auc"),
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--features", type=int, default=60)
+    parser.add_argument("--row-group-size", type=int, default=64 * 1024)
+    parser.add_argument(
+        "--models",
+        nargs="+",
+        choices=sorted(MODELS),
+        default=["xgboost", "lightgbm"],
+    )
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "dataset.parquet"
+        features = write_dataset(path, args.rows, args.features, args.row_group_size)
+        size_mb = path.stat().st_size / 1024**2
+        print(f"{args.rows} rows x {args.features} features, {size_mb:.0f} MB Parquet")
+        for model in args.models:
+            print(model)
+            for mode in ("in-memory", "out-of-core"):
+                queue = context.Queue()
+                process = context.Process(
+                    target=run_mode, args=(mode, model, str(path), features, queue)
+                )
+                process.start()
+                seconds, peak_mb, roc_auc = queue.get()
+                process.join()
+                print(
+                    f"{mode:>12}: {seconds:7.2f}s, peak RSS +{peak_mb:7.0f} MB, "
+                    f"ROC AUC {roc_auc}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# benchmarks/bench_training_memory.py
+"""
+Peak memory of preparing a training matrix, before and after the float32
+feature matrix builder.
+
+Writes a synthetic dataset of CK / Commit Guru style metrics (floats with
+missing values, integer counts) to Parquet. Each path loads the feature and
+target columns and prepares X/y, then makes the train/test split done by the
+model strategies and the float32 matrix used by the HP search objective.
+"legacy" is the previous handler code (to_pandas, .copy(), fillna(0)).
+"builder" is load_dataframe_artifact's self-destructing conversion plus
+build_training_data. Peaks are measured with tracemalloc, which sees the
+NumPy/pandas buffers but not Arrow's own allocator, so the Parquet decode is
+excluded from both.
+"""
+
+import argparse
+import gc
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+from _common import use_worker
+
+use_worker("ml")
+
+from services.feature_matrix import build_training_data  # noqa: E402
+from sklearn.model_selection import train_test_split  # noqa: E402
+
+
+def write_dataset(path: Path, rows: int, features: int):
+    rng = np.random.default_rng(0)
+    data = {}
+    for i in range(features):
+        if i % 2:
+            values = rng.normal(size=rows)
+            values[rng.random(rows) < 0.02] = np.nan
+            data[f"metric_{i}"] = values
+        else:
+            data[f"count_{i}"] = rng.integers(0, 5000, size=rows)
+    data["is_buggy"] = rng.random(rows) < 0.3
+    pq.write_table(pa.table(data), path, row_group_size=64 * 1024)
+    return [name for name in data if name != "is_buggy"]
+
+
+def legacy(path, features):
+    df = pq.read_table(path, columns=features + ["is_buggy"]).to_pandas()
+    X = df[features].copy()
+    y = df["is_buggy"].copy()
+    if X.isnull().values.any():
+        X = X.fillna(0)
+    y = y.astype(int)
+    return X, y, df
+
+
+def builder(path, features):
+    table = pq.read_table(path, columns=features + ["is_buggy"])
+    df = table.to_pandas(split_blocks=True, self_destruct=True)
+    del table
+    X, y = build_training_data(df, features, "is_buggy")
+    return X, y, None
+
+
+def measure(prepare, path, features):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    X, y, raw = prepare(path, features)
+    del raw  # The handlers drop the loaded frame once X/y exist
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=0, stratify=y
+    )
+    matrix = np.ascontiguousarray(X.to_numpy(dtype=np.float32))
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    held = X.memory_usage(index=False).sum()
+    if not np.shares_memory(matrix, X.to_numpy()):
+        held += matrix.nbytes
+    return elapsed, peak / 1024**2, held / 1024**2, X_train.dtypes.iloc[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--features", type=int, default=60)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "dataset.parquet"
+        features = write_dataset(path, args.rows, args.features)
+        print(f"{args.rows} rows x {args.features} features")
+        for name, prepare in (("legacy", legacy), ("builder", builder)):
+            seconds, peak_mb, held_mb, dtype = measure(prepare, path, features)
+            print(
+                f"{name:>8}: {seconds:6.2f}s, peak {peak_mb:7.0f} MB, "
+                f"X + HP search matrix {held_mb:6.0f} MB ({dtype})"
+            )
+
+
+if __name__ == "__main__":
+    main()
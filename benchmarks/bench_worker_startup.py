@@ -0,0 +1,108 @@
+# benchmarks/bench_worker_startup.py
+"""
+Import time and RSS of an ML worker process, per worker role.
+
+Each role runs in a fresh process. It imports app.tasks, which is what the
+prefork parent loads (and every child inherits), then the modules the role's
+first job loads through the factories. "inference" loads an XGBoost strategy,
+"training" a LightGBM strategy and the evaluation metrics, "xai" adds SHAP,
+and "hp-search" the Optuna HP search handler. "eager" imports every model
+strategy, XAI technique and Optuna, which is what each worker process held
+at startup before the factories loaded them lazily. Reports the time to
+import app.tasks, the time for the role's modules, peak RSS, and which
+heavy ML libraries ended up loaded.
+"""
+
+import argparse
+import importlib
+import multiprocessing
+import resource
+import sys
+import time
+
+from _common import use_worker
+
+use_worker("ml")
+
+HEAVY_LIBRARIES = [
+    "sklearn",
+    "xgboost",
+    "lightgbm",
+    "shap",
+    "lime",
+    "dice_ml",
+    "optuna",
+]
+ROLES = {
+    "inference": ["services.strategies.xgboost_strategy", "xgboost"],
+    "training": [
+        "services.strategies.lightgbm_strategy",
+        "lightgbm",
+        "sklearn.metrics",
+        "sklearn.model_selection",
+    ],
+    "xai": [
+        "services.strategies.xgboost_strategy",
+        "xgboost",
+        "services.strategies.shap_strategy",
+    ],
+    "hp-search": [
+        "services.handlers.hp_search_handler",
+        "services.strategies.xgboost_strategy",
+        "xgboost",
+    ],
+    "eager": [
+        "services.strategies.sklearn_strategy",
+        "sklearn.ensemble",
+        "services.strategies.xgboost_strategy",
+        "xgboost",
+        "services.strategies.lightgbm_strategy",
+        "lightgbm",
+        "services.strategies.shap_strategy",
+        "services.strategies.lime_strategy",
+        "services.strategies.feature_importance_strategy",
+        "services.strategies.counterfactuals_strategy",
+        "services.strategies.sklearn_decision_path_strategy",
+        "services.strategies.xgboost_decision_path_strategy",
+        "services.strategies.lightgbm_decision_path_strategy",
+        "services.handlers.hp_search_handler",
+    ],
+}
+
+
+def run_role(modules, queue):
+    start = time.perf_counter()
+    importlib.import_module("app.tasks")
+    startup = time.perf_counter() - start
+    start = time.perf_counter()
+    for name in modules:
+        importlib.import_module(name)
+    role = time.perf_counter() - start
+    rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    loaded = [lib for lib in HEAVY_LIBRARIES if lib in sys.modules]
+    queue.put((startup, role, rss_mb, loaded))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--roles", nargs="+", choices=["worker", *ROLES], default=["worker", *ROLES]
+    )
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    print(f"{'role':>10}  {'app.tasks':>9}  {'role':>6}  {'RSS':>7}  libraries")
+    for role in args.roles:
+        queue = context.Queue()
+        process = context.Process(target=run_role, args=(ROLES.get(role, []), queue))
+        process.start()
+        startup, role_seconds, rss_mb, loaded = queue.get()
+        process.join()
+        print(
+            f"{role:>10}  {startup:8.2f}s  {role_seconds:5.2f}s  {rss_mb:4.0f} MB  "
+            f"{', '.join(loaded) or '-'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# benchmarks/bench_xai_decision_paths.py
+"""
+Decision path wall time: one instance at a time versus all instances at once.
+
+The decision path strategies used to walk the trees once per instance. They
+now route the whole inference matrix through each explained tree in one pass
+and build the node and edge objects of each distinct path once. The script
+explains --rows instances (commits usually repeat files, so only --distinct of
+them are distinct) with each strategy, either instance by instance, like the
+legacy loop, or in a single call, and checks that both give the same paths.
+For XGBoost and LightGBM each per-instance call also dumps the booster, which
+the legacy loop did once per job, so their ratios overstate the gain; the
+scikit-learn ratio compares like with like.
+"""
+
+import argparse
+import logging
+import time
+
+import lightgbm as lgb
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from _common import use_worker
+
+use_worker("ml")
+
+from services.strategies.lightgbm_decision_path_strategy import (  # noqa: E402
+    LightGBMDecisionPathStrategy,
+)
+from services.strategies.sklearn_decision_path_strategy import (  # noqa: E402
+    SklearnDecisionPathStrategy,
+)
+from services.strategies.xgboost_decision_path_strategy import (  # noqa: E402
+    XGBoostDecisionPathStrategy,
+)
+from sklearn.ensemble import RandomForestClassifier  # noqa: E402
+
+
+def make_data(rows: int, features: int, seed: int):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(
+        rng.normal(size=(rows, features)), columns=[f"f{i}" for i in range(features)]
+    )
+    y = (X["f0"] + X["f1"] * X["f2"] + rng.normal(size=rows) > 0).astype(int)
+    return X, y
+
+
+def explain_per_instance(strategy, X_inference, identifiers):
+    paths = []
+    for i in range(len(X_inference)):
+        result = strategy.explain(
+            X_inference.iloc[[i]], identifiers.iloc[[i]].reset_index(drop=True)
+        )
+        paths.extend(result.instance_decision_paths)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--train-rows", type=int, default=5000)
+    parser.add_argument("--features", type=int, default=30)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--distinct", type=int, default=250)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    logging.getLogger("services").setLevel(logging.WARNING)
+
+    X, y = make_data(args.train_rows, args.features, args.seed)
+    rng = np.random.default_rng(args.seed)
+    X_inference = X.iloc[rng.integers(0, args.distinct, args.rows)].reset_index(
+        drop=True
+    )
+    identifiers = pd.DataFrame(
+        {"file": [f"F{i}.java" for i in range(args.rows)], "class_name": "C"}
+    )
+    strategies = {
+        "scikit-learn random forest": SklearnDecisionPathStrategy(
+            RandomForestClassifier(
+                n_estimators=100, max_depth=12, random_state=args.seed
+            ).fit(X, y)
+        ),
+        "XGBoost": XGBoostDecisionPathStrategy(
+            xgb.XGBClassifier(n_estimators=100, max_depth=8).fit(X, y)
+        ),
+        "LightGBM": LightGBMDecisionPathStrategy(
+            lgb.LGBMClassifier(n_estimators=100, num_leaves=63, verbose=-1).fit(X, y)
+        ),
+    }
+
+    print(f"{args.rows} instances ({args.distinct} distinct), {args.features} features")
+    for label, strategy in strategies.items():
+        start = time.perf_counter()
+        looped = explain_per_instance(strategy, X_inference, identifiers)
+        loop_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batched = strategy.explain(X_inference, identifiers).instance_decision_paths
+        batch_time = time.perf_counter() - start
+
+        same = [p.model_dump() for p in looped] == [p.model_dump() for p in batched]
+        print(
+            f"{label:<28} per instance {loop_time:7.2f} s  "
+            f"all at once {batch_time:6.3f} s  {loop_time / batch_time:6.1f}x  "
+            f"same paths: {same}"
+        )
+
+
+if __name__ == "__main__":
+    main()
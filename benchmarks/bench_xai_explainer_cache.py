@@ -0,0 +1,111 @@
+# benchmarks/bench_xai_explainer_cache.py
+"""
+XAI wall time with and without the per-process explainer cache.
+
+Simulates the XAI jobs queued after an inference: for each of --commits commits
+(--rows rows each) a SHAP explanation and a feature importance explanation are
+generated, then the SHAP explanation is requested again (a retried or re-run
+job). Without a model key every call builds its own explainer and recomputes
+SHAP values; with one, explainers are built once per model and the SHAP
+values of a commit are shared by all three calls. Both runs use the stratified
+background summary saved at training time.
+"""
+
+import argparse
+import logging
+import time
+
+import numpy as np
+import pandas as pd
+from _common import use_worker
+
+use_worker("ml")
+
+from services.explainer_cache import (  # noqa: E402
+    explainer_cache,
+    summarize_background,
+)
+from services.strategies.feature_importance_strategy import (  # noqa: E402
+    FeatureImportanceStrategy,
+)
+from services.strategies.shap_strategy import SHAPStrategy  # noqa: E402
+from sklearn.ensemble import RandomForestClassifier  # noqa: E402
+from sklearn.linear_model import LogisticRegression  # noqa: E402
+
+
+def make_data(rows: int, features: int, seed: int):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(
+        rng.normal(size=(rows, features)), columns=[f"f{i}" for i in range(features)]
+    )
+    y = (X["f0"] + X["f1"] * X["f2"] + rng.normal(size=rows) > 1.0).astype(int)
+    return X, y
+
+
+def explain_commits(model, background, commits, model_key):
+    results = []
+    for X_commit in commits:
+        ids = pd.DataFrame({"file": ["f.java"] * len(X_commit), "class_name": "C"})
+        shap_result = SHAPStrategy(model, background, model_key=model_key).explain(
+            X_commit, ids
+        )
+        fi_result = FeatureImportanceStrategy(
+            model, background, model_key=model_key
+        )._get_shap_based_importances(X_commit, ids, list(X_commit.columns))
+        SHAPStrategy(model, background, model_key=model_key).explain(X_commit, ids)
+        results.append((shap_result, fi_result))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--train-rows", type=int, default=3000)
+    parser.add_argument("--features", type=int, default=10)
+    parser.add_argument("--commits", type=int, default=5)
+    parser.add_argument("--rows", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    logging.getLogger("services").setLevel(logging.WARNING)
+    logging.getLogger("shap").setLevel(logging.WARNING)
+    # The TreeExplainer -> KernelExplainer fallback warns on every call
+    logging.getLogger("services.strategies.shap_strategy").setLevel(logging.ERROR)
+
+    X, y = make_data(args.train_rows, args.features, args.seed)
+    background = summarize_background(X, y, max_rows=100)
+    commits = [
+        make_data(args.rows, args.features, args.seed + i + 1)[0]
+        for i in range(args.commits)
+    ]
+    models = {
+        "RandomForest (TreeExplainer)": RandomForestClassifier(
+            n_estimators=100, random_state=args.seed
+        ).fit(X, y),
+        "LogisticRegression (KernelExplainer)": LogisticRegression().fit(X, y),
+    }
+
+    print(
+        f"{args.commits} commits x {args.rows} rows, {args.features} features: "
+        "SHAP + feature importance + repeated SHAP per commit"
+    )
+    for label, model in models.items():
+        explainer_cache.clear()
+        timings = {}
+        outputs = {}
+        for mode, key in (("uncached", None), ("cached", "model@etag")):
+            start = time.perf_counter()
+            outputs[mode] = explain_commits(model, background, commits, key)
+            timings[mode] = time.perf_counter() - start
+        first_uncached = outputs["uncached"][0][0].instance_shap_values[0]
+        first_cached = outputs["cached"][0][0].instance_shap_values[0]
+        same_base = first_uncached.base_value == first_cached.base_value
+        print(
+            f"{label:<36} uncached {timings['uncached']:7.2f} s  "
+            f"cached {timings['cached']:7.2f} s  "
+            f"{timings['uncached'] / timings['cached']:5.2f}x  "
+            f"same base value: {same_base}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+# benchmarks/bench_xai_lime.py
+"""
+LIME wall time: per-instance loop versus chunked, batched explanation.
+
+The legacy LIMEStrategy called explain_instance in a loop, with one
+predict_proba call per instance on its --samples perturbations. The current
+strategy draws the perturbations of many instances first and predicts them in
+one call, and it spreads chunks of instances over --workers processes. The
+script explains --instances rows of a random forest with both approaches and
+checks that the parallel result equals the in-process one (same seeds).
+"""
+
+import argparse
+import logging
+import time
+
+import lime.lime_tabular
+import numpy as np
+import pandas as pd
+from _common import use_worker
+
+use_worker("ml")
+
+from services.strategies import lime_strategy  # noqa: E402
+from services.strategies.lime_strategy import LIMEStrategy  # noqa: E402
+from sklearn.ensemble import RandomForestClassifier  # noqa: E402
+
+from shared.core.config import settings  # noqa: E402
+
+
+def make_data(rows: int, features: int, seed: int):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(
+        rng.normal(size=(rows, features)), columns=[f"f{i}" for i in range(features)]
+    )
+    y = (X["f0"] + X["f1"] * X["f2"] + rng.normal(size=rows) > 0).astype(int)
+    return X, y
+
+
+def legacy_explain(model, background, X_inference, num_samples, seed):
+    """The previous LIMEStrategy loop."""
+    explainer = lime.lime_tabular.LimeTabularExplainer(
+        training_data=background.values,
+        feature_names=X_inference.columns.tolist(),
+        class_names=lime_strategy.CLASS_NAMES,
+        mode="classification",
+        random_state=seed,
+    )
+    results = []
+    for i in range(len(X_inference)):
+        explanation = explainer.explain_instance(
+            data_row=X_inference.iloc[i].values,
+            predict_fn=lambda rows: model.predict_proba(
+                pd.DataFrame(rows, columns=X_inference.columns)
+            ),
+            num_features=min(10, X_inference.shape[1]),
+            num_samples=num_samples,
+            labels=(1,),
+        )
+        results.append(explanation.as_list(label=1))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--train-rows", type=int, default=5000)
+    parser.add_argument("--features", type=int, default=30)
+    parser.add_argument("--trees", type=int, default=100)
+    parser.add_argument("--instances", type=int, default=40)
+    parser.add_argument("--samples", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=-1)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    logging.getLogger("services").setLevel(logging.WARNING)
+    settings.ML_XAI_LIME_NUM_SAMPLES = args.samples
+    settings.ML_XAI_RANDOM_SEED = args.seed
+
+    X, y = make_data(args.train_rows, args.features, args.seed)
+    model = RandomForestClassifier(
+        n_estimators=args.trees, n_jobs=1, random_state=args.seed
+    ).fit(X, y)
+    background = X.sample(100, random_state=args.seed)
+    X_inference = X.iloc[: args.instances].reset_index(drop=True)
+    identifiers = pd.DataFrame(
+        {"file": [f"F{i}.java" for i in range(args.instances)], "class_name": "C"}
+    )
+    print(
+        f"{args.instances} instances x {args.samples} samples, {args.features} features, "
+        f"random forest with {args.trees} trees"
+    )
+
+    start = time.perf_counter()
+    legacy_explain(model, background, X_inference, args.samples, args.seed)
+    legacy = time.perf_counter() - start
+    print(f"{'per-instance loop':<28} {legacy:7.2f} s")
+
+    results = {}
+    for label, n_jobs in (
+        ("batched, in-process", 1),
+        ("batched, parallel", args.workers),
+    ):
+        settings.ML_XAI_NUM_WORKERS = n_jobs
+        start = time.perf_counter()
+        results[n_jobs] = LIMEStrategy(model, background).explain(
+            X_inference, identifiers
+        )
+        elapsed = time.perf_counter() - start
+        print(f"{label:<28} {elapsed:7.2f} s  {legacy / elapsed:5.2f}x")
+    print(f"parallel == in-process: {results[1] == results[args.workers]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -32,6 +32,7 @@ import {
   PaginatedInferenceJobRead,
   InferenceJobRead,
   XAIResultRead,
+  XAIResultPage,
   XAITriggerResponse,
 } from "@/types/api";
 
@@ -451,6 +452,22 @@ export const getXAIResultsForJob = async (
   return apiService.get<XAIResultRead[]>(`/xai/inference-jobs/${inferenceJobId}/xai-results`);
 };
 
+export const getXAIResultInstances = async (
+  xaiResultId: string | number,
+  params?: { skip?: number; limit?: number; featureSkip?: number; featureLimit?: number }
+): Promise<XAIResultPage> => {
+  const queryParams = new URLSearchParams();
+  if (params?.skip !== undefined) queryParams.append("skip", String(params.skip));
+  if (params?.limit !== undefined) queryParams.append("limit", String(params.limit));
+  if (params?.featureSkip !== undefined)
+    queryParams.append("feature_skip", String(params.featureSkip));
+  if (params?.featureLimit !== undefined)
+    queryParams.append("feature_limit", String(params.featureLimit));
+  return apiService.get<XAIResultPage>(
+    `/xai/xai-results/${xaiResultId}/instances?${queryParams.toString()}`
+  );
+};
+
 export const triggerXAIProcessing = async (
   inferenceJobId: string | number
 ): Promise<XAITriggerResponse> => {
@@ -20,6 +20,8 @@ export interface DatasetConfig {
   target_column: string;
   cleaning_rules: CleaningRuleConfig[]; // Use the exported CleaningRuleConfig
   feature_selection?: FeatureSelectionConfig | null;
+  after_watermark?: number | null; // Only commits ingested after this watermark (delta dataset)
+  watermark?: number | null; // Set by the worker: highest commit ID the dataset was built from
 }
 
 // This interface should mirror shared/schemas/dataset.py -> DatasetRead
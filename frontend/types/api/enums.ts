@@ -46,6 +46,7 @@ export enum ModelTypeEnum {
   SKLEARN_ADABOOSTCLASSIFIER = "sklearn_adaboostclassifier",
   SKLEARN_DECISIONTREECLASSIFIER = "sklearn_decisiontreeclassifier",
   SKLEARN_KNNCLASSIFIER = "sklearn_knnclassifier",
+  SKLEARN_SGDCLASSIFIER = "sklearn_sgdclassifier",
 
   XGBOOST_CLASSIFIER = "xgboost_classifier",
   LIGHTGBM_CLASSIFIER = "lightgbm_classifier",
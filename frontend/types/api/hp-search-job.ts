@@ -28,6 +28,7 @@ export interface OptunaConfig {
   pruner_config?: Record<string, any> | null;
   continue_if_exists: boolean;
   hp_search_cv_folds?: number | null;
+  n_parallel_workers?: number;
 }
 
 export interface HPSearchConfig {
@@ -12,6 +12,8 @@ export interface TrainingRunConfig {
   target_column: string;
   random_seed?: number | null;
   eval_test_split_size?: number | null;
+  parent_model_id?: number | null; // Continue training this model (incremental mode)
+  incremental_estimators?: number | null;
 }
 
 export interface TrainingJobBase {
@@ -114,6 +114,29 @@ export interface XAIResultRead {
   updated_at: string; // ISO date string
 }
 
+// Present in result_data when the full result is stored compressed; result_data
+// then only holds the first instances with their top features.
+export interface XAICompactStorageSummary {
+  format: string;
+  total_instances: number;
+  preview_instances: number;
+  preview_features: number;
+  top_features: { feature: string; mean_abs_score: number }[];
+  payload_bytes: number;
+}
+
+export interface XAIResultPage {
+  xai_result_id: number;
+  xai_type: XAITypeEnum;
+  total_instances: number;
+  skip: number;
+  limit: number;
+  feature_skip: number;
+  feature_limit?: number | null;
+  // Entries shaped like the result_data instance entries of the XAI type
+  instances: Record<string, any>[];
+}
+
 export interface XAITriggerResponse {
   task_id?: string | null;
   message: string;
@@ -5,6 +5,8 @@ from celery import Celery
 
 from shared.core.config import settings  # Import shared settings
 
+from .routing import TASK_QUEUES, TASK_ROUTES
+
 
 def create_celery_app(
     main_name: str,  # e.g., 'ingestion_worker', 'dataset_worker'
@@ -29,6 +31,10 @@ def create_celery_app(
         task_track_started=True,
         result_expires=3600,  # Keep results for 1 hour (if backend is enabled)
         broker_connection_retry_on_startup=True,
+        # Queue topology and task routing shared by every sender and worker
+        # (see routing.py); workers pick their queues and pool settings there
+        task_queues=TASK_QUEUES,
+        task_routes=TASK_ROUTES,
         # Add other common configurations here if needed
         # e.g., serializers:
         # task_serializer='json',
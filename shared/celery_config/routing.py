@@ -0,0 +1,116 @@
+# shared/celery_config/routing.py
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from celery import Celery
+from celery.signals import celeryd_init
+from kombu import Exchange, Queue
+
+from shared.core.config import settings
+
+# --- Queues ---
+INGESTION_QUEUE = "ingestion"
+DATASET_QUEUE = "dataset"
+ML_INFERENCE_QUEUE = "ml_inference"  # Latency-critical single-commit predictions
+ML_QUEUE = "ml_queue"  # Long batch jobs: training and HP search
+XAI_QUEUE = "xai_queue"
+
+# Messages on the inference queue are served highest priority first
+# (RabbitMQ priority queue; the other queues are declared as before)
+INFERENCE_MAX_PRIORITY = 9
+INFERENCE_PRIORITIES: Dict[str, int] = {
+    "webhook": 9,  # A push is waiting on the prediction
+    "manual": 6,
+    "batch": 3,
+}
+
+
+def _queue(name: str, **queue_arguments) -> Queue:
+    return Queue(
+        name,
+        Exchange(name),
+        routing_key=name,
+        queue_arguments=queue_arguments or None,
+    )
+
+
+TASK_QUEUES = (
+    _queue(INGESTION_QUEUE),
+    _queue(DATASET_QUEUE),
+    _queue(ML_INFERENCE_QUEUE, **{"x-max-priority": INFERENCE_MAX_PRIORITY}),
+    _queue(ML_QUEUE),
+    _queue(XAI_QUEUE),
+)
+
+# Every sender (backend, workers) routes by task name, so tasks only name a
+# queue here. An explicit priority passed when sending overrides the default.
+TASK_ROUTES = {
+    "tasks.ingest_repository": {"queue": INGESTION_QUEUE},
+    "tasks.ingest_features_for_inference": {"queue": INGESTION_QUEUE},
+    "tasks.generate_dataset": {"queue": DATASET_QUEUE},
+    "tasks.delete_storage_object": {"queue": DATASET_QUEUE},
+    "tasks.inference_predict": {
+        "queue": ML_INFERENCE_QUEUE,
+        "priority": INFERENCE_PRIORITIES["manual"],
+    },
+    "tasks.batch_inference_predict": {
+        "queue": ML_INFERENCE_QUEUE,
+        "priority": INFERENCE_PRIORITIES["batch"],
+    },
+    "tasks.train_model": {"queue": ML_QUEUE},
+    "tasks.hyperparameter_search": {"queue": ML_QUEUE},
+    "tasks.hp_search_trial_worker": {"queue": ML_QUEUE},
+    "tasks.hp_search_finalize": {"queue": ML_QUEUE},
+    "tasks.orchestrate_xai": {"queue": XAI_QUEUE},
+    "tasks.generate_explanation": {"queue": XAI_QUEUE},
+    "tasks.generate_explanations": {"queue": XAI_QUEUE},
+}
+
+
+def inference_priority(trigger_source: Optional[str]) -> int:
+    """Message priority of an inference job started by `trigger_source`."""
+    return INFERENCE_PRIORITIES.get(
+        trigger_source or "", INFERENCE_PRIORITIES["manual"]
+    )
+
+
+# --- Worker pools ---
+class WorkerPool(NamedTuple):
+    queues: Tuple[str, ...]
+    concurrency: int
+    # Messages reserved per process. 1 keeps a busy process from holding on to
+    # jobs that another process could start right away.
+    prefetch_multiplier: int = 1
+
+
+WORKER_POOLS: Dict[str, WorkerPool] = {
+    "ml_inference": WorkerPool(
+        (ML_INFERENCE_QUEUE,), settings.CELERY_ML_INFERENCE_CONCURRENCY
+    ),
+    "ml_batch": WorkerPool((ML_QUEUE,), settings.CELERY_ML_BATCH_CONCURRENCY),
+    "ml_xai": WorkerPool((XAI_QUEUE,), settings.CELERY_ML_XAI_CONCURRENCY),
+    # Single ML worker consuming every ML queue (development setups)
+    "ml": WorkerPool((ML_INFERENCE_QUEUE, ML_QUEUE, XAI_QUEUE), 1),
+}
+
+
+def configure_worker_pool(app: Celery, pool_name: Optional[str]) -> None:
+    """
+    Applies a worker pool's concurrency and prefetch settings to `app` and,
+    unless queues are given with -Q, limits its worker to the pool's queues.
+    """
+    if not pool_name:
+        return
+    if pool_name not in WORKER_POOLS:
+        raise ValueError(
+            f"Unknown worker pool '{pool_name}'. Expected one of: {', '.join(WORKER_POOLS)}"
+        )
+    pool = WORKER_POOLS[pool_name]
+    app.conf.update(
+        worker_concurrency=pool.concurrency,
+        worker_prefetch_multiplier=pool.prefetch_multiplier,
+    )
+
+    @celeryd_init.connect(weak=False)
+    def _consume_pool_queues(sender=None, instance=None, **kwargs):
+        if instance is not None and instance.app is app:
+            app.amqp.queues.select(pool.queues)
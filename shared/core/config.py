@@ -2,7 +2,7 @@
 import logging  # Import logging here for use within the class
 import re
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from pydantic import AmqpDsn, Field, PostgresDsn, RedisDsn, SecretStr, computed_field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -34,6 +34,21 @@ class Settings(BaseSettings):
     CELERY_RESULT_BACKEND: Optional[str] = Field(
         None, validation_alias="CELERY_RESULT_BACKEND"
     )
+    # Worker pool this ML worker runs ("ml_inference", "ml_batch", "ml_xai", or
+    # "ml" for every ML queue; see shared/celery_config/routing.py)
+    CELERY_WORKER_POOL: Optional[str] = Field(
+        None, validation_alias="CELERY_WORKER_POOL"
+    )
+    # Worker processes per ML pool
+    CELERY_ML_INFERENCE_CONCURRENCY: int = Field(
+        2, validation_alias="CELERY_ML_INFERENCE_CONCURRENCY"
+    )
+    CELERY_ML_BATCH_CONCURRENCY: int = Field(
+        1, validation_alias="CELERY_ML_BATCH_CONCURRENCY"
+    )
+    CELERY_ML_XAI_CONCURRENCY: int = Field(
+        1, validation_alias="CELERY_ML_XAI_CONCURRENCY"
+    )
 
     # --- Database Configuration ---
     DATABASE_URL: PostgresDsn = Field(..., validation_alias="DATABASE_URL")
@@ -58,6 +73,114 @@ class Settings(BaseSettings):
     S3_REGION: Optional[str] = Field(None, validation_alias="S3_REGION")
     S3_USE_SSL: bool = Field(True, validation_alias="S3_USE_SSL")
 
+    # --- Dataset Worker ---
+    # Reuse the post-delta base table across dataset generations of a repository
+    DATASET_SNAPSHOT_CACHE_ENABLED: bool = Field(
+        True, validation_alias="DATASET_SNAPSHOT_CACHE_ENABLED"
+    )
+    # Rows per Parquet row group in generated datasets (smaller groups let
+    # filtered reads skip more data; larger ones compress and scan better)
+    DATASET_PARQUET_ROW_GROUP_SIZE: int = Field(
+        64 * 1024, validation_alias="DATASET_PARQUET_ROW_GROUP_SIZE"
+    )
+
+    # --- ML Worker ---
+    # Per-process cache of loaded model artifacts, counted in stored (compressed
+    # joblib) bytes; loaded tree models take about 2-5x that in memory
+    ML_MODEL_CACHE_MAX_BYTES: int = Field(
+        256 * 1024**2, validation_alias="ML_MODEL_CACHE_MAX_BYTES"
+    )
+    # MLModel IDs loaded into the cache when a worker process starts, e.g. "[1, 4]"
+    ML_MODEL_CACHE_WARMUP_MODEL_IDS: List[int] = Field(
+        default_factory=list, validation_alias="ML_MODEL_CACHE_WARMUP_MODEL_IDS"
+    )
+    # Host-local copies of S3 datasets/artifacts shared by worker processes (0 disables)
+    ML_ARTIFACT_CACHE_DIR: Path = Field(
+        Path("/app/artifact_cache"), validation_alias="ML_ARTIFACT_CACHE_DIR"
+    )
+    ML_ARTIFACT_CACHE_MAX_BYTES: int = Field(
+        20 * 1024**3, validation_alias="ML_ARTIFACT_CACHE_MAX_BYTES"
+    )
+    # Export fitted tree ensembles to NumPy node arrays after training, and
+    # prefer that compiled predictor for inference when it exists
+    ML_COMPILE_TREE_MODELS: bool = Field(
+        True, validation_alias="ML_COMPILE_TREE_MODELS"
+    )
+    ML_INFERENCE_USE_COMPILED_MODELS: bool = Field(
+        True, validation_alias="ML_INFERENCE_USE_COMPILED_MODELS"
+    )
+    # Wait this long for more queued single-commit inference jobs of the same
+    # model and predict them together (0 disables micro-batching)
+    ML_INFERENCE_COALESCE_WINDOW_MS: int = Field(
+        0, validation_alias="ML_INFERENCE_COALESCE_WINDOW_MS"
+    )
+    ML_INFERENCE_COALESCE_MAX_JOBS: int = Field(
+        256, validation_alias="ML_INFERENCE_COALESCE_MAX_JOBS"
+    )
+    # Upper bound for optuna_config.n_parallel_workers of HP search jobs
+    # (parallel trial workers need CELERY_RESULT_BACKEND for the finalizer chord)
+    ML_HP_SEARCH_MAX_PARALLEL_WORKERS: int = Field(
+        8, validation_alias="ML_HP_SEARCH_MAX_PARALLEL_WORKERS"
+    )
+    # Trees / boosting rounds added per incremental training job when the job
+    # config does not set incremental_estimators
+    ML_INCREMENTAL_ESTIMATORS: int = Field(
+        50, validation_alias="ML_INCREMENTAL_ESTIMATORS"
+    )
+    # Train from the dataset's Parquet row groups instead of a DataFrame when
+    # it has at least this many rows and the model type supports streaming
+    # (0 disables); held-out evaluation rows are capped separately
+    ML_OUT_OF_CORE_MIN_ROWS: int = Field(
+        2_000_000, validation_alias="ML_OUT_OF_CORE_MIN_ROWS"
+    )
+    ML_OUT_OF_CORE_EVAL_MAX_ROWS: int = Field(
+        200_000, validation_alias="ML_OUT_OF_CORE_EVAL_MAX_ROWS"
+    )
+    # Passes over the row groups for partial_fit estimators
+    ML_OUT_OF_CORE_EPOCHS: int = Field(5, validation_alias="ML_OUT_OF_CORE_EPOCHS")
+    # XAI background summary saved next to each trained model
+    # ("stratified" sample of the training rows or "kmeans" centroids)
+    ML_XAI_BACKGROUND_ROWS: int = Field(100, validation_alias="ML_XAI_BACKGROUND_ROWS")
+    ML_XAI_BACKGROUND_METHOD: str = Field(
+        "stratified", validation_alias="ML_XAI_BACKGROUND_METHOD"
+    )
+    # Run all XAI techniques of an inference job in one task that loads the
+    # model, features and background data once (False: one task per technique)
+    ML_XAI_COMBINED_EXECUTION: bool = Field(
+        True, validation_alias="ML_XAI_COMBINED_EXECUTION"
+    )
+    # Worker processes for per-instance LIME / counterfactual explanations
+    # (joblib n_jobs semantics, 1 runs in-process). Each XAI task is capped to
+    # cores // CELERY_ML_XAI_CONCURRENCY so concurrent tasks don't oversubscribe
+    # the host, and -1 takes that whole share. Lower it when other ML worker
+    # pools (inference, training) run on the same cores.
+    ML_XAI_NUM_WORKERS: int = Field(-1, validation_alias="ML_XAI_NUM_WORKERS")
+    # Perturbation samples per instance (LIME) and random samples per query
+    # instance (DiCE); instance i is seeded with ML_XAI_RANDOM_SEED + i
+    ML_XAI_LIME_NUM_SAMPLES: int = Field(
+        5000, validation_alias="ML_XAI_LIME_NUM_SAMPLES"
+    )
+    ML_XAI_COUNTERFACTUAL_SAMPLE_SIZE: int = Field(
+        1000, validation_alias="ML_XAI_COUNTERFACTUAL_SAMPLE_SIZE"
+    )
+    ML_XAI_RANDOM_SEED: int = Field(42, validation_alias="ML_XAI_RANDOM_SEED")
+    # Per-process caches of fitted SHAP explainers and of computed SHAP values
+    ML_XAI_EXPLAINER_CACHE_SIZE: int = Field(
+        16, validation_alias="ML_XAI_EXPLAINER_CACHE_SIZE"
+    )
+    ML_XAI_SHAP_RESULT_CACHE_SIZE: int = Field(
+        32, validation_alias="ML_XAI_SHAP_RESULT_CACHE_SIZE"
+    )
+    # XAI results larger than this (as JSON) are stored compressed next to a
+    # small preview: the first instances with their top features
+    ML_XAI_INLINE_MAX_BYTES: int = Field(
+        65536, validation_alias="ML_XAI_INLINE_MAX_BYTES"
+    )
+    ML_XAI_PREVIEW_INSTANCES: int = Field(
+        20, validation_alias="ML_XAI_PREVIEW_INSTANCES"
+    )
+    ML_XAI_PREVIEW_FEATURES: int = Field(10, validation_alias="ML_XAI_PREVIEW_FEATURES")
+
     @property
     def s3_storage_options(self) -> Dict[str, Any]:
         opts = {}
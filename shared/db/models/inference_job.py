@@ -49,6 +49,18 @@ class InferenceJob(Base):
         comment="Stored prediction output (e.g., {'prediction': 1, 'probability': 0.85})",
     )
 
+    batch_id: Mapped[str | None] = mapped_column(
+        String,
+        nullable=True,
+        index=True,
+        comment="Groups jobs predicted together (a batch request or coalesced single jobs)",
+    )
+    prediction_queued_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        comment="Set when the job's features are available and its prediction task is queued",
+    )
+
     started_at: Mapped[datetime | None] = mapped_column(
         DateTime(timezone=True), nullable=True
     )
@@ -8,6 +8,7 @@ from sqlalchemy import (
     Enum,
     ForeignKey,
     Index,
+    LargeBinary,
     String,
     Text,
     UniqueConstraint,
@@ -46,6 +47,11 @@ class XAIResult(Base):
     )
     # Stores the structured result (SHAP details, LIME weights, etc.)
     result_data: Mapped[Dict[str, Any] | None] = mapped_column(JSON, nullable=True)
+    # Full result of large explanations, compressed (see shared.utils.xai_result_storage);
+    # result_data then only holds a preview. Deferred: loaded on access only
+    result_payload: Mapped[bytes | None] = mapped_column(
+        LargeBinary, nullable=True, deferred=True
+    )
     status_message: Mapped[str | None] = mapped_column(Text, nullable=True)
     celery_task_id: Mapped[str | None] = mapped_column(
         String, nullable=True, index=True
@@ -1,9 +1,9 @@
 # shared/repositories/inference_job_repository.py
 import logging
 from datetime import datetime, timezone  # For updated_at
-from typing import Callable, Optional, Sequence  # Added Callable
+from typing import Any, Callable, Dict, List, Optional, Sequence  # Added Callable
 
-from sqlalchemy import select  # Import update
+from sqlalchemy import or_, select, update
 from sqlalchemy.orm import Session  # Keep Session for type hint
 
 # Import DB Model and Enums/Schemas
@@ -111,6 +111,107 @@ class InferenceJobRepository(BaseRepository[InferenceJob]):
             )
         return db_obj
 
+    def get_by_batch_id(self, batch_id: str) -> Sequence[InferenceJob]:
+        """Gets all jobs of a batch, oldest first."""
+        with self._session_scope() as session:
+            stmt = (
+                select(InferenceJob)
+                .where(InferenceJob.batch_id == batch_id)
+                .order_by(InferenceJob.id)
+            )
+            return session.execute(stmt).scalars().all()
+
+    def start_batch(self, batch_id: str, task_id: str) -> List[int]:
+        """Marks the non-terminal jobs of a batch RUNNING under `task_id`. Returns their IDs."""
+        now = datetime.now(timezone.utc)
+        with self._session_scope() as session:
+            job_ids = list(
+                session.execute(
+                    update(InferenceJob)
+                    .where(
+                        InferenceJob.batch_id == batch_id,
+                        InferenceJob.status.in_(
+                            [JobStatusEnum.PENDING, JobStatusEnum.RUNNING]
+                        ),
+                    )
+                    .values(
+                        celery_task_id=task_id,
+                        status=JobStatusEnum.RUNNING,
+                        status_message="Batch prediction started.",
+                        started_at=now,
+                        updated_at=now,
+                    )
+                    .returning(InferenceJob.id)
+                )
+                .scalars()
+                .all()
+            )
+            session.commit()
+        return sorted(job_ids)
+
+    def claim_queued_jobs(
+        self, ml_model_id: int, batch_id: str, task_id: str, limit: int
+    ) -> List[int]:
+        """
+        Atomically claims up to `limit` jobs of a model whose prediction is queued
+        but not yet taken by another task (FOR UPDATE SKIP LOCKED), stamping them
+        with `batch_id`/`task_id` and RUNNING. Jobs this task claimed before (e.g.
+        on redelivery) are claimed again. Returns the claimed job IDs.
+        """
+        now = datetime.now(timezone.utc)
+        with self._session_scope() as session:
+            stmt = (
+                select(InferenceJob.id)
+                .where(
+                    InferenceJob.ml_model_id == ml_model_id,
+                    InferenceJob.prediction_queued_at.is_not(None),
+                    InferenceJob.status.in_(
+                        [JobStatusEnum.PENDING, JobStatusEnum.RUNNING]
+                    ),
+                    or_(
+                        InferenceJob.batch_id.is_(None),
+                        InferenceJob.celery_task_id == task_id,
+                    ),
+                )
+                .order_by(InferenceJob.prediction_queued_at)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            )
+            job_ids = list(session.execute(stmt).scalars().all())
+            if job_ids:
+                session.execute(
+                    update(InferenceJob)
+                    .where(InferenceJob.id.in_(job_ids))
+                    .values(
+                        batch_id=batch_id,
+                        celery_task_id=task_id,
+                        status=JobStatusEnum.RUNNING,
+                        status_message="Claimed for batch prediction.",
+                        started_at=now,
+                        updated_at=now,
+                    )
+                )
+            session.commit()
+        logger.info(
+            f"InferenceJobRepo: Claimed {len(job_ids)} queued job(s) of model {ml_model_id} into batch {batch_id}"
+        )
+        return job_ids
+
+    def complete_jobs(self, results: Sequence[Dict[str, Any]]) -> int:
+        """
+        Writes final status for many jobs in one executemany UPDATE. Each item
+        holds 'id', 'status', 'status_message' and 'prediction_result'.
+        """
+        if not results:
+            return 0
+        now = datetime.now(timezone.utc)
+        rows = [{**r, "completed_at": now, "updated_at": now} for r in results]
+        with self._session_scope() as session:
+            session.execute(update(InferenceJob), rows)
+            session.commit()
+        logger.info(f"InferenceJobRepo: Completed {len(rows)} job(s) in bulk")
+        return len(rows)
+
     def delete_job(self, job_id: int) -> bool:
         """Deletes an inference job record. Returns True if deleted."""
         logger.info(f"InferenceJobRepo: Deleting job ID {job_id}")
@@ -1,11 +1,10 @@
 # shared/repositories/ml_feature_repository.py
 import logging
-from typing import Callable, Optional  # Added Callable
+from typing import Callable, List, Optional, Sequence  # Added Callable
 
-import numpy as np
 import pandas as pd
-from sqlalchemy import select
-from sqlalchemy.orm import Session  # Keep Session for type hint
+from sqlalchemy import Float, Integer, Select, and_, func, null, select
+from sqlalchemy.orm import Session, aliased  # Keep Session for type hint
 
 from shared.core.config import settings
 from shared.db import CK_METRIC_COLUMNS, COMMIT_GURU_METRIC_COLUMNS
@@ -19,6 +18,27 @@ from .base_repository import BaseRepository
 logger = logging.getLogger(__name__)
 logger.setLevel(settings.LOG_LEVEL.upper())
 
+# Commit hashes per IN (...) list when fetching many commits
+_IN_CLAUSE_CHUNK = 5000
+
+# parent_hashes is only needed to find the parent; like the other parent_*
+# helper columns it is not a feature
+_GURU_FEATURE_COLUMNS = [c for c in COMMIT_GURU_METRIC_COLUMNS if c != "parent_hashes"]
+_NUMERIC_CK_COLUMNS = {
+    c
+    for c in CK_METRIC_COLUMNS
+    if isinstance(getattr(CKMetric, c).type, (Integer, Float))
+}
+_DELTA_COLUMNS = [f"d_{c}" for c in CK_METRIC_COLUMNS]
+_FEATURE_COLUMNS = (
+    _GURU_FEATURE_COLUMNS + CK_METRIC_COLUMNS + ["class", "type"] + _DELTA_COLUMNS
+)
+
+
+def _chunks(values: Sequence[str], size: int = _IN_CLAUSE_CHUNK):
+    for start in range(0, len(values), size):
+        yield list(values[start : start + size])
+
 
 # Inherit from BaseRepository AND the specific interface
 class MLFeatureRepository(BaseRepository):
@@ -34,163 +54,106 @@ class MLFeatureRepository(BaseRepository):
         super().__init__(session_factory)  # Initialize BaseRepository
         logger.debug("MLFeatureRepository initialized.")
 
-    # --- Implement the interface method ---
     def get_features_for_commit(
         self, repo_id: int, commit_hash: str
     ) -> Optional[pd.DataFrame]:
         """
-        Fetches CommitGuru and CK metrics for a specific commit and its parent,
-        calculates delta CK metrics, and combines them into a combined DataFrame.
-        Uses the session scope provided by BaseRepository.
+        Features (CommitGuru metrics, CK metrics and d_* deltas against the first
+        parent) for a single commit. Returns None when the commit has no
+        CommitGuru or CK metrics, or no parent to compute deltas against.
+        """
+        features = self.get_features_for_commits(repo_id, [commit_hash])
+        if features.empty:
+            logger.error(
+                f"MLFeatureRepo: No features for repo {repo_id}, commit {commit_hash[:7]} (missing CommitGuru/CK metrics or parent commit)."
+            )
+            return None
+        return features
+
+    def get_features_for_commits(
+        self, repo_id: int, commit_hashes: Sequence[str]
+    ) -> pd.DataFrame:
+        """
+        Features for many commits in one DataFrame. Target/parent CK joins and
+        deltas are computed by the database in a single statement (one per
+        _IN_CLAUSE_CHUNK hashes). Commits without CommitGuru or CK metrics, or
+        without a parent, are absent from the result.
         """
+        hashes = list(dict.fromkeys(commit_hashes))
         logger.info(
-            f"MLFeatureRepo: Fetching features for repo {repo_id}, commit {commit_hash[:7]}..."
+            f"MLFeatureRepo: Fetching features for {len(hashes)} commits of repo {repo_id}..."
         )
-
-        # Use the session scope from BaseRepository
+        frames: List[pd.DataFrame] = []
         with self._session_scope() as session:
-            # --- 1. Fetch Target CommitGuruMetric ---
-            cgm_stmt = select(CommitGuruMetric).where(
-                CommitGuruMetric.repository_id == repo_id,
-                CommitGuruMetric.commit_hash == commit_hash,
-            )
-            target_cgm = session.execute(cgm_stmt).scalar_one_or_none()
-
-            if not target_cgm:
-                logger.error(
-                    f"MLFeatureRepo: CommitGuruMetric not found for repo {repo_id}, commit {commit_hash[:7]}."
-                )
-                return None  # Return None within the session scope
-
-            guru_features = {
-                col: getattr(target_cgm, col, None)
-                for col in COMMIT_GURU_METRIC_COLUMNS
-            }
-            # --- Add Commit hash ---
-            guru_features["commit_hash"] = target_cgm.commit_hash
-
-            # --- 2. Fetch Target CKMetrics ---
-            ckm_target_stmt = select(CKMetric).where(
-                CKMetric.repository_id == repo_id, CKMetric.commit_hash == commit_hash
+            for chunk in _chunks(hashes):
+                result = session.execute(self._features_statement(repo_id, chunk))
+                frames.append(pd.DataFrame(result.all(), columns=list(result.keys())))
+
+        features = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        if features.empty:
+            features = pd.DataFrame(columns=_FEATURE_COLUMNS)
+        # Integer deltas without NULLs come back as ints; keep one dtype like training data
+        features[_DELTA_COLUMNS] = features[_DELTA_COLUMNS].astype("float64")
+        logger.info(
+            f"MLFeatureRepo: Built features for {features['commit_hash'].nunique()} commits. Shape: {features.shape}"
+        )
+        return features
+
+    @staticmethod
+    def _features_statement(repo_id: int, commit_hashes: List[str]) -> Select:
+        """
+        SELECT of the feature rows for `commit_hashes`: every CK row of a target
+        commit, left-joined to the CK row of the same file/class in its first
+        parent, with CommitGuru metrics repeated per row.
+        """
+        parent_hash = func.split_part(func.trim(CommitGuruMetric.parent_hashes), " ", 1)
+        targets = (
+            select(
+                *(getattr(CommitGuruMetric, c).label(c) for c in _GURU_FEATURE_COLUMNS),
+                parent_hash.label("parent_hash"),
             )
-            target_ck_results = session.execute(ckm_target_stmt).scalars().all()
-
-            if not target_ck_results:
-                logger.error(
-                    f"MLFeatureRepo: No CKMetric records found for target commit {commit_hash[:7]}. Cannot generate features requiring CK/delta."
-                )
-                return None  # Return None within the session scope
-
-            target_ck_list = []
-            for m in target_ck_results:
-                record = {col: getattr(m, col, None) for col in CK_METRIC_COLUMNS}
-                record["merge_key_file"] = m.file
-                record["merge_key_class"] = m.class_name
-                record["class"] = m.class_name
-                record["type"] = m.type_
-                target_ck_list.append(record)
-            target_ck_df = pd.DataFrame(target_ck_list)
-
-            # --- 3. Find Parent Commit Hash ---
-            parent_hashes_str = target_cgm.parent_hashes
-            if not parent_hashes_str:
-                logger.error(
-                    f"MLFeatureRepo: Commit {commit_hash[:7]} has no parent hash. Cannot calculate delta features."
-                )
-                return None
-            parent_hash = parent_hashes_str.split()[0]
-            logger.info(f"MLFeatureRepo: Identified parent commit: {parent_hash[:7]}")
-
-            # --- 4. Fetch Parent CKMetrics ---
-            ckm_parent_stmt = select(CKMetric).where(
-                CKMetric.repository_id == repo_id, CKMetric.commit_hash == parent_hash
+            .where(
+                CommitGuruMetric.repository_id == repo_id,
+                CommitGuruMetric.commit_hash.in_(commit_hashes),
+                parent_hash != "",
             )
-            parent_ck_results = session.execute(ckm_parent_stmt).scalars().all()
-            parent_ck_df = pd.DataFrame()
-            if not parent_ck_results:
-                logger.warning(
-                    f"MLFeatureRepo: No CKMetric records found for parent commit {parent_hash[:7]}. Delta features will be NaN."
-                )
-            else:
-                parent_ck_list = []
-                for m in parent_ck_results:
-                    record = {col: getattr(m, col, None) for col in CK_METRIC_COLUMNS}
-                    record["merge_key_file"] = m.file
-                    record["merge_key_class"] = m.class_name
-                    parent_ck_list.append(record)
-                parent_ck_df = pd.DataFrame(parent_ck_list)
-
-        # --- Steps 5-8 (Merge, Delta Calc, Combine, Cleanup) happen outside the session scope ---
-        # --- These are DataFrame operations ---
-
-        # --- 5. Merge Target and Parent CK DataFrames ---
-        if not parent_ck_df.empty:
-            parent_ck_df_renamed = parent_ck_df.rename(
-                columns={col: f"parent_{col}" for col in CK_METRIC_COLUMNS}
+            .cte("targets")
+        )
+        target_ck = aliased(CKMetric, name="target_ck")
+        parent_ck = aliased(CKMetric, name="parent_ck")
+
+        deltas = [
+            (
+                (getattr(target_ck, c) - getattr(parent_ck, c))
+                if c in _NUMERIC_CK_COLUMNS
+                else null()
+            ).label(f"d_{c}")
+            for c in CK_METRIC_COLUMNS
+        ]
+        return (
+            select(
+                *(targets.c[c] for c in _GURU_FEATURE_COLUMNS),
+                *(getattr(target_ck, c).label(c) for c in CK_METRIC_COLUMNS),
+                target_ck.class_name.label("class"),
+                target_ck.type_.label("type"),
+                *deltas,
             )
-            # Use suffixes=('', '_parent') to avoid modifying already renamed cols
-            merged_df = pd.merge(
-                target_ck_df,
-                parent_ck_df_renamed,
-                on=["merge_key_file", "merge_key_class"],
-                how="left",
-                suffixes=("", "_parent_dup"),
+            .select_from(targets)
+            .join(
+                target_ck,
+                and_(
+                    target_ck.repository_id == repo_id,
+                    target_ck.commit_hash == targets.c.commit_hash,
+                ),
             )
-            # Drop duplicate parent columns if merge created them (shouldn't with rename)
-            merged_df = merged_df[
-                [c for c in merged_df.columns if not c.endswith("_parent_dup")]
-            ]
-
-        else:
-            merged_df = target_ck_df.copy()
-            for col in CK_METRIC_COLUMNS:
-                merged_df[f"parent_{col}"] = np.nan
-
-        # --- 6. Calculate Delta Metrics ---
-        logger.debug("MLFeatureRepo: Calculating delta metrics...")
-        for col in CK_METRIC_COLUMNS:
-            current_col = col
-            parent_col = f"parent_{col}"
-            delta_col = f"d_{col}"
-
-            if current_col in merged_df.columns and parent_col in merged_df.columns:
-                target_numeric = pd.to_numeric(merged_df[current_col], errors="coerce")
-                parent_numeric = pd.to_numeric(merged_df[parent_col], errors="coerce")
-                merged_df[delta_col] = target_numeric - parent_numeric
-                mask_invalid = target_numeric.isna() | parent_numeric.isna()
-                merged_df.loc[mask_invalid, delta_col] = np.nan
-            else:
-                merged_df[delta_col] = np.nan
-
-        # --- 7. Combine with CommitGuru Metrics ---
-        logger.debug("MLFeatureRepo: Combining CK/Delta with CommitGuru features...")
-        final_features_list = []
-        for _, row in merged_df.iterrows():
-            # Ensure guru_features is defined (fetched within session scope)
-            if guru_features is None:  # Should not happen if target_cgm was found
-                logger.error(
-                    "MLFeatureRepo: CommitGuru features missing during final combination."
-                )
-                return None
-            combined_row = {**guru_features, **row.to_dict()}
-            final_features_list.append(combined_row)
-
-        if not final_features_list:
-            logger.error(
-                f"MLFeatureRepo: Feature generation resulted in empty list for commit {commit_hash[:7]}."
+            .outerjoin(
+                parent_ck,
+                and_(
+                    parent_ck.repository_id == repo_id,
+                    parent_ck.commit_hash == targets.c.parent_hash,
+                    parent_ck.file == target_ck.file,
+                    parent_ck.class_name.is_not_distinct_from(target_ck.class_name),
+                ),
             )
-            return None
-        final_df = pd.DataFrame(final_features_list)
-
-        # --- 8. Cleanup ---
-        cols_to_drop = [
-            c
-            for c in final_df.columns
-            if c.startswith("parent_") or c.startswith("merge_key_")
-        ]
-        final_df = final_df.drop(columns=cols_to_drop, errors="ignore")
-
-        logger.info(
-            f"MLFeatureRepo: Finished feature retrieval for commit {commit_hash[:7]}. Shape: {final_df.shape}"
+            .order_by(target_ck.id, parent_ck.id)
         )
-        return final_df  # Return the final DataFrame
@@ -1,7 +1,7 @@
 # shared/repositories/xai_result_repository.py
 import logging
 from datetime import datetime, timezone
-from typing import Callable, Dict, List, Optional  # Added Callable
+from typing import Any, Callable, Dict, List, Optional  # Added Callable
 
 from sqlalchemy import select, update
 from sqlalchemy.orm import Session  # Keep Session for type hint
@@ -10,6 +10,7 @@ from sqlalchemy.orm import Session  # Keep Session for type hint
 import shared.schemas as schemas
 from shared.db.models import XAIResult  # Keep model import
 from shared.schemas.enums import XAIStatusEnum, XAITypeEnum
+from shared.utils.xai_result_storage import pack_xai_result
 
 # Import Base Repository
 from .base_repository import BaseRepository
@@ -76,6 +77,64 @@ class XaiResultRepository(BaseRepository[XAIResult]):  # Specify ModelType
             # Rollback is handled by context manager
         return xai_result_id
 
+    def create_pending_xai_results_sync(
+        self, inference_job_id: int, xai_types: List[XAITypeEnum]
+    ) -> Dict[XAITypeEnum, int]:
+        """
+        Creates PENDING XAIResult records for several types in one transaction
+        and returns their IDs by type. Existing records of these types (one per
+        job and type is allowed) are reset to PENDING instead.
+        """
+        if not xai_types:
+            return {}
+        with self._session_scope() as session:
+            existing = {
+                record.xai_type: record
+                for record in session.scalars(
+                    select(XAIResult).where(
+                        XAIResult.inference_job_id == inference_job_id,
+                        XAIResult.xai_type.in_(xai_types),
+                    )
+                )
+            }
+            records = []
+            for xai_type in xai_types:
+                record = existing.get(xai_type)
+                if record is None:
+                    xai_create = schemas.XAIResultCreate(
+                        inference_job_id=inference_job_id, xai_type=xai_type
+                    )
+                    record = XAIResult(**xai_create.model_dump())
+                    session.add(record)
+                else:
+                    record.status = XAIStatusEnum.PENDING
+                    record.status_message = None
+                    record.result_data = None
+                    record.result_payload = None
+                    record.celery_task_id = None
+                    record.started_at = None
+                    record.completed_at = None
+                records.append(record)
+            session.flush()
+            xai_result_ids = {record.xai_type: record.id for record in records}
+            session.commit()
+        logger.info(
+            f"XaiRepo: {len(xai_result_ids)} PENDING XAIResult record(s) for Job {inference_job_id}: {sorted(xai_result_ids.values())}"
+        )
+        return xai_result_ids
+
+    def get_xai_results_sync(self, xai_result_ids: List[int]) -> List[XAIResult]:
+        """Synchronously fetches several XAIResult records, ordered by ID."""
+        if not xai_result_ids:
+            return []
+        with self._session_scope() as session:
+            stmt = (
+                select(XAIResult)
+                .where(XAIResult.id.in_(xai_result_ids))
+                .order_by(XAIResult.id)
+            )
+            return list(session.scalars(stmt))
+
     def get_xai_result_sync(self, xai_result_id: int) -> Optional[XAIResult]:
         """Synchronously fetches an XAIResult record by ID."""
         logger.debug(f"XaiRepo: Fetching XAIResult {xai_result_id}")
@@ -84,6 +143,36 @@ class XaiResultRepository(BaseRepository[XAIResult]):  # Specify ModelType
             result = session.get(XAIResult, xai_result_id)
         return result
 
+    @staticmethod
+    def _apply_update(
+        xai_record: XAIResult,
+        status: XAIStatusEnum,
+        message: Optional[str] = None,
+        result_data: Optional[Dict] = None,
+        task_id: Optional[str] = None,
+        is_start: bool = False,
+    ):
+        logger.info(
+            f"XaiRepo: Updating XAIResult {xai_record.id} status to {status.value}"
+        )
+        xai_record.status = status
+        if message:
+            xai_record.status_message = message[:1000]
+        if result_data is not None:
+            xai_record.result_data, xai_record.result_payload = pack_xai_result(
+                xai_record.xai_type, result_data
+            )
+        if task_id:
+            xai_record.celery_task_id = task_id
+        if is_start and xai_record.started_at is None:
+            xai_record.started_at = datetime.now(timezone.utc)
+        if status in [
+            XAIStatusEnum.SUCCESS,
+            XAIStatusEnum.FAILED,
+            XAIStatusEnum.REVOKED,
+        ]:
+            xai_record.completed_at = datetime.now(timezone.utc)
+
     def update_xai_result_sync(
         self,
         xai_result_id: int,
@@ -106,25 +195,9 @@ class XaiResultRepository(BaseRepository[XAIResult]):  # Specify ModelType
                         f"XAIResult record {xai_result_id} not found for update."
                     )
 
-                logger.info(
-                    f"XaiRepo: Updating XAIResult {xai_result_id} status to {status.value}"
+                self._apply_update(
+                    xai_record, status, message, result_data, task_id, is_start
                 )
-                xai_record.status = status
-                if message:
-                    xai_record.status_message = message[:1000]
-                if result_data is not None:
-                    xai_record.result_data = result_data
-                if task_id:
-                    xai_record.celery_task_id = task_id
-                if is_start and xai_record.started_at is None:
-                    xai_record.started_at = datetime.now(timezone.utc)
-                if status in [
-                    XAIStatusEnum.SUCCESS,
-                    XAIStatusEnum.FAILED,
-                    XAIStatusEnum.REVOKED,
-                ]:
-                    xai_record.completed_at = datetime.now(timezone.utc)
-
                 session.add(xai_record)
                 session.commit()  # ensure commit happens...
             logger.debug(f"XaiRepo: XAIResult {xai_result_id} update committed.")
@@ -136,6 +209,38 @@ class XaiResultRepository(BaseRepository[XAIResult]):  # Specify ModelType
             # Rollback handled by context manager
             raise  # Re-raise
 
+    def update_xai_results_sync(self, updates: Dict[int, Dict[str, Any]]):
+        """
+        Applies several XAIResult updates in one transaction. Keys are XAIResult
+        IDs, values the keyword arguments of update_xai_result_sync (status,
+        message, result_data, task_id, is_start).
+        """
+        if not updates:
+            return
+        try:
+            with self._session_scope() as session:
+                records = {
+                    record.id: record
+                    for record in session.scalars(
+                        select(XAIResult).where(XAIResult.id.in_(list(updates)))
+                    )
+                }
+                missing = set(updates) - set(records)
+                if missing:
+                    raise ValueError(
+                        f"XAIResult records {sorted(missing)} not found for update."
+                    )
+                for xai_result_id, update_kwargs in updates.items():
+                    self._apply_update(records[xai_result_id], **update_kwargs)
+                session.commit()
+            logger.debug(f"XaiRepo: XAIResults {sorted(updates)} update committed.")
+        except Exception as e:
+            logger.error(
+                f"XaiRepo: Failed to update XAIResult DB entries {sorted(updates)}: {e}",
+                exc_info=True,
+            )
+            raise
+
     def update_xai_task_id_sync(self, xai_result_id: int, task_id: str):
         """Synchronously updates only the celery_task_id for an XAIResult."""
         try:
@@ -161,6 +266,30 @@ class XaiResultRepository(BaseRepository[XAIResult]):  # Specify ModelType
             )
             raise  # Re-raise
 
+    def update_xai_task_ids_sync(self, xai_result_ids: List[int], task_id: str):
+        """Synchronously sets the same celery_task_id on several XAIResults."""
+        if not xai_result_ids:
+            return
+        try:
+            with self._session_scope() as session:
+                stmt = (
+                    update(XAIResult)
+                    .where(XAIResult.id.in_(xai_result_ids))
+                    .values(celery_task_id=task_id)
+                    .execution_options(synchronize_session=False)
+                )
+                session.execute(stmt)
+                session.commit()
+            logger.debug(
+                f"XaiRepo: Set task ID {task_id} for XAIResults {xai_result_ids}."
+            )
+        except Exception as e:
+            logger.error(
+                f"XaiRepo: Failed to update task ID for XAIResults {xai_result_ids}: {e}",
+                exc_info=True,
+            )
+            raise
+
     def mark_xai_results_failed_sync(self, xai_result_ids: List[int], message: str):
         """Synchronously marks a list of XAIResult records as FAILED."""
         if not xai_result_ids:
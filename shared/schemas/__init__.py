@@ -50,6 +50,8 @@ from .hp_search_job import (
     PaginatedHPSearchJobRead,
 )
 from .inference import (
+    BatchInferenceRequest,
+    BatchInferenceTriggerResponse,
     GitHubPushPayload,
     InferenceTriggerResponse,
     ManualInferenceRequest,
@@ -107,7 +109,13 @@ from .xai import (
     LIMEResultData,
     SHAPResultData,
 )
-from .xai_job import XAIResultBase, XAIResultCreate, XAIResultRead, XAIResultUpdate
+from .xai_job import (
+    XAIResultBase,
+    XAIResultCreate,
+    XAIResultPage,
+    XAIResultRead,
+    XAIResultUpdate,
+)
 
 __all__ = [
     # Enums
@@ -172,6 +180,8 @@ __all__ = [
     "InferenceJobRead",
     "ManualInferenceRequest",
     "InferenceTriggerResponse",
+    "BatchInferenceRequest",
+    "BatchInferenceTriggerResponse",
     "PaginatedInferenceJobRead",
     "GitHubPushPayload",
     "RepoApiResponseStatus",
@@ -193,6 +203,7 @@ __all__ = [
     "SHAPResultData",
     "XAIResultBase",
     "XAIResultCreate",
+    "XAIResultPage",
     "XAIResultRead",
     "XAIResultUpdate",
     "PaginatedDatasetRead",
@@ -53,6 +53,14 @@ class DatasetConfig(BaseModel):
         None,
         description="Configuration for the feature selection step, which runs after cleaning.",
     )
+    after_watermark: Optional[int] = Field(
+        None,
+        description="Only include commits ingested after this watermark (e.g. the 'watermark' of the dataset a model was trained on). Builds a delta dataset for incremental training.",
+    )
+    watermark: Optional[int] = Field(
+        None,
+        description="Set by the dataset worker: highest CommitGuruMetric ID the dataset was built from.",
+    )
 
 
 # --- Dataset Schemas ---
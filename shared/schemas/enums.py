@@ -79,6 +79,9 @@ class ModelTypeEnum(str, enum.Enum):
     SKLEARN_ADABOOSTCLASSIFIER = "sklearn_adaboostclassifier"
     SKLEARN_DECISIONTREECLASSIFIER = "sklearn_decisiontreeclassifier"
     SKLEARN_KNNCLASSIFIER = "sklearn_knnclassifier"  # k-Nearest Neighbors
+    SKLEARN_SGDCLASSIFIER = (
+        "sklearn_sgdclassifier"  # Linear model, trainable out of core
+    )
 
     # gradient boosting libraries
     XGBOOST_CLASSIFIER = "xgboost_classifier"
@@ -53,6 +53,11 @@ class OptunaConfig(BaseModel):
         ge=2,
         description="Number of cross-validation folds within the objective function.",
     )
+    n_parallel_workers: int = Field(
+        1,
+        ge=1,
+        description="Number of ML worker tasks running trials of the shared study concurrently.",
+    )
 
 
 # --- Hyperparameter Space Definition ---
@@ -1,7 +1,8 @@
 # shared/schemas/inference.py
-from typing import Dict, List
+from datetime import datetime
+from typing import Dict, List, Optional
 
-from pydantic import BaseModel, Field, HttpUrl
+from pydantic import BaseModel, Field, HttpUrl, model_validator
 
 
 class ManualInferenceRequest(BaseModel):
@@ -29,6 +30,45 @@ class InferenceTriggerResponse(BaseModel):
     )
 
 
+class BatchInferenceRequest(BaseModel):
+    """Request body for predicting many already-ingested commits in one job."""
+
+    repo_id: int = Field(..., description="The database ID of the repository.")
+    ml_model_id: int = Field(..., description="The database ID of the ML model to use.")
+    commit_hashes: Optional[List[str]] = Field(
+        None,
+        description="Full commit hashes to predict. Mutually exclusive with the date range.",
+    )
+    start_date: Optional[datetime] = Field(
+        None, description="Predict commits authored at or after this time."
+    )
+    end_date: Optional[datetime] = Field(
+        None, description="Predict commits authored at or before this time."
+    )
+    run_xai: bool = Field(
+        False, description="Also generate XAI explanations for every commit."
+    )
+
+    @model_validator(mode="after")
+    def check_commit_selection(self) -> "BatchInferenceRequest":
+        has_range = self.start_date is not None or self.end_date is not None
+        if bool(self.commit_hashes) == has_range:
+            raise ValueError(
+                "Provide either a non-empty 'commit_hashes' list or a 'start_date'/'end_date' range."
+            )
+        return self
+
+
+class BatchInferenceTriggerResponse(BaseModel):
+    """Response containing IDs after triggering a batch inference job."""
+
+    batch_id: str = Field(..., description="Identifier shared by the batch's jobs.")
+    inference_job_ids: List[int] = Field(
+        ..., description="The IDs of the created InferenceJob records, one per commit."
+    )
+    task_id: str = Field(..., description="The Celery task ID of the batch prediction.")
+
+
 # Basic structure for GitHub Push Event Payload (add more fields as needed)
 class GitHubRepositoryInfo(BaseModel):
     id: int
@@ -50,6 +50,8 @@ class InferenceJobBase(BaseModel):
 class InferenceJobCreateInternal(InferenceJobBase):
     status: JobStatusEnum = JobStatusEnum.PENDING
     celery_task_id: Optional[str] = None
+    batch_id: Optional[str] = None
+    prediction_queued_at: Optional[datetime] = None
 
 
 # --- Update (Internal use) ---
@@ -73,6 +75,7 @@ class InferenceJobRead(InferenceJobBase):
     status_message: Optional[str] = None
     # Use the result package schema here for consistent response structure
     prediction_result: Optional[InferenceResultPackage] = None
+    batch_id: Optional[str] = None
     ml_model: Optional[MLModelRead] = None
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
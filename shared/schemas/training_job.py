@@ -36,6 +36,16 @@ class TrainingRunConfig(BaseModel):
     eval_test_split_size: Optional[float] = Field(
         0.2, ge=0, lt=1, description="Fraction for test split during evaluation."
     )
+    # --- Incremental training ---
+    parent_model_id: Optional[int] = Field(
+        None,
+        description="Continue training this model on the job's dataset (usually a delta dataset) and register the result as its next version.",
+    )
+    incremental_estimators: Optional[int] = Field(
+        None,
+        gt=0,
+        description="Trees / boosting rounds added when continuing a parent model (default: ML_INCREMENTAL_ESTIMATORS).",
+    )
 
 
 # --- Base ---
@@ -1,6 +1,6 @@
 # shared/schemas/xai_job.py
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -51,6 +51,29 @@ class XAIResultRead(XAIResultBase):
     model_config = ConfigDict(from_attributes=True, use_enum_values=True)
 
 
+class XAIResultPage(BaseModel):
+    """A page of the instances of one XAI result."""
+
+    xai_result_id: int
+    xai_type: XAITypeEnum
+    total_instances: int = Field(
+        ..., description="Number of instances in the full result."
+    )
+    skip: int
+    limit: int
+    feature_skip: int = 0
+    feature_limit: Optional[int] = Field(
+        None,
+        description="Features returned per instance, most important first (top-k). None returns all.",
+    )
+    instances: List[Dict[str, Any]] = Field(
+        ...,
+        description="Instance entries shaped like the full result_data entries; SHAP and LIME entries also carry 'feature_count'.",
+    )
+
+    model_config = ConfigDict(use_enum_values=True)
+
+
 class XAITriggerResponse(BaseModel):
     task_id: Optional[str] = Field(
         None, description="Celery task ID for the XAI orchestration."
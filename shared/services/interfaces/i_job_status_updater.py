@@ -56,6 +56,11 @@ class IJobStatusUpdater(ABC):
         """Updates the feature artifact path for an InferenceJob."""
         pass
 
+    @abstractmethod
+    def mark_inference_prediction_queued(self, job_id: int) -> bool:
+        """Marks an InferenceJob's features as ready so its prediction can be batched."""
+        pass
+
     # Add Dataset-specific convenience methods
     @abstractmethod
     def update_dataset_start(self, dataset_id: int, task_id: str) -> bool:
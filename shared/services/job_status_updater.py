@@ -241,6 +241,11 @@ class JobStatusUpdater(IJobStatusUpdater):
             return False
         return self._get_and_update_job(job_id, InferenceJob, updates)
 
+    def mark_inference_prediction_queued(self, job_id: int) -> bool:
+        """Marks an InferenceJob's features as ready so its prediction can be batched."""
+        updates = {"prediction_queued_at": datetime.now(timezone.utc)}
+        return self._get_and_update_job(job_id, InferenceJob, updates)
+
     # Add specific dataset methods leveraging the generic update method
     def update_dataset_start(self, dataset_id: int, task_id: str) -> bool:
         """Sets Dataset status to GENERATING."""
@@ -0,0 +1,71 @@
+# shared/utils/bot_filter.py
+import logging
+import re
+from typing import Iterable, List, Optional, Pattern, Set
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Backreferences (\1, (?P=name)) change meaning once patterns are OR-ed together
+_BACKREFERENCE = re.compile(r"\\[1-9]|\(\?P=")
+
+
+def _combine(patterns: List[str]) -> List[Pattern]:
+    """
+    Compiles patterns into a single alternation where possible, falling back to
+    one compiled regex per pattern (e.g. for inline global flags or backrefs).
+    """
+    if not patterns:
+        return []
+    if len(patterns) > 1 and not any(_BACKREFERENCE.search(p) for p in patterns):
+        try:
+            return [re.compile("|".join(f"(?:{p})" for p in patterns))]
+        except re.error:
+            logger.debug("Bot patterns cannot be combined; matching individually.")
+    compiled = []
+    for pattern in patterns:
+        try:
+            compiled.append(re.compile(pattern))
+        except re.error as e:
+            logger.warning(f"Ignoring invalid bot pattern '{pattern}': {e}")
+    return compiled
+
+
+class BotMatcher:
+    """
+    Classifies author names with bot patterns: an author is a bot if any
+    inclusion pattern matches (re.search) and no exclusion pattern does.
+    Inclusion and exclusion patterns are each compiled into one combined regex.
+    """
+
+    def __init__(self, patterns: Iterable):
+        patterns = list(patterns or [])
+        self._inclusion = _combine([p.pattern for p in patterns if not p.is_exclusion])
+        self._exclusion = _combine([p.pattern for p in patterns if p.is_exclusion])
+
+    @property
+    def has_patterns(self) -> bool:
+        return bool(self._inclusion)
+
+    def is_bot(self, author_name: Optional[str]) -> bool:
+        if not isinstance(author_name, str):
+            return False
+        # If any exclusion pattern matches, it's NOT a bot.
+        if any(exc.search(author_name) for exc in self._exclusion):
+            return False
+        # If any inclusion pattern matches (and no exclusion did), it IS a bot.
+        return any(inc.search(author_name) for inc in self._inclusion)
+
+    def bot_authors(self, author_names: Iterable[Optional[str]]) -> Set[str]:
+        """Returns the bots among the given names, testing each distinct name once."""
+        if not self.has_patterns:
+            return set()
+        return {name for name in set(author_names) if self.is_bot(name)}
+
+    def bot_mask(self, author_names: pd.Series) -> pd.Series:
+        """Boolean mask over a Series of author names, evaluated per distinct author."""
+        if not self.has_patterns or author_names.empty:
+            return pd.Series(False, index=author_names.index)
+        bots = self.bot_authors(author_names.dropna().unique())
+        return author_names.isin(bots)
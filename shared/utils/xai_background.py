@@ -0,0 +1,69 @@
+# shared/utils/xai_background.py
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+# k-means centroids are fitted on at most this many rows, drawn at random
+KMEANS_FIT_ROWS = 20_000
+
+
+def background_centroids_uri(background_uri: str) -> str:
+    """URI of the k-means centroids stored next to a dataset background sample."""
+    stem, dot, suffix = background_uri.rpartition(".")
+    return f"{stem}.centroids.{suffix}" if dot else f"{background_uri}.centroids"
+
+
+def summarize_background(
+    X: pd.DataFrame,
+    y: Optional[pd.Series] = None,
+    max_rows: int = 100,
+    method: str = "stratified",
+    random_state: int = 42,
+) -> pd.DataFrame:
+    """
+    Small background set for SHAP/LIME drawn from the training features.
+
+    "stratified" keeps the class proportions of `y` (every class gets at least
+    one row); "kmeans" returns `max_rows` k-means centroids of a random sample
+    of at most KMEANS_FIT_ROWS rows of X, with missing values replaced by the
+    column means. Both return a DataFrame with X's
+    columns and at most `max_rows` rows.
+    """
+    if len(X) <= max_rows:
+        return X.reset_index(drop=True)
+
+    if method == "kmeans":
+        from sklearn.cluster import MiniBatchKMeans
+
+        if len(X) > KMEANS_FIT_ROWS:
+            X = X.sample(n=KMEANS_FIT_ROWS, random_state=random_state)
+        values = X.to_numpy(dtype=np.float64)
+        if np.isnan(values).any():
+            column_means = np.nan_to_num(np.nanmean(values, axis=0))
+            values = np.where(np.isnan(values), column_means, values)
+        kmeans = MiniBatchKMeans(
+            n_clusters=max_rows, random_state=random_state, n_init=3
+        ).fit(values)
+        return pd.DataFrame(kmeans.cluster_centers_, columns=X.columns)
+
+    if y is None or y.nunique() < 2:
+        return X.sample(n=max_rows, random_state=random_state).reset_index(drop=True)
+
+    labels = pd.Series(np.asarray(y), index=X.index)
+    counts = labels.value_counts()
+    per_class = np.maximum(
+        1, np.floor(counts / counts.sum() * max_rows).astype(int)
+    ).clip(upper=counts)
+    # Hand out rows lost to rounding to the largest classes first
+    for label in counts.index:
+        if per_class.sum() >= max_rows:
+            break
+        per_class[label] = min(
+            counts[label], per_class[label] + max_rows - per_class.sum()
+        )
+    parts = [
+        X.loc[labels.index[labels == label]].sample(n=int(n), random_state=random_state)
+        for label, n in per_class.items()
+    ]
+    return pd.concat(parts).reset_index(drop=True)
@@ -0,0 +1,189 @@
+# shared/utils/xai_result_storage.py
+import json
+import logging
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import pyarrow as pa
+
+from shared.core.config import settings
+from shared.schemas.enums import XAITypeEnum
+
+logger = logging.getLogger(__name__)
+logger.setLevel(settings.LOG_LEVEL.upper())
+
+# Arrow IPC stream with one row per instance, zstd-compressed
+STORAGE_FORMAT = "arrow-ipc-zstd-v1"
+STORAGE_KEY = "compact_storage"
+
+# Key of the per-instance list in each result_data document
+ITEM_KEYS: Dict[XAITypeEnum, str] = {
+    XAITypeEnum.SHAP: "instance_shap_values",
+    XAITypeEnum.LIME: "instance_lime_values",
+    XAITypeEnum.FEATURE_IMPORTANCE: "feature_importances",
+    XAITypeEnum.COUNTERFACTUALS: "instance_counterfactuals",
+    XAITypeEnum.DECISION_PATH: "instance_decision_paths",
+}
+
+
+class FeatureList(NamedTuple):
+    """Where an instance keeps its per-feature scores, and how to read them."""
+
+    key: str
+    name: Callable[[Any], str]
+    score: Callable[[Any], float]
+
+
+FEATURE_LISTS: Dict[XAITypeEnum, FeatureList] = {
+    XAITypeEnum.SHAP: FeatureList(
+        "shap_values", lambda e: e["feature"], lambda e: abs(e["value"])
+    ),
+    XAITypeEnum.LIME: FeatureList("explanation", lambda e: e[0], lambda e: abs(e[1])),
+}
+
+
+def _rank_features(xai_type: XAITypeEnum, item: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of the instance with its features sorted by decreasing |score|."""
+    feature_list = FEATURE_LISTS.get(xai_type)
+    if feature_list is None or not isinstance(item.get(feature_list.key), list):
+        return item
+    ranked = dict(item)
+    ranked[feature_list.key] = sorted(
+        item[feature_list.key], key=feature_list.score, reverse=True
+    )
+    return ranked
+
+
+def _slice_features(
+    xai_type: XAITypeEnum,
+    item: Dict[str, Any],
+    feature_skip: int = 0,
+    feature_limit: Optional[int] = None,
+) -> Dict[str, Any]:
+    feature_list = FEATURE_LISTS.get(xai_type)
+    if feature_list is None or not isinstance(item.get(feature_list.key), list):
+        return item
+    end = None if feature_limit is None else feature_skip + feature_limit
+    sliced = dict(item)
+    sliced[feature_list.key] = item[feature_list.key][feature_skip:end]
+    sliced["feature_count"] = len(item[feature_list.key])
+    return sliced
+
+
+def _top_features(
+    xai_type: XAITypeEnum, items: List[Dict[str, Any]], k: int
+) -> List[Dict[str, Any]]:
+    """Features with the highest mean |score| over all instances."""
+    feature_list = FEATURE_LISTS.get(xai_type)
+    if feature_list is None:
+        return []
+    totals: Dict[str, float] = {}
+    for item in items:
+        for entry in item.get(feature_list.key) or []:
+            name = feature_list.name(entry)
+            totals[name] = totals.get(name, 0.0) + feature_list.score(entry)
+    ranked = sorted(totals.items(), key=lambda kv: kv[1], reverse=True)[:k]
+    return [
+        {"feature": name, "mean_abs_score": round(total / len(items), 6)}
+        for name, total in ranked
+    ]
+
+
+def pack_xai_result(
+    xai_type: XAITypeEnum, result_data: Dict[str, Any]
+) -> Tuple[Dict[str, Any], Optional[bytes]]:
+    """
+    Splits an XAI result into the JSON kept in XAIResult.result_data and an
+    optional compressed payload.
+
+    Results up to ML_XAI_INLINE_MAX_BYTES are returned unchanged. Larger ones
+    are stored with one row per instance, features ranked by importance, and
+    result_data becomes a preview in the same shape as the full document: the
+    first ML_XAI_PREVIEW_INSTANCES instances with their top
+    ML_XAI_PREVIEW_FEATURES features, plus a summary under STORAGE_KEY.
+    """
+    item_key = ITEM_KEYS.get(xai_type)
+    items = result_data.get(item_key) if item_key else None
+    if not isinstance(items, list):
+        return result_data, None
+    encoded_items = [
+        json.dumps(_rank_features(xai_type, item), separators=(",", ":")).encode()
+        for item in items
+    ]
+    json_bytes = sum(map(len, encoded_items))
+    if json_bytes <= settings.ML_XAI_INLINE_MAX_BYTES:
+        return result_data, None
+
+    preview_features = settings.ML_XAI_PREVIEW_FEATURES
+    table = pa.table(
+        {
+            "file": pa.array([item.get("file") for item in items], pa.string()),
+            "class_name": pa.array(
+                [item.get("class_name", item.get("class")) for item in items],
+                pa.string(),
+            ),
+            "item": pa.array(encoded_items, pa.binary()),
+        }
+    )
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(
+        sink, table.schema, options=pa.ipc.IpcWriteOptions(compression="zstd")
+    ) as writer:
+        writer.write_table(table)
+    payload = sink.getvalue().to_pybytes()
+
+    preview_items = [
+        _slice_features(xai_type, _rank_features(xai_type, item), 0, preview_features)
+        for item in items[: settings.ML_XAI_PREVIEW_INSTANCES]
+    ]
+    summary = {
+        "format": STORAGE_FORMAT,
+        "total_instances": len(items),
+        "preview_instances": len(preview_items),
+        "preview_features": preview_features,
+        "top_features": _top_features(xai_type, items, preview_features),
+        "payload_bytes": len(payload),
+    }
+    preview = {key: value for key, value in result_data.items() if key != item_key} | {
+        item_key: preview_items,
+        STORAGE_KEY: summary,
+    }
+    logger.info(
+        f"Packed {xai_type.value} result: {len(items)} instances, "
+        f"{json_bytes} JSON bytes -> {len(payload)} compressed bytes."
+    )
+    return preview, payload
+
+
+def read_xai_result_page(
+    xai_type: XAITypeEnum,
+    result_data: Optional[Dict[str, Any]],
+    payload: Optional[bytes],
+    skip: int = 0,
+    limit: int = 50,
+    feature_skip: int = 0,
+    feature_limit: Optional[int] = None,
+) -> Tuple[int, List[Dict[str, Any]]]:
+    """
+    Returns the total instance count and instances [skip, skip + limit) of a
+    stored XAI result, each with features [feature_skip, feature_skip +
+    feature_limit) in decreasing order of importance. Works for both packed
+    and inline results.
+    """
+    if payload is not None:
+        table = pa.ipc.open_stream(payload).read_all()
+        total = table.num_rows
+        page_items = [
+            json.loads(encoded)
+            for encoded in table.column("item").slice(skip, limit).to_pylist()
+        ]
+    else:
+        item_key = ITEM_KEYS.get(xai_type)
+        items = (result_data or {}).get(item_key) or []
+        total = len(items)
+        page_items = [
+            _rank_features(xai_type, item) for item in items[skip : skip + limit]
+        ]
+    return total, [
+        _slice_features(xai_type, item, feature_skip, feature_limit)
+        for item in page_items
+    ]
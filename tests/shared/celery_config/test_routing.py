@@ -0,0 +1,69 @@
+import pytest
+
+from shared.celery_config.app import create_celery_app
+from shared.celery_config.routing import (
+    INFERENCE_MAX_PRIORITY,
+    INFERENCE_PRIORITIES,
+    ML_INFERENCE_QUEUE,
+    ML_QUEUE,
+    XAI_QUEUE,
+    configure_worker_pool,
+    inference_priority,
+)
+
+
+@pytest.fixture
+def app():
+    return create_celery_app(main_name="test_routing")
+
+
+def route(app, task_name, **options):
+    return app.amqp.router.route(options, task_name)
+
+
+def test_inference_routes_to_priority_queue(app):
+    options = route(app, "tasks.inference_predict")
+
+    assert options["queue"].name == ML_INFERENCE_QUEUE
+    assert options["queue"].queue_arguments == {
+        "x-max-priority": INFERENCE_MAX_PRIORITY
+    }
+    assert options["priority"] == INFERENCE_PRIORITIES["manual"]
+    assert (
+        route(app, "tasks.batch_inference_predict")["priority"]
+        == INFERENCE_PRIORITIES["batch"]
+    )
+
+
+def test_explicit_priority_overrides_route_default(app):
+    options = route(
+        app, "tasks.inference_predict", priority=INFERENCE_PRIORITIES["webhook"]
+    )
+
+    assert options["priority"] == INFERENCE_PRIORITIES["webhook"]
+
+
+def test_long_jobs_stay_off_inference_queue(app):
+    assert route(app, "tasks.train_model")["queue"].name == ML_QUEUE
+    assert route(app, "tasks.hyperparameter_search")["queue"].name == ML_QUEUE
+    assert route(app, "tasks.orchestrate_xai")["queue"].name == XAI_QUEUE
+    assert route(app, "tasks.generate_explanation")["queue"].name == XAI_QUEUE
+
+
+def test_inference_priority():
+    assert inference_priority("webhook") > inference_priority("manual")
+    assert inference_priority("manual") > inference_priority("batch")
+    assert inference_priority(None) == INFERENCE_PRIORITIES["manual"]
+    assert inference_priority("unknown") == INFERENCE_PRIORITIES["manual"]
+
+
+def test_configure_worker_pool(app):
+    configure_worker_pool(app, "ml_inference")
+
+    assert app.conf.worker_prefetch_multiplier == 1
+    assert app.conf.worker_concurrency >= 1
+
+
+def test_configure_unknown_worker_pool(app):
+    with pytest.raises(ValueError):
+        configure_worker_pool(app, "gpu")
@@ -0,0 +1,95 @@
+import math
+
+import pytest
+from sqlalchemy import ARRAY, create_engine, event
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+
+from shared.db import CK_METRIC_COLUMNS
+from shared.db.models import CKMetric, CommitGuruMetric
+from shared.repositories.ml_feature_repository import MLFeatureRepository
+
+
+# The statement targets PostgreSQL; SQLite only needs stand-ins for the
+# ARRAY column type and split_part()
+@compiles(ARRAY, "sqlite")
+def _array_as_json(type_, compiler, **kw):
+    return "JSON"
+
+
+def _split_part(value, delimiter, index):
+    parts = (value or "").split(delimiter)
+    return parts[index - 1] if index <= len(parts) else ""
+
+
+@pytest.fixture
+def repo():
+    engine = create_engine("sqlite://")
+    event.listen(
+        engine,
+        "connect",
+        lambda conn, _: conn.create_function("split_part", 3, _split_part),
+    )
+    CKMetric.__table__.create(engine)
+    CommitGuruMetric.__table__.create(engine)
+    session_factory = sessionmaker(bind=engine)
+
+    def guru(commit_hash, parent_hashes, la):
+        return CommitGuruMetric(
+            repository_id=1,
+            commit_hash=commit_hash,
+            parent_hashes=parent_hashes,
+            is_buggy=False,
+            la=la,
+        )
+
+    def ck(commit_hash, file, class_name, cbo):
+        return CKMetric(
+            repository_id=1,
+            commit_hash=commit_hash,
+            file=file,
+            class_name=class_name,
+            type_="class",
+            cbo=cbo,
+            loc=10,
+        )
+
+    with session_factory() as session:
+        session.add_all(
+            [
+                guru("c1", "p1", 5.0),
+                guru("c2", "p2 p3", 7.0),
+                guru("c3", "", 1.0),
+                ck("c1", "A.java", "A", 10.0),
+                ck("c1", "B.java", "B", 4.0),
+                ck("c2", "A.java", "A", 1.0),
+                ck("c3", "A.java", "A", 1.0),
+                ck("p1", "A.java", "A", 3.0),
+                ck("p2", "A.java", "A", 6.0),
+                ck("p3", "A.java", "A", 100.0),
+            ]
+        )
+        session.commit()
+    return MLFeatureRepository(session_factory)
+
+
+def test_features_for_commits_join_first_parent_per_class(repo):
+    features = repo.get_features_for_commits(1, ["c1", "c2", "c3", "missing"])
+
+    assert list(features["commit_hash"]) == ["c1", "c1", "c2"]
+    assert list(features["la"]) == [5.0, 5.0, 7.0]
+    assert list(features["class"]) == ["A", "B", "A"]
+    deltas = features["d_cbo"].tolist()
+    assert deltas[0] == 7 and math.isnan(deltas[1]) and deltas[2] == -5
+    assert features["d_loc"].tolist()[0] == 0
+    assert features["d_file"].isna().all()
+    assert not [c for c in features.columns if c.startswith("parent_")]
+    assert list(features.columns[-len(CK_METRIC_COLUMNS) :]) == [
+        f"d_{c}" for c in CK_METRIC_COLUMNS
+    ]
+
+
+def test_single_commit_wrapper(repo):
+    single = repo.get_features_for_commit(1, "c2")
+    assert single is not None and single["d_cbo"].tolist() == [-5]
+    assert repo.get_features_for_commit(1, "c3") is None
@@ -0,0 +1,106 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from shared.core.config import settings
+from shared.db.models import XAIResult
+from shared.repositories.xai_result_repository import XaiResultRepository
+from shared.schemas.enums import XAIStatusEnum, XAITypeEnum
+from shared.utils.xai_result_storage import STORAGE_KEY
+
+
+@pytest.fixture
+def repo():
+    engine = create_engine("sqlite://")
+    XAIResult.__table__.create(engine)
+    return XaiResultRepository(sessionmaker(bind=engine))
+
+
+def test_create_pending_creates_missing_and_resets_existing(repo):
+    failed_id = repo.create_pending_xai_result_sync(7, XAITypeEnum.SHAP)
+    repo.update_xai_result_sync(
+        failed_id, XAIStatusEnum.FAILED, "boom", result_data={"x": 1}, task_id="t0"
+    )
+
+    ids = repo.create_pending_xai_results_sync(
+        7, [XAITypeEnum.SHAP, XAITypeEnum.LIME, XAITypeEnum.FEATURE_IMPORTANCE]
+    )
+
+    assert set(ids) == {
+        XAITypeEnum.SHAP,
+        XAITypeEnum.LIME,
+        XAITypeEnum.FEATURE_IMPORTANCE,
+    }
+    assert ids[XAITypeEnum.SHAP] == failed_id  # Reused, not a duplicate row
+    records = repo.get_xai_results_sync(list(ids.values()))
+    assert len(records) == 3
+    for record in records:
+        assert record.status == XAIStatusEnum.PENDING
+        assert record.result_data is None
+        assert record.celery_task_id is None
+        assert record.completed_at is None
+
+
+def test_update_xai_results_applies_all_updates_together(repo):
+    ids = repo.create_pending_xai_results_sync(3, [XAITypeEnum.SHAP, XAITypeEnum.LIME])
+    shap_id, lime_id = ids[XAITypeEnum.SHAP], ids[XAITypeEnum.LIME]
+    repo.update_xai_task_ids_sync([shap_id, lime_id], "task-1")
+
+    repo.update_xai_results_sync(
+        {
+            shap_id: {
+                "status": XAIStatusEnum.SUCCESS,
+                "message": "ok",
+                "result_data": {"instance_shap_values": []},
+            },
+            lime_id: {"status": XAIStatusEnum.FAILED, "message": "no data"},
+        }
+    )
+
+    shap_record, lime_record = repo.get_xai_results_sync([shap_id, lime_id])
+    assert shap_record.status == XAIStatusEnum.SUCCESS
+    assert shap_record.result_data == {"instance_shap_values": []}
+    assert shap_record.celery_task_id == "task-1"
+    assert lime_record.status == XAIStatusEnum.FAILED
+    assert lime_record.status_message == "no data"
+    assert shap_record.completed_at is not None and lime_record.completed_at
+
+
+def test_update_xai_results_is_all_or_nothing(repo):
+    ids = repo.create_pending_xai_results_sync(3, [XAITypeEnum.SHAP])
+    shap_id = ids[XAITypeEnum.SHAP]
+
+    with pytest.raises(ValueError):
+        repo.update_xai_results_sync(
+            {
+                shap_id: {"status": XAIStatusEnum.SUCCESS},
+                shap_id + 100: {"status": XAIStatusEnum.SUCCESS},
+            }
+        )
+
+    assert repo.get_xai_result_sync(shap_id).status == XAIStatusEnum.PENDING
+
+
+def test_large_results_are_stored_compressed(repo, monkeypatch):
+    monkeypatch.setattr(settings, "ML_XAI_INLINE_MAX_BYTES", 1024)
+    ids = repo.create_pending_xai_results_sync(5, [XAITypeEnum.LIME])
+    lime_id = ids[XAITypeEnum.LIME]
+    result_data = {
+        "instance_lime_values": [
+            {"file": f"F{i}.java", "explanation": [["loc", 0.5], ["wmc", -0.25]]}
+            for i in range(100)
+        ]
+    }
+
+    repo.update_xai_result_sync(lime_id, XAIStatusEnum.SUCCESS, result_data=result_data)
+
+    with repo._session_scope() as session:
+        record = session.get(XAIResult, lime_id)
+        assert record.result_payload is not None
+        assert record.result_data[STORAGE_KEY]["total_instances"] == 100
+
+    repo.create_pending_xai_results_sync(5, [XAITypeEnum.LIME])
+    with repo._session_scope() as session:
+        record = session.get(XAIResult, lime_id)
+        assert record.result_payload is None
+        assert record.result_data is None
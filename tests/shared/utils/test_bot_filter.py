@@ -0,0 +1,34 @@
+from types import SimpleNamespace
+
+import pandas as pd
+
+from shared.utils.bot_filter import BotMatcher
+
+
+def pattern(regex, is_exclusion=False):
+    return SimpleNamespace(pattern=regex, is_exclusion=is_exclusion)
+
+
+def test_inclusion_and_exclusion_patterns():
+    matcher = BotMatcher(
+        [pattern(r"\[bot\]$"), pattern(r"^dependabot"), pattern("human", True)]
+    )
+    assert matcher.is_bot("renovate[bot]")
+    assert matcher.is_bot("dependabot-preview")
+    assert not matcher.is_bot("human[bot]")
+    assert not matcher.is_bot("alice")
+    assert not matcher.is_bot(None)
+
+
+def test_bot_mask_matches_per_row_evaluation():
+    matcher = BotMatcher([pattern("bot"), pattern(r"(a)\1")])
+    names = pd.Series(["ci-bot", "alice", None, "aa-team", "ci-bot", "bob"])
+    mask = matcher.bot_mask(names)
+    assert mask.tolist() == [matcher.is_bot(n) for n in names]
+    assert matcher.bot_authors(names) == {"ci-bot", "aa-team"}
+
+
+def test_invalid_pattern_is_ignored_and_no_patterns_match_nothing():
+    matcher = BotMatcher([pattern("("), pattern("bot")])
+    assert matcher.is_bot("my-bot")
+    assert not BotMatcher([]).bot_mask(pd.Series(["bot"])).any()
@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+
+from shared.utils import xai_background
+from shared.utils.xai_background import background_centroids_uri, summarize_background
+
+
+def make_data(rows=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.normal(size=(rows, 4)), columns=["a", "b", "c", "d"])
+    y = pd.Series((rng.random(rows) < 0.1).astype(int))  # ~10% positives
+    return X, y
+
+
+def test_background_centroids_uri():
+    assert (
+        background_centroids_uri("s3://b/datasets/dataset_3_background.parquet")
+        == "s3://b/datasets/dataset_3_background.centroids.parquet"
+    )
+
+
+def test_stratified_background_keeps_class_proportions():
+    X, y = make_data()
+    X["label"] = y
+    background = summarize_background(X, y, max_rows=100)
+
+    assert len(background) == 100
+    assert list(background.columns) == list(X.columns)
+    expected_positives = round(y.mean() * 100)
+    assert abs(int(background["label"].sum()) - expected_positives) <= 1
+
+
+def test_stratified_background_keeps_rare_class():
+    X, y = make_data()
+    y[:] = 0
+    y.iloc[7] = 1
+    X["label"] = y
+    background = summarize_background(X, y, max_rows=50)
+
+    assert len(background) == 50
+    assert int(background["label"].sum()) == 1
+
+
+def test_kmeans_background_returns_centroids():
+    X, _ = make_data()
+    background = summarize_background(X, max_rows=20, method="kmeans")
+
+    assert background.shape == (20, X.shape[1])
+    assert list(background.columns) == list(X.columns)
+
+
+def test_small_frames_are_returned_whole():
+    X, y = make_data(rows=30)
+    assert len(summarize_background(X, y, max_rows=100)) == 30
+
+
+def test_kmeans_background_ignores_missing_values():
+    X, _ = make_data(rows=500)
+    X.iloc[::5, 1] = np.nan
+    background = summarize_background(X, max_rows=10, method="kmeans")
+
+    assert background.shape == (10, X.shape[1])
+    assert not background.isna().any().any()
+
+
+def test_kmeans_background_fits_a_bounded_sample(monkeypatch):
+    from sklearn.cluster import MiniBatchKMeans
+
+    fitted_rows = []
+    fit = MiniBatchKMeans.fit
+
+    def recording_fit(self, X, *args, **kwargs):
+        fitted_rows.append(len(X))
+        return fit(self, X, *args, **kwargs)
+
+    monkeypatch.setattr(xai_background, "KMEANS_FIT_ROWS", 300)
+    monkeypatch.setattr(MiniBatchKMeans, "fit", recording_fit)
+    X, _ = make_data()
+    background = summarize_background(X, max_rows=20, method="kmeans")
+
+    assert fitted_rows == [300]
+    assert background.shape == (20, X.shape[1])
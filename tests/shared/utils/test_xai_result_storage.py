@@ -0,0 +1,130 @@
+import json
+
+import pytest
+
+from shared.core.config import settings
+from shared.schemas.enums import XAITypeEnum
+from shared.utils.xai_result_storage import (
+    STORAGE_KEY,
+    pack_xai_result,
+    read_xai_result_page,
+)
+
+
+def shap_result(instances, features):
+    return {
+        "instance_shap_values": [
+            {
+                "file": f"src/F{i}.java",
+                "class_name": f"F{i}",
+                "base_value": 0.3,
+                "shap_values": [
+                    {
+                        "feature": f"metric_{j}",
+                        "value": ((i + j) % 7 - 3) / (j + 1),
+                        "feature_value": j * 1.5,
+                    }
+                    for j in range(features)
+                ],
+            }
+            for i in range(instances)
+        ]
+    }
+
+
+@pytest.fixture
+def small_limits(monkeypatch):
+    monkeypatch.setattr(settings, "ML_XAI_INLINE_MAX_BYTES", 2048)
+    monkeypatch.setattr(settings, "ML_XAI_PREVIEW_INSTANCES", 5)
+    monkeypatch.setattr(settings, "ML_XAI_PREVIEW_FEATURES", 3)
+
+
+def test_small_results_stay_inline(small_limits):
+    result = shap_result(instances=1, features=3)
+
+    row_data, payload = pack_xai_result(XAITypeEnum.SHAP, result)
+
+    assert payload is None
+    assert row_data is result
+
+
+def test_large_results_keep_a_preview_in_the_row(small_limits):
+    result = shap_result(instances=200, features=40)
+
+    row_data, payload = pack_xai_result(XAITypeEnum.SHAP, result)
+
+    assert payload is not None
+    assert len(payload) < len(json.dumps(result)) / 4
+    preview = row_data["instance_shap_values"]
+    assert len(preview) == 5
+    assert [p["file"] for p in preview] == [f"src/F{i}.java" for i in range(5)]
+    for entry in preview:
+        scores = [abs(v["value"]) for v in entry["shap_values"]]
+        assert len(scores) == 3 and scores == sorted(scores, reverse=True)
+        assert entry["feature_count"] == 40
+    summary = row_data[STORAGE_KEY]
+    assert summary["total_instances"] == 200
+    assert len(summary["top_features"]) == 3
+    assert len(json.dumps(row_data)) < settings.ML_XAI_INLINE_MAX_BYTES
+
+
+@pytest.mark.parametrize("packed", [True, False])
+def test_pages_match_the_full_result(small_limits, monkeypatch, packed):
+    if not packed:
+        monkeypatch.setattr(settings, "ML_XAI_INLINE_MAX_BYTES", 10**9)
+    result = shap_result(instances=60, features=12)
+    row_data, payload = pack_xai_result(XAITypeEnum.SHAP, result)
+    assert (payload is not None) == packed
+
+    total, page = read_xai_result_page(
+        XAITypeEnum.SHAP, row_data, payload, skip=50, limit=20, feature_limit=4
+    )
+
+    assert total == 60
+    assert [entry["file"] for entry in page] == [
+        f"src/F{i}.java" for i in range(50, 60)
+    ]
+    for entry, original in zip(page, result["instance_shap_values"][50:]):
+        expected = sorted(
+            original["shap_values"], key=lambda v: abs(v["value"]), reverse=True
+        )
+        assert entry["shap_values"] == expected[:4]
+        assert entry["feature_count"] == 12
+        assert entry["base_value"] == original["base_value"]
+
+    _, next_features = read_xai_result_page(
+        XAITypeEnum.SHAP, row_data, payload, skip=0, limit=1, feature_skip=4
+    )
+    assert len(next_features[0]["shap_values"]) == 8
+
+
+def test_lime_and_decision_path_results(small_limits):
+    lime = {
+        "instance_lime_values": [
+            {
+                "file": f"F{i}",
+                "explanation": [[f"m{j}", (j - 10) / 3] for j in range(30)],
+            }
+            for i in range(50)
+        ]
+    }
+    row_data, payload = pack_xai_result(XAITypeEnum.LIME, lime)
+    _, page = read_xai_result_page(
+        XAITypeEnum.LIME, row_data, payload, skip=0, limit=2, feature_limit=2
+    )
+    assert payload is not None
+    assert page[0]["explanation"] == [["m29", 19 / 3], ["m28", 6.0]]
+
+    paths = {
+        "instance_decision_paths": [
+            {"file": f"F{i}", "nodes": [{"id": str(n)} for n in range(20)], "edges": []}
+            for i in range(50)
+        ]
+    }
+    row_data, payload = pack_xai_result(XAITypeEnum.DECISION_PATH, paths)
+    total, page = read_xai_result_page(
+        XAITypeEnum.DECISION_PATH, row_data, payload, skip=49, limit=5
+    )
+    assert payload is not None
+    assert total == 50
+    assert page == [paths["instance_decision_paths"][49]]
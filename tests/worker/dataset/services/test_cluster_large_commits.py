@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import worker.dataset.services.cleaning_rules.clustering as clustering
+from worker.dataset.services.cleaning_rules.implementations import (
+    ClusterLargeCommits,
+)
+
+CONFIG = {"feature_columns": ["cbo", "wmc", "d_loc"], "target_column": "is_buggy"}
+
+
+def make_history(seed=0):
+    rng = np.random.default_rng(seed)
+    counts = np.concatenate([rng.integers(11, 60, 12), rng.integers(1, 6, 30)])
+    commit_of_row = np.repeat(np.arange(len(counts)), counts)
+    rows = len(commit_of_row)
+    df = pd.DataFrame(
+        {
+            "commit_hash": np.char.add("c", commit_of_row.astype(str)),
+            "changed_file_count": counts[commit_of_row],
+            "cbo": rng.integers(0, 10, rows).astype(float),
+            "wmc": rng.normal(size=rows),
+            "d_loc": rng.normal(size=rows),
+            "file": np.char.add("F", np.arange(rows).astype(str)),
+            "is_buggy": rng.random(rows) < 0.3,
+        }
+    )
+    df.loc[df.sample(frac=0.05, random_state=seed).index, "cbo"] = np.nan
+    return df.sample(frac=1.0, random_state=seed).reset_index(drop=True)
+
+
+def test_large_commits_are_reduced_to_target_clusters():
+    df = make_history()
+    result = ClusterLargeCommits().apply(df, {"threshold": 10, "n_jobs": 1}, CONFIG)
+
+    small = df[df["changed_file_count"] <= 10]
+    avg_count = int(round(small["changed_file_count"].mean()))
+    large_commits = df.loc[df["changed_file_count"] > 10, "commit_hash"].unique()
+    per_commit = result["commit_hash"].value_counts()
+    assert all(per_commit[c] <= avg_count for c in large_commits)
+    assert result["is_buggy"].dtype == bool
+    clustered = result[result["commit_hash"].isin(large_commits)]
+    assert not clustered[CONFIG["feature_columns"]].isna().any().any()
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_output_is_deterministic_for_fixed_seed(monkeypatch, n_jobs):
+    monkeypatch.setattr(clustering, "PARALLEL_MIN_ROWS", 0)
+    df = make_history(seed=1)
+    params = {"threshold": 10, "random_state": 7}
+    reference = ClusterLargeCommits().apply(df, {**params, "n_jobs": 1}, CONFIG)
+    result = ClusterLargeCommits().apply(df, {**params, "n_jobs": n_jobs}, CONFIG)
+    pd.testing.assert_frame_equal(result, reference)
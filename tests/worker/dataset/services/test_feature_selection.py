@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+from sklearn.metrics import mutual_info_score
+
+from worker.dataset.services.feature_selection.measures import (
+    discretize,
+    mutual_information,
+    pairwise_correlation,
+    stratified_sample_indices,
+)
+from worker.dataset.services.feature_selection.strategies import (
+    CbfsFeatureSelection,
+    MrmrFeatureSelection,
+)
+
+
+def make_features(n=3000, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, 8))
+    X[:, 1] = 2 * X[:, 0] + rng.normal(scale=0.05, size=n)  # duplicate of f0
+    X[:, 2] = X[:, 0] + rng.normal(scale=1.0, size=n)
+    X[:, 3] = X[:, 4] + rng.normal(scale=0.5, size=n)
+    X[rng.random(X.shape) < 0.05] = np.nan
+    X[:, 6] = 1.0  # constant, no missing values
+    df = pd.DataFrame(X, columns=[f"f{i}" for i in range(8)])
+    target = pd.Series((X[:, 0] > 0) ^ (X[:, 4] > 1), name="is_buggy")
+    return df, target
+
+
+def legacy_cbfs(dataframe, target, threshold):
+    corr = pd.concat([dataframe, target], axis=1).corr(numeric_only=True).abs()
+    target_corr = corr[target.name]
+    relevant = [
+        c for c in target_corr[target_corr > threshold].index if c != target.name
+    ]
+    selected = []
+    for feature in relevant:
+        if all(corr.loc[feature, s] <= threshold for s in selected):
+            selected.append(feature)
+    return selected
+
+
+def test_pairwise_correlation_matches_pandas():
+    df, _ = make_features()
+    expected = df.corr().to_numpy()
+    result = pairwise_correlation(df.to_numpy())
+    np.testing.assert_allclose(result, expected, atol=1e-12)
+    assert np.array_equal(np.isnan(result), np.isnan(expected))
+
+
+def test_mutual_information_matches_sklearn():
+    df, _ = make_features()
+    codes = discretize(df.to_numpy(), n_bins=8)
+    result = mutual_information(codes[:, 0], codes, 9, 9)
+    expected = [mutual_info_score(codes[:, 0], codes[:, j]) for j in range(8)]
+    np.testing.assert_allclose(result, expected, atol=1e-12)
+
+
+def test_cbfs_matches_nested_loop():
+    df, target = make_features(seed=1)
+    for threshold in (0.05, 0.2, 0.5):
+        selected = CbfsFeatureSelection().select_features(
+            df, target, {"threshold": threshold}
+        )
+        assert selected == legacy_cbfs(df, target, threshold)
+
+
+def test_mrmr_prefers_relevant_and_skips_redundant_duplicates():
+    df, target = make_features(seed=2)
+    selected = MrmrFeatureSelection().select_features(df, target, {"k": 3})
+    assert selected[0] in ("f0", "f1")
+    assert not {"f0", "f1"} <= set(selected)
+    assert "f6" not in selected
+
+
+def test_stratified_sample_keeps_class_ratio():
+    y = np.r_[np.zeros(9000, dtype=int), np.ones(1000, dtype=int)]
+    sample = stratified_sample_indices(y, 1000, random_state=0)
+    assert len(sample) == 1000
+    assert y[sample].sum() == 100
+    assert stratified_sample_indices(y, 0) is None
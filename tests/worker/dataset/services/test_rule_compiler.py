@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from worker.dataset.services.cleaning_rules.base import (
+    CleaningRuleBase,
+    SharedColumns,
+)
+from worker.dataset.services.cleaning_rules.compiler import compile_rules
+from worker.dataset.services.cleaning_rules.implementations import (
+    FilterLargeCommits,
+    RemoveCommentOnlyChange,
+    RemoveDeadCode,
+    RemoveEmptyClass,
+    RemoveMarginalChange,
+    RemoveMinimalChange,
+    RemoveNoAddedLines,
+    RemoveTypeExceptionFiles,
+)
+
+
+def make_batch(n=500, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "file": rng.choice(["A.java", "FooType.java", "BarException.java"], n),
+            "totalMethodsQty": rng.integers(0, 5, n).astype(float),
+            "totalFieldsQty": rng.integers(0, 5, n).astype(float),
+            "cbo": rng.integers(0, 3, n),
+            "fanin": rng.integers(0, 3, n),
+            "la": rng.integers(0, 20, n).astype(float),
+            "ld": rng.integers(0, 20, n),
+            "changed_file_count": rng.integers(1, 20, n),
+            "is_buggy": rng.random(n) < 0.3,
+            "d_cbo": rng.integers(-5, 5, n).astype(float),
+            "d_wmc": rng.integers(-5, 5, n).astype(float),
+            "d_loc": rng.integers(-20, 20, n).astype(float),
+        }
+    )
+    df.loc[df.sample(frac=0.1, random_state=seed).index, "la"] = np.nan
+    df.loc[df.sample(frac=0.1, random_state=seed + 1).index, "d_wmc"] = np.nan
+    return df
+
+
+RULES = [
+    (RemoveEmptyClass(), {}),
+    (RemoveNoAddedLines(), {}),
+    (RemoveCommentOnlyChange(), {}),
+    (RemoveTypeExceptionFiles(), {}),
+    (RemoveDeadCode(), {}),
+    (RemoveMarginalChange(), {"threshold": 15}),
+    (RemoveMinimalChange(), {"threshold": 5}),
+    (FilterLargeCommits(), {"max_files_changed": 10}),
+]
+
+
+def test_compiled_rules_match_sequential_application():
+    df = make_batch()
+    expected = df
+    for rule, params in RULES:
+        expected = rule.apply(expected, params, {})
+
+    compiled = compile_rules(RULES, {})
+    result, hits = compiled.apply(df)
+
+    pd.testing.assert_frame_equal(result, expected)
+    assert set(hits) == {rule.rule_name for rule, _ in RULES}
+
+
+def test_hit_counts_are_per_rule_on_the_full_batch():
+    df = make_batch(seed=3)
+    compiled = compile_rules(RULES, {})
+    _, hits = compiled.apply(df)
+    for rule, params in RULES:
+        mask = rule.build_keep_mask(df, params, {}, SharedColumns(df))
+        assert hits[rule.rule_name] == int((~mask).sum())
+
+
+def test_rule_with_missing_columns_is_skipped():
+    df = pd.DataFrame({"la": [0.0, 1.0]})
+    compiled = compile_rules([(RemoveDeadCode(), {}), (RemoveNoAddedLines(), {})], {})
+    result, hits = compiled.apply(df)
+    assert hits == {"remove_no_added_lines": 1}
+    assert result["la"].tolist() == [1.0]
+
+
+def test_abs_delta_sum_treats_nan_as_zero():
+    df = pd.DataFrame({"d_a": [1.0, np.nan, -2.0], "d_b": [-1.0, np.nan, np.nan]})
+    assert SharedColumns(df).abs_delta_sum.tolist() == pytest.approx([2.0, 0.0, 2.0])
+
+
+class PassThroughRule(CleaningRuleBase):
+    rule_name = "pass_through"
+
+    def apply(self, df, params, config):
+        return self._apply_keep_mask(df, params, config)
+
+
+def test_rule_without_keep_mask_is_skipped():
+    df = make_batch(n=20)
+    rule = PassThroughRule()
+
+    assert rule.supports_keep_mask is False
+    assert rule.build_keep_mask(df, {}, {}, SharedColumns(df)) is None
+    pd.testing.assert_frame_equal(rule.apply(df, {}, {}), df)
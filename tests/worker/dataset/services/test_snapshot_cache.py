@@ -0,0 +1,85 @@
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("s3fs")
+fsspec = pytest.importorskip("fsspec")
+
+from worker.dataset.services.snapshot_cache import (  # noqa: E402
+    BaseTableSnapshotCache,
+)
+
+
+@pytest.fixture
+def cache():
+    snapshot_cache = BaseTableSnapshotCache({}, "bucket")
+    memory_fs = fsspec.filesystem("memory")
+    memory_fs.store.clear()
+    snapshot_cache._fs = memory_fs
+    return snapshot_cache
+
+
+def pattern(regex, is_exclusion=False):
+    return SimpleNamespace(pattern=regex, is_exclusion=is_exclusion)
+
+
+def test_key_changes_with_watermark_and_bot_patterns(cache):
+    watermark = {"repository_id": 1, "guru_rows": 10, "guru_max_id": 99}
+    key = cache.build_key(watermark, [pattern("bot")])
+    assert key == cache.build_key(dict(watermark), [pattern("bot")])
+    assert key != cache.build_key({**watermark, "guru_max_id": 100}, [pattern("bot")])
+    assert key != cache.build_key(watermark, [pattern("bot", True)])
+
+
+def store(cache, repository_id, key, batches):
+    writer = cache.open_writer(repository_id, key)
+    for batch in batches:
+        writer.write(batch)
+    return writer.commit()
+
+
+def test_store_then_stream_round_trip_and_prunes_stale(cache):
+    batches = [
+        pd.DataFrame({"commit_hash": ["a", "b"], "d_wmc": [1.0, None]}),
+        pd.DataFrame({"commit_hash": ["c"], "d_wmc": [2.0]}),
+    ]
+    old_uri = store(cache, 1, "old", batches[:1])
+    assert cache.find(1, "new") is None
+
+    uri = store(cache, 1, "new", batches)
+    assert cache.find(1, "new") == uri
+    assert cache.find(1, "old") is None and old_uri != uri
+    assert cache.count_rows(uri) == 3
+
+    streamed = pd.concat(cache.stream_batches(uri, batch_size=2), ignore_index=True)
+    expected = pd.concat(batches, ignore_index=True)
+    pd.testing.assert_frame_equal(streamed, expected)
+
+
+def test_later_batches_take_first_batch_types(cache):
+    uri = store(
+        cache,
+        1,
+        "key",
+        [
+            pd.DataFrame({"la": [1, 2], "d_wmc": [0.5, 1.0]}),
+            pd.DataFrame({"la": [3.0, None], "d_wmc": [2, 3]}),
+        ],
+    )
+
+    streamed = pd.concat(cache.stream_batches(uri, batch_size=10), ignore_index=True)
+    assert streamed["la"].tolist()[:3] == [1, 2, 3]
+    assert streamed["la"].isna().tolist() == [False, False, False, True]
+    assert streamed["d_wmc"].tolist() == [0.5, 1.0, 2.0, 3.0]
+
+
+def test_aborted_or_empty_writer_stores_nothing(cache):
+    writer = cache.open_writer(1, "aborted")
+    writer.write(pd.DataFrame({"commit_hash": ["a"]}))
+    writer.abort()
+    assert writer.commit() is None
+    assert cache.find(1, "aborted") is None
+
+    assert cache.open_writer(1, "empty").commit() is None
+    assert cache.find(1, "empty") is None
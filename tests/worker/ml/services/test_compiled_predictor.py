@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import (
+    ExtraTreesClassifier,
+    GradientBoostingClassifier,
+    RandomForestClassifier,
+)
+from sklearn.linear_model import LogisticRegression
+from sklearn.tree import DecisionTreeClassifier
+
+from worker.ml.services.compiled_predictor import (
+    compile_tree_ensemble,
+    compiled_artifact_uri,
+)
+
+
+def make_data(rows=600, seed=0):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.normal(size=(rows, 8)), columns=[f"f{i}" for i in range(8)])
+    X["f7"] = rng.integers(0, 5, rows)  # Ties on thresholds for an integer column
+    y = (X["f0"] + X["f1"] * X["f2"] + rng.normal(scale=0.5, size=rows) > 0).astype(int)
+    return X, y
+
+
+@pytest.mark.parametrize(
+    "model",
+    [
+        DecisionTreeClassifier(max_depth=6, random_state=0),
+        RandomForestClassifier(n_estimators=30, random_state=0),
+        ExtraTreesClassifier(n_estimators=20, max_depth=8, random_state=0),
+        GradientBoostingClassifier(n_estimators=40, max_depth=3, random_state=0),
+    ],
+    ids=lambda m: type(m).__name__,
+)
+def test_compiled_matches_native_predict_proba(model):
+    X, y = make_data()
+    model.fit(X, y)
+    compiled = compile_tree_ensemble(model, X)
+    assert compiled is not None
+
+    X_new, _ = make_data(rows=300, seed=1)
+    # Columns in a different order must still be mapped by name
+    shuffled = X_new[X_new.columns[::-1]]
+    np.testing.assert_allclose(
+        compiled.predict_proba(shuffled), model.predict_proba(X_new), atol=1e-9
+    )
+    np.testing.assert_array_equal(compiled.predict(X_new), model.predict(X_new))
+    result = compiled.predict_result(X_new.head(2))
+    assert set(result) == {"predictions", "probabilities"}
+    assert len(result["probabilities"][0]) == 2
+
+
+def test_compiled_xgboost_matches_on_split_values():
+    xgb = pytest.importorskip("xgboost")
+    X, y = make_data()
+    # hist splits lie on training values, so training rows hit the thresholds
+    model = xgb.XGBClassifier(n_estimators=30, max_depth=4, random_state=0).fit(X, y)
+    compiled = compile_tree_ensemble(model, X)
+    assert compiled is not None
+    np.testing.assert_allclose(
+        compiled.predict_proba(X.astype(np.float32)), model.predict_proba(X), atol=1e-6
+    )
+
+
+def test_unsupported_models_are_not_compiled():
+    X, y = make_data()
+    assert compile_tree_ensemble(LogisticRegression().fit(X, y), X) is None
+
+
+def test_compiled_artifact_uri():
+    assert (
+        compiled_artifact_uri("s3://b/models/m/v1/model.joblib")
+        == "s3://b/models/m/v1/model.compiled.joblib"
+    )
@@ -0,0 +1,120 @@
+import lightgbm as lgb
+import numpy as np
+import pandas as pd
+import pytest
+import xgboost as xgb
+from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+from sklearn.tree import DecisionTreeClassifier
+
+from worker.ml.services.strategies.lightgbm_decision_path_strategy import (
+    LightGBMDecisionPathStrategy,
+)
+from worker.ml.services.strategies.sklearn_decision_path_strategy import (
+    SklearnDecisionPathStrategy,
+)
+from worker.ml.services.strategies.xgboost_decision_path_strategy import (
+    XGBoostDecisionPathStrategy,
+)
+
+
+def make_data(rows=400, seed=0):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.normal(size=(rows, 5)), columns=[f"f{i}" for i in range(5)])
+    y = (X["f0"] + X["f1"] * X["f2"] + rng.normal(scale=0.5, size=rows) > 0).astype(int)
+    return X, y
+
+
+def make_inference(X, rows=60, with_missing=False):
+    X_inference = pd.concat([X.iloc[:rows], X.iloc[:10]], ignore_index=True)
+    if with_missing:
+        X_inference.iloc[::4, 0] = np.nan
+    identifiers = pd.DataFrame(
+        {"file": [f"F{i}.java" for i in range(len(X_inference))], "class_name": "C"}
+    )
+    return X_inference, identifiers
+
+
+def assert_connected(path):
+    assert path.nodes[-1].condition == "Leaf"
+    assert [(e.source, e.target) for e in path.edges] == [
+        (a.id, b.id) for a, b in zip(path.nodes, path.nodes[1:])
+    ]
+
+
+@pytest.mark.parametrize(
+    "model",
+    [
+        DecisionTreeClassifier(max_depth=5, random_state=0),
+        RandomForestClassifier(n_estimators=10, max_depth=5, random_state=0),
+        GradientBoostingClassifier(n_estimators=5, random_state=0),
+    ],
+)
+def test_sklearn_paths_match_per_instance_decision_path(model):
+    X, y = make_data()
+    model.fit(X, y)
+    X_inference, identifiers = make_inference(X)
+
+    result = SklearnDecisionPathStrategy(model).explain(X_inference, identifiers)
+
+    trees = (
+        [model]
+        if isinstance(model, DecisionTreeClassifier)
+        else list(np.ravel(model.estimators_))[
+            : 1 if isinstance(model, GradientBoostingClassifier) else 3
+        ]
+    )
+    paths = result.instance_decision_paths
+    assert len(paths) == len(X_inference) * len(trees)
+    for i in range(len(X_inference)):
+        for t, tree in enumerate(trees):
+            path = paths[i * len(trees) + t]
+            row = X_inference.iloc[[i]]
+            if not hasattr(tree, "feature_names_in_"):
+                row = row.to_numpy()
+            expected = tree.decision_path(row).indices
+            assert [int(node.id) for node in path.nodes] == expected.tolist()
+            assert path.file == f"F{i}.java"
+            assert_connected(path)
+            for edge, child in zip(path.edges, expected[1:]):
+                parent = int(edge.source)
+                is_left = child == tree.tree_.children_left[parent]
+                assert edge.label == ("True" if is_left else "False")
+
+    # Repeated instances share the path objects built once per tree
+    assert paths[0].nodes[0] is paths[len(trees) * 60].nodes[0]
+
+
+def test_xgboost_paths_end_in_predicted_leaves():
+    X, y = make_data()
+    model = xgb.XGBClassifier(n_estimators=3, max_depth=4).fit(X, y)
+    X_inference, identifiers = make_inference(X, with_missing=True)
+
+    result = XGBoostDecisionPathStrategy(model).explain(X_inference, identifiers)
+
+    leaves = model.get_booster().predict(xgb.DMatrix(X_inference), pred_leaf=True)
+    paths = result.instance_decision_paths
+    assert len(paths) == len(X_inference)
+    for i, path in enumerate(paths):
+        assert path.nodes[-1].id == f"T0_N{int(leaves[i, 0])}"
+        assert_connected(path)
+        missing_labels = [e.label for e in path.edges if e.label == "Missing"]
+        if np.isnan(X_inference.iloc[i, 0]):
+            assert missing_labels or "f0" not in path.nodes[0].condition
+        else:
+            assert not missing_labels
+
+
+def test_lightgbm_paths_end_in_predicted_leaves():
+    X, y = make_data()
+    model = lgb.LGBMClassifier(n_estimators=3, verbose=-1).fit(X, y)
+    X_inference, identifiers = make_inference(X, with_missing=True)
+
+    result = LightGBMDecisionPathStrategy(model).explain(X_inference, identifiers)
+
+    leaves = model.booster_.predict(X_inference, pred_leaf=True)
+    paths = result.instance_decision_paths
+    assert len(paths) == len(X_inference)
+    for i, path in enumerate(paths):
+        assert path.nodes[-1].id == f"T0_L{int(leaves[i, 0])}"
+        assert_connected(path)
+        assert {e.label for e in path.edges} <= {"True", "False"}
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+
+from worker.ml.services.explainer_cache import (
+    ExplainerCache,
+    background_artifact_uri,
+    frame_fingerprint,
+)
+
+
+def make_data(rows=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.normal(size=(rows, 4)), columns=["a", "b", "c", "d"])
+    y = pd.Series((rng.random(rows) < 0.1).astype(int))  # ~10% positives
+    return X, y
+
+
+def test_background_artifact_uri():
+    assert (
+        background_artifact_uri("s3://b/models/m/v1/model.joblib")
+        == "s3://b/models/m/v1/model.background.joblib"
+    )
+
+
+def test_frame_fingerprint_ignores_index_and_tracks_values():
+    X, _ = make_data(rows=50)
+    shifted = X.set_index(X.index + 1000)
+    changed = X.copy()
+    changed.iloc[0, 0] += 1
+
+    assert frame_fingerprint(X) == frame_fingerprint(shifted)
+    assert frame_fingerprint(X) != frame_fingerprint(changed)
+
+
+def test_explainer_cache_reuses_and_evicts():
+    cache = ExplainerCache(max_explainers=2, max_results=2)
+    background, _ = make_data(rows=20)
+    builds = []
+
+    def build(name):
+        return lambda: builds.append(name) or name
+
+    assert cache.get_explainer("m@1", "tree", background, build("m1")) == "m1"
+    assert cache.get_explainer("m@1", "tree", background, build("again")) == "m1"
+    cache.get_explainer("m@2", "tree", background, build("m2"))
+    cache.get_explainer("m@3", "tree", background, build("m3"))  # evicts m@1
+    cache.get_explainer("m@1", "tree", background, build("m1-rebuilt"))
+
+    assert builds == ["m1", "m2", "m3", "m1-rebuilt"]
+    assert cache.stats()["explainers"] == 2
+
+
+def test_shap_values_are_keyed_by_input_rows():
+    cache = ExplainerCache(max_explainers=2, max_results=4)
+    X, _ = make_data(rows=20)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return len(calls)
+
+    first = cache.get_shap_values("m@1", X, None, compute)
+    same_rows = cache.get_shap_values("m@1", X.copy(), None, compute)
+    other_rows = cache.get_shap_values("m@1", X.iloc[:5], None, compute)
+    other_model = cache.get_shap_values("m@2", X, None, compute)
+
+    assert (first, same_rows, other_rows, other_model) == (1, 1, 2, 3)
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from worker.ml.services.feature_matrix import (
+    build_feature_matrix,
+    build_training_data,
+    compact_labels,
+)
+
+
+@pytest.fixture
+def dataset():
+    return pd.DataFrame(
+        {
+            "file": ["A.java", "B.java", "C.java", "D.java"],
+            "cbo": [1.5, np.nan, 3.0, 4.25],
+            "loc": pd.array([10, 20, None, 40], dtype="Int64"),
+            "fix": [True, False, True, False],
+            "is_buggy": [1.0, 0.0, np.nan, 1.0],
+        },
+        index=[10, 11, 12, 13],
+    )
+
+
+def test_feature_block_is_one_contiguous_float32_array(dataset):
+    X = build_feature_matrix(dataset, ["cbo", "loc", "fix"])
+
+    values = X.to_numpy()
+    assert values.dtype == np.float32 and values.flags.c_contiguous
+    assert np.shares_memory(values, X.to_numpy())
+    np.testing.assert_array_equal(
+        values,
+        [[1.5, 10, 1], [0, 20, 0], [3, 0, 1], [4.25, 40, 0]],
+    )
+    assert list(X.index) == [10, 11, 12, 13]
+    # The source frame is left untouched
+    assert np.isnan(dataset.loc[11, "cbo"])
+
+
+def test_training_data_drops_unlabelled_rows_and_compacts_labels(dataset):
+    X, y = build_training_data(dataset, ["cbo", "loc"], "is_buggy")
+
+    assert list(X.index) == list(y.index) == [10, 11, 13]
+    np.testing.assert_array_equal(X.to_numpy(), [[1.5, 10], [0, 20], [4.25, 40]])
+    assert y.dtype == np.int8 and y.tolist() == [1, 0, 1]
+
+
+def test_identifier_columns_are_rejected(dataset):
+    with pytest.raises(ValueError, match="non-numeric: file"):
+        build_feature_matrix(dataset, ["cbo", "file"])
+
+
+def test_compact_labels():
+    assert compact_labels(pd.Series([True, False])).dtype == np.int8
+    assert compact_labels(pd.Series([0, 1, 2], dtype=np.int64)).dtype == np.int8
+    assert compact_labels(pd.Series(["0", "1"])).tolist() == [0, 1]
+    with pytest.raises(ValueError):
+        compact_labels(pd.Series(["yes", "no"]))
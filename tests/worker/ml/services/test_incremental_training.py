@@ -0,0 +1,144 @@
+import lightgbm as lgb
+import numpy as np
+import pandas as pd
+import pytest
+import xgboost as xgb
+from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+
+from shared.schemas.enums import ModelTypeEnum
+from worker.ml.services.model_cache import ModelCache
+from worker.ml.services.strategies.lightgbm_strategy import LightGBMStrategy
+from worker.ml.services.strategies.sklearn_strategy import SklearnStrategy
+from worker.ml.services.strategies.xgboost_strategy import XGBoostStrategy
+
+JOB_CONFIG = {"random_seed": 0, "eval_test_split_size": 0.2}
+
+
+def make_data(rows=600, seed=0):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(
+        rng.normal(size=(rows, 4)).astype(np.float32),
+        columns=["cbo", "wmc", "la", "ld"],
+    )
+    y = pd.Series((X["cbo"] + 0.5 * X["wmc"] > 0).astype(int), name="is_buggy")
+    return X, y
+
+
+def fit_parent(model_type, X, y):
+    if model_type == ModelTypeEnum.SKLEARN_RANDOMFOREST:
+        return RandomForestClassifier(n_estimators=10, random_state=0).fit(X, y)
+    if model_type == ModelTypeEnum.SKLEARN_GRADIENTBOOSTINGCLASSIFIER:
+        return GradientBoostingClassifier(n_estimators=10, random_state=0).fit(X, y)
+    if model_type == ModelTypeEnum.XGBOOST_CLASSIFIER:
+        return xgb.XGBClassifier(n_estimators=10, max_depth=3, random_state=0).fit(X, y)
+    return lgb.LGBMClassifier(n_estimators=10, random_state=0, verbose=-1).fit(X, y)
+
+
+def make_strategy(model_type):
+    if model_type == ModelTypeEnum.XGBOOST_CLASSIFIER:
+        strategy_class = XGBoostStrategy
+    elif model_type == ModelTypeEnum.LIGHTGBM_CLASSIFIER:
+        strategy_class = LightGBMStrategy
+    else:
+        strategy_class = SklearnStrategy
+    return strategy_class(model_type, {}, dict(JOB_CONFIG), artifact_service=None)
+
+
+def tree_count(model):
+    if isinstance(model, xgb.XGBClassifier):
+        return model.get_booster().num_boosted_rounds()
+    if isinstance(model, lgb.LGBMClassifier):
+        return model.booster_.num_trees()
+    return len(model.estimators_)
+
+
+@pytest.mark.parametrize(
+    "model_type",
+    [
+        ModelTypeEnum.SKLEARN_RANDOMFOREST,
+        ModelTypeEnum.SKLEARN_GRADIENTBOOSTINGCLASSIFIER,
+        ModelTypeEnum.XGBOOST_CLASSIFIER,
+        ModelTypeEnum.LIGHTGBM_CLASSIFIER,
+    ],
+)
+def test_incremental_training_extends_a_cached_parent_without_modifying_it(
+    model_type,
+):
+    X, y = make_data()
+    X_delta, y_delta = make_data(rows=300, seed=1)
+    cache = ModelCache(max_bytes=10_000_000)
+    parent = cache.get_or_load(
+        "s3://b/parent.joblib", "e1", lambda: fit_parent(model_type, X, y), 1000
+    )
+    parent_trees = tree_count(parent)
+    parent_params = parent.get_params()
+    parent_proba = parent.predict_proba(X_delta)
+
+    result = make_strategy(model_type).train_incremental(
+        parent, X_delta, y_delta, n_estimators=5
+    )
+
+    assert result.model is not parent
+    assert tree_count(result.model) == parent_trees + 5
+    assert result.metrics["incremental_training_rows"] == 240
+    assert "accuracy" in result.metrics
+    # The parent is shared through the model cache and must be left as it was
+    cached = cache.get_or_load("s3://b/parent.joblib", "e1", lambda: None, 1000)
+    assert cached is parent
+    assert tree_count(parent) == parent_trees
+    assert parent.get_params() == parent_params
+    np.testing.assert_array_equal(parent.predict_proba(X_delta), parent_proba)
+
+
+def test_warm_start_keeps_the_parent_trees():
+    X, y = make_data()
+    X_delta, y_delta = make_data(rows=300, seed=1)
+    parent = fit_parent(ModelTypeEnum.SKLEARN_RANDOMFOREST, X, y)
+
+    model = (
+        make_strategy(ModelTypeEnum.SKLEARN_RANDOMFOREST)
+        .train_incremental(parent, X_delta, y_delta, n_estimators=5)
+        .model
+    )
+
+    assert model.warm_start is False
+    for parent_tree, tree in zip(parent.estimators_, model.estimators_[:10]):
+        np.testing.assert_array_equal(parent_tree.tree_.threshold, tree.tree_.threshold)
+
+
+def test_boosting_continues_from_the_parent_booster():
+    X, y = make_data()
+    X_delta, y_delta = make_data(rows=300, seed=1)
+    parent = fit_parent(ModelTypeEnum.XGBOOST_CLASSIFIER, X, y)
+
+    model = (
+        make_strategy(ModelTypeEnum.XGBOOST_CLASSIFIER)
+        .train_incremental(parent, X_delta, y_delta, n_estimators=5)
+        .model
+    )
+
+    # The first rounds of the continued model are the parent's
+    first_rounds = model.get_booster()[: parent.get_booster().num_boosted_rounds()]
+    np.testing.assert_allclose(
+        first_rounds.predict(xgb.DMatrix(X_delta)), parent.predict_proba(X_delta)[:, 1]
+    )
+
+
+def test_missing_parent_class_is_rejected():
+    X, y = make_data()
+    X_delta, _ = make_data(rows=300, seed=1)
+    parent = fit_parent(ModelTypeEnum.LIGHTGBM_CLASSIFIER, X, y)
+
+    with pytest.raises(ValueError, match="no samples of class"):
+        make_strategy(ModelTypeEnum.LIGHTGBM_CLASSIFIER).train_incremental(
+            parent, X_delta, pd.Series(np.zeros(len(X_delta), dtype=int)), 5
+        )
+
+
+def test_unsupported_model_types_are_rejected():
+    X, y = make_data()
+    strategy = make_strategy(ModelTypeEnum.SKLEARN_DECISIONTREECLASSIFIER)
+    parent = strategy._get_model_instance().fit(X, y)
+
+    with pytest.raises(ValueError, match="not supported"):
+        strategy.train_incremental(parent, X, y, n_estimators=5)
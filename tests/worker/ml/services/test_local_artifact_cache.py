@@ -0,0 +1,66 @@
+import os
+
+from worker.ml.services.local_artifact_cache import LocalArtifactCache
+
+
+def make_fetch(payload, calls):
+    def fetch(destination):
+        calls.append(destination)
+        with open(destination, "wb") as f:
+            f.write(payload)
+
+    return fetch
+
+
+def test_hit_after_miss_and_new_entry_on_etag_change(tmp_path):
+    cache = LocalArtifactCache(tmp_path, max_bytes=10_000)
+    calls = []
+    first = cache.get_path("s3://b/data.parquet", "e1", make_fetch(b"v1", calls))
+    again = cache.get_path("s3://b/data.parquet", "e1", make_fetch(b"v1", calls))
+    assert first == again and first.read_bytes() == b"v1"
+    assert first.suffix == ".parquet"
+    assert len(calls) == 1
+
+    updated = cache.get_path("s3://b/data.parquet", "e2", make_fetch(b"v2", calls))
+    assert updated != first and updated.read_bytes() == b"v2"
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 2, 2)
+
+
+def test_lru_eviction_by_size(tmp_path):
+    cache = LocalArtifactCache(tmp_path, max_bytes=350)
+    paths = []
+    for i, name in enumerate("abc"):
+        path = cache.get_path(f"s3://b/{name}", "e", make_fetch(b"x" * 100, []))
+        os.utime(path, (i, i))
+        paths.append(path)
+    # "a" was used most recently, so "b" is the eviction victim
+    os.utime(paths[0], (10, 10))
+    cache.get_path("s3://b/d", "e", make_fetch(b"x" * 100, []))
+    assert paths[0].exists() and not paths[1].exists()
+    assert cache.stats()["bytes"] <= 350
+
+
+def test_failed_fetch_leaves_no_partial_file(tmp_path):
+    cache = LocalArtifactCache(tmp_path, max_bytes=10_000)
+
+    def broken_fetch(destination):
+        with open(destination, "wb") as f:
+            f.write(b"partial")
+        raise OSError("connection reset")
+
+    try:
+        cache.get_path("s3://b/m.joblib", "e1", broken_fetch)
+    except OSError:
+        pass
+    assert not [p for p in tmp_path.rglob("*") if p.is_file()]
+
+
+def test_variants_of_one_object_version_are_separate_entries(tmp_path):
+    cache = LocalArtifactCache(tmp_path, max_bytes=10_000)
+    full = cache.get_path("s3://b/d.parquet", "e1", make_fetch(b"all", []))
+    projected = cache.get_path(
+        "s3://b/d.parquet", "e1", make_fetch(b"some", []), variant="f1,is_buggy"
+    )
+    assert full != projected
+    assert (full.read_bytes(), projected.read_bytes()) == (b"all", b"some")
@@ -0,0 +1,58 @@
+import numpy as np
+
+from worker.ml.services.model_cache import ModelCache
+
+
+def make_loader(obj, calls):
+    def loader():
+        calls.append(obj)
+        return obj
+
+    return loader
+
+
+def test_hit_after_miss_and_reload_on_etag_change():
+    cache = ModelCache(max_bytes=10_000_000)
+    calls = []
+    model = {"weights": np.ones(100)}
+    assert (
+        cache.get_or_load("s3://b/m.pkl", "e1", make_loader(model, calls), 800) is model
+    )
+    assert (
+        cache.get_or_load("s3://b/m.pkl", "e1", make_loader(model, calls), 800) is model
+    )
+    assert len(calls) == 1
+
+    updated = {"weights": np.zeros(100)}
+    assert (
+        cache.get_or_load("s3://b/m.pkl", "e2", make_loader(updated, calls), 800)
+        is updated
+    )
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 2, 1)
+
+
+def test_lru_eviction_by_size():
+    size = 8000
+    cache = ModelCache(max_bytes=int(size * 2.5))
+    calls = []
+    for name in ("a", "b"):
+        cache.get_or_load(name, "e", make_loader(np.ones(1000), calls), size)
+    cache.get_or_load("a", "e", make_loader(None, calls), size)  # touch "a"
+    cache.get_or_load("c", "e", make_loader(np.ones(1000), calls), size)
+
+    stats = cache.stats()
+    assert stats["evictions"] == 1 and stats["entries"] == 2
+    assert stats["bytes"] <= cache.max_bytes
+    cache.get_or_load("a", "e", make_loader(None, calls), size)
+    assert cache.stats()["hits"] == 2  # "a" survived, "b" was evicted
+
+
+def test_oversized_and_failed_loads_are_not_cached():
+    cache = ModelCache(max_bytes=10)
+    calls = []
+    assert (
+        cache.get_or_load("big", "e", make_loader(np.ones(100), calls), 800) is not None
+    )
+    assert cache.get_or_load("missing", "e", make_loader(None, calls), 800) is None
+    assert cache.stats()["entries"] == 0
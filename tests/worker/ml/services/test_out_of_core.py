@@ -0,0 +1,105 @@
+import weakref
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from worker.ml.services.out_of_core import ParquetTrainingData
+
+FEATURES = ["cbo", "wmc", "lines_added"]
+
+
+@pytest.fixture
+def parquet_file(tmp_path):
+    n = 1000
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "cbo": rng.normal(size=n),
+            "wmc": np.where(np.arange(n) % 10 == 0, np.nan, np.arange(n, dtype=float)),
+            "lines_added": rng.integers(0, 50, size=n),
+            "file": [f"F{i}.java" for i in range(n)],
+            "is_buggy": pd.array(np.arange(n) % 3 == 0, dtype="boolean"),
+        }
+    )
+    df.loc[::100, "is_buggy"] = None
+    path = tmp_path / "dataset.parquet"
+    pq.write_table(
+        pa.Table.from_pandas(df, preserve_index=False), path, row_group_size=128
+    )
+    return pq.ParquetFile(path)
+
+
+def test_rows_are_split_once_between_training_and_evaluation(parquet_file):
+    data = ParquetTrainingData(
+        parquet_file, FEATURES, "is_buggy", test_size=0.2, random_seed=7
+    )
+    X_eval, y_eval = data.eval_set()
+
+    batches = list(data.iter_train_groups())
+    assert len(batches) == parquet_file.num_row_groups
+    X_train = np.vstack([X for X, _ in batches])
+    y_train = np.concatenate([y for _, y in batches])
+    # Unlabelled rows are dropped; every other row lands in exactly one split
+    assert len(y_train) + len(y_eval) == 990 == data.train_rows + len(y_eval)
+    assert 100 < len(y_eval) < 300
+    assert X_train.dtype == np.float32 and not np.isnan(X_train).any()
+    assert list(X_eval.columns) == FEATURES
+    assert data.classes.tolist() == [0, 1]
+    assert np.array_equal(data.train_labels(), y_train)
+
+    again = ParquetTrainingData(
+        parquet_file, FEATURES, "is_buggy", test_size=0.2, random_seed=7
+    )
+    pd.testing.assert_frame_equal(again.eval_set()[0], X_eval)
+
+
+def test_held_out_rows_are_capped(parquet_file):
+    data = ParquetTrainingData(
+        parquet_file, FEATURES, "is_buggy", test_size=0.5, eval_max_rows=50
+    )
+    assert len(data.eval_set()[1]) == 50
+    assert data.train_rows == 940
+
+    X_sample, y_sample = data.class_sample(rows_per_class=5)
+    assert y_sample.value_counts().to_dict() == {0: 5, 1: 5}
+    assert list(X_sample.columns) == FEATURES
+
+
+def test_rejects_missing_columns_and_text_targets(parquet_file):
+    with pytest.raises(ValueError, match="missing required columns: churn"):
+        ParquetTrainingData(parquet_file, FEATURES + ["churn"], "is_buggy")
+    with pytest.raises(TypeError):
+        ParquetTrainingData(parquet_file, FEATURES, "file")
+
+
+def test_lightgbm_dataset_holds_one_decoded_row_group(parquet_file, monkeypatch):
+    import lightgbm as lgb
+
+    from worker.ml.services.strategies.lightgbm_row_groups import row_group_sequences
+
+    data = ParquetTrainingData(parquet_file, FEATURES, "is_buggy", random_seed=7)
+    decoded_groups = []
+    most_held = 0
+    read_train_group = data.read_train_group
+
+    def tracking_read(group, dtype=np.float32):
+        nonlocal most_held
+        X, y = read_train_group(group, dtype=dtype)
+        decoded_groups.append(weakref.ref(X))
+        most_held = max(most_held, sum(ref() is not None for ref in decoded_groups))
+        return X, y
+
+    monkeypatch.setattr(data, "read_train_group", tracking_read)
+    sequences, decoded = row_group_sequences(data)
+    dataset = lgb.Dataset(
+        sequences, label=data.train_labels(), params={"verbose": -1}
+    ).construct()
+
+    assert len(sequences) == 8
+    assert dataset.num_data() == len(data.train_labels())
+    # Sampling and pushing each walk the groups once, one group at a time
+    assert len(decoded_groups) == 2 * len(sequences)
+    assert most_held == 1
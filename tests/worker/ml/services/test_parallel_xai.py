@@ -0,0 +1,29 @@
+from shared.core.config import settings
+from worker.ml.services.strategies import parallel_xai
+from worker.ml.services.strategies.parallel_xai import (
+    map_instance_chunks,
+    xai_worker_count,
+)
+
+
+def explain_positions(positions, offset):
+    return [position + offset for position in positions]
+
+
+def test_worker_count_is_capped_to_the_task_share_of_cores(monkeypatch):
+    monkeypatch.setattr(parallel_xai, "cpu_count", lambda: 8)
+    monkeypatch.setattr(settings, "CELERY_ML_XAI_CONCURRENCY", 2)
+    assert xai_worker_count(8) == 4
+    assert xai_worker_count(3) == 3
+    assert xai_worker_count(1) == 1
+
+    monkeypatch.setattr(settings, "CELERY_ML_XAI_CONCURRENCY", 16)
+    assert xai_worker_count(8) == 1
+    assert xai_worker_count(-1) == 1
+
+
+def test_results_keep_input_order():
+    assert map_instance_chunks(explain_positions, 20, 100, n_jobs=2) == list(
+        range(100, 120)
+    )
+    assert map_instance_chunks(explain_positions, 3, 0, n_jobs=2) == [0, 1, 2]
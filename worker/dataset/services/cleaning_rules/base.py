@@ -1,13 +1,78 @@
 # worker/dataset/services/cleaning_rules/base.py
 import logging
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Type
+from typing import Any, Dict, List, Optional, Type
 
+import numpy as np
 import pandas as pd
 
 from shared.schemas.rule_definition import RuleDefinition, RuleParamDefinition
 
 
+class SharedColumns:
+    """
+    Lazily computed, cached column views shared by every rule evaluated against
+    the same DataFrame (e.g. NaN-filled metrics, the absolute delta sum).
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self._filled: Dict[str, np.ndarray] = {}
+        self._flags: Dict[str, np.ndarray] = {}
+        self._delta_columns: Optional[List[str]] = None
+        self._abs_delta_sum: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+    def has(self, *columns: str) -> bool:
+        return all(col in self.df.columns for col in columns)
+
+    def filled(self, column: str) -> np.ndarray:
+        """Column values with NaN treated as 0."""
+        if column not in self._filled:
+            self._filled[column] = self.df[column].fillna(0).to_numpy()
+        return self._filled[column]
+
+    def flag(self, column: str) -> np.ndarray:
+        """Boolean view of a flag column (e.g. 'is_buggy'), NaN treated as False."""
+        if column not in self._flags:
+            self._flags[column] = (
+                self.df[column].fillna(False).astype(bool).to_numpy(dtype=bool)
+            )
+        return self._flags[column]
+
+    @property
+    def delta_columns(self) -> List[str]:
+        if self._delta_columns is None:
+            self._delta_columns = [c for c in self.df.columns if c.startswith("d_")]
+        return self._delta_columns
+
+    @property
+    def abs_delta_sum(self) -> np.ndarray:
+        """Row-wise sum of absolute d_* values, computed once per DataFrame."""
+        if self._abs_delta_sum is None:
+            if not self.delta_columns:
+                self._abs_delta_sum = np.zeros(len(self.df), dtype=np.float64)
+            else:
+                try:
+                    values = self.df[self.delta_columns].to_numpy(
+                        dtype=np.float64, na_value=np.nan
+                    )
+                    self._abs_delta_sum = np.nansum(np.abs(values), axis=1)
+                except (TypeError, ValueError):
+                    # Mixed/object columns: fall back to pandas coercion
+                    self._abs_delta_sum = (
+                        self.df[self.delta_columns]
+                        .apply(pd.to_numeric, errors="coerce")
+                        .fillna(0)
+                        .abs()
+                        .sum(axis=1)
+                        .to_numpy(dtype=np.float64)
+                    )
+        return self._abs_delta_sum
+
+
 class CleaningRuleBase(ABC):
     rule_name: str = "base_rule_name"
     description: str = "Base rule description."
@@ -29,6 +94,37 @@ class CleaningRuleBase(ABC):
     ) -> pd.DataFrame:
         pass
 
+    def build_keep_mask(
+        self,
+        df: pd.DataFrame,
+        params: Dict[str, Any],
+        config: Dict[str, Any],
+        columns: SharedColumns,
+    ) -> Optional[np.ndarray]:
+        """
+        Row-wise rules override this to return a boolean mask of rows to keep,
+        which lets the rule compiler fuse them into a single pass.
+        Returning None means the rule is skipped for this DataFrame.
+        """
+        return None
+
+    @property
+    def supports_keep_mask(self) -> bool:
+        return type(self).build_keep_mask is not CleaningRuleBase.build_keep_mask
+
+    def _apply_keep_mask(
+        self, df: pd.DataFrame, params: Dict[str, Any], config: Dict[str, Any]
+    ) -> pd.DataFrame:
+        """Standalone `apply` for mask-based rules (used outside the compiled pass)."""
+        mask = self.build_keep_mask(df, params, config, SharedColumns(df))
+        if mask is None:
+            return df
+        df_clean = df[mask]
+        dropped = df.shape[0] - df_clean.shape[0]
+        if dropped > 0:
+            logger.debug(f"Rule '{self.rule_name}': Dropped {dropped} rows.")
+        return df_clean
+
     def __init__(self):
         pass
 
@@ -0,0 +1,91 @@
+# worker/dataset/services/cleaning_rules/clustering.py
+import logging
+from typing import List, Optional, Tuple
+
+import numpy as np
+from joblib import Parallel, delayed, effective_n_jobs
+from sklearn.cluster import MiniBatchKMeans
+
+from shared.core.config import settings
+
+logger = logging.getLogger(__name__)
+logger.setLevel(settings.LOG_LEVEL.upper())
+
+# (start, stop, n_clusters) of one commit's rows in the commit-sorted feature matrix
+ClusterUnit = Tuple[int, int, int]
+
+# Below this many rows the pool start-up cost outweighs the parallel speed-up
+PARALLEL_MIN_ROWS = 20_000
+
+
+def _cluster_units(
+    X: np.ndarray, units: List[ClusterUnit], random_state: int, batch_size: int
+) -> List[Optional[np.ndarray]]:
+    """Clusters each unit's slice of X. Runs in pool workers, so must stay top-level."""
+    labels: List[Optional[np.ndarray]] = []
+    for start, stop, n_clusters in units:
+        try:
+            model = MiniBatchKMeans(
+                n_clusters=n_clusters,
+                random_state=random_state,
+                batch_size=batch_size,
+                n_init="auto",
+                init="k-means++",
+            )
+            labels.append(model.fit_predict(X[start:stop]).astype(np.int64))
+        except Exception as e:
+            logger.error(
+                f"Clustering failed for rows [{start}:{stop}] (k={n_clusters}): {e}"
+            )
+            labels.append(None)
+    return labels
+
+
+def _partition_units(units: List[ClusterUnit], n_chunks: int) -> List[List[int]]:
+    """Greedy largest-first assignment of unit indices to balanced chunks."""
+    chunks: List[List[int]] = [[] for _ in range(n_chunks)]
+    loads = np.zeros(n_chunks, dtype=np.int64)
+    for idx in sorted(
+        range(len(units)), key=lambda i: units[i][1] - units[i][0], reverse=True
+    ):
+        target = int(np.argmin(loads))
+        chunks[target].append(idx)
+        loads[target] += units[idx][1] - units[idx][0]
+    return [chunk for chunk in chunks if chunk]
+
+
+def cluster_commit_groups(
+    X: np.ndarray,
+    units: List[ClusterUnit],
+    random_state: int = 42,
+    n_jobs: int = -1,
+    batch_size: int = 1024,
+) -> List[Optional[np.ndarray]]:
+    """
+    Runs mini-batch k-means for every commit unit, distributing units over a
+    process pool. X is memory-mapped into the workers by joblib instead of being
+    pickled per task. Every unit is seeded with `random_state`, so labels do not
+    depend on scheduling. Returns labels per unit (None where clustering failed).
+    """
+    if not units:
+        return []
+    X = np.ascontiguousarray(X, dtype=np.float64)
+    total_rows = sum(stop - start for start, stop, _ in units)
+    workers = min(effective_n_jobs(n_jobs), len(units))
+
+    if workers <= 1 or total_rows < PARALLEL_MIN_ROWS:
+        return _cluster_units(X, units, random_state, batch_size)
+
+    chunks = _partition_units(units, workers * 4)
+    logger.debug(
+        f"Clustering {len(units)} commits ({total_rows} rows) in {len(chunks)} chunks over {workers} workers."
+    )
+    chunk_results = Parallel(n_jobs=workers, max_nbytes="1M", mmap_mode="r")(
+        delayed(_cluster_units)(X, [units[i] for i in chunk], random_state, batch_size)
+        for chunk in chunks
+    )
+    labels: List[Optional[np.ndarray]] = [None] * len(units)
+    for chunk, chunk_labels in zip(chunks, chunk_results):
+        for idx, unit_labels in zip(chunk, chunk_labels):
+            labels[idx] = unit_labels
+    return labels
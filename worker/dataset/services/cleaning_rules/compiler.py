@@ -0,0 +1,95 @@
+# worker/dataset/services/cleaning_rules/compiler.py
+import logging
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from shared.core.config import settings
+
+from .base import CleaningRuleBase, SharedColumns
+
+logger = logging.getLogger(__name__)
+logger.setLevel(settings.LOG_LEVEL.upper())
+
+
+class CompiledRuleSet:
+    """
+    Batch-safe rules fused into a single pass: every rule contributes a keep-mask
+    over one SharedColumns cache, masks are AND-ed and rows are dropped once.
+    Rules that do not implement `build_keep_mask` run sequentially afterwards.
+    """
+
+    def __init__(
+        self,
+        fused_rules: List[Tuple[CleaningRuleBase, Dict[str, Any]]],
+        fallback_rules: List[Tuple[CleaningRuleBase, Dict[str, Any]]],
+        dataset_config: Dict[str, Any],
+    ):
+        self.fused_rules = fused_rules
+        self.fallback_rules = fallback_rules
+        self.dataset_config = dataset_config
+
+    @property
+    def rule_names(self) -> List[str]:
+        return [rule.rule_name for rule, _ in self.fused_rules + self.fallback_rules]
+
+    def evaluate(self, df: pd.DataFrame) -> Tuple[np.ndarray, Dict[str, int]]:
+        """
+        Evaluates all fused rule masks in one pass.
+        Returns the combined keep-mask and, per rule, the number of rows it flags
+        for removal (rules may overlap, so hits do not sum to the dropped count).
+        """
+        columns = SharedColumns(df)
+        keep = np.ones(len(df), dtype=bool)
+        hits: Dict[str, int] = {}
+        for rule, params in self.fused_rules:
+            try:
+                mask = rule.build_keep_mask(df, params, self.dataset_config, columns)
+            except Exception as e:
+                logger.error(
+                    f"Error evaluating fused rule '{rule.rule_name}': {e}",
+                    exc_info=True,
+                )
+                continue
+            if mask is None:  # Rule skipped (e.g. missing columns)
+                continue
+            mask = np.asarray(mask, dtype=bool)
+            hits[rule.rule_name] = int(len(mask) - np.count_nonzero(mask))
+            keep &= mask
+        return keep, hits
+
+    def apply(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str, int]]:
+        """Applies all rules, copying the DataFrame at most once for the fused pass."""
+        hits: Dict[str, int] = {}
+        current_df = df
+        if self.fused_rules and not df.empty:
+            keep, hits = self.evaluate(df)
+            if not keep.all():
+                current_df = df[keep]
+
+        for rule, params in self.fallback_rules:
+            if current_df.empty:
+                break
+            try:
+                before = len(current_df)
+                current_df = rule.apply(current_df, params, self.dataset_config)
+                hits[rule.rule_name] = before - len(current_df)
+            except Exception as e:
+                logger.error(
+                    f"Error applying batch rule '{rule.rule_name}': {e}", exc_info=True
+                )
+        return current_df, hits
+
+
+def compile_rules(
+    rules: List[Tuple[CleaningRuleBase, Dict[str, Any]]],
+    dataset_config: Dict[str, Any],
+) -> CompiledRuleSet:
+    """Splits configured rules into fusable (mask-based) and sequential fallbacks."""
+    fused = [(rule, params) for rule, params in rules if rule.supports_keep_mask]
+    fallback = [(rule, params) for rule, params in rules if not rule.supports_keep_mask]
+    logger.debug(
+        f"Compiled {len(fused)} fused rules and {len(fallback)} sequential fallback rules."
+    )
+    return CompiledRuleSet(fused, fallback, dataset_config)
@@ -1,14 +1,19 @@
 # worker/dataset/services/cleaning_rules/implementations.py
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 
 import numpy as np
 import pandas as pd
-from sklearn.cluster import KMeans
 
 from shared.core.config import settings
 
-from .base import CleaningRuleBase, RuleParamDefinition, register_rule
+from .base import (
+    CleaningRuleBase,
+    RuleParamDefinition,
+    SharedColumns,
+    register_rule,
+)
+from .clustering import cluster_commit_groups
 
 logger = logging.getLogger(__name__)
 logger.setLevel(settings.LOG_LEVEL.upper())
@@ -184,7 +189,9 @@ class DropDuplicates(CleaningRuleBase):
 @register_rule
 class RemoveRecentCleanLastChange(CleaningRuleBase):
     rule_name = "remove_recent_clean_last_change"
-    description = "Exclude clean changes if they are the last for a class and occurred recently."
+    description = (
+        "Exclude clean changes if they are the last for a class and occurred recently."
+    )
     parameters = [
         RuleParamDefinition(
             name="gap_seconds",
@@ -252,25 +259,28 @@ class RemoveEmptyClass(CleaningRuleBase):
     parameters = []
     is_batch_safe = True  # This rule only looks at individual rows
 
+    def build_keep_mask(
+        self,
+        df: pd.DataFrame,
+        params: Dict[str, Any],
+        config: Dict[str, Any],
+        columns: SharedColumns,
+    ) -> Optional[np.ndarray]:
+        required_cols = ["totalMethodsQty", "totalFieldsQty"]
+        if not columns.has(*required_cols):
+            logger.warning(
+                f"Rule 3 skipped: Missing required columns: {required_cols}."
+            )
+            return None
+        # Keep rows where methods > 0 OR fields > 0 (handle NaN as not > 0)
+        return (columns.filled("totalMethodsQty") > 0) | (
+            columns.filled("totalFieldsQty") > 0
+        )
+
     def apply(
         self, df: pd.DataFrame, params: Dict[str, Any], config: Dict[str, Any]
     ) -> pd.DataFrame:
-        initial_len = df.shape[0]
-        required_cols = ["totalMethodsQty", "totalFieldsQty"]
-        if all(col in df.columns for col in required_cols):
-            # Keep rows where methods > 0 OR fields > 0 (handle NaN as not > 0)
-            mask = (df["totalMethodsQty"].fillna(0) > 0) | (
-                df["totalFieldsQty"].fillna(0) > 0
-            )
-            df_clean = df[mask]
-            dropped = initial_len - df_clean.shape[0]
-            if dropped > 0:
-                logger.debug(
-                    f"Rule 3: Dropped {dropped} rows corresponding to empty classes."
-                )
-            return df_clean
-        logger.warning(f"Rule 3 skipped: Missing required columns: {required_cols}.")
-        return df
+        return self._apply_keep_mask(df, params, config)
 
 
 @register_rule
@@ -280,28 +290,31 @@ class RemoveTrivialGetSet(CleaningRuleBase):
     parameters = []
     is_batch_safe = True  # Looks at individual rows
 
+    def build_keep_mask(
+        self,
+        df: pd.DataFrame,
+        params: Dict[str, Any],
+        config: Dict[str, Any],
+        columns: SharedColumns,
+    ) -> Optional[np.ndarray]:
+        required_cols = ["totalMethodsQty", "wmc", "rfc"]
+        if not columns.has(*required_cols):
+            logger.warning(
+                f"Rule 4 skipped: Missing required columns: {required_cols}."
+            )
+            return None
+        # Keep rows where it's NOT the case that (methods>0 AND wmc<=1 AND rfc<=1)
+        # NaNs are filled with 0, so NaN <= 1 evaluates to True
+        return ~(
+            (columns.filled("totalMethodsQty") > 0)
+            & (columns.filled("wmc") <= 1)
+            & (columns.filled("rfc") <= 1)
+        )
+
     def apply(
         self, df: pd.DataFrame, params: Dict[str, Any], config: Dict[str, Any]
     ) -> pd.DataFrame:
-        initial_len = df.shape[0]
-        required_cols = ["totalMethodsQty", "wmc", "rfc"]
-        if all(col in df.columns for col in required_cols):
-            # Keep rows where it's NOT the case that (methods>0 AND wmc<=1 AND rfc<=1)
-            # Handle NaNs by filling with 0, so NaN <= 1 evaluates to True
-            mask = ~(
-                (df["totalMethodsQty"].fillna(0) > 0)
-                & (df["wmc"].fillna(0) <= 1)
-                & (df["rfc"].fillna(0) <= 1)
-            )
-            df_clean = df[mask]
-            dropped = initial_len - df_clean.shape[0]
-            if dropped > 0:
-                logger.debug(
-                    f"Rule 4: Dropped {dropped} rows likely corresponding to trivial getter/setter classes."
-                )
-            return df_clean
-        logger.warning(f"Rule 4 skipped: Missing required columns: {required_cols}.")
-        return df
+        return self._apply_keep_mask(df, params, config)
 
 
 @register_rule
@@ -311,21 +324,22 @@ class RemoveNoAddedLines(CleaningRuleBase):
     parameters = []
     is_batch_safe = True  # Looks at individual rows
 
+    def build_keep_mask(
+        self,
+        df: pd.DataFrame,
+        params: Dict[str, Any],
+        config: Dict[str, Any],
+        columns: SharedColumns,
+    ) -> Optional[np.ndarray]:
+        if not columns.has("la"):
+            logger.warning("Rule 5 skipped: Missing 'la' column.")
+            return None
+        return columns.filled("la") > 0  # Treat NaN as 0 for filtering
+
     def apply(
         self, df: pd.DataFrame, params: Dict[str, Any], config: Dict[str, Any]
     ) -> pd.DataFrame:
-        initial_len = df.shape[0]
-        if "la" in df.columns:
-            mask = df["la"].fillna(0) > 0  # Treat NaN as 0 for filtering
-            df_clean = df[mask]
-            dropped = initial_len - df_clean.shape[0]
-            if dropped > 0:
-                logger.debug(
-                    f"Rule 5: Dropped {dropped} rows with no lines added (la <= 0)."
-                )
-            return df_clean
-        logger.warning("Rule 5 skipped: Missing 'la' column.")
-        return df
+        return self._apply_keep_mask(df, params, config)
 
 
 @register_rule
@@ -337,23 +351,24 @@ class RemoveCommentOnlyChange(CleaningRuleBase):
     parameters = []
     is_batch_safe = True  # Looks at individual rows
 
+    def build_keep_mask(
+        self,
+        df: pd.DataFrame,
+        params: Dict[str, Any],
+        config: Dict[str, Any],
+        columns: SharedColumns,
+    ) -> Optional[np.ndarray]:
+        if not columns.delta_columns:
+            logger.warning("Rule 6 skipped: No delta (d_*) columns found.")
+            return None
+        # Keep rows where AT LEAST ONE d_* metric is non-zero, i.e. the
+        # (shared) absolute delta sum is non-zero
+        return columns.abs_delta_sum != 0
+
     def apply(
         self, df: pd.DataFrame, params: Dict[str, Any], config: Dict[str, Any]
     ) -> pd.DataFrame:
-        initial_len = df.shape[0]
-        d_cols = [col for col in df.columns if col.startswith("d_")]
-        if d_cols:
-            # Keep rows where AT LEAST ONE d_* metric is non-zero
-            mask = ~df[d_cols].fillna(0).eq(0).all(axis=1)
-            df_clean = df[mask]
-            dropped = initial_len - df_clean.shape[0]
-            if dropped > 0:
-                logger.debug(
-                    f"Rule 6: Dropped {dropped} rows with only comment changes (all d_* were 0)."
-                )
-            return df_clean
-        logger.warning("Rule 6 skipped: No delta (d_*) columns found.")
-        return df
+        return self._apply_keep_mask(df, params, config)
 
 
 @register_rule
@@ -372,27 +387,30 @@ class RemoveTrivialMethodChange(CleaningRuleBase):
     ]
     is_batch_safe = True  # Looks at individual rows
 
-    def apply(
-        self, df: pd.DataFrame, params: Dict[str, Any], config: Dict[str, Any]
-    ) -> pd.DataFrame:
+    def build_keep_mask(
+        self,
+        df: pd.DataFrame,
+        params: Dict[str, Any],
+        config: Dict[str, Any],
+        columns: SharedColumns,
+    ) -> Optional[np.ndarray]:
         min_change = params.get("min_line_change", 10)
-        initial_len = df.shape[0]
         required_cols = ["la", "ld", "d_totalMethodsQty"]
-        if all(col in df.columns for col in required_cols):
-            # Keep rows where it's NOT the case that (line change < min_change AND method count changed)
-            mask = ~(
-                ((df["la"].fillna(0) + df["ld"].fillna(0)) < min_change)
-                & (df["d_totalMethodsQty"].fillna(0) != 0)
+        if not columns.has(*required_cols):
+            logger.warning(
+                f"Rule 7 skipped: Missing required columns: {required_cols}."
             )
-            df_clean = df[mask]
-            dropped = initial_len - df_clean.shape[0]
-            if dropped > 0:
-                logger.debug(
-                    f"Rule 7: Dropped {dropped} rows with trivial line changes (<{min_change}) but method count changes."
-                )
-            return df_clean
-        logger.warning(f"Rule 7 skipped: Missing required columns: {required_cols}.")
-        return df
+            return None
+        # Keep rows where it's NOT the case that (line change < min_change AND method count changed)
+        return ~(
+            ((columns.filled("la") + columns.filled("ld")) < min_change)
+            & (columns.filled("d_totalMethodsQty") != 0)
+        )
+
+    def apply(
+        self, df: pd.DataFrame, params: Dict[str, Any], config: Dict[str, Any]
+    ) -> pd.DataFrame:
+        return self._apply_keep_mask(df, params, config)
 
 
 @register_rule
@@ -404,27 +422,29 @@ class RemoveTypeExceptionFiles(CleaningRuleBase):
     parameters = []
     is_batch_safe = True  # Looks at individual rows
 
+    def build_keep_mask(
+        self,
+        df: pd.DataFrame,
+        params: Dict[str, Any],
+        config: Dict[str, Any],
+        columns: SharedColumns,
+    ) -> Optional[np.ndarray]:
+        if not columns.has("file"):
+            logger.warning("Rule 8 skipped: Missing 'file' column.")
+            return None
+        # Keep rows that DON'T match the patterns
+        # Handle potential non-string values in 'file' column
+        matches = (
+            df["file"]
+            .astype(str)
+            .str.contains(r"(Type|Exception)\.java$", regex=True, na=False)
+        )
+        return ~matches.to_numpy(dtype=bool)
+
     def apply(
         self, df: pd.DataFrame, params: Dict[str, Any], config: Dict[str, Any]
     ) -> pd.DataFrame:
-        initial_len = df.shape[0]
-        if "file" in df.columns:
-            # Filter keeping rows that DON'T match the patterns
-            # Handle potential non-string values in 'file' column
-            mask = (
-                df["file"]
-                .astype(str)
-                .str.contains(r"(Type|Exception)\.java$", regex=True, na=False)
-            )
-            df_clean = df[~mask]  # Keep rows where the mask is False
-            dropped = initial_len - df_clean.shape[0]
-            if dropped > 0:
-                logger.debug(
-                    f"Rule 8: Dropped {dropped} rows matching '*Type.java' or '*Exception.java'."
-                )
-            return df_clean
-        logger.warning("Rule 8 skipped: Missing 'file' column.")
-        return df
+        return self._apply_keep_mask(df, params, config)
 
 
 @register_rule
@@ -434,23 +454,26 @@ class RemoveDeadCode(CleaningRuleBase):
     parameters = []
     is_batch_safe = True  # Looks at individual rows
 
+    def build_keep_mask(
+        self,
+        df: pd.DataFrame,
+        params: Dict[str, Any],
+        config: Dict[str, Any],
+        columns: SharedColumns,
+    ) -> Optional[np.ndarray]:
+        required_cols = ["cbo", "fanin"]
+        if not columns.has(*required_cols):
+            logger.warning(
+                f"Rule 9 skipped: Missing required columns: {required_cols}."
+            )
+            return None
+        # Keep rows where it's NOT the case that (cbo=0 AND fanin=0)
+        return ~((columns.filled("cbo") == 0) & (columns.filled("fanin") == 0))
+
     def apply(
         self, df: pd.DataFrame, params: Dict[str, Any], config: Dict[str, Any]
     ) -> pd.DataFrame:
-        initial_len = df.shape[0]
-        required_cols = ["cbo", "fanin"]
-        if all(col in df.columns for col in required_cols):
-            # Keep rows where it's NOT the case that (cbo=0 AND fanin=0)
-            mask = ~((df["cbo"].fillna(0) == 0) & (df["fanin"].fillna(0) == 0))
-            df_clean = df[mask]
-            dropped = initial_len - df_clean.shape[0]
-            if dropped > 0:
-                logger.debug(
-                    f"Rule 9: Dropped {dropped} rows likely corresponding to dead code (cbo=0, fanin=0)."
-                )
-            return df_clean
-        logger.warning(f"Rule 9 skipped: Missing required columns: {required_cols}.")
-        return df
+        return self._apply_keep_mask(df, params, config)
 
 
 @register_rule
@@ -460,27 +483,30 @@ class RemoveDataClass(CleaningRuleBase):
     parameters = []
     is_batch_safe = True  # Looks at individual rows
 
+    def build_keep_mask(
+        self,
+        df: pd.DataFrame,
+        params: Dict[str, Any],
+        config: Dict[str, Any],
+        columns: SharedColumns,
+    ) -> Optional[np.ndarray]:
+        required_cols = ["wmc", "rfc", "totalFieldsQty"]
+        if not columns.has(*required_cols):
+            logger.warning(
+                f"Rule 10 skipped: Missing required columns: {required_cols}."
+            )
+            return None
+        # Keep rows where it's NOT the case that (wmc<=1 AND rfc<=1 AND fields>=1)
+        return ~(
+            (columns.filled("wmc") <= 1)
+            & (columns.filled("rfc") <= 1)
+            & (columns.filled("totalFieldsQty") >= 1)
+        )
+
     def apply(
         self, df: pd.DataFrame, params: Dict[str, Any], config: Dict[str, Any]
     ) -> pd.DataFrame:
-        initial_len = df.shape[0]
-        required_cols = ["wmc", "rfc", "totalFieldsQty"]
-        if all(col in df.columns for col in required_cols):
-            # Keep rows where it's NOT the case that (wmc<=1 AND rfc<=1 AND fields>=1)
-            mask = ~(
-                (df["wmc"].fillna(0) <= 1)
-                & (df["rfc"].fillna(0) <= 1)
-                & (df["totalFieldsQty"].fillna(0) >= 1)
-            )
-            df_clean = df[mask]
-            dropped = initial_len - df_clean.shape[0]
-            if dropped > 0:
-                logger.debug(
-                    f"Rule 10: Dropped {dropped} rows likely corresponding to data classes."
-                )
-            return df_clean
-        logger.warning(f"Rule 10 skipped: Missing required columns: {required_cols}.")
-        return df
+        return self._apply_keep_mask(df, params, config)
 
 
 @register_rule
@@ -492,23 +518,26 @@ class RemoveNoCodeChange(CleaningRuleBase):
     parameters = []
     is_batch_safe = True  # Looks at individual rows
 
+    def build_keep_mask(
+        self,
+        df: pd.DataFrame,
+        params: Dict[str, Any],
+        config: Dict[str, Any],
+        columns: SharedColumns,
+    ) -> Optional[np.ndarray]:
+        required_cols = ["la", "ld"]
+        if not columns.has(*required_cols):
+            logger.warning(
+                f"Rule 11 skipped: Missing required columns: {required_cols}."
+            )
+            return None
+        # Keep rows where it's NOT the case that (la=0 AND ld=0)
+        return ~((columns.filled("la") == 0) & (columns.filled("ld") == 0))
+
     def apply(
         self, df: pd.DataFrame, params: Dict[str, Any], config: Dict[str, Any]
     ) -> pd.DataFrame:
-        initial_len = df.shape[0]
-        required_cols = ["la", "ld"]
-        if all(col in df.columns for col in required_cols):
-            # Keep rows where it's NOT the case that (la=0 AND ld=0)
-            mask = ~((df["la"].fillna(0) == 0) & (df["ld"].fillna(0) == 0))
-            df_clean = df[mask]
-            dropped = initial_len - df_clean.shape[0]
-            if dropped > 0:
-                logger.debug(
-                    f"Rule 11: Dropped {dropped} rows with no lines added or deleted."
-                )
-            return df_clean
-        logger.warning(f"Rule 11 skipped: Missing required columns: {required_cols}.")
-        return df
+        return self._apply_keep_mask(df, params, config)
 
 
 @register_rule
@@ -525,28 +554,26 @@ class RemoveMarginalChange(CleaningRuleBase):
     ]
     is_batch_safe = True  # Looks at individual rows
 
+    def build_keep_mask(
+        self,
+        df: pd.DataFrame,
+        params: Dict[str, Any],
+        config: Dict[str, Any],
+        columns: SharedColumns,
+    ) -> Optional[np.ndarray]:
+        threshold = params.get("threshold", 15)
+        if not columns.delta_columns or not columns.has("is_buggy"):
+            logger.warning(
+                "Rule 12 skipped: Missing delta (d_*) columns or 'is_buggy' column."
+            )
+            return None
+        # Keep rows where change > threshold OR the row is buggy
+        return (columns.abs_delta_sum > threshold) | columns.flag("is_buggy")
+
     def apply(
         self, df: pd.DataFrame, params: Dict[str, Any], config: Dict[str, Any]
     ) -> pd.DataFrame:
-        threshold = params.get("threshold", 15)
-        initial_len = df.shape[0]
-        d_cols = [col for col in df.columns if col.startswith("d_")]
-
-        if d_cols and "is_buggy" in df.columns:
-            total_change = df[d_cols].fillna(0).abs().sum(axis=1)
-            # Keep rows where change > threshold OR the row is buggy
-            mask = (total_change > threshold) | (df["is_buggy"])
-            df_clean = df[mask]
-            dropped = initial_len - df_clean.shape[0]
-            if dropped > 0:
-                logger.debug(
-                    f"Rule 12: Dropped {dropped} non-buggy rows with marginal delta sum <= {threshold}."
-                )
-            return df_clean
-        logger.warning(
-            "Rule 12 skipped: Missing delta (d_*) columns or 'is_buggy' column."
-        )
-        return df
+        return self._apply_keep_mask(df, params, config)
 
 
 @register_rule
@@ -563,28 +590,26 @@ class RemoveMinimalChange(CleaningRuleBase):
     ]
     is_batch_safe = True  # Looks at individual rows
 
+    def build_keep_mask(
+        self,
+        df: pd.DataFrame,
+        params: Dict[str, Any],
+        config: Dict[str, Any],
+        columns: SharedColumns,
+    ) -> Optional[np.ndarray]:
+        threshold = params.get("threshold", 5)
+        if not columns.delta_columns or not columns.has("is_buggy"):
+            logger.warning(
+                "Rule 13 skipped: Missing delta (d_*) columns or 'is_buggy' column."
+            )
+            return None
+        # Keep rows where change >= threshold OR the row is buggy
+        return (columns.abs_delta_sum >= threshold) | columns.flag("is_buggy")
+
     def apply(
         self, df: pd.DataFrame, params: Dict[str, Any], config: Dict[str, Any]
     ) -> pd.DataFrame:
-        threshold = params.get("threshold", 5)
-        initial_len = df.shape[0]
-        d_cols = [col for col in df.columns if col.startswith("d_")]
-
-        if d_cols and "is_buggy" in df.columns:
-            total_change = df[d_cols].fillna(0).abs().sum(axis=1)
-            # Keep rows where change >= threshold OR the row is buggy
-            mask = (total_change >= threshold) | (df["is_buggy"])
-            df_clean = df[mask]
-            dropped = initial_len - df_clean.shape[0]
-            if dropped > 0:
-                logger.debug(
-                    f"Rule 13: Dropped {dropped} non-buggy rows with minimal delta sum < {threshold}."
-                )
-            return df_clean
-        logger.warning(
-            "Rule 13 skipped: Missing delta (d_*) columns or 'is_buggy' column."
-        )
-        return df
+        return self._apply_keep_mask(df, params, config)
 
 
 @register_rule
@@ -602,38 +627,57 @@ class FilterLargeCommits(CleaningRuleBase):
     # This rule can be applied per batch, as it looks at commit-level stats that should be consistent within the batch.
     is_batch_safe = True
 
+    def build_keep_mask(
+        self,
+        df: pd.DataFrame,
+        params: Dict[str, Any],
+        config: Dict[str, Any],
+        columns: SharedColumns,
+    ) -> Optional[np.ndarray]:
+        threshold = params.get("max_files_changed", 10)
+        required_cols = ["changed_file_count", "is_buggy"]
+        if not columns.has(*required_cols):
+            logger.warning(
+                f"Rule 14 skipped: Missing required columns: {required_cols}."
+            )
+            return None
+        # Keep rows where file count <= threshold OR the row is buggy
+        return (columns.filled("changed_file_count") <= threshold) | columns.flag(
+            "is_buggy"
+        )
+
     def apply(
         self, df: pd.DataFrame, params: Dict[str, Any], config: Dict[str, Any]
     ) -> pd.DataFrame:
-        threshold = params.get("max_files_changed", 10)
-        initial_len = df.shape[0]
-        required_cols = ["changed_file_count", "is_buggy"]
-        if all(col in df.columns for col in required_cols):
-            # Keep rows where file count <= threshold OR the row is buggy
-            mask = (df["changed_file_count"].fillna(0) <= threshold) | (df["is_buggy"])
-            df_clean = df[mask]
-            dropped = initial_len - df_clean.shape[0]
-            if dropped > 0:
-                logger.debug(
-                    f"Rule 14: Dropped {dropped} non-buggy rows from large commits (>{threshold} files)."
-                )
-            return df_clean
-        logger.warning(f"Rule 14 skipped: Missing required columns: {required_cols}.")
-        return df
+        return self._apply_keep_mask(df, params, config)
 
 
 # --- Rule Cluster ---
 @register_rule
 class ClusterLargeCommits(CleaningRuleBase):
     rule_name = "cluster_large_commits"
-    description = "Cluster rows within commits changing > N files, reducing rows via aggregation."
+    description = (
+        "Cluster rows within commits changing > N files, reducing rows via aggregation."
+    )
     parameters = [
         RuleParamDefinition(
             name="threshold",
             type="integer",
             description="File count threshold to trigger clustering.",
             default=10,
-        )
+        ),
+        RuleParamDefinition(
+            name="random_state",
+            type="integer",
+            description="Seed for clustering; output is deterministic for a fixed seed.",
+            default=42,
+        ),
+        RuleParamDefinition(
+            name="n_jobs",
+            type="integer",
+            description="Worker processes used to cluster commits (-1 = all cores).",
+            default=-1,
+        ),
     ]
     # This rule needs to see all rows for a commit to cluster them, making it non-batch-safe.
     is_batch_safe = False
@@ -642,6 +686,8 @@ class ClusterLargeCommits(CleaningRuleBase):
         self, df: pd.DataFrame, params: Dict[str, Any], config: Dict[str, Any]
     ) -> pd.DataFrame:
         threshold = params.get("threshold", 10)
+        random_state = params.get("random_state", 42)
+        n_jobs = params.get("n_jobs", -1)
         commit_hash_col = "commit_hash"
 
         required_cols = ["changed_file_count", commit_hash_col]
@@ -662,8 +708,9 @@ class ClusterLargeCommits(CleaningRuleBase):
         y_column = [y_column_name] if isinstance(y_column_name, str) else y_column_name
 
         # Split data
-        df_below = df[df["changed_file_count"] <= threshold].copy()
-        df_above = df[df["changed_file_count"] > threshold].copy()
+        is_large = (df["changed_file_count"] > threshold).to_numpy()
+        df_below = df[df["changed_file_count"] <= threshold]
+        df_above = df[is_large]
 
         if df_above.empty:
             return df_below
@@ -688,95 +735,92 @@ class ClusterLargeCommits(CleaningRuleBase):
             )
             return df  # Return original DataFrame if no features
 
-        reduced_rows_list = [df_below]
-
-        for commit, group in df_above.groupby(commit_hash_col):
-            if group.shape[0] <= avg_count:
-                reduced_rows_list.append(group)
-                continue
+        # --- Sort large-commit rows by commit so every commit is a contiguous slice ---
+        codes, _ = pd.factorize(df_above[commit_hash_col], sort=True)
+        valid = codes >= 0  # groupby semantics: rows without a commit hash are dropped
+        order = np.argsort(codes[valid], kind="stable")
+        df_sorted = df_above[valid].iloc[order]
+        codes_sorted = codes[valid][order]
+        sizes = np.bincount(codes_sorted)
+        starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+
+        # Impute NaNs with the commit mean (0 if the whole commit is NaN), vectorised
+        features = df_sorted[cluster_features].astype(np.float64)
+        features = features.fillna(
+            features.groupby(codes_sorted).transform("mean")
+        ).fillna(0)
+        X = np.ascontiguousarray(features.to_numpy())
+
+        clustered_codes = np.flatnonzero(sizes > avg_count)
+        units = [
+            (int(starts[c]), int(starts[c] + sizes[c]), min(avg_count, int(sizes[c])))
+            for c in clustered_codes
+        ]
+        unit_labels = cluster_commit_groups(
+            X, units, random_state=random_state, n_jobs=n_jobs
+        )
 
-            group_for_cluster = group.copy()
-            for feature in cluster_features:
-                if group_for_cluster[feature].isnull().any():
-                    group_mean = group_for_cluster[feature].mean()
-                    group_for_cluster[feature].fillna(group_mean, inplace=True)
-                    group_for_cluster[feature].fillna(
-                        0, inplace=True
-                    )  # Fallback if all were NaN
-
-            try:
-                n_clusters = min(
-                    avg_count, group.shape[0]
-                )  # Cannot have more clusters than samples
-                if (
-                    n_clusters < 1
-                ):  # Should not happen if group is not empty, but safeguard
-                    logger.warning(
-                        f"Rule Cluster: Calculated n_clusters={n_clusters} for commit {commit[:7]}. Skipping clustering for this commit."
-                    )
-                    reduced_rows_list.append(group)
-                    continue
-
-                kmeans = KMeans(
-                    n_clusters=n_clusters,
-                    random_state=42,
-                    n_init="auto",
-                    init="k-means++",
-                )
-                clusters = kmeans.fit_predict(group_for_cluster[cluster_features])
-                group_for_cluster["cluster"] = clusters
-            except Exception as e:
+        # Global cluster id per row (-1 = keep row as is); ids increase with commit order
+        cluster_ids = np.full(len(df_sorted), -1, dtype=np.int64)
+        cluster_commit: List[int] = []
+        for code, (start, stop, n_clusters), labels in zip(
+            clustered_codes, units, unit_labels
+        ):
+            if labels is None:
                 logger.error(
-                    f"Rule Cluster: Clustering failed for commit {commit[:7]}: {e}. Keeping original rows.",
-                    exc_info=True,
+                    f"Rule Cluster: Clustering failed for commit {str(df_sorted[commit_hash_col].iloc[start])[:7]}. Keeping original rows."
                 )
-                reduced_rows_list.append(group)
                 continue
+            cluster_ids[start:stop] = len(cluster_commit) + labels
+            cluster_commit.extend([int(code)] * n_clusters)
 
-            agg_funcs = {}
-
-            def aggregate_target(series):
-                return (
-                    (series.astype(float).mean() >= 0.5) if not series.empty else False
-                )
+        is_clustered = cluster_ids >= 0
+        kept = df_sorted[~is_clustered]
+        kept_order = codes_sorted[~is_clustered]
 
-            for col in group_for_cluster.columns:
-                if col == "cluster":
-                    continue
-                col_type = group_for_cluster[col].dtype
+        try:
+            to_aggregate = df_sorted[is_clustered].copy()
+            # Aggregate the imputed values used for clustering
+            to_aggregate[cluster_features] = X[is_clustered]
+            agg_funcs = {}
+            for col in to_aggregate.columns:
                 if col == commit_hash_col or col in info_columns:
                     agg_funcs[col] = "first"
-                elif (
-                    col in cluster_features
-                ):  # Aggregate numeric features used for clustering
+                elif col in cluster_features:
                     agg_funcs[col] = "mean"
                 elif col in y_column:
-                    agg_funcs[col] = aggregate_target
-                elif pd.api.types.is_numeric_dtype(
-                    col_type
-                ):  # Aggregate other numeric cols
+                    # Majority vote: mean >= 0.5 (applied after aggregation)
+                    to_aggregate[col] = to_aggregate[col].astype(float)
+                    agg_funcs[col] = "mean"
+                elif pd.api.types.is_numeric_dtype(to_aggregate[col].dtype):
                     agg_funcs[col] = "mean"
                 else:  # Keep first for any other non-numeric columns
                     agg_funcs[col] = "first"
 
-            try:
-                aggregated = (
-                    group_for_cluster.groupby("cluster")
-                    .agg(agg_funcs)
-                    .reset_index(drop=True)
-                )
-                reduced_rows_list.append(aggregated)
-            except Exception as agg_e:
-                logger.error(
-                    f"Rule Cluster: Aggregation failed for commit {commit[:7]}: {agg_e}. Keeping original rows.",
-                    exc_info=True,
-                )
-                reduced_rows_list.append(group)
-
-        if not reduced_rows_list:
-            result_df = pd.DataFrame(columns=df.columns)
-        else:
-            result_df = pd.concat(reduced_rows_list, ignore_index=True, sort=False)
+            aggregated = to_aggregate.groupby(cluster_ids[is_clustered], sort=True).agg(
+                agg_funcs
+            )
+            aggregated_order = np.asarray(cluster_commit)[aggregated.index.to_numpy()]
+            for col in y_column:
+                if col in aggregated.columns and col not in cluster_features:
+                    aggregated[col] = aggregated[col] >= 0.5
+        except Exception as agg_e:
+            logger.error(
+                f"Rule Cluster: Aggregation failed: {agg_e}. Keeping original rows.",
+                exc_info=True,
+            )
+            aggregated = df_sorted.iloc[0:0]
+            aggregated_order = np.empty(0, dtype=np.int64)
+            kept, kept_order = df_sorted, codes_sorted
+
+        # Restore per-commit output order (a commit is either kept or aggregated)
+        reduced = pd.concat([kept, aggregated], ignore_index=True, sort=False)
+        reduced_order = np.argsort(
+            np.concatenate([kept_order, aggregated_order]), kind="stable"
+        )
+        result_df = pd.concat(
+            [df_below, reduced.iloc[reduced_order]], ignore_index=True, sort=False
+        )
 
         dropped = initial_len - result_df.shape[0]
         if dropped > 0:
@@ -8,6 +8,7 @@ from pydantic import BaseModel, Field, ValidationError, create_model
 from shared.core.config import settings
 
 from .cleaning_rules.base import CleaningRuleBase, RuleParamDefinition
+from .cleaning_rules.compiler import CompiledRuleSet, compile_rules
 from .interfaces import ICleaningService
 
 logger = logging.getLogger(__name__)
@@ -29,8 +30,18 @@ class RuleBasedCleaningService(ICleaningService):  # Inherit directly from inter
         self.rule_registry = rule_registry
         self.batch_rules_info: List[Dict] = []
         self.global_rules_info: List[Dict] = []
+        self.compiled_batch_rules: Optional[CompiledRuleSet] = None
+        # Cumulative per-rule hit counts (rows flagged for removal) across batches
+        self.rule_hit_counts: Dict[str, int] = {}
         logger.info(f"Initializing Cleaning Service: {self.__class__.__name__}")
         self._load_and_prepare_rules()  # Load rules using the injected registry
+        self.compiled_batch_rules = compile_rules(
+            [
+                (info["instance"], info["params_model"].model_dump())
+                for info in self.batch_rules_info
+            ],
+            self.dataset_config,
+        )
 
     def _validate_and_prepare_params(
         self,
@@ -141,38 +152,32 @@ class RuleBasedCleaningService(ICleaningService):  # Inherit directly from inter
         )
 
     def apply_batch_rules(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Applies all configured batch-safe rules sequentially using prepared params."""
-        if not self.batch_rules_info:
+        """
+        Applies all configured batch-safe rules as one compiled pass: masks are
+        evaluated over shared precomputed columns and rows are dropped once.
+        """
+        if not self.batch_rules_info or self.compiled_batch_rules is None:
             return df
         logger.debug(
-            f"Applying {len(self.batch_rules_info)} batch-safe cleaning rules..."
+            f"Applying {len(self.batch_rules_info)} batch-safe cleaning rules (compiled)..."
         )
-        current_df = df
-        for rule_info in self.batch_rules_info:
-            instance: CleaningRuleBase = rule_info["instance"]
-            validated_params: BaseModel = rule_info["params_model"]
-            rule_name = instance.rule_name
-            try:
-                start_shape = current_df.shape
-                current_df = instance.apply(
-                    current_df, validated_params.model_dump(), self.dataset_config
-                )
-                end_shape = current_df.shape
-                if start_shape != end_shape:
-                    logger.debug(
-                        f"Batch rule '{rule_name}' applied. Shape change: {start_shape} -> {end_shape}"
-                    )
-                if current_df.empty:
-                    logger.warning(
-                        f"DataFrame became empty after applying batch rule '{rule_name}'."
-                    )
-                    break
-            except Exception as e:
-                logger.error(
-                    f"Error applying batch rule '{rule_name}': {e}", exc_info=True
-                )
+        start_shape = df.shape
+        current_df, hits = self.compiled_batch_rules.apply(df)
+        for rule_name, count in hits.items():
+            self.rule_hit_counts[rule_name] = (
+                self.rule_hit_counts.get(rule_name, 0) + count
+            )
+        if start_shape != current_df.shape:
+            logger.debug(
+                f"Batch rules applied. Shape change: {start_shape} -> {current_df.shape}. Hits: {hits}"
+            )
+        if current_df.empty:
+            logger.warning("DataFrame became empty after applying batch rules.")
         return current_df
 
+    def get_rule_hit_counts(self) -> Dict[str, int]:
+        return dict(self.rule_hit_counts)
+
     def apply_global_rules(self, df: pd.DataFrame) -> pd.DataFrame:
         """Applies all configured global rules sequentially using prepared params."""
         if not self.global_rules_info:
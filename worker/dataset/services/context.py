@@ -53,6 +53,9 @@ class DatasetContext(BaseModel):
     processed_dataframe: Optional[pd.DataFrame] = Field(
         None, description="DataFrame after processing steps."
     )
+    ingestion_watermark: Optional[int] = Field(
+        None, description="Highest CommitGuruMetric ID the dataset is built from."
+    )
 
     # --- Output ---
     final_dataframe: Optional[pd.DataFrame] = Field(
@@ -1,10 +1,10 @@
 # worker/dataset/services/data_loader.py
 import logging
-from typing import Generator, List
+from typing import Any, Dict, Generator, List, Optional, Set
 
 import pandas as pd
 import sqlalchemy as sa
-from sqlalchemy import func, select
+from sqlalchemy import distinct, func, select
 
 from shared.core.config import settings
 from shared.db.models import (  # Import models directly for query construction
@@ -15,6 +15,7 @@ from shared.db.models import (  # Import models directly for query construction
 
 # Import BaseRepository for context manager access
 from shared.repositories.base_repository import BaseRepository
+from shared.utils.bot_filter import BotMatcher
 
 # Import interfaces and specific repositories
 from .interfaces import IDataLoader
@@ -116,9 +117,18 @@ class DataLoader(IDataLoader):  # Implement interface
         self.session_factory = session_factory  # Needed for base repo context manager
         self.repository_id = repository_id
         self.bot_patterns = bot_patterns
+        self.bot_matcher = BotMatcher(bot_patterns)
+        # Resolved lazily: bot authors among this repository's distinct authors
+        self._bot_authors: Optional[Set[str]] = None
+        # Set if the author lookup fails; batches are then filtered in memory
+        self._filter_bots_in_memory = False
         # Repositories are not directly injected here; queries are built using models
         # We use the session_factory context manager for execution
 
+        # Optional CommitGuruMetric.id bounds (delta datasets / watermark)
+        self.after_id: Optional[int] = None
+        self.upto_id: Optional[int] = None
+
         self.cgm_alias = sa.orm.aliased(CommitGuruMetric, name="cgm")
         self.ckm_alias = sa.orm.aliased(CKMetric, name="ckm")
         self.base_query = self._build_base_query()
@@ -138,9 +148,103 @@ class DataLoader(IDataLoader):  # Implement interface
             )
             .where(self.cgm_alias.repository_id == self.repository_id)
         )
+        if self.after_id is not None:
+            query = query.where(self.cgm_alias.id > self.after_id)
+        if self.upto_id is not None:
+            query = query.where(self.cgm_alias.id <= self.upto_id)
 
         return query
 
+    def set_commit_id_range(
+        self, after_id: Optional[int] = None, upto_id: Optional[int] = None
+    ):
+        """Restricts loaded rows to commits with after_id < CommitGuruMetric.id <= upto_id."""
+        self.after_id = after_id
+        self.upto_id = upto_id
+        self.base_query = self._build_base_query()
+        logger.debug(f"Commit ID range set to ({after_id}, {upto_id}].")
+
+    def _resolve_bot_authors(self, session) -> Set[str]:
+        """
+        Classifies each distinct author of the repository once against the
+        combined bot patterns, so bot commits can be excluded in the query.
+        """
+        if self._bot_authors is not None:
+            return self._bot_authors
+        self._bot_authors = set()
+        if not self.bot_matcher.has_patterns:
+            return self._bot_authors
+        try:
+            authors = (
+                session.execute(
+                    select(distinct(CommitGuruMetric.author_name)).where(
+                        CommitGuruMetric.repository_id == self.repository_id
+                    )
+                )
+                .scalars()
+                .all()
+            )
+            self._bot_authors = self.bot_matcher.bot_authors(authors)
+            logger.info(
+                f"Bot filter: {len(self._bot_authors)} of {len(authors)} distinct authors match bot patterns."
+            )
+        except Exception as e:
+            logger.error(
+                f"Failed to resolve bot authors, filtering batches in memory instead: {e}",
+                exc_info=True,
+            )
+            session.rollback()  # Keep the session usable for the main query
+            self._filter_bots_in_memory = True
+        return self._bot_authors
+
+    def _get_query(self, session):
+        """Base query with bot-authored commits excluded."""
+        bot_authors = self._resolve_bot_authors(session)
+        if not bot_authors:
+            return self.base_query
+        return self.base_query.where(
+            sa.or_(
+                self.cgm_alias.author_name.is_(None),
+                self.cgm_alias.author_name.not_in(sorted(bot_authors)),
+            )
+        )
+
+    def get_ingestion_watermark(self) -> Dict[str, Any]:
+        """
+        Summarises the repository's ingested rows with index-backed aggregates.
+        New commits raise the counts and max ids; bug relinking changes the
+        buggy count, so any ingestion run moves the watermark.
+        """
+        cgm = CommitGuruMetric
+        ckm = CKMetric
+        query = select(
+            select(func.count(cgm.id))
+            .where(cgm.repository_id == self.repository_id)
+            .scalar_subquery()
+            .label("guru_rows"),
+            select(func.max(cgm.id))
+            .where(cgm.repository_id == self.repository_id)
+            .scalar_subquery()
+            .label("guru_max_id"),
+            select(func.count(cgm.id))
+            .where(cgm.repository_id == self.repository_id, cgm.is_buggy.is_(True))
+            .scalar_subquery()
+            .label("guru_buggy_rows"),
+            select(func.count(ckm.id))
+            .where(ckm.repository_id == self.repository_id)
+            .scalar_subquery()
+            .label("ck_rows"),
+            select(func.max(ckm.id))
+            .where(ckm.repository_id == self.repository_id)
+            .scalar_subquery()
+            .label("ck_max_id"),
+        )
+        with BaseRepository._session_scope(self) as session:
+            row = session.execute(query).one()
+        watermark = {"repository_id": self.repository_id, **row._asdict()}
+        logger.debug(f"Ingestion watermark: {watermark}")
+        return watermark
+
     def estimate_total_rows(self) -> int:
         """Estimates the total number of rows the query will return."""
         logger.debug("Estimating total rows for query...")
@@ -151,7 +255,7 @@ class DataLoader(IDataLoader):  # Implement interface
             try:
                 # Execute the count query within the session scope
                 count_query = select(func.count()).select_from(
-                    self.base_query.subquery()
+                    self._get_query(session).subquery()
                 )
                 estimated_count = session.execute(count_query).scalar() or 1
                 logger.debug(f"Estimated total rows: {estimated_count}")
@@ -169,7 +273,7 @@ class DataLoader(IDataLoader):  # Implement interface
         ) as session:  # Access context manager via Base
             try:
                 # Execute the main query within the session scope
-                stream = session.execute(self.base_query).yield_per(batch_size)
+                stream = session.execute(self._get_query(session)).yield_per(batch_size)
                 batch_num = 0
                 for result_batch in stream.partitions(batch_size):
                     batch_num += 1
@@ -210,6 +314,8 @@ class DataLoader(IDataLoader):  # Implement interface
 
                     if batch_data:
                         df = pd.DataFrame(batch_data)
+                        if self._filter_bots_in_memory:
+                            df = df[~self.bot_matcher.bot_mask(df["author_name"])]
                         end_time = pd.Timestamp.now()
                         logger.debug(
                             f"Batch {batch_num}: Yielding DataFrame with shape {df.shape}. Time: {end_time - start_time}"
@@ -1,6 +1,6 @@
 # worker/dataset/services/dependencies.py
 import logging
-from typing import Any, Callable, Dict, List, Type
+from typing import Any, Callable, Dict, List, Optional, Type
 
 from sqlalchemy.orm import Session
 
@@ -24,8 +24,10 @@ from .interfaces import (
     IDatasetGeneratorStep,
     IOutputWriter,
     IRepositoryFactory,
+    ISnapshotCache,
 )
 from .output_writer import OutputWriter
+from .snapshot_cache import BaseTableSnapshotCache
 
 # Import all step classes
 from .steps import (
@@ -133,6 +135,17 @@ class DependencyProvider:
             )
         return self._cached_services[IOutputWriter]
 
+    # --- Factory Method for ISnapshotCache ---
+    def _get_snapshot_cache(self) -> Optional[ISnapshotCache]:
+        """Gets or creates the base table snapshot cache (None if disabled)."""
+        if not settings.DATASET_SNAPSHOT_CACHE_ENABLED:
+            return None
+        if ISnapshotCache not in self._cached_services:
+            self._cached_services[ISnapshotCache] = BaseTableSnapshotCache(
+                settings.s3_storage_options, settings.S3_BUCKET_NAME
+            )
+        return self._cached_services[ISnapshotCache]
+
     # --- Factory Method for ICleaningService (Context-Dependent) ---
     def _get_cleaning_service(self, context: DatasetContext) -> ICleaningService:
         """Gets or creates the CleaningService instance using the factory."""
@@ -178,6 +191,7 @@ class DependencyProvider:
             # This step orchestrates sub-steps and needs deps for them
             deps["cleaning_service"] = self._get_cleaning_service(context)
             deps["session_factory"] = self.session_factory  # DataLoader needs factory
+            deps["snapshot_cache"] = self._get_snapshot_cache()
             # Repos needed by sub-steps are accessed via repo_factory inside execute
         elif step_type == ProcessGloballyStep:
             # This step orchestrates sub-steps
@@ -0,0 +1,173 @@
+# worker/dataset/services/feature_selection/measures.py
+import logging
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on elements per joint-histogram chunk (rows x columns)
+_MI_CHUNK_ELEMENTS = 8_000_000
+
+
+def numeric_feature_matrix(dataframe: pd.DataFrame) -> Tuple[np.ndarray, list]:
+    """Numeric/bool columns as a float64 matrix with +/-inf mapped to NaN."""
+    numeric_df = dataframe.select_dtypes(include=["number", "bool"])
+    X = numeric_df.to_numpy(dtype=np.float64, na_value=np.nan, copy=True)
+    X[~np.isfinite(X)] = np.nan
+    return X, numeric_df.columns.tolist()
+
+
+def pairwise_correlation(X: np.ndarray) -> np.ndarray:
+    """
+    Pearson correlation of every column pair over the rows where both are
+    present (same result as DataFrame.corr()), computed with five matrix
+    products instead of per-pair loops.
+    """
+    present = ~np.isnan(X)
+    M = present.astype(np.float64)
+    X0 = np.where(present, X, 0.0)
+    # Column means over all present rows keep the products well conditioned
+    with np.errstate(invalid="ignore"):
+        X0 = np.where(present, X0 - np.nanmean(X, axis=0), 0.0)
+
+    n = M.T @ M  # rows where both i and j are present
+    sx = X0.T @ M  # sum of x_i over those rows
+    sy = sx.T  # sum of x_j over those rows
+    sxx = (X0 * X0).T @ M
+    syy = sxx.T
+    sxy = X0.T @ X0
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = n * sxy - sx * sy
+        var = (n * sxx - sx * sx) * (n * syy - sy * sy)
+        corr = cov / np.sqrt(var)
+    corr[(n < 2) | ~(var > 0)] = np.nan
+    np.fill_diagonal(corr, np.where(np.diag(var) > 0, 1.0, np.nan))
+    return np.clip(corr, -1.0, 1.0)
+
+
+def stratified_sample_indices(
+    y_codes: np.ndarray, max_rows: int, random_state: int = 42
+) -> Optional[np.ndarray]:
+    """
+    Row indices of a class-stratified sample of at most `max_rows` rows, or None
+    if no sampling is needed. Every class keeps at least one row.
+    """
+    n_rows = len(y_codes)
+    if not max_rows or n_rows <= max_rows:
+        return None
+    rng = np.random.default_rng(random_state)
+    fraction = max_rows / n_rows
+    picked = []
+    for code in np.unique(y_codes):
+        members = np.flatnonzero(y_codes == code)
+        take = max(1, int(round(len(members) * fraction)))
+        picked.append(rng.choice(members, size=take, replace=False))
+    return np.sort(np.concatenate(picked))
+
+
+def discretize(X: np.ndarray, n_bins: int) -> np.ndarray:
+    """
+    Equal-frequency binning of every column into codes 0..n_bins-1; missing
+    values get their own code n_bins. Codes are stored as uint8 where they fit
+    to keep the matrix small on wide, tall datasets.
+    """
+    n_rows, n_cols = X.shape
+    dtype = np.uint8 if n_bins < np.iinfo(np.uint8).max else np.int64
+    codes = np.full((n_rows, n_cols), n_bins, dtype=dtype)
+    quantiles = np.linspace(0, 1, n_bins + 1)[1:-1]
+    with np.errstate(all="ignore"):
+        inner_edges = np.nanquantile(X, quantiles, axis=0)  # (n_bins-1, n_cols)
+    for j in range(n_cols):
+        present = ~np.isnan(X[:, j])
+        if not present.any():
+            continue
+        edges = np.unique(inner_edges[:, j])
+        codes[present, j] = np.searchsorted(edges, X[present, j], side="right")
+    return codes
+
+
+def _entropy(counts: np.ndarray, n: float) -> np.ndarray:
+    """Shannon entropy (nats) along the last axis of a count array."""
+    p = counts / n
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return -np.sum(np.where(p > 0, p * np.log(p), 0.0), axis=-1)
+
+
+def mutual_information(a: np.ndarray, B: np.ndarray, n_a: int, n_b: int) -> np.ndarray:
+    """
+    Mutual information (nats) between a code vector `a` (values < n_a) and
+    every column of the code matrix `B` (values < n_b). All joint histograms
+    of a chunk of columns come from a single bincount.
+    """
+    n_rows, n_cols = B.shape
+    result = np.empty(n_cols, dtype=np.float64)
+    a = a.astype(np.int64)
+    h_a = _entropy(np.bincount(a, minlength=n_a), n_rows)
+    chunk = max(1, _MI_CHUNK_ELEMENTS // max(n_rows, 1))
+    cells = n_a * n_b
+    for start in range(0, n_cols, chunk):
+        block = B[:, start : start + chunk].astype(np.int64)
+        width = block.shape[1]
+        offsets = np.arange(width, dtype=np.int64) * cells
+        joint_codes = a[:, None] * n_b + block + offsets
+        joint = np.bincount(joint_codes.ravel(), minlength=width * cells).reshape(
+            width, n_a, n_b
+        )
+        h_b = _entropy(joint.sum(axis=1), n_rows)
+        h_ab = _entropy(joint.reshape(width, cells), n_rows)
+        result[start : start + width] = h_a + h_b - h_ab
+    return np.maximum(result, 0.0)
+
+
+class MutualInformationCache:
+    """
+    Binned mutual information for one feature matrix. Relevance to the target
+    is computed once for all features; feature-feature MI is computed on demand,
+    one vectorised row at a time, and every pair is cached symmetrically.
+    """
+
+    def __init__(self, X: np.ndarray, y: np.ndarray, n_bins: int = 10):
+        self.n_bins = n_bins
+        self.codes = discretize(X, n_bins)
+        self.n_codes = n_bins + 1  # includes the missing-value code
+        self.y_codes, y_uniques = pd.factorize(y, use_na_sentinel=False)
+        self.n_classes = max(len(y_uniques), 1)
+        self._pairwise = np.full((X.shape[1], X.shape[1]), np.nan)
+        self._relevance: Optional[np.ndarray] = None
+
+    @property
+    def relevance(self) -> np.ndarray:
+        if self._relevance is None:
+            self._relevance = mutual_information(
+                self.y_codes, self.codes, self.n_classes, self.n_codes
+            )
+        return self._relevance
+
+    @property
+    def informative(self) -> np.ndarray:
+        """Mask of features taking more than one binned value (non-zero entropy)."""
+        return np.array(
+            [
+                np.count_nonzero(np.bincount(self.codes[:, j])) > 1
+                for j in range(self.codes.shape[1])
+            ],
+            dtype=bool,
+        )
+
+    def redundancy(self, feature: int, others: np.ndarray) -> np.ndarray:
+        """MI between `feature` and each index in `others`, computing only misses."""
+        cached = self._pairwise[feature, others]
+        missing = others[np.isnan(cached)]
+        if missing.size:
+            values = mutual_information(
+                self.codes[:, feature],
+                self.codes[:, missing],
+                self.n_codes,
+                self.n_codes,
+            )
+            self._pairwise[feature, missing] = values
+            self._pairwise[missing, feature] = values
+        return self._pairwise[feature, others]
@@ -2,17 +2,23 @@
 import logging
 from typing import Any, Dict, List
 
+import numpy as np
 import pandas as pd
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.feature_selection import SelectFromModel
 
-# Assuming mrmr and cbfs might come from a library like 'skfeature-chappers' or a custom implementation
-# As a placeholder, we will implement simplified logic.
 from shared.feature_selection import (
     FeatureSelectionParamDefinition,
     FeatureSelectionStrategy,
 )
 
+from .measures import (
+    MutualInformationCache,
+    numeric_feature_matrix,
+    pairwise_correlation,
+    stratified_sample_indices,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -37,31 +43,33 @@ class CbfsFeatureSelection(FeatureSelectionStrategy):
         threshold = params.get("threshold", 0.7)
         logger.info(f"Applying CBFS with threshold: {threshold}")
 
-        df_with_target = pd.concat([dataframe, target_column], axis=1)
-        corr_matrix = df_with_target.corr(numeric_only=True).abs()
-
-        # Find features highly correlated with the target
-        target_corr = corr_matrix[target_column.name]
-        relevant_features = target_corr[target_corr > threshold].index.tolist()
-        if target_column.name in relevant_features:
-            relevant_features.remove(target_column.name)
-
-        if not relevant_features:
+        X, columns = numeric_feature_matrix(dataframe)
+        y = pd.to_numeric(target_column, errors="coerce").to_numpy(
+            dtype=np.float64, na_value=np.nan
+        )
+        # One correlation matrix over features + target (target is the last column)
+        corr_matrix = np.abs(pairwise_correlation(np.column_stack([X, y])))
+        feature_corr = corr_matrix[:-1, :-1]
+        target_corr = corr_matrix[:-1, -1]
+
+        # Find features highly correlated with the target (NaN compares False)
+        relevant = np.flatnonzero(target_corr > threshold)
+        if relevant.size == 0:
             logger.warning(
                 "CBFS: No features found above the correlation threshold with the target. Returning all original features."
             )
             return dataframe.columns.tolist()
 
-        # Remove highly correlated features among the relevant set
+        # Remove highly correlated features among the relevant set: a feature is
+        # redundant once any already-selected feature correlates with it above
+        # the threshold, so each selection blocks its whole correlation row.
+        redundant = np.zeros(len(columns), dtype=bool)
         selected_features = []
-        for feature in relevant_features:
-            is_redundant = False
-            for selected in selected_features:
-                if corr_matrix.loc[feature, selected] > threshold:
-                    is_redundant = True
-                    break
-            if not is_redundant:
-                selected_features.append(feature)
+        for feature in relevant:
+            if redundant[feature]:
+                continue
+            selected_features.append(columns[feature])
+            redundant |= feature_corr[feature] > threshold
 
         logger.info(
             f"CBFS selected {len(selected_features)} out of {len(dataframe.columns)} features."
@@ -70,7 +78,14 @@ class CbfsFeatureSelection(FeatureSelectionStrategy):
 
 
 class MrmrFeatureSelection(FeatureSelectionStrategy):
-    """Minimum Redundancy Maximum Relevance (mRMR)."""
+    """
+    Minimum Redundancy Maximum Relevance (mRMR), MID scheme.
+
+    Features are added greedily by I(f; y) - mean(I(f; s) for s in selected),
+    with mutual information estimated on equal-frequency bins. Relevance is
+    computed once for all features; each step only adds the redundancy of the
+    remaining features against the newly selected one.
+    """
 
     algorithm_name = "mrmr"
     display_name = "Min-Redundancy Max-Relevance"
@@ -81,26 +96,68 @@ class MrmrFeatureSelection(FeatureSelectionStrategy):
             type="integer",
             description="Number of top features to select.",
             default=20,
-        )
+        ),
+        FeatureSelectionParamDefinition(
+            name="n_bins",
+            type="integer",
+            description="Number of equal-frequency bins used to estimate mutual information.",
+            default=10,
+            range={"min": 2, "max": 64, "step": 1},
+        ),
+        FeatureSelectionParamDefinition(
+            name="max_rows",
+            type="integer",
+            description="Rows sampled (stratified by target) for estimation. 0 uses all rows.",
+            default=200000,
+        ),
     ]
 
     def select_features(
         self, dataframe: pd.DataFrame, target_column: pd.Series, params: Dict[str, Any]
     ) -> List[str]:
         k = params.get("k", 20)
-        logger.info(f"Applying mRMR to select top {k} features.")
-
-        # Placeholder logic: Select top K features based on correlation with target
-        df_with_target = pd.concat([dataframe, target_column], axis=1)
-        target_corr = (
-            df_with_target.corr(numeric_only=True)[target_column.name]
-            .abs()
-            .sort_values(ascending=False)
+        n_bins = params.get("n_bins", 10)
+        max_rows = params.get("max_rows", 200000)
+        random_state = params.get("random_state", 42)
+        logger.info(f"Applying mRMR to select top {k} features ({n_bins} bins).")
+
+        X, columns = numeric_feature_matrix(dataframe)
+        if not columns or k <= 0:
+            logger.warning("mRMR: No numeric features to select from.")
+            return []
+        y = target_column.to_numpy()
+
+        sample = stratified_sample_indices(
+            pd.factorize(y, use_na_sentinel=False)[0], max_rows, random_state
         )
-        selected = target_corr[1 : k + 1].index.tolist()  # Exclude target itself
+        if sample is not None:
+            logger.info(
+                f"mRMR: Estimating on a stratified sample of {len(sample)} rows."
+            )
+            X, y = X[sample], y[sample]
 
-        logger.info(f"mRMR (placeholder) selected {len(selected)} features.")
-        return selected
+        mi = MutualInformationCache(X, y, n_bins=n_bins)
+        # Constant or all-missing features carry no information (and no redundancy)
+        remaining = mi.informative
+        if not remaining.any():
+            logger.warning("mRMR: All numeric features are constant.")
+            return []
+        relevance = mi.relevance
+
+        selected = [int(np.argmax(np.where(remaining, relevance, -np.inf)))]
+        remaining[selected[0]] = False
+        redundancy_sum = np.zeros(len(columns))
+        while len(selected) < k and remaining.any():
+            candidates = np.flatnonzero(remaining)
+            redundancy_sum[candidates] += mi.redundancy(selected[-1], candidates)
+            scores = relevance[candidates] - redundancy_sum[candidates] / len(selected)
+            best = int(candidates[np.argmax(scores)])
+            selected.append(best)
+            remaining[best] = False
+
+        selected_features = [columns[i] for i in selected]
+        logger.info(f"mRMR selected {len(selected_features)} features.")
+        return selected_features
 
 
 class ModelBasedFeatureSelection(FeatureSelectionStrategy):
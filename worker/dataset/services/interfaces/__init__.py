@@ -8,6 +8,7 @@ from .i_repository_factory import (  # Export placeholders too
     IRepositoryFactory,
     RepositoryRepository,
 )
+from .i_snapshot_cache import ISnapshotCache, ISnapshotWriter
 from .i_step import IDatasetGeneratorStep
 
 __all__ = [
@@ -16,6 +17,8 @@ __all__ = [
     "IOutputWriter",
     "ICleaningService",
     "IRepositoryFactory",
+    "ISnapshotCache",
+    "ISnapshotWriter",
     # Export placeholder types
     "DatasetRepository",
     "RepositoryRepository",
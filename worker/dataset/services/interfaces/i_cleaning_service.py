@@ -1,5 +1,6 @@
 # worker/dataset/services/interfaces/i_cleaning_service.py
 from abc import ABC, abstractmethod
+from typing import Dict
 
 import pandas as pd
 
@@ -16,3 +17,7 @@ class ICleaningService(ABC):
     def apply_global_rules(self, df: pd.DataFrame) -> pd.DataFrame:
         """Applies global (non-batch-safe) cleaning rules to the entire DataFrame."""
         pass
+
+    def get_rule_hit_counts(self) -> Dict[str, int]:
+        """Returns cumulative per-rule counts of rows flagged for removal."""
+        return {}
@@ -1,6 +1,6 @@
 # worker/dataset/services/interfaces/i_data_loader.py
 from abc import ABC, abstractmethod
-from typing import Generator
+from typing import Any, Dict, Generator, Optional
 
 import pandas as pd
 
@@ -17,3 +17,15 @@ class IDataLoader(ABC):
     def stream_batches(self, batch_size: int) -> Generator[pd.DataFrame, None, None]:
         """Executes the query and yields data in Pandas DataFrame batches."""
         pass
+
+    @abstractmethod
+    def get_ingestion_watermark(self) -> Dict[str, Any]:
+        """Returns a cheap summary of the ingested data that changes on re-ingestion."""
+        pass
+
+    @abstractmethod
+    def set_commit_id_range(
+        self, after_id: Optional[int] = None, upto_id: Optional[int] = None
+    ):
+        """Restricts loaded rows to commits with after_id < CommitGuruMetric.id <= upto_id."""
+        pass
@@ -0,0 +1,58 @@
+# worker/dataset/services/interfaces/i_snapshot_cache.py
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Generator, List, Optional
+
+import pandas as pd
+
+
+class ISnapshotWriter(ABC):
+    """Interface for writing a base table snapshot one batch at a time."""
+
+    @abstractmethod
+    def write(self, batch: pd.DataFrame) -> None:
+        """Appends a batch of base table rows to the snapshot."""
+        pass
+
+    @abstractmethod
+    def commit(self) -> Optional[str]:
+        """Publishes the snapshot and returns its URI, or None if it was not stored."""
+        pass
+
+    @abstractmethod
+    def abort(self) -> None:
+        """Discards the rows written so far."""
+        pass
+
+
+class ISnapshotCache(ABC):
+    """Interface for caching a repository's config-independent base table."""
+
+    @abstractmethod
+    def build_key(self, watermark: Dict[str, Any], bot_patterns: List[Any]) -> str:
+        """Derives the snapshot key from the ingestion watermark and bot patterns."""
+        pass
+
+    @abstractmethod
+    def find(self, repository_id: int, key: str) -> Optional[str]:
+        """Returns the URI of a valid snapshot for the key, or None."""
+        pass
+
+    @abstractmethod
+    def count_rows(self, snapshot_uri: str) -> int:
+        """Returns the number of rows stored in the snapshot."""
+        pass
+
+    @abstractmethod
+    def stream_batches(
+        self, snapshot_uri: str, batch_size: int
+    ) -> Generator[pd.DataFrame, None, None]:
+        """Yields the snapshot as Pandas DataFrame batches."""
+        pass
+
+    @abstractmethod
+    def open_writer(self, repository_id: int, key: str) -> ISnapshotWriter:
+        """
+        Starts a snapshot for the key. Committing it drops older snapshots of
+        the repository.
+        """
+        pass
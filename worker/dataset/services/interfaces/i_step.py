@@ -1,8 +1,9 @@
 # worker/dataset/services/interfaces/i_step.py
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from services.context import DatasetContext  # Forward reference ok with '..'
+if TYPE_CHECKING:
+    from services.context import DatasetContext
 
 
 class IDatasetGeneratorStep(ABC):
@@ -103,12 +103,17 @@ class OutputWriter(IOutputWriter):  # Implement interface
                 )  # Cast table to the schema with new metadata
             # ------------------------
 
-            # Write using pyarrow.parquet.write_table with fsspec file handle
+            # Write using pyarrow.parquet.write_table with fsspec file handle.
+            # Bounded row groups with min/max statistics and a page index let
+            # readers project columns and skip row groups that fail a filter.
             with self.fs.open(s3_path, "wb") as f:
                 pq.write_table(
                     table,
                     f,
                     compression="snappy",
+                    row_group_size=settings.DATASET_PARQUET_ROW_GROUP_SIZE,
+                    write_statistics=True,
+                    write_page_index=True,
                 )
 
             logger.info(f"Successfully wrote final dataset to s3://{s3_path}")
@@ -0,0 +1,208 @@
+# worker/dataset/services/snapshot_cache.py
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from typing import Any, Dict, Generator, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import s3fs
+
+from shared.core.config import settings
+
+from .interfaces import ISnapshotCache, ISnapshotWriter
+
+logger = logging.getLogger(__name__)
+logger.setLevel(settings.LOG_LEVEL.upper())
+
+# Bump when the base batch steps change what the snapshot contains
+SNAPSHOT_FORMAT_VERSION = 1
+
+
+class BaseTableSnapshotCache(ISnapshotCache):
+    """
+    Caches the post-delta base table of a repository (file filters, commit stats,
+    parent CK lookup and delta metrics applied, no config-specific cleaning) as
+    Parquet in object storage.
+
+    Snapshots are keyed by the repository's ingestion watermark and the applied
+    bot patterns, so ingesting new commits (or relinking bugs, or editing bot
+    patterns) yields a new key and the old snapshot is no longer used.
+    """
+
+    def __init__(self, storage_options: Dict, bucket_name: str):
+        self.storage_options = storage_options
+        self.base_uri = f"s3://{bucket_name}/snapshots"
+        self._fs: Optional[s3fs.S3FileSystem] = None
+        logger.debug("BaseTableSnapshotCache initialized.")
+
+    @property
+    def fs(self) -> s3fs.S3FileSystem:
+        """Lazy Initializer for the S3FileSystem instance."""
+        if self._fs is None:
+            self._fs = s3fs.S3FileSystem(**self.storage_options)
+        return self._fs
+
+    def _repository_prefix(self, repository_id: int) -> str:
+        return f"{self.base_uri}/repository_{repository_id}"
+
+    def _snapshot_uri(self, repository_id: int, key: str) -> str:
+        return f"{self._repository_prefix(repository_id)}/base_{key}.parquet"
+
+    @staticmethod
+    def _path(uri: str) -> str:
+        return uri.replace("s3://", "", 1)
+
+    def build_key(self, watermark: Dict[str, Any], bot_patterns: List[Any]) -> str:
+        payload = {
+            "version": SNAPSHOT_FORMAT_VERSION,
+            "watermark": watermark,
+            "bot_patterns": sorted(
+                (p.pattern, bool(p.is_exclusion)) for p in bot_patterns or []
+            ),
+        }
+        encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()[:20]
+
+    def find(self, repository_id: int, key: str) -> Optional[str]:
+        uri = self._snapshot_uri(repository_id, key)
+        try:
+            if self.fs.exists(self._path(uri)):
+                return uri
+        except Exception as e:
+            logger.warning(f"Could not check base table snapshot {uri}: {e}")
+        return None
+
+    def count_rows(self, snapshot_uri: str) -> int:
+        with self.fs.open(self._path(snapshot_uri), "rb") as f:
+            return pq.ParquetFile(f).metadata.num_rows
+
+    def stream_batches(
+        self, snapshot_uri: str, batch_size: int
+    ) -> Generator[pd.DataFrame, None, None]:
+        with self.fs.open(self._path(snapshot_uri), "rb") as f:
+            parquet_file = pq.ParquetFile(f)
+            for record_batch in parquet_file.iter_batches(batch_size=batch_size):
+                yield record_batch.to_pandas()
+
+    def open_writer(self, repository_id: int, key: str) -> "SnapshotWriter":
+        return SnapshotWriter(self, repository_id, key)
+
+    def _publish(self, repository_id: int, key: str, local_path: str) -> str:
+        """
+        Uploads a local snapshot file to a temporary object and moves it into
+        place, so a concurrent reader never sees a partial file.
+        """
+        uri = self._snapshot_uri(repository_id, key)
+        path = self._path(uri)
+        tmp_path = f"{path}.tmp"
+        try:
+            self.fs.mkdirs(
+                self._path(self._repository_prefix(repository_id)), exist_ok=True
+            )
+            self.fs.put(local_path, tmp_path)
+            self.fs.mv(tmp_path, path)
+        except Exception:
+            try:
+                if self.fs.exists(tmp_path):
+                    self.fs.rm(tmp_path)
+            except Exception:
+                pass
+            raise
+        self._remove_stale(repository_id, keep_path=path)
+        return uri
+
+    def _remove_stale(self, repository_id: int, keep_path: str):
+        """Deletes snapshots of the repository built from an older watermark."""
+        try:
+            prefix = self._path(self._repository_prefix(repository_id))
+            for stale in self.fs.glob(f"{prefix}/base_*.parquet"):
+                if stale.strip("/") != keep_path.strip("/"):
+                    self.fs.rm(stale)
+                    logger.info(f"Removed stale base table snapshot s3://{stale}")
+        except Exception as e:
+            logger.warning(
+                f"Could not prune stale snapshots for repository {repository_id}: {e}"
+            )
+
+
+class SnapshotWriter(ISnapshotWriter):
+    """
+    Streams base table batches into a local Parquet file, one row group per
+    batch, and uploads it on commit. Only the batch being written is held in
+    memory. Failures are logged and swallowed: the snapshot is an
+    optimisation, not part of the dataset.
+    """
+
+    def __init__(self, cache: BaseTableSnapshotCache, repository_id: int, key: str):
+        self.cache = cache
+        self.repository_id = repository_id
+        self.key = key
+        self._local_path: Optional[str] = None
+        self._writer: Optional[pq.ParquetWriter] = None
+        self._rows = 0
+        self._failed = False
+
+    def write(self, batch: pd.DataFrame) -> None:
+        if self._failed or batch is None or batch.empty:
+            return
+        try:
+            if self._writer is None:
+                table = pa.Table.from_pandas(batch, preserve_index=False)
+                with tempfile.NamedTemporaryFile(
+                    prefix="base_snapshot_", suffix=".parquet", delete=False
+                ) as f:
+                    self._local_path = f.name
+                self._writer = pq.ParquetWriter(
+                    self._local_path, table.schema, compression="snappy"
+                )
+            else:
+                # Later batches take the first batch's column types
+                table = pa.Table.from_pandas(
+                    batch, schema=self._writer.schema, preserve_index=False
+                )
+            self._writer.write_table(table)
+            self._rows += len(batch)
+        except Exception as e:
+            logger.warning(
+                f"Not storing base table snapshot {self.key}: could not write batch: {e}"
+            )
+            self.abort()
+
+    def commit(self) -> Optional[str]:
+        if self._failed or self._writer is None:
+            self.abort()
+            return None
+        try:
+            self._writer.close()
+            self._writer = None
+            uri = self.cache._publish(self.repository_id, self.key, self._local_path)
+            logger.info(f"Stored base table snapshot ({self._rows} rows) at {uri}")
+            return uri
+        except Exception as e:
+            logger.error(
+                f"Failed to store base table snapshot {self.key}: {e}", exc_info=True
+            )
+            return None
+        finally:
+            self._failed = True
+            self._close()
+
+    def abort(self) -> None:
+        self._failed = True
+        self._close()
+
+    def _close(self) -> None:
+        """Closes the Parquet writer and deletes the local file."""
+        if self._writer is not None:
+            try:
+                self._writer.close()
+            except Exception:
+                pass
+            self._writer = None
+        if self._local_path and os.path.exists(self._local_path):
+            os.remove(self._local_path)
+        self._local_path = None
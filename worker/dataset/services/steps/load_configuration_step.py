@@ -79,14 +79,13 @@ class LoadConfigurationStep(BaseDatasetStep):
                 )
 
             # --- Load Bot Patterns ---
-            # Use BotPatternRepository method
-            context.bot_patterns_db = list(
-                await asyncio.to_thread(
-                    bot_pattern_repo.get_patterns,
-                    repository_id=context.repository_db.id,
-                    include_global=True,
-                )
+            # Use BotPatternRepository method (returns (patterns, total))
+            bot_patterns, _ = await asyncio.to_thread(
+                bot_pattern_repo.get_patterns,
+                repository_id=context.repository_db.id,
+                include_global=True,
             )
+            context.bot_patterns_db = list(bot_patterns)
             step_logger.info(
                 f"Fetched {len(context.bot_patterns_db)} applicable bot patterns."
             )
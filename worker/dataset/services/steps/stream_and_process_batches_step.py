@@ -1,6 +1,6 @@
 # worker/dataset/services/steps/stream_and_process_batches_step.py
 import logging
-from typing import List
+from typing import Any, Dict, Generator, List, Optional, Tuple
 
 import pandas as pd
 
@@ -13,6 +13,8 @@ from services.interfaces import (
     IDataLoader,
     IDatasetGeneratorStep,
     IRepositoryFactory,
+    ISnapshotCache,
+    ISnapshotWriter,
 )
 
 # Import repositories needed by sub-steps
@@ -32,24 +34,97 @@ logger = logging.getLogger(__name__)
 
 
 class StreamAndProcessBatchesStep(IDatasetGeneratorStep):
-    """Fetches data in batches and applies batch-level processing steps."""
+    """
+    Fetches data in batches and applies batch-level processing steps.
+
+    The base steps (file filters, commit stats, parent lookup, deltas) do not
+    depend on the dataset config, so their output is cached as a snapshot of the
+    repository's base table. When a snapshot for the current ingestion watermark
+    exists, batches are streamed from it and only the config steps run.
+    """
 
     name = "Stream and Process Batches"
 
     def __init__(self):
         # Instantiate the sub-steps this orchestrator will run
-        self.batch_steps = [
+        self.base_steps = [
             ApplyFileFiltersStep(),
             CalculateCommitStatsStep(),
             GetParentCKMetricsStep(),
             CalculateDeltaMetricsStep(),
+        ]
+        self.config_steps = [
             ApplyBatchCleaningRulesStep(),
             DropMissingParentsStep(),
         ]
+        self.batch_steps = self.base_steps + self.config_steps
         logger.debug(
             f"Initialized with batch steps: {[s.name for s in self.batch_steps]}"
         )
 
+    def _run_sub_steps(
+        self,
+        batch_context: DatasetContext,
+        sub_steps: List[IDatasetGeneratorStep],
+        sub_step_deps: dict,
+        batch_num: int,
+        step_logger: StepLogger,
+    ) -> DatasetContext:
+        """Executes sub-steps sequentially on one batch, stopping if it empties."""
+        for sub_step in sub_steps:
+            if (
+                batch_context.processed_dataframe is None
+                or batch_context.processed_dataframe.empty
+            ):
+                step_logger.debug(
+                    f"Batch {batch_num} became empty before step [{sub_step.name}]. Skipping remaining batch steps."
+                )
+                break
+            step_logger.debug(
+                f"  Batch {batch_num}: Running sub-step [{sub_step.name}]..."
+            )
+            try:
+                batch_context = sub_step.execute(batch_context, **sub_step_deps)
+            except Exception as sub_step_err:
+                # Fail hard if a sub-step fails.
+                step_logger.error(
+                    f"Error in sub-step [{sub_step.name}] for batch {batch_num}: {sub_step_err}",
+                    exc_info=True,
+                )
+                raise RuntimeError(
+                    f"Sub-step [{sub_step.name}] failed"
+                ) from sub_step_err
+        return batch_context
+
+    def _read_watermark(
+        self, data_loader: IDataLoader, step_logger: StepLogger
+    ) -> Optional[Dict[str, Any]]:
+        try:
+            return data_loader.get_ingestion_watermark()
+        except Exception as e:
+            step_logger.warning(
+                f"Could not determine ingestion watermark, snapshot cache disabled for this run: {e}"
+            )
+            return None
+
+    def _find_snapshot(
+        self,
+        context: DatasetContext,
+        watermark: Optional[Dict[str, Any]],
+        snapshot_cache: Optional[ISnapshotCache],
+        step_logger: StepLogger,
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """Returns (snapshot key, URI of a valid snapshot or None)."""
+        if snapshot_cache is None or watermark is None:
+            return None, None
+        key = snapshot_cache.build_key(watermark, context.bot_patterns_db)
+        snapshot_uri = snapshot_cache.find(context.repository_db.id, key)
+        if snapshot_uri:
+            step_logger.info(f"Using base table snapshot {snapshot_uri}")
+        else:
+            step_logger.info(f"No base table snapshot for key {key}, building from DB.")
+        return key, snapshot_uri
+
     def execute(
         self,
         context: DatasetContext,
@@ -59,6 +134,7 @@ class StreamAndProcessBatchesStep(IDatasetGeneratorStep):
         cleaning_service: ICleaningService,
         job_status_updater: IJobStatusUpdater,  # For progress within the loop
         session_factory: callable,  # Needed for DataLoader
+        snapshot_cache: Optional[ISnapshotCache] = None,
         **kwargs,
     ) -> DatasetContext:
         log_prefix = f"Task {context.task_instance.request.id} - Step [{self.name}]"
@@ -86,16 +162,53 @@ class StreamAndProcessBatchesStep(IDatasetGeneratorStep):
             # Add other repos/services if sub-steps need them
         }
 
+        # --- Pin the commit range to the ingestion watermark ---
+        # The dataset records the watermark it was built from; a delta dataset
+        # (after_watermark set) only loads commits ingested after a previous one.
+        watermark = self._read_watermark(data_loader, step_logger)
+        if watermark is not None:
+            context.ingestion_watermark = watermark.get("guru_max_id")
+        after_watermark = context.dataset_config.after_watermark
+        data_loader.set_commit_id_range(after_watermark, context.ingestion_watermark)
+        if after_watermark is not None:
+            step_logger.info(
+                f"Building delta dataset from commits after watermark {after_watermark} "
+                f"(up to {context.ingestion_watermark})."
+            )
+            # Snapshots hold the whole base table; deltas are small enough to rebuild
+            snapshot_cache = None
+
+        # --- Choose the batch source: base table snapshot or DB ---
+        batch_size = 1000  # TODO: Make configurable?
+        snapshot_key, snapshot_uri = self._find_snapshot(
+            context, watermark, snapshot_cache, step_logger
+        )
+        batch_source: Generator[pd.DataFrame, None, None]
+        if snapshot_uri:
+            context.estimated_total_rows = max(
+                snapshot_cache.count_rows(snapshot_uri), 1
+            )
+            batch_source = snapshot_cache.stream_batches(snapshot_uri, batch_size)
+            sub_steps = self.config_steps
+        else:
+            context.estimated_total_rows = data_loader.estimate_total_rows()
+            batch_source = data_loader.stream_batches(batch_size)
+            sub_steps = self.base_steps
+        # Base batches are streamed to a new snapshot when none matched the key
+        snapshot_writer: Optional[ISnapshotWriter] = (
+            snapshot_cache.open_writer(context.repository_db.id, snapshot_key)
+            if snapshot_key and not snapshot_uri
+            else None
+        )
+
         # --- Batch Processing Loop ---
         step_logger.info("Starting data batch streaming and processing...")
-        batch_size = 1000  # TODO: Make configurable?
-        context.estimated_total_rows = data_loader.estimate_total_rows()
         processed_batches_list: List[pd.DataFrame] = []
         processed_row_count = 0
         batch_num = 0
 
         try:
-            for batch_df in data_loader.stream_batches(batch_size):
+            for batch_df in batch_source:
                 batch_num += 1
                 rows_in_batch = len(batch_df)
                 step_logger.debug(
@@ -110,31 +223,20 @@ class StreamAndProcessBatchesStep(IDatasetGeneratorStep):
                     processed_dataframe=batch_df,  # Start with the loaded batch
                 )
 
-                # Execute batch sub-steps sequentially
-                for sub_step in self.batch_steps:
-                    if (
-                        batch_context.processed_dataframe is None
-                        or batch_context.processed_dataframe.empty
-                    ):
-                        step_logger.debug(
-                            f"Batch {batch_num} became empty after step [{sub_step.name}]. Skipping remaining batch steps."
-                        )
-                        break
-                    step_logger.debug(
-                        f"  Batch {batch_num}: Running sub-step [{sub_step.name}]..."
+                batch_context = self._run_sub_steps(
+                    batch_context, sub_steps, sub_step_deps, batch_num, step_logger
+                )
+                if not snapshot_uri:
+                    # Base table rows for this batch (config steps don't mutate them)
+                    if snapshot_writer is not None:
+                        snapshot_writer.write(batch_context.processed_dataframe)
+                    batch_context = self._run_sub_steps(
+                        batch_context,
+                        self.config_steps,
+                        sub_step_deps,
+                        batch_num,
+                        step_logger,
                     )
-                    try:
-                        batch_context = sub_step.execute(batch_context, **sub_step_deps)
-                    except Exception as sub_step_err:
-                        # Log error but try to continue with next batch? Or fail hard?
-                        # Let's fail hard for now if a sub-step fails.
-                        step_logger.error(
-                            f"Error in sub-step [{sub_step.name}] for batch {batch_num}: {sub_step_err}",
-                            exc_info=True,
-                        )
-                        raise RuntimeError(
-                            f"Sub-step [{sub_step.name}] failed"
-                        ) from sub_step_err
 
                 # Add the final processed batch df to our list if not empty
                 if (
@@ -173,11 +275,20 @@ class StreamAndProcessBatchesStep(IDatasetGeneratorStep):
             step_logger.info(
                 f"Finished processing {batch_num} batches. Total rows after batch processing: {processed_row_count}"
             )
+            rule_hits = cleaning_service.get_rule_hit_counts()
+            if rule_hits:
+                step_logger.info(f"Batch cleaning rule hit counts: {rule_hits}")
 
         except Exception as e:
             step_logger.error(
                 f"Error during batch streaming/processing loop: {e}", exc_info=True
             )
+            if snapshot_writer is not None:
+                snapshot_writer.abort()
             raise  # Re-raise to fail the pipeline
 
+        # --- Persist the base table for later generations of this repository ---
+        if snapshot_writer is not None:
+            snapshot_writer.commit()
+
         return context
@@ -1,5 +1,8 @@
 # worker/dataset/services/steps/write_output_step.py
 import logging
+from typing import Optional
+
+import pandas as pd
 
 from services.context import DatasetContext
 
@@ -9,6 +12,7 @@ from shared.core.config import settings  # For bucket name etc.
 from shared.schemas.enums import DatasetStatusEnum
 from shared.services.interfaces import IJobStatusUpdater
 from shared.utils.pipeline_logging import StepLogger
+from shared.utils.xai_background import background_centroids_uri, summarize_background
 
 logger = logging.getLogger(__name__)
 
@@ -56,7 +60,6 @@ class WriteOutputStep(IDatasetGeneratorStep):
             context.dataset_config.target_column if context.dataset_config else None
         )
 
-        background_sample_written = False
         try:
             # --- Write Main Dataset ---
             step_logger.info(f"Writing main dataset to {context.output_storage_uri}...")
@@ -67,44 +70,21 @@ class WriteOutputStep(IDatasetGeneratorStep):
             )
             step_logger.info("Main dataset written successfully.")
 
-            # --- Write Background Sample ---
-            sample_size = 500
-            min_rows_for_sampling = 50
-
-            if context.rows_written >= min_rows_for_sampling:
-                step_logger.info(
-                    f"Creating background data sample (size={sample_size})..."
-                )
-                background_sample_df = df_final.sample(
-                    n=min(sample_size, context.rows_written), random_state=42
-                )
-                step_logger.info(
-                    f"Writing background sample ({background_sample_df.shape}) to {context.background_sample_uri}..."
-                )
-                output_writer.clear_existing(context.background_sample_uri)
-                output_writer.write_parquet(
-                    background_sample_df,
-                    context.background_sample_uri,
-                    target_column_name=target_column,
-                )
-                background_sample_written = True
-                step_logger.info("Background sample written successfully.")
-            else:
-                step_logger.warning(
-                    f"Dataset too small ({context.rows_written} rows) for background sampling (min: {min_rows_for_sampling}). Skipping."
-                )
-                context.background_sample_uri = (
-                    None  # Ensure URI is None if not written
-                )
+            # --- Write XAI Background Artifacts ---
+            # A stratified, feature-only sample and its k-means centroids, so XAI
+            # jobs read a few KB instead of the whole dataset. They are optional:
+            # XAI falls back to other background data when they're missing.
+            if not self._write_background_artifacts(
+                context, df_final, target_column, output_writer, step_logger
+            ):
+                context.background_sample_uri = None
 
             # --- Final Success Update in DB ---
             final_message = f"Dataset generated ({context.rows_written} rows)."
-            if background_sample_written:
+            if context.background_sample_uri:
                 final_message += " Background sample created."
-            else:
-                final_message += " Background sample skipped."
 
-            # --- Update Feature Columns in Config if Changed ---
+            # --- Update Feature Columns and Watermark in Config ---
             # Get the list of feature columns from the final DataFrame (all columns except the target)
             final_feature_columns = [
                 col for col in df_final.columns if col != target_column
@@ -112,15 +92,19 @@ class WriteOutputStep(IDatasetGeneratorStep):
 
             # Check if the feature columns have changed from the original config
             original_feature_columns = context.dataset_config.feature_columns
+            config_updates = {}
 
-            print("AAAAAAAAAA")
-            print(final_feature_columns)
-            print(original_feature_columns)
             if set(final_feature_columns) != set(original_feature_columns):
                 step_logger.info(
                     f"Feature columns have changed from {len(original_feature_columns)} to {len(final_feature_columns)}. Updating config in DB."
                 )
+                config_updates["feature_columns"] = final_feature_columns
 
+            # Recorded so a later delta dataset can start where this one ends
+            if context.ingestion_watermark is not None:
+                config_updates["watermark"] = context.ingestion_watermark
+
+            if config_updates:
                 # Fetch the existing Dataset object to modify its config
                 dataset_repo = (
                     repo_factory.get_dataset_repo()
@@ -128,16 +112,15 @@ class WriteOutputStep(IDatasetGeneratorStep):
                 dataset_db_obj = dataset_repo.get_by_id(context.dataset_id)
 
                 if dataset_db_obj:
-                    # Create a new config dictionary with the updated feature columns
-                    new_config = dataset_db_obj.config.copy()
-                    new_config["feature_columns"] = final_feature_columns
+                    # Create a new config dictionary with the updated values
+                    new_config = {**dataset_db_obj.config, **config_updates}
                     dataset_db_obj.config = new_config  # Assign the new dictionary to trigger SQLAlchemy's change detection
 
                     # The job_status_updater might not support updating arbitrary columns like `config`.
                     # So, we'll perform a direct repository update here.
                     dataset_repo.update_config(dataset_db_obj.id, new_config)
                     step_logger.info(
-                        "Dataset configuration updated with new feature columns."
+                        f"Dataset configuration updated ({', '.join(config_updates)})."
                     )
                 else:
                     step_logger.error(
@@ -179,7 +162,73 @@ class WriteOutputStep(IDatasetGeneratorStep):
                 output_writer.clear_existing(context.output_storage_uri)
             if context.background_sample_uri:
                 output_writer.clear_existing(context.background_sample_uri)
+                output_writer.clear_existing(
+                    background_centroids_uri(context.background_sample_uri)
+                )
             raise
 
         step_logger.info("Output writing and final status update complete.")
         return context
+
+    def _write_background_artifacts(
+        self,
+        context: DatasetContext,
+        df_final: pd.DataFrame,
+        target_column: Optional[str],
+        output_writer: IOutputWriter,
+        step_logger: StepLogger,
+    ) -> bool:
+        """
+        Writes the XAI background sample and its centroids. Failures are logged
+        and recorded as warnings instead of failing the dataset. Returns whether
+        the background sample was written.
+        """
+        sample_uri = context.background_sample_uri
+        centroids_uri = background_centroids_uri(sample_uri)
+        if target_column in df_final.columns:
+            features_df = df_final.drop(columns=[target_column])
+            target = df_final[target_column]
+        else:
+            features_df, target = df_final, None
+        max_rows = settings.ML_XAI_BACKGROUND_ROWS
+
+        try:
+            sample_df = summarize_background(
+                features_df, target, max_rows=max_rows, method="stratified"
+            )
+            step_logger.info(
+                f"Writing background sample ({sample_df.shape}) to {sample_uri}..."
+            )
+            output_writer.clear_existing(sample_uri)
+            output_writer.write_parquet(sample_df, sample_uri)
+        except Exception as e:
+            step_logger.warning(
+                f"Could not write background sample, continuing without it: {e}",
+                exc_info=True,
+            )
+            context.warnings.append(f"Background sample not created: {e}")
+            output_writer.clear_existing(sample_uri)
+            return False
+
+        # k-means centroids of the numeric features
+        numeric_df = features_df.select_dtypes(include=["number", "bool"])
+        output_writer.clear_existing(centroids_uri)
+        if numeric_df.shape[1] == 0:
+            step_logger.warning("No numeric feature columns; skipping centroids.")
+            return True
+        try:
+            centroids_df = summarize_background(
+                numeric_df, max_rows=max_rows, method="kmeans"
+            )
+            step_logger.info(
+                f"Writing background centroids ({centroids_df.shape}) to {centroids_uri}..."
+            )
+            output_writer.write_parquet(centroids_df, centroids_uri)
+        except Exception as e:
+            step_logger.warning(
+                f"Could not write background centroids, continuing without them: {e}",
+                exc_info=True,
+            )
+            context.warnings.append(f"Background centroids not created: {e}")
+            output_writer.clear_existing(centroids_uri)
+        return True
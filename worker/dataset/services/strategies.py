@@ -6,7 +6,6 @@ from typing import List, Type
 # Import step interface and concrete step classes
 from services.interfaces import IDatasetGeneratorStep
 from services.steps import (
-    ApplyBotPatternsStep,
     FeatureSelectionStep,
     LoadConfigurationStep,
     ProcessGloballyStep,
@@ -31,6 +30,9 @@ class DefaultDatasetGenerationStrategy(IDatasetGenerationStrategy):
     """
     Standard strategy for generating a dataset:
     Load -> Process Batches -> Process Globally -> Select Columns -> Write Output
+
+    Bot-authored commits are excluded by the DataLoader query while streaming,
+    so no separate bot-filtering pass runs over the global DataFrame.
     """
 
     def get_steps(self) -> List[Type[IDatasetGeneratorStep]]:
@@ -39,7 +41,6 @@ class DefaultDatasetGenerationStrategy(IDatasetGenerationStrategy):
             LoadConfigurationStep,
             StreamAndProcessBatchesStep,  # This step orchestrates batch sub-steps
             ProcessGloballyStep,  # This step orchestrates global sub-steps
-            ApplyBotPatternsStep,
             SelectFinalColumnsStep,
             FeatureSelectionStep,
             WriteOutputStep,
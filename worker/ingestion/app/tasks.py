@@ -2,6 +2,7 @@
 import asyncio  # For async tasks
 import logging  # Use standard logging
 from pathlib import Path
+from typing import Optional
 
 from celery import shared_task
 from celery.exceptions import Reject, Terminated
@@ -16,6 +17,7 @@ from services.strategies import (
 )
 
 from shared.celery_config.base_task import EventPublishingTask  # Import new base task
+from shared.celery_config.routing import inference_priority
 from shared.core.config import settings
 from shared.db.models import InferenceJob
 from shared.db_session import SyncSessionLocal
@@ -32,6 +34,7 @@ async def _ingest_features_for_inference_async(
     inference_job_id: int,
     repo_id: int,
     commit_hash_input: str,
+    trigger_source: Optional[str] = None,
 ):
     """
     Celery task to orchestrate feature extraction for a single commit inference
@@ -97,9 +100,14 @@ async def _ingest_features_for_inference_async(
 
         prediction_task_name = "tasks.inference_predict"  # From ml_worker
         prediction_task_args = [inference_job_id]
-        # Celery's send_task is synchronous for dispatching, result is AsyncResult
+        # Mark before dispatch so the ML worker may coalesce this job into a batch
+        job_status_updater.mark_inference_prediction_queued(inference_job_id)
+        # Celery's send_task is synchronous for dispatching, result is AsyncResult.
+        # Webhook-triggered predictions jump ahead of manual and batch ones.
         prediction_task_dispatch = celery_app.send_task(
-            prediction_task_name, args=prediction_task_args, queue="ml_queue"
+            prediction_task_name,
+            args=prediction_task_args,
+            priority=inference_priority(trigger_source),
         )
 
         if not prediction_task_dispatch or not prediction_task_dispatch.id:
@@ -297,6 +305,7 @@ def ingest_features_for_inference_task(
     inference_job_id: int,
     repo_id: int,
     commit_hash_input: str,
+    trigger_source: Optional[str] = None,
 ):
     """
     Synchronous wrapper so the prefork worker gets a *real* return
@@ -304,7 +313,7 @@ def ingest_features_for_inference_task(
     """
     return asyncio.run(
         _ingest_features_for_inference_async(
-            self, inference_job_id, repo_id, commit_hash_input
+            self, inference_job_id, repo_id, commit_hash_input, trigger_source
         )
     )
 
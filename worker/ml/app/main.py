@@ -1,12 +1,13 @@
 # worker/ml/app/main.py
 import logging
+import threading
 from typing import Any, Dict, List
 
-from services.strategies.lightgbm_strategy import LightGBMStrategy
-from services.strategies.sklearn_strategy import SklearnStrategy
-from services.strategies.xgboost_strategy import XGBoostStrategy
+from celery.signals import worker_init, worker_process_init
+from services.factories.model_strategy_factory import get_all_model_strategy_classes
 
 from shared.celery_config.app import create_celery_app
+from shared.celery_config.routing import configure_worker_pool
 from shared.core.config import settings
 from shared.db_session.sync_session import get_sync_db_session
 from shared.repositories.ml_model_type_definition_repository import (
@@ -26,11 +27,9 @@ celery_app = create_celery_app(
     include_tasks=["app.tasks"],  # Path relative to where celery worker cmd is run
 )
 
-# Optional: Add ML worker-specific Celery config here if needed
-# celery_app.conf.update(
-#     # Example: Set prefetch multiplier if needed for GPU tasks
-#     worker_prefetch_multiplier=1,
-# )
+# Concurrency, prefetch and queues of the worker pool this process runs
+# (inference, batch training / HP search, or XAI)
+configure_worker_pool(celery_app, settings.CELERY_WORKER_POOL)
 
 WORKER_IDENTIFIER = "ml-worker"  # Identifier for this worker
 
@@ -42,13 +41,9 @@ def discover_and_prepare_model_type_definitions() -> List[Dict[str, Any]]:
     """
     definitions_for_db: List[Dict[str, Any]] = []
 
-    # List all strategy classes that define supported model types
-    strategy_classes = [
-        SklearnStrategy,
-        XGBoostStrategy,
-        LightGBMStrategy,
-        # Add other strategy classes here
-    ]
+    # All strategy classes that define supported model types. Strategy modules
+    # import their ML libraries on use, so this doesn't load them.
+    strategy_classes = get_all_model_strategy_classes()
 
     discovered_type_names = set()
 
@@ -112,9 +107,11 @@ def discover_and_prepare_model_type_definitions() -> List[Dict[str, Any]]:
     return definitions_for_db
 
 
-def update_model_type_registry_in_db():
+@worker_init.connect
+def update_model_type_registry_in_db(**kwargs):
     """
     Discovers model type definitions and upserts them into the database.
+    Runs once in the worker's main process at startup, before the pool forks.
     """
     logger.info("Updating ML model type registry in database...")
     definitions = discover_and_prepare_model_type_definitions()
@@ -139,28 +136,30 @@ def update_model_type_registry_in_db():
         )
 
 
-logger.info("Celery app created for ML worker.")
+@worker_process_init.connect
+def warm_up_model_cache_on_process_init(**kwargs):
+    """
+    Preloads configured models into this process's model cache. Runs in a
+    background thread so slow downloads don't trip the process-init timeout;
+    jobs needing a model that is still loading wait on the cache lock.
+    """
+    model_ids = settings.ML_MODEL_CACHE_WARMUP_MODEL_IDS
+    if not model_ids:
+        return
+
+    def _warm_up():
+        from services.dependencies import DependencyProvider
+        from services.model_cache import warm_up_model_cache
+
+        provider = DependencyProvider()
+        warm_up_model_cache(
+            model_ids,
+            provider.get_model_repository(),
+            provider.get_artifact_service(),
+        )
 
-# Discover and update ML model type definitions in DB
-update_model_type_registry_in_db()
-
-# Initialize Optuna storage (can be done here or lazy-loaded in tasks)
-# This ensures Optuna knows about the DB URL early.
-try:
-    import optuna
-
-    optuna.logging.set_verbosity(optuna.logging.DEBUG)
-    # Check if the database URL is set
-    if settings.OPTUNA_DB_URL:
-        # This doesn't create tables, just configures Optuna's default storage factory
-        optuna.storages.RDBStorage(url=str(settings.OPTUNA_DB_URL))
-        logger.info("Optuna RDBStorage configured with URL from settings.")
-        # Actual study creation will handle table creation if needed.
-    else:
-        logger.warning("OPTUNA_DB_URL not set. Optuna will use in-memory storage.")
-except ImportError:
-    logger.warning(
-        "Optuna library not found. Hyperparameter search features will be unavailable."
-    )
-except Exception as e:
-    logger.error(f"Error configuring Optuna storage: {e}", exc_info=True)
+    logger.info(f"Warming up model cache with MLModel IDs: {model_ids}")
+    threading.Thread(target=_warm_up, name="model-cache-warmup", daemon=True).start()
+
+
+logger.info("Celery app created for ML worker.")
@@ -1,17 +1,21 @@
 # worker/ml/app/tasks.py
 import asyncio
 import logging
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
-from celery import shared_task
+from celery import chord, shared_task
 from celery.exceptions import Ignore, Reject, Terminated
 
 # --- Import Dependency Provider ---
 from services.dependencies import DependencyProvider
-from services.handlers.hp_search_handler import HPSearchJobHandler
+from services.handlers.batch_inference_handler import BatchInferenceHandler
 from services.handlers.inference_handler import InferenceJobHandler
 
 # --- Import Handlers ---
 from services.handlers.training_handler import TrainingJobHandler
+from services.handlers.xai_batch_explanation_handler import (
+    XAIBatchExplanationHandler,
+)
 from services.handlers.xai_explanation_handler import XAIExplanationHandler
 from services.handlers.xai_orchestration_handler import XAIOrchestrationHandler
 
@@ -27,6 +31,11 @@ from shared.db_session import SyncSessionLocal
 # Import Celery app instance if needed for dispatching other tasks
 from .main import celery_app
 
+# The HP search handler brings in Optuna and the CV objective; it is imported
+# by the HP search tasks so other workers never load them
+if TYPE_CHECKING:
+    from services.handlers.hp_search_handler import HPSearchJobHandler
+
 logger = logging.getLogger(__name__)
 logger.setLevel(settings.LOG_LEVEL.upper())
 
@@ -185,13 +194,53 @@ def train_model_task(self: EventPublishingTask, training_job_id: int):
     return asyncio.run(_train_model_task_async(self, training_job_id))
 
 
+def _build_hp_search_handler(
+    self: EventPublishingTask, provider: DependencyProvider, hp_search_job_id: int
+) -> "HPSearchJobHandler":
+    from services.handlers.hp_search_handler import HPSearchJobHandler
+
+    return HPSearchJobHandler(
+        job_id=hp_search_job_id,
+        task_instance=self,
+        # --- Inject Dependencies ---
+        status_updater=provider.get_job_status_updater(),
+        model_repo=provider.get_model_repository(),
+        xai_repo=provider.get_xai_result_repository(),
+        feature_repo=provider.get_ml_feature_repository(),
+        artifact_service=provider.get_artifact_service(),
+        dataset_repo=provider.get_dataset_repository(),
+        hp_search_job_repo=provider.get_hp_search_job_repository(),
+    )
+
+
+def _dispatch_hp_search_trial_workers(hp_search_job_id: int, n_workers: int) -> str:
+    """Fans out trial workers on the shared study; the finalizer runs once after all of them."""
+    trial_workers = [
+        celery_app.signature(
+            "tasks.hp_search_trial_worker",
+            args=[hp_search_job_id, worker_index],
+        )
+        for worker_index in range(n_workers)
+    ]
+    finalizer = celery_app.signature(
+        "tasks.hp_search_finalize", args=[hp_search_job_id]
+    )
+    return chord(trial_workers)(finalizer).id
+
+
 async def _hyperparameter_search_task_async(
-    self: EventPublishingTask, hp_search_job_id: int
+    self: EventPublishingTask,
+    hp_search_job_id: int,
+    worker_results: Optional[List[Dict[str, Any]]] = None,
 ):
-    """Async implementation of hyperparameter search task."""
+    """
+    Async implementation of hyperparameter search task. With worker_results
+    it finalizes a search whose trials were run by parallel trial workers.
+    """
     task_id = self.request.id
+    finalize_only = worker_results is not None
     logger.info(
-        f"Task {task_id}: Received HP search request for Job ID {hp_search_job_id}"
+        f"Task {task_id}: Received HP search {'finalize ' if finalize_only else ''}request for Job ID {hp_search_job_id}"
     )
     final_task_result = {
         "job_id": hp_search_job_id,
@@ -202,21 +251,42 @@ async def _hyperparameter_search_task_async(
     try:
         # --- Instantiate Provider and Handler ---
         provider = DependencyProvider()
-        handler = HPSearchJobHandler(
-            job_id=hp_search_job_id,
-            task_instance=self,
-            # --- Inject Dependencies ---
-            status_updater=provider.get_job_status_updater(),
-            model_repo=provider.get_model_repository(),
-            xai_repo=provider.get_xai_result_repository(),
-            feature_repo=provider.get_ml_feature_repository(),
-            artifact_service=provider.get_artifact_service(),
-            dataset_repo=provider.get_dataset_repository(),
-            hp_search_job_repo=provider.get_hp_search_job_repository(),
-        )
+        handler = _build_hp_search_handler(self, provider, hp_search_job_id)
+
+        n_workers = 1 if finalize_only else handler.requested_parallel_workers()
+        if n_workers > 1 and not settings.CELERY_RESULT_BACKEND:
+            logger.warning(
+                f"Task {task_id}: {n_workers} parallel workers requested for HP Search Job "
+                f"{hp_search_job_id}, but no CELERY_RESULT_BACKEND is configured. Running in this task."
+            )
+            n_workers = 1
 
         # --- Execute Handler ---
-        final_task_result = await handler.process_job()
+        if finalize_only:
+            failed_workers = [
+                r for r in worker_results if r.get("status") == JobStatusEnum.FAILED
+            ]
+            if failed_workers:
+                logger.warning(
+                    f"Task {task_id}: {len(failed_workers)}/{len(worker_results)} trial workers of "
+                    f"HP Search Job {hp_search_job_id} failed: {[r.get('error') for r in failed_workers]}"
+                )
+            final_task_result = await handler.process_job(finalize_only=True)
+            final_task_result["trials_run_per_worker"] = [
+                r.get("trials_run", 0) for r in worker_results
+            ]
+        elif n_workers > 1:
+            final_task_result = await handler.prepare_parallel_search(n_workers)
+            if final_task_result.get("status") == JobStatusEnum.RUNNING:
+                final_task_result["chord_id"] = _dispatch_hp_search_trial_workers(
+                    hp_search_job_id, n_workers
+                )
+                logger.info(
+                    f"Task {task_id}: Dispatched {n_workers} trial workers for HP Search Job {hp_search_job_id}."
+                )
+                return final_task_result
+        else:
+            final_task_result = await handler.process_job()
 
         # --- Update Celery Task State (based on handler result) ---
         handler_status = final_task_result.get("status")
@@ -337,6 +407,187 @@ def hyperparameter_search_task(self: EventPublishingTask, hp_search_job_id: int)
     return asyncio.run(_hyperparameter_search_task_async(self, hp_search_job_id))
 
 
+async def _hp_search_trial_worker_task_async(
+    self: EventPublishingTask, hp_search_job_id: int, worker_index: int
+):
+    """Async implementation of one parallel HP search trial worker."""
+    task_id = self.request.id
+    logger.info(
+        f"Task {task_id}: Trial worker {worker_index} starting for HP Search Job {hp_search_job_id}"
+    )
+    try:
+        provider = DependencyProvider()
+        handler = _build_hp_search_handler(self, provider, hp_search_job_id)
+        worker_result = await handler.run_trial_worker(worker_index)
+    except Terminated:
+        logger.warning(f"Task {task_id}: Terminated.")
+        raise
+    except Exception as e:
+        # Never fail the chord header: the finalizer must still run
+        logger.error(
+            f"Task {task_id}: Trial worker {worker_index} for HP Search Job {hp_search_job_id} failed: {e}",
+            exc_info=True,
+        )
+        worker_result = {
+            "job_id": hp_search_job_id,
+            "worker_index": worker_index,
+            "status": JobStatusEnum.FAILED,
+            "trials_run": 0,
+            "error": str(e)[:500],
+        }
+    logger.info(
+        f"Task {task_id}: Trial worker {worker_index} for HP Search Job {hp_search_job_id} "
+        f"finished with {worker_result.get('status')} after {worker_result.get('trials_run', 0)} trials."
+    )
+    return worker_result
+
+
+@shared_task(
+    bind=True,
+    name="tasks.hp_search_trial_worker",
+    acks_late=True,
+    base=EventPublishingTask,
+)
+def hp_search_trial_worker_task(
+    self: EventPublishingTask, hp_search_job_id: int, worker_index: int
+):
+    """Celery task facade for one trial worker of a parallel HP search."""
+    return asyncio.run(
+        _hp_search_trial_worker_task_async(self, hp_search_job_id, worker_index)
+    )
+
+
+@shared_task(
+    bind=True,
+    name="tasks.hp_search_finalize",
+    acks_late=True,
+    base=EventPublishingTask,
+)
+def hp_search_finalize_task(
+    self: EventPublishingTask,
+    worker_results: List[Dict[str, Any]],
+    hp_search_job_id: int,
+):
+    """Chord callback of a parallel HP search: saves the best model and completes the job once."""
+    return asyncio.run(
+        _hyperparameter_search_task_async(
+            self, hp_search_job_id, worker_results=worker_results or []
+        )
+    )
+
+
+def _dispatch_xai_orchestrations(task_id: str, job_ids: List[int]) -> Dict[int, str]:
+    """Sends one XAI orchestration task per job. Returns dispatched task IDs by job ID."""
+    dispatched = {}
+    for job_id in job_ids:
+        try:
+            orchestration_task = celery_app.send_task(
+                "tasks.orchestrate_xai", args=[job_id]
+            )
+            dispatched[job_id] = orchestration_task.id
+        except Exception as dispatch_err:
+            logger.error(
+                f"Task {task_id}: Failed to dispatch XAI task for job {job_id}: {dispatch_err}",
+                exc_info=True,
+            )
+    logger.info(
+        f"Task {task_id}: Dispatched XAI orchestration for {len(dispatched)}/{len(job_ids)} job(s)."
+    )
+    return dispatched
+
+
+def _build_batch_inference_handler(
+    self: EventPublishingTask,
+    provider: DependencyProvider,
+    job_ids: List[int],
+    batch_id: str,
+) -> BatchInferenceHandler:
+    return BatchInferenceHandler(
+        job_ids=job_ids,
+        batch_id=batch_id,
+        task_instance=self,
+        status_updater=provider.get_job_status_updater(),
+        model_repo=provider.get_model_repository(),
+        xai_repo=provider.get_xai_result_repository(),
+        feature_repo=provider.get_ml_feature_repository(),
+        artifact_service=provider.get_artifact_service(),
+        inference_job_repo=provider.get_inference_job_repository(),
+    )
+
+
+async def _coalesce_inference_predict(
+    self: EventPublishingTask, provider: DependencyProvider, inference_job_id: int
+) -> Optional[Dict[str, Any]]:
+    """
+    Micro-batching for single-commit jobs: waits for the coalescing window, then
+    claims every queued job of the same model (including this one) and predicts
+    them together. Returns None when the job is not eligible (it then runs on the
+    regular per-job path).
+    """
+    task_id = self.request.id
+    inference_job_repo = provider.get_inference_job_repository()
+    job = inference_job_repo.get_by_id(inference_job_id)
+    if not job or job.prediction_queued_at is None:
+        return None
+
+    await asyncio.sleep(settings.ML_INFERENCE_COALESCE_WINDOW_MS / 1000)
+    # Deterministic per task, so a redelivered task re-claims its own batch
+    batch_id = f"coalesced-{task_id}"
+    job_ids = await asyncio.to_thread(
+        inference_job_repo.claim_queued_jobs,
+        job.ml_model_id,
+        batch_id,
+        task_id,
+        settings.ML_INFERENCE_COALESCE_MAX_JOBS,
+    )
+    if inference_job_id not in job_ids:
+        if job_ids:
+            # Should not happen (our own job was claimed elsewhere first), but
+            # the jobs we did claim still need to be predicted
+            logger.warning(
+                f"Task {task_id}: Job {inference_job_id} was claimed elsewhere; predicting {len(job_ids)} other claimed job(s)."
+            )
+        else:
+            logger.info(
+                f"Task {task_id}: Inference Job {inference_job_id} was already coalesced into another task's batch."
+            )
+            return {
+                "job_id": inference_job_id,
+                "status": JobStatusEnum.SKIPPED,
+                "message": "Prediction coalesced into another task's batch.",
+            }
+
+    logger.info(
+        f"Task {task_id}: Coalesced {len(job_ids)} queued inference job(s) into batch {batch_id}."
+    )
+    handler = _build_batch_inference_handler(self, provider, job_ids, batch_id)
+    batch_result = await handler.process_job()
+    batch_result["job_id"] = inference_job_id
+    batch_result["xai_orchestration_task_ids"] = _dispatch_xai_orchestrations(
+        task_id, batch_result["run_xai_job_ids"]
+    )
+    if inference_job_id in batch_result["succeeded_job_ids"]:
+        await self.update_task_state(
+            state=JobStatusEnum.SUCCESS,
+            status_message="Prediction successful",
+            progress=100,
+            result_summary=batch_result,
+            job_type="inference",
+            entity_id=inference_job_id,
+            entity_type="InferenceJob",
+        )
+    elif inference_job_id in batch_result["failed_job_ids"]:
+        await self.update_task_state(
+            state=JobStatusEnum.FAILED,
+            status_message="Prediction failed",
+            error_details=batch_result["message"],
+            job_type="inference",
+            entity_id=inference_job_id,
+            entity_type="InferenceJob",
+        )
+    return batch_result
+
+
 async def _inference_predict_task_async(
     self: EventPublishingTask, inference_job_id: int
 ):
@@ -355,6 +606,12 @@ async def _inference_predict_task_async(
     try:
         # --- Instantiate Provider and Handler ---
         provider = DependencyProvider()
+        if settings.ML_INFERENCE_COALESCE_WINDOW_MS > 0:
+            coalesced_result = await _coalesce_inference_predict(
+                self, provider, inference_job_id
+            )
+            if coalesced_result is not None:
+                return coalesced_result
         handler = InferenceJobHandler(
             job_id=inference_job_id,
             task_instance=self,
@@ -398,7 +655,7 @@ async def _inference_predict_task_async(
             args = [inference_job_id]
             try:
                 orchestration_task = celery_app.send_task(
-                    orchestration_task_name, args=args, queue="ml_queue"
+                    orchestration_task_name, args=args
                 )
                 if orchestration_task and orchestration_task.id:
                     logger.info(
@@ -516,6 +773,99 @@ def inference_predict_task(self: EventPublishingTask, inference_job_id: int):
     return asyncio.run(_inference_predict_task_async(self, inference_job_id))
 
 
+async def _batch_inference_predict_task_async(self: EventPublishingTask, batch_id: str):
+    """Async implementation of the batch inference prediction task."""
+    task_id = self.request.id
+    logger.info(f"Task {task_id}: Starting batch prediction for batch {batch_id}")
+    job_ids: List[int] = []
+    try:
+        provider = DependencyProvider()
+        job_ids = await asyncio.to_thread(
+            provider.get_inference_job_repository().start_batch, batch_id, task_id
+        )
+        if not job_ids:
+            raise Ignore(f"No pending inference jobs in batch {batch_id}.")
+
+        handler = _build_batch_inference_handler(self, provider, job_ids, batch_id)
+        batch_result = await handler.process_job()
+        batch_result["xai_orchestration_task_ids"] = _dispatch_xai_orchestrations(
+            task_id, batch_result["run_xai_job_ids"]
+        )
+
+        if batch_result["succeeded_job_ids"]:
+            await self.update_task_state(
+                state=JobStatusEnum.SUCCESS,
+                status_message=batch_result["message"],
+                progress=100,
+                result_summary=batch_result,
+                job_type="inference",
+            )
+        else:
+            await self.update_task_state(
+                state=JobStatusEnum.FAILED,
+                status_message="Batch prediction failed",
+                error_details=batch_result["message"],
+                job_type="inference",
+            )
+        return batch_result
+
+    except Terminated as e:
+        logger.warning(f"Task {task_id}: Terminated.")
+        await self.update_task_state(
+            state="REVOKED",
+            status_message="Task terminated",
+            error_details=str(e),
+            job_type="inference",
+        )
+        raise e
+    except Ignore as e:
+        logger.info(f"Task {task_id}: Ignored. Reason: {e}")
+        await self.update_task_state(
+            state=JobStatusEnum.SUCCESS,
+            status_message=f"Task ignored: {str(e)}",
+            job_type="inference",
+        )
+        return {"status": "IGNORED", "message": str(e)}
+    except Exception as e:
+        error_msg = f"Unhandled exception in task {task_id} for batch {batch_id}: {type(e).__name__}: {e}"
+        logger.critical(error_msg, exc_info=True)
+        try:  # Last resort DB update
+            DependencyProvider().get_inference_job_repository().complete_jobs(
+                [
+                    {
+                        "id": job_id,
+                        "status": JobStatusEnum.FAILED,
+                        "status_message": error_msg[:1000],
+                        "prediction_result": {"error": error_msg[:500]},
+                    }
+                    for job_id in job_ids
+                ]
+            )
+        except Exception as final_db_err:
+            logger.error(
+                f"Task {task_id}: Failed last resort DB update: {final_db_err}"
+            )
+        await self.update_task_state(
+            state=JobStatusEnum.FAILED,
+            status_message="Unhandled exception",
+            error_details=error_msg[:1000],
+            job_type="inference",
+        )
+        raise Reject(error_msg, requeue=False) from e
+
+
+# === Batch Inference Prediction Task ===
+@shared_task(
+    bind=True,
+    name="tasks.batch_inference_predict",
+    acks_late=True,
+    base=EventPublishingTask,
+)
+def batch_inference_predict_task(self: EventPublishingTask, batch_id: str):
+    """Predicts all jobs of a batch with one model load and vectorised predict calls."""
+    return asyncio.run(_batch_inference_predict_task_async(self, batch_id))
+
+
 async def _orchestrate_xai_task_async(self: EventPublishingTask, inference_job_id: int):
     """Async implementation of XAI orchestration task."""
     task_id = self.request.id
@@ -748,3 +1098,101 @@ async def _generate_explanation_task_async(
 def generate_explanation_task(self: EventPublishingTask, xai_result_id: int):
     """Celery task facade for generating specific XAI explanation using a handler."""
     return asyncio.run(_generate_explanation_task_async(self, xai_result_id))
+
+
+async def _generate_explanations_task_async(
+    self: EventPublishingTask, xai_result_ids: List[int]
+):
+    """Async implementation of the combined explanation generation task."""
+    task_id = self.request.id
+    logger.info(
+        f"Task {task_id}: Received combined explanation generation request for XAIResult IDs {xai_result_ids}"
+    )
+    # Task events are reported against the first XAIResult of the batch
+    entity_id = xai_result_ids[0] if xai_result_ids else None
+
+    try:
+        provider = DependencyProvider()
+        handler = XAIBatchExplanationHandler(
+            xai_result_ids=xai_result_ids,
+            task_instance=self,
+            # --- Inject Dependencies ---
+            xai_repo=provider.get_xai_result_repository(),
+            model_repo=provider.get_model_repository(),
+            feature_repo=provider.get_ml_feature_repository(),
+            artifact_service=provider.get_artifact_service(),
+            inference_job_repo=provider.get_inference_job_repository(),
+            dataset_repo=provider.get_dataset_repository(),
+        )
+
+        # Handler writes all XAIResult rows and returns a per-record summary
+        final_task_result = await handler.process_explanations()
+
+        succeeded = final_task_result["succeeded"]
+        await self.update_task_state(
+            state=JobStatusEnum.SUCCESS if succeeded else JobStatusEnum.FAILED,
+            status_message=(
+                f"Generated {succeeded}/{len(final_task_result['xai_result_statuses'])} explanations"
+            ),
+            progress=100,
+            result_summary=final_task_result,
+            job_type="xai_explanation",
+            entity_id=entity_id,
+            entity_type="XAIResult",
+        )
+        return final_task_result
+
+    except Terminated as e:
+        logger.warning(f"Task {task_id}: Terminated.")
+        await self.update_task_state(
+            state="REVOKED",
+            status_message="Task terminated",
+            error_details=str(e),
+            job_type="xai_explanation",
+            entity_id=entity_id,
+            entity_type="XAIResult",
+        )
+        raise e
+    except Ignore as e:
+        logger.info(f"Task {task_id}: Ignored. Reason: {e}")
+        await self.update_task_state(
+            state=JobStatusEnum.SUCCESS,
+            status_message=f"Task ignored: {str(e)}",
+            job_type="xai_explanation",
+            entity_id=entity_id,
+            entity_type="XAIResult",
+        )
+        return {"status": "IGNORED", "message": str(e)}
+    except Exception as e:
+        error_msg = f"Unhandled exception in task {task_id} for XAI results {xai_result_ids}: {type(e).__name__}: {e}"
+        logger.critical(error_msg, exc_info=True)
+        # Last resort DB update
+        try:
+            DependencyProvider().get_xai_result_repository().mark_xai_results_failed_sync(
+                xai_result_ids, error_msg
+            )
+        except Exception as final_db_err:
+            logger.error(
+                f"Task {task_id}: Failed last resort DB update: {final_db_err}"
+            )
+        await self.update_task_state(
+            state=JobStatusEnum.FAILED,
+            status_message="Unhandled exception",
+            error_details=error_msg[:1000],
+            job_type="xai_explanation",
+            entity_id=entity_id,
+            entity_type="XAIResult",
+        )
+        raise Reject(error_msg, requeue=False) from e
+
+
+# === Combined Explanation Generation Task ===
+@shared_task(
+    bind=True,
+    name="tasks.generate_explanations",
+    acks_late=True,
+    base=EventPublishingTask,
+)
+def generate_explanations_task(self: EventPublishingTask, xai_result_ids: List[int]):
+    """Generates several XAI explanations of one inference job in a single pass."""
+    return asyncio.run(_generate_explanations_task_async(self, xai_result_ids))
@@ -4,14 +4,14 @@
 # Exit immediately if a command exits with a non-zero status.
 set -e
 
-# Default queues if not passed as argument
-QUEUES=${1:-ml_queue,xai_queue} # Default to both if no arg given
+# Worker pool to run (see shared/celery_config/routing.py): ml_inference,
+# ml_batch, ml_xai, or ml to consume every ML queue from one worker
+export CELERY_WORKER_POOL=${1:-${CELERY_WORKER_POOL:-ml}}
 
 echo "--- ML Worker Entrypoint ---"
 echo "Using Log Level: ${LOG_LEVEL:-INFO}"
-echo "Starting Celery worker for queue(s): ${QUEUES}"
+echo "Starting Celery worker pool: ${CELERY_WORKER_POOL}"
 echo "------------------------------------"
 
-# Use exec, pass queues, maybe set concurrency
-# Example: setting concurrency to 1 for GPU tasks on ml_queue, maybe higher for xai_queue if separate worker
-exec python3 -m celery -A app.main.celery_app worker --loglevel=${LOG_LEVEL:-INFO} -Q ${QUEUES} -c 1
+# Queues, concurrency and prefetch come from the pool definition
+exec python3 -m celery -A app.main.celery_app worker --loglevel=${LOG_LEVEL:-INFO}
@@ -1,7 +1,8 @@
 # worker/ml/services/artifact_service.py
 import logging
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Dict, Iterator, List, Optional, Sequence
 
 # import pickle # Remove pickle
 import joblib  # Add joblib for safer serialization
@@ -12,6 +13,8 @@ import s3fs
 
 # Import the new interface
 from services.interfaces import IArtifactService
+from services.local_artifact_cache import local_artifact_cache
+from services.model_cache import model_cache
 from shared.core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -96,8 +99,11 @@ class ArtifactService(IArtifactService):
                     )
             return False
 
-    def load_artifact(self, uri: str) -> Optional[Any]:
-        """Loads a Python object from S3 using joblib."""
+    def load_artifact(self, uri: str, etag: Optional[str] = None) -> Optional[Any]:
+        """
+        Loads a Python object from S3 using joblib. `etag`, when the caller
+        already has it, saves the local cache another HEAD request.
+        """
         if not uri:
             logger.error("Cannot load artifact: S3 URI is empty.")
             return None
@@ -107,13 +113,20 @@ class ArtifactService(IArtifactService):
             s3_path = self._get_s3_path(uri)
             logger.info(f"Attempting to load artifact from: {uri} using joblib")
 
-            if not fs_client.exists(s3_path):
-                logger.error(f"Artifact not found at S3 location: {uri}")
-                return None
+            if local_artifact_cache.enabled:
+                local_path = self._get_local_copy(uri, etag=etag)
+                if local_path is None:
+                    logger.error(f"Artifact not found at S3 location: {uri}")
+                    return None
+                artifact = joblib.load(local_path)
+            else:
+                if not fs_client.exists(s3_path):
+                    logger.error(f"Artifact not found at S3 location: {uri}")
+                    return None
 
-            with fs_client.open(s3_path, "rb") as f:
-                # Replace pickle.load with joblib.load
-                artifact = joblib.load(f)
+                with fs_client.open(s3_path, "rb") as f:
+                    # Replace pickle.load with joblib.load
+                    artifact = joblib.load(f)
 
             logger.info(f"Successfully loaded artifact from: {uri}")
             return artifact
@@ -121,6 +134,110 @@ class ArtifactService(IArtifactService):
             logger.error(f"Error loading artifact from {uri}: {e}", exc_info=True)
             return None
 
+    def get_artifact_etag(self, uri: str) -> Optional[str]:
+        """Returns the object's current ETag (None if it does not exist)."""
+        info = self._get_artifact_info(uri)
+        return self._etag_of(info) if info is not None else None
+
+    def _get_artifact_info(self, uri: str) -> Optional[Dict[str, Any]]:
+        """The object's metadata from one HEAD request (None if it does not exist)."""
+        try:
+            return self.fs.info(self._get_s3_path(uri), refresh=True)
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def _etag_of(info: Dict[str, Any]) -> str:
+        # Fall back to size + mtime for stores that don't report an ETag
+        etag = info.get("ETag") or f"{info.get('size')}-{info.get('LastModified')}"
+        return str(etag).strip('"')
+
+    def _get_local_copy(
+        self,
+        uri: str,
+        columns: Optional[Sequence[str]] = None,
+        etag: Optional[str] = None,
+    ) -> Optional[Path]:
+        """
+        Path of an up-to-date local copy of the object, downloading it into the
+        host's artifact cache if the current ETag isn't there yet. None if the
+        object does not exist.
+
+        With `columns`, the object must be Parquet and only those column chunks
+        are fetched from S3 (ranged reads); the projection is cached as its own
+        entry. `etag` is looked up (one HEAD request) unless the caller passes
+        the one it just read.
+        """
+        if etag is None:
+            etag = self.get_artifact_etag(uri)
+        if etag is None:
+            return None
+        s3_path = self._get_s3_path(uri)
+        if columns is None:
+            return local_artifact_cache.get_path(
+                uri, etag, lambda destination: self.fs.get(s3_path, destination)
+            )
+
+        def fetch_projection(destination: str):
+            table = self._read_parquet_projection(s3_path, columns, filesystem=self.fs)
+            pq.write_table(table, destination, compression="snappy")
+
+        return local_artifact_cache.get_path(
+            uri, etag, fetch_projection, variant=",".join(columns)
+        )
+
+    def _read_parquet_projection(
+        self,
+        source: str,
+        columns: Optional[Sequence[str]],
+        filters: Optional[List[tuple]] = None,
+        filesystem: Optional[s3fs.S3FileSystem] = None,
+    ) -> pa.Table:
+        """
+        Reads only `columns` (those present in the file; absent ones are left
+        for the caller to report) and the row groups that can satisfy `filters`.
+        `source` is a path on `filesystem`, or a memory-mapped local file.
+        """
+        if columns is not None:
+            available = set(pq.read_schema(source, filesystem=filesystem).names)
+            columns = [c for c in dict.fromkeys(columns) if c in available]
+        return pq.read_table(
+            source,
+            columns=columns,
+            filters=filters or None,
+            filesystem=filesystem,
+            memory_map=filesystem is None,
+        )
+
+    def load_cached_artifact(self, uri: str) -> Optional[Any]:
+        """
+        Loads a Python object through the per-process model cache. A HEAD request
+        validates the cached copy's ETag; the artifact is only downloaded and
+        deserialised on a miss or when the object at the URI has changed. The
+        entry is charged the object's stored size.
+        """
+        if not uri:
+            logger.error("Cannot load artifact: S3 URI is empty.")
+            return None
+        try:
+            info = self._get_artifact_info(uri)
+        except Exception as e:
+            logger.error(f"Error reading metadata of {uri}: {e}", exc_info=True)
+            return None
+        if info is None:
+            logger.error(f"Artifact not found at S3 location: {uri}")
+            model_cache.invalidate(uri)
+            return None
+        etag = self._etag_of(info)
+        artifact = model_cache.get_or_load(
+            uri,
+            etag,
+            lambda: self.load_artifact(uri, etag=etag),
+            size_bytes=int(info.get("size") or 0),
+        )
+        logger.debug(f"Model cache stats: {model_cache.stats()}")
+        return artifact
+
     def delete_artifact(self, uri: str) -> bool:
         """Deletes an artifact from S3."""
         if not uri:
@@ -142,8 +259,18 @@ class ArtifactService(IArtifactService):
             logger.error(f"Error deleting artifact {uri}: {e}", exc_info=True)
             return False
 
-    def load_dataframe_artifact(self, uri: str) -> Optional[pd.DataFrame]:
-        """Loads a DataFrame artifact from S3 (assuming Parquet format)."""
+    def load_dataframe_artifact(
+        self,
+        uri: str,
+        columns: Optional[Sequence[str]] = None,
+        filters: Optional[List[tuple]] = None,
+    ) -> Optional[pd.DataFrame]:
+        """
+        Loads a DataFrame artifact from S3 (assuming Parquet format). `columns`
+        projects the read to those columns; `filters` (pyarrow DNF, e.g.
+        [("repository_id", "=", 3)]) skips row groups by their statistics and
+        drops non-matching rows.
+        """
         if not uri:
             logger.error("Cannot load DataFrame artifact: S3 URI is empty.")
             return None
@@ -153,13 +280,24 @@ class ArtifactService(IArtifactService):
             s3_path = self._get_s3_path(uri)
             logger.info(f"Attempting to load DataFrame artifact (Parquet) from: {uri}")
 
-            if not fs_client.exists(s3_path):
-                logger.error(f"DataFrame artifact not found at S3 location: {uri}")
-                return None
-
-            with fs_client.open(s3_path, "rb") as f:
-                # Read using pyarrow engine for potentially better compatibility
-                df = pd.read_parquet(f, engine="pyarrow")
+            if local_artifact_cache.enabled:
+                local_path = self._get_local_copy(uri, columns)
+                if local_path is None:
+                    logger.error(f"DataFrame artifact not found at S3 location: {uri}")
+                    return None
+                # Memory-mapped read: pages come straight from the (shared) page cache
+                table = self._read_parquet_projection(str(local_path), columns, filters)
+            else:
+                if not fs_client.exists(s3_path):
+                    logger.error(f"DataFrame artifact not found at S3 location: {uri}")
+                    return None
+                table = self._read_parquet_projection(
+                    s3_path, columns, filters, filesystem=fs_client
+                )
+            # Release each Arrow column as soon as it is converted, instead of
+            # holding the table and the DataFrame at the same time
+            df = table.to_pandas(split_blocks=True, self_destruct=True)
+            del table
 
             logger.info(f"Successfully loaded DataFrame artifact (Parquet) from: {uri}")
             return df
@@ -173,6 +311,36 @@ class ArtifactService(IArtifactService):
             )
             return None
 
+    @contextmanager
+    def open_parquet_file(self, uri: str) -> Iterator[Optional[pq.ParquetFile]]:
+        """
+        Opens a Parquet artifact for reading row group by row group. Uses a
+        memory-mapped copy in the host's artifact cache when enabled, otherwise
+        reads ranges straight from S3. Yields None if the object does not exist.
+        The file and the memory map or S3 handle behind it are closed on exit,
+        since ParquetFile does not close a source it was handed.
+        """
+        if not uri:
+            logger.error("Cannot open Parquet artifact: S3 URI is empty.")
+            yield None
+            return
+        if local_artifact_cache.enabled:
+            local_path = self._get_local_copy(uri)
+            if local_path is None:
+                logger.error(f"Parquet artifact not found at S3 location: {uri}")
+                yield None
+                return
+            source = pa.memory_map(str(local_path))
+        else:
+            s3_path = self._get_s3_path(uri)
+            if not self.fs.exists(s3_path):
+                logger.error(f"Parquet artifact not found at S3 location: {uri}")
+                yield None
+                return
+            source = self.fs.open(s3_path, "rb")
+        with source, pq.ParquetFile(source) as parquet_file:
+            yield parquet_file
+
     def write_dataframe_artifact(self, df: pd.DataFrame, uri: str) -> bool:
         """Writes a DataFrame artifact to S3 (assuming Parquet format)."""
         if df is None or not isinstance(df, pd.DataFrame):
@@ -0,0 +1,385 @@
+# worker/ml/services/compiled_predictor.py
+import json
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from shared.core.config import settings
+
+logger = logging.getLogger(__name__)
+logger.setLevel(settings.LOG_LEVEL.upper())
+
+# Rows of the training data used to verify a compiled model against the native one
+PARITY_SAMPLE_ROWS = 1000
+PARITY_ATOL = 1e-6
+
+_AVERAGE_PROBA = "average_proba"  # Random forests / single trees
+_SUM_MARGIN = "sum_margin"  # Binary gradient boosting: sigmoid(base + sum of leaves)
+
+
+def compiled_artifact_uri(model_uri: str) -> str:
+    """URI of the compiled predictor stored next to a model artifact."""
+    stem, dot, suffix = model_uri.rpartition(".")
+    return f"{stem}.compiled.{suffix}" if dot else f"{model_uri}.compiled"
+
+
+class CompiledTreeEnsemble:
+    """
+    Tree ensemble flattened into NumPy node arrays. All trees are evaluated
+    together, one tree level per step, instead of going through the estimator's
+    Python-level input validation and per-tree dispatch.
+
+    Leaves point to themselves, so a sample that reaches a leaf early stays put
+    for the remaining steps.
+    """
+
+    def __init__(
+        self,
+        *,
+        feature_names: Sequence[str],
+        classes: np.ndarray,
+        kind: str,
+        roots: np.ndarray,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        left: np.ndarray,
+        right: np.ndarray,
+        missing_left: np.ndarray,
+        value: np.ndarray,
+        depth: int,
+        strict_less: bool,
+        input_dtype: Any,
+        base_margin: float = 0.0,
+        source: str = "",
+    ):
+        self.feature_names = list(feature_names)
+        self.classes = np.asarray(classes)
+        self.kind = kind
+        self.roots = roots.astype(np.int32)
+        self.feature = feature.astype(np.int32)
+        self.threshold = threshold.astype(np.float64)
+        self.left = left.astype(np.int32)
+        self.right = right.astype(np.int32)
+        self.missing_left = missing_left.astype(bool)
+        self.value = value.astype(np.float64)
+        self.depth = int(depth)
+        self.strict_less = strict_less
+        self.input_dtype = np.dtype(input_dtype)
+        self.base_margin = float(base_margin)
+        self.source = source
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    def _as_matrix(self, data: Any) -> np.ndarray:
+        if isinstance(data, pd.DataFrame):
+            if list(data.columns) != self.feature_names:
+                data = data[self.feature_names]
+            return data.to_numpy(dtype=self.input_dtype)
+        return np.asarray(data, dtype=self.input_dtype)
+
+    def _leaves(self, X: np.ndarray) -> np.ndarray:
+        """Leaf index reached by every (sample, tree) pair."""
+        nodes = np.broadcast_to(self.roots, (len(X), self.n_trees)).copy()
+        rows = np.arange(len(X))[:, None]
+        for _ in range(self.depth):
+            x = X[rows, self.feature[nodes]]
+            threshold = self.threshold[nodes]
+            go_left = (x < threshold) if self.strict_less else (x <= threshold)
+            go_left |= np.isnan(x) & self.missing_left[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return nodes
+
+    def _margin(self, X: np.ndarray) -> np.ndarray:
+        # (trees, samples) layout: the reduction adds trees in order, like the
+        # native implementations, rather than pairwise
+        return self.base_margin + self.value[self._leaves(X).T, 0].sum(axis=0)
+
+    def predict_proba(self, data: Any) -> np.ndarray:
+        X = self._as_matrix(data)
+        if self.kind == _SUM_MARGIN:
+            positive = 1.0 / (1.0 + np.exp(-self._margin(X)))
+            return np.column_stack([1.0 - positive, positive])
+        return self.value[self._leaves(X).T].sum(axis=0) / self.n_trees
+
+    def predict(self, data: Any) -> np.ndarray:
+        return self.classes.take(np.argmax(self.predict_proba(data), axis=1))
+
+    def predict_result(self, data: Any) -> Dict[str, Any]:
+        """Same output format as BaseModelStrategy.predict."""
+        proba = self.predict_proba(data)
+        return {
+            "predictions": self.classes.take(np.argmax(proba, axis=1)).tolist(),
+            "probabilities": proba.tolist(),
+        }
+
+
+# --- Exporters: each returns the flattened node arrays of its trees ---
+
+
+def _concat_trees(
+    trees: List[Dict[str, np.ndarray]],
+) -> Tuple[Dict[str, np.ndarray], np.ndarray, int]:
+    """Concatenates per-tree node arrays, offsetting child indices; leaves self-loop."""
+    arrays: Dict[str, List[np.ndarray]] = {
+        k: [] for k in ("feature", "threshold", "left", "right", "missing_left")
+    }
+    values, roots, offset, depth = [], [], 0, 0
+    for tree in trees:
+        n_nodes = len(tree["left"])
+        own = np.arange(n_nodes)
+        leaf = tree["left"] < 0
+        arrays["left"].append(np.where(leaf, own, tree["left"]) + offset)
+        arrays["right"].append(np.where(leaf, own, tree["right"]) + offset)
+        arrays["feature"].append(np.where(leaf, 0, tree["feature"]))
+        arrays["threshold"].append(np.where(leaf, 0.0, tree["threshold"]))
+        arrays["missing_left"].append(tree["missing_left"])
+        values.append(tree["value"])
+        roots.append(offset)
+        offset += n_nodes
+        depth = max(depth, tree["depth"])
+    flat = {k: np.concatenate(v) for k, v in arrays.items()}
+    flat["value"] = np.concatenate(values)
+    return flat, np.asarray(roots), depth
+
+
+def _sklearn_tree(estimator: Any, value_scale: Optional[float] = None) -> Dict:
+    tree = estimator.tree_
+    if value_scale is None:
+        # Classifier leaves: class distribution normalised like predict_proba
+        value = tree.value[:, 0, :]
+        totals = value.sum(axis=1, keepdims=True)
+        totals[totals == 0] = 1.0
+        value = value / totals
+    else:
+        # Regressor leaves of a boosting stage, pre-multiplied by the learning rate
+        value = value_scale * tree.value[:, 0, :1]
+    missing_left = getattr(tree, "missing_go_to_left", None)
+    return {
+        "feature": tree.feature,
+        "threshold": tree.threshold,
+        "left": tree.children_left,
+        "right": tree.children_right,
+        "missing_left": (
+            np.zeros(tree.node_count, dtype=bool)
+            if missing_left is None
+            else np.asarray(missing_left, dtype=bool)
+        ),
+        "value": value,
+        "depth": tree.max_depth,
+    }
+
+
+def _export_sklearn(model: Any) -> Optional[Dict[str, Any]]:
+    from sklearn.ensemble import (
+        ExtraTreesClassifier,
+        GradientBoostingClassifier,
+        RandomForestClassifier,
+    )
+    from sklearn.tree import DecisionTreeClassifier
+
+    if isinstance(model, DecisionTreeClassifier):
+        trees = [_sklearn_tree(model)]
+        kind = _AVERAGE_PROBA
+    elif isinstance(model, (RandomForestClassifier, ExtraTreesClassifier)):
+        trees = [_sklearn_tree(est) for est in model.estimators_]
+        kind = _AVERAGE_PROBA
+    elif isinstance(model, GradientBoostingClassifier):
+        if model.estimators_.shape[1] != 1:
+            return None  # Multiclass boosting: one tree per class and stage
+        trees = [
+            _sklearn_tree(stage[0], value_scale=model.learning_rate)
+            for stage in model.estimators_
+        ]
+        kind = _SUM_MARGIN
+    else:
+        return None
+    if getattr(model, "n_outputs_", 1) != 1:
+        return None
+    # sklearn compares float32-cast inputs against float64 thresholds
+    return {"trees": trees, "kind": kind, "strict_less": False, "dtype": np.float32}
+
+
+def _export_xgboost(model: Any) -> Optional[Dict[str, Any]]:
+    if getattr(model, "objective", None) != "binary:logistic":
+        return None
+    booster = model.get_booster()
+    dump = json.loads(bytes(booster.save_raw(raw_format="json")))
+    gbm = dump["learner"]["gradient_booster"]
+    if gbm.get("name") != "gbtree":
+        return None
+    json_trees = gbm["model"]["trees"]
+    best_iteration = getattr(model, "best_iteration", None)
+    if best_iteration is not None:
+        per_round = int(gbm["model"]["gbtree_model_param"].get("num_parallel_tree", 1))
+        json_trees = json_trees[: (best_iteration + 1) * per_round]
+
+    trees = []
+    for t in json_trees:
+        left = np.asarray(t["left_children"])
+        parents = np.asarray(t["parents"])
+        depth = np.zeros(len(left), dtype=int)
+        for node in range(1, len(left)):  # Parents precede children in the dump
+            depth[node] = depth[parents[node]] + 1
+        # Splits are float32 in the booster (and lie on training values with
+        # the hist method); round the JSON decimals back to those exact values
+        conditions = np.asarray(t["split_conditions"], dtype=np.float32).astype(
+            np.float64
+        )
+        trees.append(
+            {
+                "feature": np.asarray(t["split_indices"]),
+                "threshold": conditions,
+                "left": left,
+                "right": np.asarray(t["right_children"]),
+                "missing_left": np.asarray(t["default_left"], dtype=bool),
+                # Leaves keep their value in split_conditions
+                "value": conditions[:, None],
+                "depth": int(depth.max()),
+            }
+        )
+    # XGBoost goes left when x < split, on float32 inputs
+    return {
+        "trees": trees,
+        "kind": _SUM_MARGIN,
+        "strict_less": True,
+        "dtype": np.float32,
+    }
+
+
+def _export_lightgbm(model: Any) -> Optional[Dict[str, Any]]:
+    if getattr(model, "n_classes_", 2) != 2:
+        return None
+    best_iteration = getattr(model, "best_iteration_", None) or None
+    dump = model.booster_.dump_model(num_iteration=best_iteration)
+
+    trees = []
+    for info in dump["tree_info"]:
+        nodes: List[Dict[str, Any]] = []
+
+        def visit(node: Dict[str, Any], level: int) -> int:
+            index = len(nodes)
+            record = {"depth": level}
+            nodes.append(record)
+            if "leaf_value" in node:
+                record.update(
+                    feature=0, threshold=0.0, left=-1, right=-1, missing_left=False
+                )
+                record["value"] = node["leaf_value"]
+                return index
+            if node.get("decision_type") != "<=" or node.get("missing_type") == "Zero":
+                raise ValueError("unsupported split type")
+            record.update(
+                feature=node["split_feature"],
+                threshold=float(node["threshold"]),
+                missing_left=bool(node.get("default_left", False))
+                and node.get("missing_type") == "NaN",
+                value=0.0,
+            )
+            record["left"] = visit(node["left_child"], level + 1)
+            record["right"] = visit(node["right_child"], level + 1)
+            return index
+
+        try:
+            visit(info["tree_structure"], 0)
+        except ValueError:
+            return None  # Categorical or zero-as-missing splits
+        tree = {
+            key: np.asarray([n[key] for n in nodes])
+            for key in ("feature", "threshold", "left", "right", "missing_left")
+        }
+        tree["value"] = np.asarray([n["value"] for n in nodes], dtype=np.float64)[
+            :, None
+        ]
+        tree["depth"] = max(n["depth"] for n in nodes)
+        trees.append(tree)
+    return {
+        "trees": trees,
+        "kind": _SUM_MARGIN,
+        "strict_less": False,
+        "dtype": np.float64,
+    }
+
+
+def _native_margin(model: Any, X: pd.DataFrame) -> np.ndarray:
+    """Raw (pre-sigmoid) score of a binary boosting model."""
+    if hasattr(model, "get_booster"):
+        return np.asarray(model.predict(X, output_margin=True), dtype=np.float64)
+    if hasattr(model, "booster_"):
+        return np.asarray(model.predict(X, raw_score=True), dtype=np.float64)
+    return np.asarray(model.decision_function(X), dtype=np.float64).ravel()
+
+
+def compile_tree_ensemble(
+    model: Any, X_reference: pd.DataFrame
+) -> Optional[CompiledTreeEnsemble]:
+    """
+    Compiles a fitted tree-ensemble classifier (scikit-learn decision tree,
+    random forest, extra trees or binary gradient boosting; binary XGBoost or
+    LightGBM) into a CompiledTreeEnsemble. `X_reference` rows (e.g. training
+    data) calibrate the boosting base score and verify parity with the native
+    predict_proba. Returns None for unsupported models or on any mismatch.
+    """
+    module = type(model).__module__.split(".")[0]
+    exporter = {
+        "sklearn": _export_sklearn,
+        "xgboost": _export_xgboost,
+        "lightgbm": _export_lightgbm,
+    }.get(module)
+    if exporter is None or not hasattr(model, "predict_proba") or X_reference.empty:
+        return None
+    feature_names = list(getattr(model, "feature_names_in_", X_reference.columns))
+    sample = X_reference[feature_names].head(PARITY_SAMPLE_ROWS)
+
+    try:
+        exported = exporter(model)
+        if exported is None:
+            logger.info(f"Model {type(model).__name__} is not a supported tree model.")
+            return None
+        flat, roots, depth = _concat_trees(exported["trees"])
+        compiled = CompiledTreeEnsemble(
+            feature_names=feature_names,
+            classes=model.classes_,
+            kind=exported["kind"],
+            roots=roots,
+            depth=depth,
+            strict_less=exported["strict_less"],
+            input_dtype=exported["dtype"],
+            source=f"{type(model).__module__}.{type(model).__name__}",
+            **flat,
+        )
+        if compiled.kind == _SUM_MARGIN:
+            # Base score/init estimator: native margin minus the sum of the trees
+            first = sample.head(1)
+            compiled.base_margin = float(
+                _native_margin(model, first)[0]
+                - compiled._margin(compiled._as_matrix(first))[0]
+            )
+
+        native = np.asarray(model.predict_proba(sample), dtype=np.float64)
+        ours = compiled.predict_proba(sample)
+        if native.shape != ours.shape or not np.allclose(
+            native, ours, rtol=0, atol=PARITY_ATOL
+        ):
+            max_diff = (
+                float(np.max(np.abs(native - ours)))
+                if native.shape == ours.shape
+                else "shape mismatch"
+            )
+            logger.warning(
+                f"Compiled {compiled.source} does not match native predict_proba (max diff {max_diff}); not using it."
+            )
+            return None
+    except Exception as e:
+        logger.warning(
+            f"Could not compile {type(model).__name__}: {type(e).__name__}: {e}"
+        )
+        return None
+
+    logger.info(
+        f"Compiled {compiled.source}: {compiled.n_trees} trees, {len(compiled.left)} nodes, depth {compiled.depth}."
+    )
+    return compiled
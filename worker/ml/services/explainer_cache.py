@@ -0,0 +1,110 @@
+# worker/ml/services/explainer_cache.py
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+import pandas as pd
+
+from shared.core.config import settings
+
+logger = logging.getLogger(__name__)
+logger.setLevel(settings.LOG_LEVEL.upper())
+
+
+def background_artifact_uri(model_uri: str) -> str:
+    """URI of the XAI background summary stored next to a model artifact."""
+    stem, dot, suffix = model_uri.rpartition(".")
+    return f"{stem}.background.{suffix}" if dot else f"{model_uri}.background"
+
+
+def frame_fingerprint(df: Optional[pd.DataFrame]) -> str:
+    """Content hash of a DataFrame's columns and values (index ignored)."""
+    if df is None:
+        return "none"
+    digest = hashlib.sha1("\0".join(map(str, df.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+class ExplainerCache:
+    """
+    Per-process LRU caches for XAI: fitted explainers (TreeExplainer /
+    KernelExplainer) and the SHAP values they produced, keyed by a model
+    version key plus content hashes of the background and input data. Building
+    an explainer is paid once per model, and the SHAP and SHAP-based
+    feature-importance explanations of the same instances share one pass.
+
+    Cached objects are shared between jobs and must be treated as read-only.
+    """
+
+    def __init__(self, max_explainers: int, max_results: int):
+        self.max_explainers = max_explainers
+        self.max_results = max_results
+        self._explainers: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._results: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    def _get_or_build(
+        self,
+        store: "OrderedDict[Hashable, Any]",
+        limit: int,
+        key: Hashable,
+        build: Callable[[], Any],
+    ) -> Any:
+        with self._lock:
+            if key in store:
+                store.move_to_end(key)
+                self.hits += 1
+                return store[key]
+            self.misses += 1
+            value = build()
+            if value is not None and limit > 0:
+                store[key] = value
+                while len(store) > limit:
+                    store.popitem(last=False)
+            return value
+
+    def get_explainer(
+        self,
+        model_key: str,
+        kind: str,
+        background: Optional[pd.DataFrame],
+        build: Callable[[], Any],
+    ) -> Any:
+        key = (model_key, kind, frame_fingerprint(background))
+        return self._get_or_build(self._explainers, self.max_explainers, key, build)
+
+    def get_shap_values(
+        self,
+        model_key: str,
+        X: pd.DataFrame,
+        background: Optional[pd.DataFrame],
+        compute: Callable[[], Any],
+    ) -> Any:
+        key = (model_key, frame_fingerprint(X), frame_fingerprint(background))
+        return self._get_or_build(self._results, self.max_results, key, compute)
+
+    def clear(self):
+        with self._lock:
+            self._explainers.clear()
+            self._results.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "explainers": len(self._explainers),
+                "results": len(self._results),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+# One cache per worker process, shared by all XAI strategies
+explainer_cache = ExplainerCache(
+    max_explainers=settings.ML_XAI_EXPLAINER_CACHE_SIZE,
+    max_results=settings.ML_XAI_SHAP_RESULT_CACHE_SIZE,
+)
@@ -1,11 +1,17 @@
 # worker/ml/services/factories/__init__.py
 
 # Make factory functions easily importable from the services package
-from .model_strategy_factory import create_model_strategy
+from .model_strategy_factory import (
+    create_model_strategy,
+    get_all_model_strategy_classes,
+    get_model_strategy_class,
+)
 from .optuna_factory import create_pruner, create_sampler
 
 __all__ = [
     "create_model_strategy",
+    "get_model_strategy_class",
+    "get_all_model_strategy_classes",
     "create_sampler",
     "create_pruner",
 ]
@@ -1,6 +1,7 @@
 # worker/ml/services/factories/model_strategy_factory.py
+import importlib
 import logging
-from typing import Any, Dict  # Add Any
+from typing import Any, Dict, List, Tuple, Type  # Add Any
 
 # Import IArtifactService interface
 from services.interfaces.i_artifact_service import IArtifactService
@@ -8,14 +9,46 @@ from services.interfaces.i_artifact_service import IArtifactService
 # Import ModelTypeEnum from shared schemas
 from shared.schemas.enums import ModelTypeEnum
 
-# Import the base strategy and concrete strategies
+# Import the base strategy only; concrete strategies are imported on first use
 from ..strategies.base_strategy import BaseModelStrategy
-from ..strategies.lightgbm_strategy import LightGBMStrategy
-from ..strategies.sklearn_strategy import SklearnStrategy
-from ..strategies.xgboost_strategy import XGBoostStrategy
 
 logger = logging.getLogger(__name__)
 
+# (module in services.strategies, class name) of each strategy. A strategy
+# module, and the ML library behind it, is only imported when a job needs it,
+# so worker processes don't pay for libraries they never use.
+_SKLEARN_STRATEGY = ("sklearn_strategy", "SklearnStrategy")
+_STRATEGY_CLASSES: Dict[ModelTypeEnum, Tuple[str, str]] = {
+    ModelTypeEnum.XGBOOST_CLASSIFIER: ("xgboost_strategy", "XGBoostStrategy"),
+    ModelTypeEnum.LIGHTGBM_CLASSIFIER: ("lightgbm_strategy", "LightGBMStrategy"),
+}
+
+
+def _import_strategy(module_name: str, class_name: str) -> Type[BaseModelStrategy]:
+    module = importlib.import_module(f"..strategies.{module_name}", __package__)
+    return getattr(module, class_name)
+
+
+def get_model_strategy_class(model_type: ModelTypeEnum) -> Type[BaseModelStrategy]:
+    """Imports and returns the strategy class that handles `model_type`."""
+    # Scikit-learn models can share the SklearnStrategy
+    if model_type.value.startswith("sklearn_"):
+        return _import_strategy(*_SKLEARN_STRATEGY)
+    if model_type in _STRATEGY_CLASSES:
+        return _import_strategy(*_STRATEGY_CLASSES[model_type])
+    logger.error(
+        f"ModelStrategyFactory: No strategy implementation found for model type: {model_type.value}"
+    )
+    raise ValueError(f"Unsupported model type for strategy factory: {model_type.value}")
+
+
+def get_all_model_strategy_classes() -> List[Type[BaseModelStrategy]]:
+    """Every strategy class, e.g. to discover the supported model types."""
+    return [
+        _import_strategy(*entry)
+        for entry in (_SKLEARN_STRATEGY, *_STRATEGY_CLASSES.values())
+    ]
+
 
 def create_model_strategy(
     model_type: ModelTypeEnum,
@@ -31,35 +64,11 @@ def create_model_strategy(
         f"ModelStrategyFactory: Creating strategy for model type: {model_type.value}"
     )
 
-    # Scikit-learn models can share the SklearnStrategy
-    if model_type.value.startswith("sklearn_"):
-        logger.debug(f"Instantiating SklearnStrategy for {model_type.value}.")
-        return SklearnStrategy(
-            model_type=model_type,  # Pass the enum member
-            model_config=model_config,
-            job_config=job_config,
-            artifact_service=artifact_service,
-        )
-    elif model_type == ModelTypeEnum.XGBOOST_CLASSIFIER:
-        logger.debug("Instantiating XGBoostStrategy.")
-        return XGBoostStrategy(
-            model_type=model_type,
-            model_config=model_config,
-            job_config=job_config,
-            artifact_service=artifact_service,
-        )
-    elif model_type == ModelTypeEnum.LIGHTGBM_CLASSIFIER:
-        logger.debug("Instantiating LightGBMStrategy.")
-        return LightGBMStrategy(
-            model_type=model_type,
-            model_config=model_config,
-            job_config=job_config,
-            artifact_service=artifact_service,
-        )
-    else:
-        logger.error(
-            f"ModelStrategyFactory: No strategy implementation found for model type: {model_type.value}"
-        )
-        raise ValueError(
-            f"Unsupported model type for strategy factory: {model_type.value}"
-        )
+    strategy_cls = get_model_strategy_class(model_type)
+    logger.debug(f"Instantiating {strategy_cls.__name__} for {model_type.value}.")
+    return strategy_cls(
+        model_type=model_type,  # Pass the enum member
+        model_config=model_config,
+        job_config=job_config,
+        artifact_service=artifact_service,
+    )
@@ -1,19 +1,24 @@
 # worker/ml/services/factories/optuna_factory.py
 import logging
-from typing import Any, Dict, Optional
-
-import optuna
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
 # Import Enum types from shared schemas
 from shared.schemas.hp_search_job import PrunerTypeEnum, SamplerTypeEnum
 
+# Optuna is imported when a sampler or pruner is first created, so only
+# processes that run HP search jobs load it
+if TYPE_CHECKING:
+    import optuna
+
 logger = logging.getLogger(__name__)
 
 
 def create_sampler(
     sampler_type_str: Optional[str], params: Dict[str, Any], seed: int
-) -> Optional[optuna.samplers.BaseSampler]:
+) -> Optional["optuna.samplers.BaseSampler"]:
     """Factory function to create Optuna samplers."""
+    import optuna
+
     # Use default from Enum if string is None or empty
     sampler_type_enum = (
         SamplerTypeEnum(sampler_type_str) if sampler_type_str else SamplerTypeEnum.TPE
@@ -52,8 +57,10 @@ def create_sampler(
 
 def create_pruner(
     pruner_type_str: Optional[str], params: Dict[str, Any], seed: Optional[int] = None
-) -> Optional[optuna.pruners.BasePruner]:
+) -> Optional["optuna.pruners.BasePruner"]:
     """Factory function to create Optuna pruners."""
+    import optuna
+
     # Use default from Enum if string is None or empty
     pruner_type_enum = (
         PrunerTypeEnum(pruner_type_str) if pruner_type_str else PrunerTypeEnum.MEDIAN
@@ -1,4 +1,5 @@
 # worker/ml/services/factories/xai_strategy_factory.py
+import importlib
 import logging
 from typing import Any, List, Optional  # Added List
 
@@ -10,19 +11,19 @@ import pandas as pd
 from shared.schemas.enums import ModelTypeEnum, XAITypeEnum
 
 from ..strategies.base_xai_strategy import BaseXAIStrategy
-from ..strategies.counterfactuals_strategy import CounterfactualsStrategy
 
-# Feature Importance Strategies
-from ..strategies.feature_importance_strategy import FeatureImportanceStrategy
-from ..strategies.lightgbm_decision_path_strategy import LightGBMDecisionPathStrategy
-from ..strategies.lime_strategy import LIMEStrategy
-from ..strategies.shap_strategy import SHAPStrategy
+logger = logging.getLogger(__name__)
 
-# Decision Path Strategies
-from ..strategies.sklearn_decision_path_strategy import SklearnDecisionPathStrategy
-from ..strategies.xgboost_decision_path_strategy import XGBoostDecisionPathStrategy
 
-logger = logging.getLogger(__name__)
+def _import_strategy(module_name: str, class_name: str) -> Any:
+    """
+    Imports a strategy class from services.strategies. SHAP, LIME, DiCE and
+    the boosting libraries each take seconds and tens of MB to import, so a
+    technique's module is only loaded once an explanation of that type is
+    first created.
+    """
+    module = importlib.import_module(f"..strategies.{module_name}", __package__)
+    return getattr(module, class_name)
 
 
 class XAIStrategyFactory:
@@ -77,6 +78,7 @@ class XAIStrategyFactory:
         model_type_enum: ModelTypeEnum,  # The ModelTypeEnum of the model from DB
         background_data: Optional[pd.DataFrame] = None,
         feature_names: Optional[List[str]] = None,
+        model_key: Optional[str] = None,  # Model version key for the explainer cache
     ) -> BaseXAIStrategy:
 
         if model is None:
@@ -92,13 +94,19 @@ class XAIStrategyFactory:
         )
 
         if xai_type == XAITypeEnum.SHAP:
-            return SHAPStrategy(model, background_data)
+            return _import_strategy("shap_strategy", "SHAPStrategy")(
+                model, background_data, model_key=model_key
+            )
 
         elif xai_type == XAITypeEnum.LIME:
-            return LIMEStrategy(model, background_data)
+            return _import_strategy("lime_strategy", "LIMEStrategy")(
+                model, background_data
+            )
 
         elif xai_type == XAITypeEnum.FEATURE_IMPORTANCE:
-            return FeatureImportanceStrategy(model, background_data)
+            return _import_strategy(
+                "feature_importance_strategy", "FeatureImportanceStrategy"
+            )(model, background_data, model_key=model_key)
 
         elif xai_type == XAITypeEnum.DECISION_PATH:
             sklearn_tree_based_enums = [
@@ -112,17 +120,23 @@ class XAIStrategyFactory:
                 logger.debug(
                     f"XAIStrategyFactory.create: Selected SklearnDecisionPathStrategy for enum {model_type_enum.value}."
                 )
-                return SklearnDecisionPathStrategy(model)
+                return _import_strategy(
+                    "sklearn_decision_path_strategy", "SklearnDecisionPathStrategy"
+                )(model)
             elif model_type_enum == ModelTypeEnum.XGBOOST_CLASSIFIER:
                 logger.debug(
                     f"XAIStrategyFactory.create: Selected XGBoostDecisionPathStrategy for enum {model_type_enum.value}."
                 )
-                return XGBoostDecisionPathStrategy(model)
+                return _import_strategy(
+                    "xgboost_decision_path_strategy", "XGBoostDecisionPathStrategy"
+                )(model)
             elif model_type_enum == ModelTypeEnum.LIGHTGBM_CLASSIFIER:
                 logger.debug(
                     f"XAIStrategyFactory.create: Selected LightGBMDecisionPathStrategy for enum {model_type_enum.value}."
                 )
-                return LightGBMDecisionPathStrategy(model)
+                return _import_strategy(
+                    "lightgbm_decision_path_strategy", "LightGBMDecisionPathStrategy"
+                )(model)
             else:
                 logger.error(
                     f"XAIStrategyFactory.create: Decision Path strategy creation failed. Unsupported model_type_enum: {model_type_enum.value}."
@@ -132,7 +146,9 @@ class XAIStrategyFactory:
                 )
 
         elif xai_type == XAITypeEnum.COUNTERFACTUALS:
-            return CounterfactualsStrategy(model, background_data)
+            return _import_strategy(
+                "counterfactuals_strategy", "CounterfactualsStrategy"
+            )(model, background_data)
 
         else:
             logger.error(
@@ -0,0 +1,111 @@
+# worker/ml/services/feature_matrix.py
+import logging
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from shared.core.config import settings
+
+logger = logging.getLogger(__name__)
+logger.setLevel(settings.LOG_LEVEL.upper())
+
+# CK, delta and Commit Guru metrics are counts or ratios; integer counts stay
+# exact in float32 up to 2**24, far above any per-file metric value
+FEATURE_DTYPE = np.float32
+
+
+def table_to_matrix(
+    table: pa.Table, columns: Sequence[str], dtype: type = FEATURE_DTYPE
+) -> np.ndarray:
+    """Dense feature matrix of `columns`, with nulls filled with 0."""
+    matrix = np.empty((table.num_rows, len(columns)), dtype=dtype)
+    for j, name in enumerate(columns):
+        values = pc.cast(table.column(name), pa.float64()).to_numpy()
+        matrix[:, j] = np.where(np.isnan(values), 0.0, values)
+    return matrix
+
+
+def build_feature_matrix(
+    data: pd.DataFrame,
+    feature_columns: Sequence[str],
+    rows: Optional[np.ndarray] = None,
+    dtype: type = FEATURE_DTYPE,
+) -> pd.DataFrame:
+    """
+    Copies `feature_columns` (of the `rows` mask, default all rows) into one
+    C-contiguous `dtype` block, with missing values filled with 0, and wraps
+    it in a DataFrame without copying. Estimators get the block through
+    `to_numpy()` as is. Columns are copied one at a time, so the only other
+    allocation is a single column.
+
+    Identifier and other text columns must not be passed as features.
+    """
+    feature_columns = list(feature_columns)
+    non_numeric = [
+        c
+        for c in feature_columns
+        if not (
+            pd.api.types.is_numeric_dtype(data[c])
+            or pd.api.types.is_bool_dtype(data[c])
+        )
+    ]
+    if non_numeric:
+        raise ValueError(
+            f"Feature columns must be numeric, got non-numeric: {', '.join(non_numeric)}"
+        )
+
+    n_rows = len(data) if rows is None else int(np.count_nonzero(rows))
+    matrix = np.empty((n_rows, len(feature_columns)), dtype=dtype, order="C")
+    filled_columns = []
+    for j, name in enumerate(feature_columns):
+        column = data[name]
+        if column.hasnans:
+            filled_columns.append(name)
+        values = column.to_numpy(dtype=dtype, na_value=0)
+        matrix[:, j] = values if rows is None else values[rows]
+    if filled_columns:
+        logger.warning(
+            f"Feature data contains NaN values in {len(filled_columns)} column(s). Filling with 0."
+        )
+
+    index = data.index if rows is None else data.index[rows]
+    return pd.DataFrame(matrix, index=index, columns=feature_columns, copy=False)
+
+
+def compact_labels(y: pd.Series) -> pd.Series:
+    """Target as the smallest integer dtype that holds it (floats if not integral)."""
+    if pd.api.types.is_bool_dtype(y):
+        return y.astype(np.int8)
+    if not pd.api.types.is_numeric_dtype(y):
+        y = pd.to_numeric(y, errors="raise")
+    return pd.to_numeric(y, downcast="integer")
+
+
+def build_training_data(
+    data: pd.DataFrame, feature_columns: Sequence[str], target_column: str
+) -> Tuple[pd.DataFrame, pd.Series]:
+    """
+    Feature matrix (see `build_feature_matrix`) and compact labels for
+    training. Rows without a label are dropped while the matrix is built.
+    """
+    target = data[target_column]
+    rows = None
+    if target.hasnans:
+        rows = target.notna().to_numpy()
+        logger.warning(
+            f"Target column '{target_column}' has NaNs. Corresponding rows will be dropped from X and y."
+        )
+        target = target[rows]
+        if target.empty:
+            raise ValueError("Target column is empty after removing NaN values.")
+    try:
+        y = compact_labels(target)
+    except (ValueError, TypeError) as e:
+        raise TypeError(
+            f"Target column '{target_column}' could not be converted to numeric: {e}"
+        ) from e
+    X = build_feature_matrix(data, feature_columns, rows=rows)
+    return X, y
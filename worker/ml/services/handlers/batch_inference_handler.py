@@ -0,0 +1,166 @@
+# worker/ml/services/handlers/batch_inference_handler.py
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from shared.core.config import settings
+from shared.db.models import InferenceJob
+from shared.schemas.enums import JobStatusEnum
+
+from .inference_handler import InferenceJobHandler
+
+logger = logging.getLogger(__name__)
+logger.setLevel(settings.LOG_LEVEL.upper())
+
+
+class BatchInferenceHandler(InferenceJobHandler):
+    """
+    Predicts many InferenceJobs at once: per (model, repository) group the model
+    is loaded once, features for all commits come from one set-based query, and
+    a single vectorised predict call covers every row. Final statuses and result
+    packages are written with one bulk UPDATE. Serves explicit batch requests and
+    single-commit jobs coalesced by the inference task.
+    """
+
+    def __init__(
+        self, job_ids: Sequence[int], batch_id: str, task_instance: Any, **deps
+    ):
+        super().__init__(job_ids[0] if job_ids else 0, task_instance, **deps)
+        self.job_ids = list(job_ids)
+        self.batch_id = batch_id
+
+    def _failure(self, message: str) -> Dict[str, Any]:
+        return {
+            "status": JobStatusEnum.FAILED,
+            "status_message": message[:1000],
+            "prediction_result": {"error": message[:500]},
+        }
+
+    def _predict_group(
+        self, ml_model_id: int, repo_id: int, jobs: List[InferenceJob]
+    ) -> Dict[int, Dict[str, Any]]:
+        """Runs one model over all commits of a group; returns outcomes by job ID."""
+        self.ml_model_id = ml_model_id
+        self._load_model_strategy()
+
+        hashes = [job.input_reference["commit_hash"] for job in jobs]
+        features_df = self.feature_repo.get_features_for_commits(repo_id, hashes)
+        outcomes: Dict[int, Dict[str, Any]] = {}
+        if features_df.empty:
+            for job in jobs:
+                outcomes[job.id] = self._failure(
+                    f"Failed to retrieve or empty features for Repo ID {repo_id}, Commit {job.input_reference['commit_hash'][:7]}."
+                )
+            return outcomes
+
+        X_inference, identifiers_df = self._prepare_data(features_df)
+        output = self._predict(X_inference)
+        predictions = np.asarray(output.get("predictions"))
+        probabilities = output.get("probabilities")
+        probabilities = None if probabilities is None else np.asarray(probabilities)
+        if len(predictions) != len(X_inference):
+            raise ValueError(
+                f"Model returned {len(predictions)} predictions for {len(X_inference)} rows."
+            )
+        logger.info(
+            f"Batch {self.batch_id}: predicted {len(X_inference)} rows for {len(jobs)} commit(s) with model {ml_model_id} in one call."
+        )
+
+        positions = features_df.groupby("commit_hash", sort=False).indices
+        for job in jobs:
+            commit_hash = job.input_reference["commit_hash"]
+            rows = positions.get(commit_hash)
+            if rows is None:
+                outcomes[job.id] = self._failure(
+                    f"Failed to retrieve or empty features for Repo ID {repo_id}, Commit {commit_hash[:7]}."
+                )
+                continue
+            package, error = self._package_results(
+                {
+                    "predictions": predictions[rows].tolist(),
+                    "probabilities": (
+                        None if probabilities is None else probabilities[rows].tolist()
+                    ),
+                },
+                identifiers_df.iloc[rows],
+            )
+            if error:
+                outcome = self._failure(
+                    f"Inference failed during result packaging: {error}"
+                )
+                outcome["prediction_result"] = package
+            else:
+                outcome = {
+                    "status": JobStatusEnum.SUCCESS,
+                    "status_message": f"Inference successful. Commit prediction: {package.get('commit_prediction')}.",
+                    "prediction_result": package,
+                }
+            outcomes[job.id] = outcome
+        return outcomes
+
+    async def process_job(self) -> Dict:
+        """Predicts every claimed job of the batch and stores the results in bulk."""
+        wanted = set(self.job_ids)
+        jobs = [
+            job
+            for job in self.inference_job_repo.get_by_batch_id(self.batch_id)
+            if job.id in wanted
+        ]
+        outcomes: Dict[int, Dict[str, Any]] = {}
+        groups: Dict[Tuple[int, int], List[InferenceJob]] = defaultdict(list)
+        for job in jobs:
+            reference = job.input_reference or {}
+            if not reference.get("commit_hash") or not reference.get("repo_id"):
+                outcomes[job.id] = self._failure(
+                    f"input_reference incomplete in InferenceJob: {reference}"
+                )
+                continue
+            groups[(job.ml_model_id, reference["repo_id"])].append(job)
+
+        for index, ((ml_model_id, repo_id), group_jobs) in enumerate(groups.items()):
+            await self._update_progress(
+                f"Predicting {len(group_jobs)} commit(s) with model {ml_model_id}...",
+                10 + int(80 * index / max(len(groups), 1)),
+            )
+            try:
+                outcomes.update(self._predict_group(ml_model_id, repo_id, group_jobs))
+            except Exception as e:
+                logger.error(
+                    f"Batch {self.batch_id}: group (model {ml_model_id}, repo {repo_id}) failed: {e}",
+                    exc_info=True,
+                )
+                message = f"Inference Job failed: {type(e).__name__}: {e}"
+                for job in group_jobs:
+                    outcomes[job.id] = self._failure(message)
+
+        await asyncio.to_thread(
+            self.inference_job_repo.complete_jobs,
+            [{"id": job_id, **outcome} for job_id, outcome in outcomes.items()],
+        )
+
+        succeeded = sorted(
+            job_id
+            for job_id, outcome in outcomes.items()
+            if outcome["status"] == JobStatusEnum.SUCCESS
+        )
+        failed = sorted(set(outcomes) - set(succeeded))
+        message = (
+            f"Batch {self.batch_id}: {len(succeeded)} succeeded, {len(failed)} failed."
+        )
+        logger.info(message)
+        return {
+            "batch_id": self.batch_id,
+            "status": JobStatusEnum.SUCCESS if succeeded else JobStatusEnum.FAILED,
+            "message": message,
+            "succeeded_job_ids": succeeded,
+            "failed_job_ids": failed,
+            "run_xai_job_ids": [
+                job.id
+                for job in jobs
+                if job.id in succeeded
+                and (job.input_reference or {}).get("run_xai", True)
+            ],
+        }
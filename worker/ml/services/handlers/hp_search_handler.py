@@ -1,12 +1,17 @@
 # worker/ml/services/handlers/hp_search_handler.py
 import asyncio
+import hashlib
 import logging
-from typing import Any, Dict, Optional, Tuple  # Added Tuple
+import time
+from typing import Any, Dict, List, Optional, Tuple  # Added Tuple
 
+import numpy as np
 import optuna
 import pandas as pd
 
 from services.artifact_service import ArtifactService
+from services.feature_matrix import build_training_data
+from services.local_artifact_cache import local_artifact_cache
 from shared.core.config import settings
 from shared.db.models import HyperparameterSearchJob  # DB model
 from shared.repositories import (
@@ -32,6 +37,21 @@ from .base_handler import BaseMLJobHandler
 logger = logging.getLogger(__name__)
 logger.setLevel(settings.LOG_LEVEL.upper())
 
+# Optuna is loaded with this handler, on the first HP search job, rather than
+# at worker startup
+optuna.logging.set_verbosity(optuna.logging.DEBUG)
+
+# Trials that count towards n_trials (matches what study.optimize(n_trials=...) counts)
+_FINISHED_TRIAL_STATES = (
+    optuna.trial.TrialState.COMPLETE,
+    optuna.trial.TrialState.PRUNED,
+    optuna.trial.TrialState.FAIL,
+)
+# Study user attributes shared by the trial workers of a parallel search
+_TRIAL_BASELINE_ATTR = "ckguru_trial_baseline"
+_TRIAL_BUDGET_ATTR = "ckguru_trial_budget"
+_DEADLINE_ATTR = "ckguru_deadline"
+
 
 class HPSearchJobHandler(BaseMLJobHandler):
     """Handles the execution of hyperparameter search jobs using injected dependencies."""
@@ -72,8 +92,12 @@ class HPSearchJobHandler(BaseMLJobHandler):
     def job_model_class(self) -> type:
         return HyperparameterSearchJob
 
-    def _load_and_validate_job_details(self) -> bool:
-        """Loads job record and config, ensures dataset is ready."""
+    def _load_and_validate_job_details(self, mark_running: bool = True) -> bool:
+        """
+        Loads job record and config, ensures dataset is ready.
+        Trial workers and the finalizer of a parallel search pass
+        mark_running=False: the job must already be RUNNING and is left as is.
+        """
         try:
             job_record = self.hp_search_job_repo.get_by_id(self.job_id)
             if not job_record:
@@ -93,6 +117,12 @@ class HPSearchJobHandler(BaseMLJobHandler):
             if job_record.status == JobStatusEnum.REVOKED:  # Don't resume revoked.
                 logger.warning(f"Job {self.job_id} was REVOKED. Skipping.")
                 return False
+            if not mark_running and job_record.status != JobStatusEnum.RUNNING:
+                logger.warning(
+                    f"Job {self.job_id} is {job_record.status.value}, not RUNNING. Skipping."
+                )
+                self.job_db_record = job_record
+                return False
 
             self.job_db_record = job_record
             self.job_config = dict(
@@ -119,6 +149,9 @@ class HPSearchJobHandler(BaseMLJobHandler):
                 raise ValueError(f"Dataset {self.dataset_id} storage path missing.")
             self._dataset_storage_path = dataset_record.storage_path
 
+            if not mark_running:
+                return True
+
             # Update status to RUNNING
             updated = self.status_updater.update_job_start(
                 job_id=self.job_id,
@@ -175,7 +208,14 @@ class HPSearchJobHandler(BaseMLJobHandler):
                 )
 
         self._update_progress("Loading dataset artifact for HP search...", 15)
-        df = self.artifact_service.load_dataframe_artifact(self._dataset_storage_path)
+        # Only read the columns the model needs (skips identifiers/text columns)
+        config = self.job_config or {}
+        features = config.get("feature_columns") or []
+        target = config.get("target_column")
+        columns = features + [target] if features and target else None
+        df = self.artifact_service.load_dataframe_artifact(
+            self._dataset_storage_path, columns=columns
+        )
         if df is None or df.empty:
             raise ValueError(
                 f"Failed to load or empty dataset from {self._dataset_storage_path}"
@@ -206,40 +246,15 @@ class HPSearchJobHandler(BaseMLJobHandler):
                 f"Dataset missing required columns for HP search: {', '.join(missing_cols)}"
             )
 
-        X = data[features].copy()
-        y = data[target].copy()
-
-        if X.isnull().values.any():
-            logger.warning(
-                "HP Search: Feature data contains NaN values. Filling with 0."
-            )
-            X = X.fillna(0)
-        if y.isnull().any():
-            logger.warning(
-                f"HP Search: Target column '{target}' has NaNs. Corresponding rows dropped."
-            )
-            valid_indices = y.notna()
-            X = X[valid_indices]
-            y = y[valid_indices]
-            if y.empty:
-                raise ValueError(
-                    "HP Search: Target column is empty after removing NaN values."
-                )
-
-        if pd.api.types.is_bool_dtype(y):
-            y = y.astype(int)
-        elif not pd.api.types.is_numeric_dtype(y):
-            try:
-                y = pd.to_numeric(y, errors="raise")
-            except (ValueError, TypeError) as e:
-                raise TypeError(
-                    f"HP Search: Target column '{target}' could not be converted to numeric: {e}"
-                ) from e
+        # float32 feature block and compact labels, without intermediate copies
+        X, y = build_training_data(data, features, target)
 
         logger.info(f"HP Search: Prepared data - X shape {X.shape}, y shape {y.shape}")
         return X, y
 
-    def _create_optuna_sampler(self) -> Optional[optuna.samplers.BaseSampler]:
+    def _create_optuna_sampler(
+        self, seed_offset: int = 0
+    ) -> Optional[optuna.samplers.BaseSampler]:
         if not self.job_config:
             raise RuntimeError("Job config (HPSearchConfig) not loaded.")
 
@@ -250,7 +265,8 @@ class HPSearchJobHandler(BaseMLJobHandler):
         sampler_type_str = optuna_specific_config.get("sampler_type")  # Can be None
         sampler_params = optuna_specific_config.get("sampler_config", {})
         # Use random_seed from the main HPSearchConfig for sampler seed
-        seed_for_sampler = self.job_config.get("random_seed", 42)
+        # Parallel trial workers offset it so they don't propose identical trials
+        seed_for_sampler = self.job_config.get("random_seed", 42) + seed_offset
         return create_sampler(sampler_type_str, sampler_params, seed_for_sampler)
 
     def _create_optuna_pruner(self) -> Optional[optuna.pruners.BasePruner]:
@@ -293,8 +309,14 @@ class HPSearchJobHandler(BaseMLJobHandler):
         }
         return "maximize" if metric_enum in maximize_metrics else "minimize"
 
-    def _execute_hp_search(self, X: pd.DataFrame, y: pd.Series) -> optuna.Study:
-        """Executes the Optuna study."""
+    def _get_optuna_config(self) -> Dict[str, Any]:
+        optuna_specific_config = self.job_config.get("optuna_config", {})
+        return (
+            optuna_specific_config if isinstance(optuna_specific_config, dict) else {}
+        )
+
+    def _create_or_load_study(self, seed_offset: int = 0) -> optuna.Study:
+        """Creates the job's Optuna study in the RDB storage, or loads it if it exists."""
         if not self.job_db_record or not self.job_config:
             raise RuntimeError("Job record or config not loaded.")
 
@@ -309,7 +331,7 @@ class HPSearchJobHandler(BaseMLJobHandler):
 
         study_name = self.job_db_record.optuna_study_name
         direction = self._determine_optimization_direction()
-        sampler = self._create_optuna_sampler()
+        sampler = self._create_optuna_sampler(seed_offset)
         pruner = self._create_optuna_pruner()
 
         logger.info(
@@ -317,7 +339,7 @@ class HPSearchJobHandler(BaseMLJobHandler):
             f"Direction: {direction}, Sampler: {sampler.__class__.__name__ if sampler else 'Default'}, "
             f"Pruner: {pruner.__class__.__name__ if pruner else 'Default'}"
         )
-        study = optuna.create_study(
+        return optuna.create_study(
             study_name=study_name,
             storage=storage,
             load_if_exists=True,  # Important for resuming
@@ -326,7 +348,37 @@ class HPSearchJobHandler(BaseMLJobHandler):
             pruner=pruner,
         )
 
-        # --- Prepare Objective ---
+    def _training_matrix(self, X: pd.DataFrame) -> np.ndarray:
+        """
+        float32 copy of X shared by the CV folds of every trial. With the local
+        artifact cache enabled it is written once per dataset version and
+        memory-mapped, so trial workers on the same host share its pages.
+        """
+        etag = (
+            self.artifact_service.get_artifact_etag(self._dataset_storage_path)
+            if local_artifact_cache.enabled and self._dataset_storage_path
+            else None
+        )
+        if etag is None:
+            return np.ascontiguousarray(X.to_numpy(dtype=np.float32))
+
+        def write_matrix(destination: str):
+            with open(destination, "wb") as f:
+                np.save(f, np.ascontiguousarray(X.to_numpy(dtype=np.float32)))
+
+        # Same dataset version, columns and prepared rows -> same matrix
+        key = "\0".join(
+            [*X.columns, str(self.job_config.get("target_column")), str(len(X))]
+        )
+        path = local_artifact_cache.get_path(
+            f"{self._dataset_storage_path}.hp_search_X.npy",
+            etag,
+            write_matrix,
+            variant=hashlib.sha256(key.encode()).hexdigest(),
+        )
+        return np.load(path, mmap_mode="r")
+
+    def _build_objective(self, X: pd.DataFrame, y: pd.Series) -> Objective:
         # Get model_type_enum from HPSearchConfig
         model_type_str = self.job_config.get("model_type")
         if not model_type_str:
@@ -341,46 +393,216 @@ class HPSearchJobHandler(BaseMLJobHandler):
             raise ValueError("hp_space not defined in HPSearchConfig.")
 
         # The Objective needs the HPSearchConfig (self.job_config) as base_job_config
-        objective_instance = Objective(
+        return Objective(
             X,
             y,
             model_type_enum=model_type_enum_for_objective,
             hp_space_config=hp_space_config_list,
             base_job_config=self.job_config,  # Pass HPSearchConfig
             artifact_service=self.artifact_service,  # Pass injected service
+            X_matrix=self._training_matrix(X),
         )
 
-        optuna_specific_config = self.job_config.get("optuna_config", {})
-        if not isinstance(optuna_specific_config, dict):
-            optuna_specific_config = {}
-        n_trials = optuna_specific_config.get("n_trials", 10)
-        timeout_seconds = optuna_specific_config.get("timeout_seconds")  # Can be None
+    @staticmethod
+    def _count_finished_trials(study: optuna.Study) -> int:
+        return len(study.get_trials(deepcopy=False, states=_FINISHED_TRIAL_STATES))
 
-        async def progress_callback(
-            study: optuna.Study, trial: optuna.trial.FrozenTrial
-        ):
-            # Calculate progress based on completed trials relative to n_trials
-            # This doesn't account for timeout well, but is a simple progress indicator.
+    def _make_progress_callback(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        n_trials: int,
+        baseline: int,
+        stop_at: Optional[int] = None,
+        worker_label: str = "",
+    ):
+        """
+        Optuna callback reporting progress over all trials of the study (so
+        parallel workers report the same aggregate), and stopping the study
+        once `stop_at` trials have finished. It runs in the optimize thread
+        and hands the progress event to the task's event loop.
+        """
+
+        def progress_callback(study: optuna.Study, trial: optuna.trial.FrozenTrial):
+            finished = self._count_finished_trials(study) - baseline
+            if stop_at is not None and finished + baseline >= stop_at:
+                study.stop()
+            try:
+                best = f"{study.best_value:.4f}"
+            except ValueError:  # No completed trial yet
+                best = "n/a"
             progress_percent = (
-                35 + int(60 * (len(study.trials) / n_trials)) if n_trials > 0 else 35
+                35 + int(60 * (finished / n_trials)) if n_trials > 0 else 35
             )
-            await self._update_progress(
-                f"Optuna trial {trial.number + 1}/{n_trials} ({trial.state.name}). Current best: {study.best_value:.4f}",
-                min(progress_percent, 95),  # Cap at 95% during search
+            asyncio.run_coroutine_threadsafe(
+                self._update_progress(
+                    f"Optuna trials finished: {min(finished, n_trials)}/{n_trials}{worker_label} "
+                    f"(last: {trial.state.name}). Current best: {best}",
+                    min(progress_percent, 95),  # Cap at 95% during search
+                ),
+                loop,
             )
 
+        return progress_callback
+
+    async def _execute_hp_search(self, X: pd.DataFrame, y: pd.Series) -> optuna.Study:
+        """Executes the Optuna study in this process."""
+        study = self._create_or_load_study()
+        objective_instance = self._build_objective(X, y)
+
+        optuna_specific_config = self._get_optuna_config()
+        n_trials = optuna_specific_config.get("n_trials", 10)
+        timeout_seconds = optuna_specific_config.get("timeout_seconds")  # Can be None
+
+        progress_callback = self._make_progress_callback(
+            asyncio.get_running_loop(), n_trials, self._count_finished_trials(study)
+        )
+
         logger.info(
-            f"Starting Optuna study '{study_name}', optimizing for {n_trials} trials (timeout: {timeout_seconds}s)..."
+            f"Starting Optuna study '{study.study_name}', optimizing for {n_trials} trials (timeout: {timeout_seconds}s)..."
         )
-        study.optimize(
+        await asyncio.to_thread(
+            study.optimize,
             objective_instance,
             n_trials=n_trials,
             timeout=timeout_seconds,
             callbacks=[progress_callback],
         )
-        logger.info(f"Optuna study '{study_name}' optimization finished.")
+        logger.info(f"Optuna study '{study.study_name}' optimization finished.")
         return study
 
+    def requested_parallel_workers(self) -> int:
+        """
+        Number of trial workers requested by the job's optuna_config, capped by
+        ML_HP_SEARCH_MAX_PARALLEL_WORKERS. 1 means the single-process search.
+        """
+        job_record = self.hp_search_job_repo.get_by_id(self.job_id)
+        if not job_record or not isinstance(job_record.config, dict):
+            return 1
+        optuna_specific_config = job_record.config.get("optuna_config") or {}
+        if not isinstance(optuna_specific_config, dict):
+            return 1
+        requested = int(optuna_specific_config.get("n_parallel_workers") or 1)
+        return max(1, min(requested, settings.ML_HP_SEARCH_MAX_PARALLEL_WORKERS))
+
+    async def prepare_parallel_search(self, n_workers: int) -> Dict:
+        """
+        Marks the job RUNNING and creates the shared study, recording the
+        trial budget and deadline the trial workers stop at. A redelivered
+        coordinator keeps the budget recorded by the first delivery.
+        """
+        results_payload: Dict[str, Any] = {
+            "job_id": self.job_id,
+            "status": JobStatusEnum.FAILED,
+            "message": f"Job {self.job_id} failed validation or loading.",
+        }
+        if not self._load_and_validate_job_details():
+            return results_payload
+
+        try:
+            study = self._create_or_load_study()
+            optuna_specific_config = self._get_optuna_config()
+            n_trials = optuna_specific_config.get("n_trials", 10)
+            timeout_seconds = optuna_specific_config.get("timeout_seconds")
+            if _TRIAL_BUDGET_ATTR not in study.user_attrs:
+                baseline = self._count_finished_trials(study)
+                study.set_user_attr(_TRIAL_BASELINE_ATTR, baseline)
+                study.set_user_attr(_TRIAL_BUDGET_ATTR, baseline + n_trials)
+                study.set_user_attr(
+                    _DEADLINE_ATTR,
+                    time.time() + timeout_seconds if timeout_seconds else None,
+                )
+        except Exception as e:
+            status_message = (
+                f"HP Search Job {self.job_id} failed: {type(e).__name__}: {e}"
+            )
+            logger.critical(status_message, exc_info=True)
+            await asyncio.to_thread(
+                self.status_updater.update_job_completion,
+                job_id=self.job_id,
+                job_type=self.job_model_class,
+                status=JobStatusEnum.FAILED,
+                message=status_message,
+            )
+            results_payload.update(error=str(e), message=status_message)
+            return results_payload
+
+        message = f"Running {n_trials} Optuna trials on {n_workers} parallel workers."
+        await self._update_progress(message, 35)
+        results_payload.update(
+            status=JobStatusEnum.RUNNING,
+            message=message,
+            study_name=study.study_name,
+            n_workers=n_workers,
+        )
+        return results_payload
+
+    async def run_trial_worker(self, worker_index: int) -> Dict:
+        """
+        Pulls trials from the shared study until the study-wide trial budget or
+        deadline is reached. Failures are reported in the result instead of
+        raised, so the finalizer still runs for the other workers' trials.
+        """
+        result: Dict[str, Any] = {
+            "job_id": self.job_id,
+            "worker_index": worker_index,
+            "status": JobStatusEnum.FAILED,
+            "trials_run": 0,
+        }
+        try:
+            if not self._load_and_validate_job_details(mark_running=False):
+                result["status"] = JobStatusEnum.SKIPPED
+                return result
+
+            X, y = self._prepare_data(self._load_data())
+            study = self._create_or_load_study(seed_offset=worker_index)
+            objective_instance = self._build_objective(X, y)
+
+            baseline = study.user_attrs.get(_TRIAL_BASELINE_ATTR, 0)
+            budget = study.user_attrs.get(_TRIAL_BUDGET_ATTR)
+            if budget is None:
+                raise RuntimeError(
+                    f"Study '{study.study_name}' has no trial budget; it was not prepared for parallel search."
+                )
+            deadline = study.user_attrs.get(_DEADLINE_ATTR)
+            timeout = max(0.0, deadline - time.time()) if deadline else None
+
+            finished_before = self._count_finished_trials(study)
+            if finished_before >= budget or timeout == 0.0:
+                result["status"] = JobStatusEnum.SUCCESS
+                return result
+
+            progress_callback = self._make_progress_callback(
+                asyncio.get_running_loop(),
+                budget - baseline,
+                baseline,
+                stop_at=budget,
+                worker_label=f" (worker {worker_index})",
+            )
+            logger.info(
+                f"HP Search Job {self.job_id} worker {worker_index}: joining study "
+                f"'{study.study_name}' at {finished_before - baseline}/{budget - baseline} trials (timeout: {timeout}s)."
+            )
+            own_trials: List[int] = []
+            await asyncio.to_thread(
+                study.optimize,
+                objective_instance,
+                n_trials=None,
+                timeout=timeout,
+                callbacks=[
+                    progress_callback,
+                    lambda _study, trial: own_trials.append(trial.number),
+                ],
+            )
+            result["trials_run"] = len(own_trials)
+            result["status"] = JobStatusEnum.SUCCESS
+        except Exception as e:
+            logger.error(
+                f"HP Search Job {self.job_id} worker {worker_index} failed: {type(e).__name__}: {e}",
+                exc_info=True,
+            )
+            result["error"] = str(e)[:500]
+        return result
+
     def _save_best_model(
         self, study: optuna.Study, X: pd.DataFrame, y: pd.Series
     ) -> Optional[int]:
@@ -473,6 +695,9 @@ class HPSearchJobHandler(BaseMLJobHandler):
                 logger.info(
                     f"Best model saved. DB ID: {new_model_id}, S3 Path: {s3_uri}"
                 )
+                if settings.ML_COMPILE_TREE_MODELS:
+                    final_strategy.save_compiled_model(s3_uri, X)
+                final_strategy.save_background_summary(s3_uri, X, y)
 
         except Exception as e:
             logger.error(
@@ -487,8 +712,12 @@ class HPSearchJobHandler(BaseMLJobHandler):
 
         return new_model_id
 
-    async def process_job(self) -> Dict:
-        """Orchestrates the HP search job execution."""
+    async def process_job(self, finalize_only: bool = False) -> Dict:
+        """
+        Orchestrates the HP search job execution. With finalize_only the trials
+        were already run by parallel trial workers: the shared study is loaded,
+        and the best model is trained and the job completed exactly once.
+        """
         final_status = JobStatusEnum.FAILED
         status_message = "HP Search processing failed during initialization."
         results_payload: Dict[str, Any] = {
@@ -499,8 +728,18 @@ class HPSearchJobHandler(BaseMLJobHandler):
         best_model_id_saved: Optional[int] = None
         optuna_study_results: Dict[str, Any] = {}
 
+        if finalize_only and not self._load_and_validate_job_details(
+            mark_running=False
+        ):
+            # Already completed (e.g. redelivered finalizer), revoked or invalid
+            results_payload["status"] = JobStatusEnum.SKIPPED
+            results_payload["message"] = (
+                f"Job {self.job_id} is not RUNNING; nothing to finalize."
+            )
+            return results_payload
+
         try:
-            if not self._load_and_validate_job_details():
+            if not finalize_only and not self._load_and_validate_job_details():
                 if self.job_db_record and self.job_db_record.status not in [
                     JobStatusEnum.PENDING,
                     JobStatusEnum.RUNNING,
@@ -519,8 +758,12 @@ class HPSearchJobHandler(BaseMLJobHandler):
             raw_data = self._load_data()
             await self._update_progress("Preparing data for HP search...", 35)
             X, y = self._prepare_data(raw_data)
+            del raw_data  # Only the feature matrix is needed from here on
 
-            optuna_study = self._execute_hp_search(X, y)
+            if finalize_only:
+                optuna_study = self._create_or_load_study()
+            else:
+                optuna_study = await self._execute_hp_search(X, y)
 
             # Attempt to save the best model if configured
             best_model_id_saved = self._save_best_model(optuna_study, X, y)
@@ -7,6 +7,8 @@ import numpy as np
 import pandas as pd
 
 from services.artifact_service import ArtifactService
+from services.feature_matrix import build_feature_matrix
+from services.model_cache import model_cache
 from shared.core.config import settings
 from shared.db.models import InferenceJob
 from shared.repositories import (
@@ -197,10 +199,12 @@ class InferenceJobHandler(BaseMLJobHandler):
         strategy.load_model(
             model_record.s3_artifact_path
         )  # Strategy uses its artifact_service
+        if settings.ML_INFERENCE_USE_COMPILED_MODELS:
+            strategy.load_compiled_model(model_record.s3_artifact_path)
         self.model_strategy = strategy  # Store the loaded strategy instance
 
         logger.info(
-            f"Model {self.ml_model_id} (type: {model_type_enum.value}) loaded into strategy."
+            f"Model {self.ml_model_id} (type: {model_type_enum.value}) loaded into strategy. Model cache: {model_cache.stats()}"
         )
         return strategy
 
@@ -272,9 +276,11 @@ class InferenceJobHandler(BaseMLJobHandler):
                 )
                 # Fallback: use all columns not in available_identifiers
                 # This is risky if features_df contains unexpected columns.
-                potential_features = features_df.columns.difference(
-                    available_identifiers
-                ).tolist()
+                potential_features = (
+                    features_df.drop(columns=available_identifiers)
+                    .select_dtypes(include=["number", "bool"])
+                    .columns.tolist()
+                )
                 if not potential_features:
                     raise ValueError(
                         "No potential feature columns found after excluding identifiers."
@@ -294,14 +300,8 @@ class InferenceJobHandler(BaseMLJobHandler):
                 f"Input features_df is missing columns expected by the model: {sorted(list(missing_model_features))}"
             )
 
-        X_inference = features_df[expected_features].copy()
-
-        # Handle NaNs - simple fillna(0) for inference
-        if X_inference.isnull().values.any():
-            logger.warning(
-                "Inference feature data contains NaN values. Filling with 0."
-            )
-            X_inference = X_inference.fillna(0)
+        # Same float32 feature block as in training, NaNs filled with 0
+        X_inference = build_feature_matrix(features_df, expected_features)
 
         logger.info(
             f"Data prepared for inference. Features shape: {X_inference.shape}, Identifiers shape: {identifiers_df.shape}"
@@ -314,10 +314,17 @@ class InferenceJobHandler(BaseMLJobHandler):
             raise RuntimeError("Model strategy not loaded. Cannot execute prediction.")
 
         self._update_progress("Executing prediction...", 45)
-        prediction_result_dict = self.model_strategy.predict(X_inference)
+        prediction_result_dict = self._predict(X_inference)
         logger.info("Prediction execution complete via strategy.")
         return prediction_result_dict
 
+    def _predict(self, X_inference: pd.DataFrame) -> Dict[str, Any]:
+        """Predicts with the compiled predictor if one was loaded, else the native model."""
+        compiled = self.model_strategy.compiled_model
+        if compiled is not None:
+            return compiled.predict_result(X_inference)
+        return self.model_strategy.predict(X_inference)
+
     def _package_results(
         self, ml_result_dict: Dict[str, Any], identifiers_df: pd.DataFrame
     ) -> Tuple[Dict[str, Any], Optional[str]]:
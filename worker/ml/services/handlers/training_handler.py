@@ -6,8 +6,10 @@ from typing import Any, Dict, Optional, Tuple
 import pandas as pd
 
 from services.artifact_service import ArtifactService
+from services.feature_matrix import build_training_data
+from services.out_of_core import ParquetTrainingData
 from shared.core.config import settings
-from shared.db.models import TrainingJob
+from shared.db.models import Dataset, MLModel, TrainingJob
 from shared.repositories import (
     DatasetRepository,
     MLFeatureRepository,
@@ -55,7 +57,10 @@ class TrainingJobHandler(BaseMLJobHandler):
         self.dataset_repo = dataset_repo
         self.training_job_repo = training_job_repo
         self._dataset_storage_path: Optional[str] = None  # Cache path locally
+        self._dataset_num_rows: Optional[int] = None
         self.job_config: Dict[str, Any] = {}  # Initialize job_config, will be loaded
+        # Set for incremental jobs (config.parent_model_id)
+        self.parent_model_record: Optional[MLModel] = None
 
     @property
     def job_type_name(self) -> str:
@@ -114,6 +119,13 @@ class TrainingJobHandler(BaseMLJobHandler):
             if not dataset_record.storage_path:
                 raise ValueError(f"Dataset {self.dataset_id} storage path missing.")
             self._dataset_storage_path = dataset_record.storage_path
+            self._dataset_num_rows = dataset_record.num_rows
+
+            parent_model_id = self.job_config.get("parent_model_id")
+            if parent_model_id:
+                self.parent_model_record = self._load_parent_model_record(
+                    parent_model_id, dataset_record
+                )
 
             # --- Update Status to RUNNING ---
             updated = self.status_updater.update_job_start(
@@ -156,6 +168,60 @@ class TrainingJobHandler(BaseMLJobHandler):
                     )
             return False
 
+    def _load_parent_model_record(
+        self, parent_model_id: int, dataset_record: Dataset
+    ) -> MLModel:
+        """Validates the parent model of an incremental job against the job and its dataset."""
+        parent = self.model_repo.get_by_id(parent_model_id)
+        if not parent:
+            raise ValueError(f"Parent model {parent_model_id} not found.")
+        if not parent.s3_artifact_path:
+            raise ValueError(f"Parent model {parent_model_id} has no saved artifact.")
+        if parent.model_type != self.job_config.get("model_type"):
+            raise ValueError(
+                f"Parent model {parent_model_id} is a {parent.model_type} model, "
+                f"the job config asks for {self.job_config.get('model_type')}."
+            )
+
+        # The delta dataset should start at the watermark of the parent's dataset
+        after_watermark = (dataset_record.config or {}).get("after_watermark")
+        parent_dataset = (
+            self.dataset_repo.get_record(parent.dataset_id)
+            if parent.dataset_id
+            else None
+        )
+        parent_watermark = (
+            (parent_dataset.config or {}).get("watermark") if parent_dataset else None
+        )
+        if after_watermark is None:
+            logger.warning(
+                f"Dataset {dataset_record.id} is not a delta dataset; parent model {parent_model_id} "
+                "will be trained further on all of its rows, including ones it has already seen."
+            )
+        elif parent_watermark is not None and after_watermark != parent_watermark:
+            logger.warning(
+                f"Delta dataset {dataset_record.id} starts after watermark {after_watermark}, "
+                f"but parent model {parent_model_id} was trained up to {parent_watermark}."
+            )
+        logger.info(
+            f"Incremental training: continuing model {parent.name} v{parent.version} (ID {parent.id})."
+        )
+        return parent
+
+    def _align_features_with_parent(self, X: pd.DataFrame) -> pd.DataFrame:
+        """Orders the feature columns like the parent model was trained on."""
+        parent_model = self.artifact_service.load_cached_artifact(
+            self.parent_model_record.s3_artifact_path
+        )
+        parent_features = getattr(parent_model, "feature_names_in_", None)
+        if parent_features is None:
+            return X
+        if set(parent_features) != set(X.columns):
+            raise ValueError(
+                "Feature columns of the job do not match the parent model's features."
+            )
+        return X[list(parent_features)]
+
     def _load_data(self) -> pd.DataFrame:
         """Loads data using the injected artifact service and cached path."""
         if not self._dataset_storage_path:
@@ -170,7 +236,14 @@ class TrainingJobHandler(BaseMLJobHandler):
                 )
 
         self._update_progress("Loading dataset artifact...", 15)
-        df = self.artifact_service.load_dataframe_artifact(self._dataset_storage_path)
+        # Only read the columns the model needs (skips identifiers/text columns)
+        config = self.job_config or {}
+        features = config.get("feature_columns") or []
+        target = config.get("target_column")
+        columns = features + [target] if features and target else None
+        df = self.artifact_service.load_dataframe_artifact(
+            self._dataset_storage_path, columns=columns
+        )
         if df is None or df.empty:
             raise ValueError(
                 f"Failed to load or empty dataset from {self._dataset_storage_path}"
@@ -207,42 +280,14 @@ class TrainingJobHandler(BaseMLJobHandler):
                 f"Dataset missing required columns: {', '.join(missing_cols)}"
             )
 
-        X = data[features].copy()  # Use .copy() to avoid SettingWithCopyWarning
-        y = data[target].copy()
-
-        # Handle NaNs in features - simple fillna(0) for now
-        if X.isnull().values.any():
-            logger.warning("Feature data contains NaN values. Filling with 0.")
-            X = X.fillna(0)
-
-        if y.isnull().any():
-            logger.warning(
-                f"Target column '{target}' has NaNs. Corresponding rows will be dropped from X and y."
-            )
-            valid_indices = y.notna()
-            X = X[valid_indices]
-            y = y[valid_indices]
-            if y.empty:  # Should not happen if dataset generation is robust
-                raise ValueError("Target column is empty after removing NaN values.")
-
-        # Ensure target is numeric (common requirement for sklearn classifiers)
-        if pd.api.types.is_bool_dtype(y):
-            y = y.astype(int)
-        elif not pd.api.types.is_numeric_dtype(y):
-            try:
-                y = pd.to_numeric(y, errors="raise")
-            except (ValueError, TypeError) as e:
-                raise TypeError(
-                    f"Target column '{target}' could not be converted to numeric: {e}"
-                ) from e
+        # float32 feature block and compact labels, without intermediate copies
+        X, y = build_training_data(data, features, target)
 
         logger.info(f"Prepared training data: X shape {X.shape}, y shape {y.shape}")
         return X, y
 
-    def _create_and_train_strategy(
-        self, X_train: pd.DataFrame, y_train: pd.Series
-    ) -> Tuple[TrainResult, BaseModelStrategy]:
-        """Creates, validates, and trains the model strategy."""
+    def _create_strategy(self) -> BaseModelStrategy:
+        """Creates the model strategy and validates its hyperparameters."""
         if not self.job_config:
             raise RuntimeError("Job config not loaded. Cannot create/train strategy.")
 
@@ -281,19 +326,97 @@ class TrainingJobHandler(BaseMLJobHandler):
             raise ValueError(
                 f"Unknown hyperparameters for {model_type_enum.value}: {sorted(list(unknown_hp))}"
             )
+        return strategy
+
+    def _use_out_of_core(self, strategy: BaseModelStrategy) -> bool:
+        """Large datasets are streamed from Parquet when the model type allows it."""
+        threshold = settings.ML_OUT_OF_CORE_MIN_ROWS
+        return (
+            threshold > 0
+            and self._dataset_num_rows is not None
+            and self._dataset_num_rows >= threshold
+            and self.parent_model_record is None
+            and strategy.supports_out_of_core()
+        )
+
+    def _train_out_of_core(
+        self, strategy: BaseModelStrategy
+    ) -> Tuple[TrainResult, pd.DataFrame, pd.Series]:
+        """
+        Trains from the dataset's Parquet row groups without loading it into a
+        DataFrame. Returns the result and the held-out rows, which stand in for
+        the full feature matrix when saving the model.
+        """
+        config = self.job_config
+        features = config.get("feature_columns") or []
+        target = config.get("target_column")
+        if not features or not target:
+            raise ValueError(
+                "Missing feature_columns or target_column in job configuration."
+            )
+        with self.artifact_service.open_parquet_file(
+            self._dataset_storage_path
+        ) as parquet_file:
+            if parquet_file is None:
+                raise ValueError(
+                    f"Failed to open dataset from {self._dataset_storage_path}"
+                )
+            logger.info(
+                f"Dataset {self.dataset_id} has {self._dataset_num_rows} rows; "
+                "training out of core from its Parquet row groups."
+            )
+            data = ParquetTrainingData(
+                parquet_file,
+                features,
+                target,
+                test_size=config.get("eval_test_split_size", 0.2),
+                random_seed=config.get("random_seed", 42),
+                eval_max_rows=settings.ML_OUT_OF_CORE_EVAL_MAX_ROWS,
+            )
+            train_result = strategy.train_out_of_core(data)
+            logger.info(
+                f"Out-of-core training complete. Metrics: {train_result.metrics}"
+            )
+            X_reference, y_reference = data.eval_set()
+            if X_reference.empty:
+                X_reference, y_reference = data.class_sample()
+        return train_result, X_reference, y_reference
+
+    def _train_strategy(
+        self, strategy: BaseModelStrategy, X_train: pd.DataFrame, y_train: pd.Series
+    ) -> TrainResult:
+        """Trains the model strategy on an in-memory feature matrix."""
+        training_config_data = self.job_config
+        model_type_enum = strategy.model_type_enum
 
         self._update_progress(f"Training {model_type_enum.value} model...", 45)
-        train_result = strategy.train(
-            X_train, y_train
-        )  # Strategy handles model fitting
+        if self.parent_model_record is not None:
+            # Continue from the stored parent artifact, on the new rows only
+            strategy.load_model(self.parent_model_record.s3_artifact_path)
+            parent_model = strategy.model
+            n_estimators = (
+                training_config_data.get("incremental_estimators")
+                or settings.ML_INCREMENTAL_ESTIMATORS
+            )
+            train_result = strategy.train_incremental(
+                parent_model, X_train, y_train, n_estimators
+            )
+        else:
+            train_result = strategy.train(
+                X_train, y_train
+            )  # Strategy handles model fitting
 
         logger.info(
             f"Training complete for {model_type_enum.value}. Metrics: {train_result.metrics}"
         )
-        return train_result, strategy
+        return train_result
 
     def _save_results(
-        self, train_result: TrainResult, strategy: BaseModelStrategy
+        self,
+        train_result: TrainResult,
+        strategy: BaseModelStrategy,
+        X_reference: pd.DataFrame,
+        y_reference: Optional[pd.Series] = None,
     ) -> int:
         """Saves model artifact and creates DB record using injected repos/services."""
         if not self.job_config:
@@ -308,6 +431,16 @@ class TrainingJobHandler(BaseMLJobHandler):
         model_name = training_config_data.get("model_name")
         model_type_str = training_config_data.get("model_type")
         hyperparams = training_config_data.get("hyperparameters", {})
+        description = f"Trained via TrainingJob {self.job_id}"
+        parent = self.parent_model_record
+        if parent is not None:
+            # Incremental results are registered as the parent's next version
+            model_name = parent.name
+            hyperparams = {**(parent.hyperparameters or {}), **hyperparams}
+            description = (
+                f"Incrementally trained from {parent.name} v{parent.version} "
+                f"(ID {parent.id}) via TrainingJob {self.job_id}"
+            )
 
         if not model_name or not model_type_str:
             raise ValueError(
@@ -332,7 +465,7 @@ class TrainingJobHandler(BaseMLJobHandler):
                 "name": model_name,
                 "model_type": model_type_enum.value,
                 "version": new_version,
-                "description": f"Trained via TrainingJob {self.job_id}",
+                "description": description,
                 "hyperparameters": hyperparams,
                 "performance_metrics": train_result.metrics,
                 "dataset_id": self.dataset_id,
@@ -365,6 +498,9 @@ class TrainingJobHandler(BaseMLJobHandler):
                 logger.info(
                     f"Model artifact saved to {s3_uri} and DB record {new_model_id} updated."
                 )
+                if settings.ML_COMPILE_TREE_MODELS:
+                    strategy.save_compiled_model(s3_uri, X_reference)
+                strategy.save_background_summary(s3_uri, X_reference, y_reference)
 
         except Exception as e:
             logger.error(
@@ -411,14 +547,22 @@ class TrainingJobHandler(BaseMLJobHandler):
                     # results_payload["status"] remains FAILED
                 return results_payload
 
-            raw_data = self._load_data()
+            strategy_instance = self._create_strategy()
+            if self._use_out_of_core(strategy_instance):
+                await self._update_progress("Training model out of core...", 15)
+                train_result, X, y = self._train_out_of_core(strategy_instance)
+            else:
+                raw_data = self._load_data()
 
-            await self._update_progress("Preparing data...", 35)
-            X, y = self._prepare_data(raw_data)
+                await self._update_progress("Preparing data...", 35)
+                X, y = self._prepare_data(raw_data)
+                del raw_data  # Only the feature matrix is needed from here on
+                if self.parent_model_record is not None:
+                    X = self._align_features_with_parent(X)
 
-            train_result, strategy_instance = self._create_and_train_strategy(X, y)
+                train_result = self._train_strategy(strategy_instance, X, y)
 
-            new_model_id = self._save_results(train_result, strategy_instance)
+            new_model_id = self._save_results(train_result, strategy_instance, X, y)
 
             final_status = JobStatusEnum.SUCCESS
             status_message = f"Training successful. Model ID: {new_model_id} created."
@@ -0,0 +1,207 @@
+# worker/ml/services/handlers/xai_batch_explanation_handler.py
+import asyncio
+import logging
+from typing import Any, Dict, List
+
+from celery import Task
+from celery.exceptions import Ignore
+
+from services.artifact_service import ArtifactService
+from services.factories.xai_strategy_factory import XAIStrategyFactory
+from shared.repositories import (
+    DatasetRepository,
+    InferenceJobRepository,
+    MLFeatureRepository,
+    ModelRepository,
+    XaiResultRepository,
+)
+from shared.schemas.enums import XAIStatusEnum
+
+from .xai_explanation_handler import XAIExplanationHandler
+
+logger = logging.getLogger(__name__)
+
+
+class XAIBatchExplanationHandler(XAIExplanationHandler):
+    """
+    Generates several XAI explanations of one inference job in a single pass.
+    The model, the commit features and the background data are loaded once and
+    shared by all techniques, and the XAIResult rows are written together.
+    """
+
+    def __init__(
+        self,
+        xai_result_ids: List[int],
+        task_instance: Task,
+        xai_repo: XaiResultRepository,
+        model_repo: ModelRepository,
+        feature_repo: MLFeatureRepository,
+        artifact_service: ArtifactService,
+        inference_job_repo: InferenceJobRepository,
+        dataset_repo: DatasetRepository,
+    ):
+        if not xai_result_ids:
+            raise ValueError(
+                "XAIBatchExplanationHandler needs at least one XAIResult ID."
+            )
+        super().__init__(
+            xai_result_id=xai_result_ids[0],
+            task_instance=task_instance,
+            xai_repo=xai_repo,
+            model_repo=model_repo,
+            feature_repo=feature_repo,
+            artifact_service=artifact_service,
+            inference_job_repo=inference_job_repo,
+            dataset_repo=dataset_repo,
+        )
+        self.xai_result_ids = list(xai_result_ids)
+
+    def _select_runnable_records(self, task_id_str: str) -> List[Any]:
+        """Loads the XAIResult records and drops those this task must not run."""
+        records = self.xai_repo.get_xai_results_sync(self.xai_result_ids)
+        missing = set(self.xai_result_ids) - {record.id for record in records}
+        if missing:
+            logger.warning(f"XAIResult records {sorted(missing)} not found in DB.")
+
+        runnable = []
+        for record in records:
+            if record.status in [
+                XAIStatusEnum.SUCCESS,
+                XAIStatusEnum.FAILED,
+                XAIStatusEnum.REVOKED,
+            ]:
+                logger.info(
+                    f"XAIResult {record.id} is already in a terminal state ({record.status.value}). Skipping."
+                )
+            elif (
+                record.status == XAIStatusEnum.RUNNING
+                and record.celery_task_id != task_id_str
+            ):
+                logger.info(
+                    f"XAIResult {record.id} is already being processed by another task ({record.celery_task_id}). Skipping."
+                )
+            else:
+                runnable.append(record)
+
+        inference_job_ids = {record.inference_job_id for record in runnable}
+        if len(inference_job_ids) > 1:
+            raise ValueError(
+                f"XAIResults {self.xai_result_ids} belong to several inference jobs: {sorted(inference_job_ids)}."
+            )
+        return runnable
+
+    async def process_explanations(self) -> Dict[str, Any]:
+        task_id_str = self.task.request.id if self.task else "N/A"
+        logger.info(
+            f"Handler: Starting combined XAI generation for XAIResult IDs {self.xai_result_ids} (Task: {task_id_str})"
+        )
+
+        records = await asyncio.to_thread(self._select_runnable_records, task_id_str)
+        if not records:
+            raise Ignore(
+                f"None of the XAIResults {self.xai_result_ids} need to be generated."
+            )
+
+        await asyncio.to_thread(
+            self.xai_repo.update_xai_results_sync,
+            {
+                record.id: {
+                    "status": XAIStatusEnum.RUNNING,
+                    "message": "Loading model and data...",
+                    "task_id": task_id_str,
+                    "is_start": True,
+                }
+                for record in records
+            },
+        )
+
+        final_updates: Dict[int, Dict[str, Any]] = {}
+        try:
+            (
+                model_type_enum_for_xai,
+                X_inference_features_only,
+                identifiers_df,
+                background_data_df,
+            ) = await self._prepare_explanation_inputs(records[0].inference_job_id)
+
+            for record in records:
+                xai_type = record.xai_type
+                try:
+                    xai_strategy = XAIStrategyFactory.create(
+                        xai_type=xai_type,
+                        model=self.loaded_model_instance,
+                        model_type_enum=model_type_enum_for_xai,
+                        background_data=background_data_df,
+                        feature_names=self.feature_names_for_xai,
+                        model_key=self.model_key,
+                    )
+                    logger.info(
+                        f"Handler: Executing XAI strategy {xai_strategy.__class__.__name__} for XAIResult {record.id}."
+                    )
+                    explanation_result_object = xai_strategy.explain(
+                        X_inference_features_only, identifiers_df
+                    )
+                except Exception as e:
+                    logger.error(
+                        f"Handler: {xai_type.value} explanation failed for XAIResult {record.id}: {e}",
+                        exc_info=True,
+                    )
+                    explanation_result_object = None
+                    status_update_message = f"{xai_type.value} explanation failed: {type(e).__name__}: {str(e)[:250]}"
+                else:
+                    status_update_message = f"{xai_type.value} strategy execution returned no data or failed."
+
+                if explanation_result_object:
+                    final_updates[record.id] = {
+                        "status": XAIStatusEnum.SUCCESS,
+                        "message": f"{xai_type.value} explanation generated successfully.",
+                        "result_data": explanation_result_object.model_dump(
+                            exclude_none=True, mode="json"
+                        ),
+                    }
+                else:
+                    final_updates[record.id] = {
+                        "status": XAIStatusEnum.FAILED,
+                        "message": status_update_message,
+                    }
+
+        except Exception as e:
+            failure_message = f"XAI generation critically failed for Result IDs {[r.id for r in records]}: {type(e).__name__}: {str(e)[:250]}"
+            logger.critical(failure_message, exc_info=True)
+            for record in records:
+                final_updates.setdefault(
+                    record.id,
+                    {"status": XAIStatusEnum.FAILED, "message": failure_message},
+                )
+        finally:
+            # Records not reached (e.g. cancelled) are failed with the rest
+            for record in records:
+                final_updates.setdefault(
+                    record.id,
+                    {
+                        "status": XAIStatusEnum.FAILED,
+                        "message": "XAI generation was interrupted.",
+                    },
+                )
+            try:
+                await asyncio.to_thread(
+                    self.xai_repo.update_xai_results_sync, final_updates
+                )
+            except Exception as db_update_err:
+                logger.critical(
+                    f"CRITICAL: Failed final DB update for XAIResults {sorted(final_updates)}: {db_update_err}",
+                    exc_info=True,
+                )
+
+        statuses = {
+            xai_result_id: update["status"].value
+            for xai_result_id, update in final_updates.items()
+        }
+        succeeded = sum(
+            status == XAIStatusEnum.SUCCESS.value for status in statuses.values()
+        )
+        return {
+            "xai_result_statuses": statuses,
+            "succeeded": succeeded,
+            "failed": len(statuses) - succeeded,
+        }
@@ -8,8 +8,10 @@ from celery import Task
 from celery.exceptions import Ignore, Reject
 
 from services.artifact_service import ArtifactService
+from services.explainer_cache import background_artifact_uri
 from services.factories.xai_strategy_factory import XAIStrategyFactory
 from services.strategies.base_xai_strategy import BaseXAIStrategy
+from shared.core.config import settings
 from shared.exceptions import InternalError
 from shared.repositories import (
     DatasetRepository,
@@ -21,6 +23,7 @@ from shared.repositories import (
 
 # Import ModelTypeEnum
 from shared.schemas.enums import ModelTypeEnum, XAIStatusEnum
+from shared.utils.xai_background import background_centroids_uri
 
 logger = logging.getLogger(__name__)
 
@@ -51,6 +54,9 @@ class XAIExplanationHandler:
             None  # Stores the loaded model object
         )
         self.feature_names_for_xai: Optional[List[str]] = None  # Store feature names
+        self.model_s3_path: Optional[str] = None
+        # "<s3 path>@<etag>" of the loaded model, keys the per-process explainer cache
+        self.model_key: Optional[str] = None
 
         logger.debug(f"Initialized XAIExplanationHandler for Result ID {xai_result_id}")
 
@@ -111,7 +117,9 @@ class XAIExplanationHandler:
         logger.info(
             f"XAIExplanationHandler: Attempting to load model from {model_s3_path}"
         )
-        self.loaded_model_instance = self.artifact_service.load_artifact(model_s3_path)
+        self.loaded_model_instance = self.artifact_service.load_cached_artifact(
+            model_s3_path
+        )
         if not self.loaded_model_instance:
             logger.error(
                 f"XAIExplanationHandler: CRITICAL - Failed to load model from: {model_s3_path}"
@@ -124,6 +132,9 @@ class XAIExplanationHandler:
         logger.info(
             f"XAIExplanationHandler: Model loaded successfully from {model_s3_path}. Type: {type(self.loaded_model_instance).__name__}"
         )
+        self.model_s3_path = model_s3_path
+        etag = self.artifact_service.get_artifact_etag(model_s3_path)
+        self.model_key = f"{model_s3_path}@{etag}" if etag else None
 
         # Determine feature names (model-specific)
         model = self.loaded_model_instance
@@ -193,123 +204,190 @@ class XAIExplanationHandler:
             )
             raise InternalError(f"Could not determine feature names for XAI: {e}")
 
-    def _load_background_data_for_xai(
-        self, dataset_id: Optional[int], X_inference_features_only: pd.DataFrame
-    ) -> Optional[pd.DataFrame]:
-        """Loads background data. Uses self.dataset_repo and self.artifact_service."""
-        if not dataset_id:
+    def _load_model_background_summary(self) -> Optional[pd.DataFrame]:
+        """Loads the background summary saved next to the model at training time."""
+        if not self.model_s3_path or not self.feature_names_for_xai:
+            return None
+        background_uri = background_artifact_uri(self.model_s3_path)
+        try:
+            if self.artifact_service.get_artifact_etag(background_uri) is None:
+                return None
+            background_df = self.artifact_service.load_cached_artifact(background_uri)
+        except Exception as e:
             logger.warning(
-                "No training dataset ID linked to the model. Using a sample of inference data for XAI background."
-            )
-            sample_n = (
-                min(100, len(X_inference_features_only))
-                if len(X_inference_features_only) > 0
-                else 0
+                f"Failed to load XAI background summary from {background_uri}: {e}"
             )
-            return (
-                X_inference_features_only.sample(n=sample_n, random_state=42)
-                if sample_n > 0
-                else None
+            return None
+        if not isinstance(background_df, pd.DataFrame) or background_df.empty:
+            return None
+        if set(self.feature_names_for_xai) - set(background_df.columns):
+            logger.warning(
+                f"XAI background summary {background_uri} does not match the model features. Ignoring it."
             )
+            return None
+        logger.info(
+            f"Using XAI background summary from {background_uri} (shape: {background_df.shape})"
+        )
+        return background_df[self.feature_names_for_xai]
 
+    @staticmethod
+    def _sample_inference_background(
+        X_inference_features_only: pd.DataFrame,
+    ) -> Optional[pd.DataFrame]:
+        """Last-resort XAI background: a sample of the inference rows themselves."""
+        sample_n = min(100, len(X_inference_features_only))
+        if sample_n == 0:
+            return None
+        return X_inference_features_only.sample(n=sample_n, random_state=42)
+
+    def _load_dataset_background(self, dataset_id: int) -> Optional[pd.DataFrame]:
+        """
+        Loads the background artifact the dataset worker wrote next to the
+        training dataset: its stratified sample, or its k-means centroids when
+        ML_XAI_BACKGROUND_METHOD is "kmeans".
+        """
         dataset_record = self.dataset_repo.get_record(dataset_id)
         if not dataset_record:
-            logger.warning(
-                f"Dataset record {dataset_id} not found. Using inference data sample for XAI background."
-            )
-            sample_n = (
-                min(100, len(X_inference_features_only))
-                if len(X_inference_features_only) > 0
-                else 0
-            )
-            return (
-                X_inference_features_only.sample(n=sample_n, random_state=42)
-                if sample_n > 0
-                else None
-            )
-
+            logger.warning(f"Dataset record {dataset_id} not found.")
+            return None
         background_path = dataset_record.background_data_path
         if not background_path:
             logger.warning(
-                f"No background data path specified for dataset {dataset_id}. Using inference data sample."
-            )
-            sample_n = (
-                min(100, len(X_inference_features_only))
-                if len(X_inference_features_only) > 0
-                else 0
+                f"No background data path specified for dataset {dataset_id}."
             )
-            return (
-                X_inference_features_only.sample(n=sample_n, random_state=42)
-                if sample_n > 0
-                else None
+            return None
+        if not self.feature_names_for_xai:
+            raise RuntimeError(
+                "Feature names for XAI must be determined before loading background data effectively."
             )
+        if settings.ML_XAI_BACKGROUND_METHOD == "kmeans":
+            centroids_path = background_centroids_uri(background_path)
+            if self.artifact_service.get_artifact_etag(centroids_path) is not None:
+                background_path = centroids_path
 
-        logger.info(f"Loading XAI background data sample from: {background_path}")
-        try:
-            background_df_raw = self.artifact_service.load_dataframe_artifact(
-                background_path
+        logger.info(f"Loading XAI background data from: {background_path}")
+        background_df_raw = self.artifact_service.load_dataframe_artifact(
+            background_path, columns=self.feature_names_for_xai
+        )
+        if background_df_raw is None or background_df_raw.empty:
+            raise ValueError("Loaded XAI background data is empty or None.")
+
+        missing_bg_features = set(self.feature_names_for_xai) - set(
+            background_df_raw.columns
+        )
+        if missing_bg_features:
+            logger.error(
+                f"Background data is missing expected features: {missing_bg_features}. Cannot use for XAI."
             )
-            if background_df_raw is None or background_df_raw.empty:
-                raise ValueError("Loaded XAI background data is empty or None.")
+            return None
 
-            # Ensure background_df only contains the features expected by the model
-            if not self.feature_names_for_xai:
-                raise RuntimeError(
-                    "Feature names for XAI must be determined before loading background data effectively."
-                )
+        background_df_features_only = background_df_raw[
+            self.feature_names_for_xai
+        ].copy()
+        if background_df_features_only.isnull().values.any():
+            logger.warning("XAI background data contains NaN values. Filling with 0.")
+            background_df_features_only = background_df_features_only.fillna(0)
 
-            missing_bg_features = set(self.feature_names_for_xai) - set(
-                background_df_raw.columns
-            )
-            if missing_bg_features:
-                logger.error(
-                    f"Background data is missing expected features: {missing_bg_features}. Cannot use for XAI."
-                )
-                # Fallback to inference data sample
-                sample_n = (
-                    min(100, len(X_inference_features_only))
-                    if len(X_inference_features_only) > 0
-                    else 0
-                )
-                return (
-                    X_inference_features_only.sample(n=sample_n, random_state=42)
-                    if sample_n > 0
-                    else None
-                )
+        logger.info(
+            f"Loaded and processed XAI background data (shape: {background_df_features_only.shape})"
+        )
+        return background_df_features_only
 
-            background_df_features_only = background_df_raw[
-                self.feature_names_for_xai
-            ].copy()
+    def _load_background_data_for_xai(
+        self, dataset_id: Optional[int], X_inference_features_only: pd.DataFrame
+    ) -> Optional[pd.DataFrame]:
+        """
+        Loads background data: the model's background summary, else the
+        dataset's background artifact, else a sample of the inference data.
+        """
+        model_background_df = self._load_model_background_summary()
+        if model_background_df is not None:
+            return model_background_df
 
-            if background_df_features_only.isnull().values.any():
-                logger.warning(
-                    "XAI background data contains NaN values. Filling with 0."
+        if not dataset_id:
+            logger.warning("No training dataset ID linked to the model.")
+        else:
+            try:
+                dataset_background_df = self._load_dataset_background(dataset_id)
+                if dataset_background_df is not None:
+                    return dataset_background_df
+            except Exception as e:
+                logger.error(
+                    f"Failed to load or process XAI background data of dataset {dataset_id}: {e}",
+                    exc_info=True,
                 )
-                background_df_features_only = background_df_features_only.fillna(0)
 
-            logger.info(
-                f"Loaded and processed XAI background data (shape: {background_df_features_only.shape})"
-            )
-            return background_df_features_only
-        except Exception as e:
-            logger.error(
-                f"Failed to load or process XAI background data from {background_path}: {e}",
-                exc_info=True,
+        logger.warning("Using a sample of inference data for XAI background.")
+        return self._sample_inference_background(X_inference_features_only)
+
+    async def _prepare_explanation_inputs(
+        self, inference_job_id: int
+    ) -> Tuple[ModelTypeEnum, pd.DataFrame, pd.DataFrame, Optional[pd.DataFrame]]:
+        """
+        Loads the model, the commit features and the background data of an
+        inference job. Returns (model type, X, identifiers, background).
+        """
+        inference_job = await asyncio.to_thread(
+            self.inference_job_repo.get_by_id, inference_job_id
+        )
+        if not inference_job:
+            raise ValueError(f"Parent InferenceJob ID {inference_job_id} not found.")
+
+        ml_model_db_record = await asyncio.to_thread(
+            self.model_repo.get_by_id, inference_job.ml_model_id
+        )
+        if not ml_model_db_record or not ml_model_db_record.s3_artifact_path:
+            raise ValueError(
+                f"MLModel {inference_job.ml_model_id} or its S3 artifact path not found."
             )
-            logger.warning(
-                "Using inference data sample as fallback for XAI background."
+
+        # Convert DB model_type string to ModelTypeEnum
+        try:
+            model_type_enum_for_xai = ModelTypeEnum(ml_model_db_record.model_type)
+        except ValueError:
+            raise ValueError(
+                f"Invalid model_type '{ml_model_db_record.model_type}' in MLModel record {ml_model_db_record.id} for XAI."
             )
-            sample_n = (
-                min(100, len(X_inference_features_only))
-                if len(X_inference_features_only) > 0
-                else 0
+
+        input_ref = dict(inference_job.input_reference or {})
+        repo_id = input_ref.get("repo_id")
+        commit_hash = input_ref.get("commit_hash")
+        if not repo_id or not commit_hash:
+            raise ValueError(
+                "Missing repo_id or commit_hash in InferenceJob input_reference."
             )
-            return (
-                X_inference_features_only.sample(n=sample_n, random_state=42)
-                if sample_n > 0
-                else None
+
+        # Load features first to help determine feature names if model doesn't store them
+        raw_features_df = await asyncio.to_thread(
+            self.feature_repo.get_features_for_commit, repo_id, commit_hash
+        )
+        if raw_features_df is None or raw_features_df.empty:
+            raise ValueError(
+                f"Failed to retrieve features for Repo {repo_id}, Commit {commit_hash}."
             )
 
+        # Load model and determine feature names
+        self._load_model_and_determine_features(
+            ml_model_db_record.s3_artifact_path, raw_features_df
+        )
+
+        # Prepare data (X_inference will only contain self.feature_names_for_xai)
+        X_inference_features_only, identifiers_df = self._prepare_data_for_xai(
+            raw_features_df
+        )
+
+        # Load background data (pass X_inference_features_only for sampling fallback)
+        background_data_df = self._load_background_data_for_xai(
+            ml_model_db_record.dataset_id, X_inference_features_only
+        )
+
+        return (
+            model_type_enum_for_xai,
+            X_inference_features_only,
+            identifiers_df,
+            background_data_df,
+        )
+
     async def process_explanation(self) -> Optional[Dict[str, Any]]:
         task_id_str = self.task.request.id if self.task else "N/A"
         logger.info(
@@ -351,61 +429,12 @@ class XAIExplanationHandler:
                 is_start=True,
             )
 
-            inference_job = await asyncio.to_thread(
-                self.inference_job_repo.get_by_id, xai_record.inference_job_id
-            )
-            if not inference_job:
-                raise ValueError(
-                    f"Parent InferenceJob ID {xai_record.inference_job_id} not found."
-                )
-
-            ml_model_db_record = await asyncio.to_thread(
-                self.model_repo.get_by_id, inference_job.ml_model_id
-            )
-            if not ml_model_db_record or not ml_model_db_record.s3_artifact_path:
-                raise ValueError(
-                    f"MLModel {inference_job.ml_model_id} or its S3 artifact path not found."
-                )
-
-            # Convert DB model_type string to ModelTypeEnum
-            try:
-                model_type_enum_for_xai = ModelTypeEnum(ml_model_db_record.model_type)
-            except ValueError:
-                raise ValueError(
-                    f"Invalid model_type '{ml_model_db_record.model_type}' in MLModel record {ml_model_db_record.id} for XAI."
-                )
-
-            input_ref = dict(inference_job.input_reference or {})
-            repo_id = input_ref.get("repo_id")
-            commit_hash = input_ref.get("commit_hash")
-            if not repo_id or not commit_hash:
-                raise ValueError(
-                    "Missing repo_id or commit_hash in InferenceJob input_reference."
-                )
-
-            # Load features first to help determine feature names if model doesn't store them
-            raw_features_df = await asyncio.to_thread(
-                self.feature_repo.get_features_for_commit, repo_id, commit_hash
-            )
-            if raw_features_df is None or raw_features_df.empty:
-                raise ValueError(
-                    f"Failed to retrieve features for Repo {repo_id}, Commit {commit_hash}."
-                )
-
-            # Load model and determine feature names
-            self._load_model_and_determine_features(
-                ml_model_db_record.s3_artifact_path, raw_features_df
-            )
-
-            # Prepare data (X_inference will only contain self.feature_names_for_xai)
-            X_inference_features_only, identifiers_df = self._prepare_data_for_xai(
-                raw_features_df
-            )
-
-            # Load background data (pass X_inference_features_only for sampling fallback)
-            background_data_df = self._load_background_data_for_xai(
-                ml_model_db_record.dataset_id, X_inference_features_only
-            )
+            (
+                model_type_enum_for_xai,
+                X_inference_features_only,
+                identifiers_df,
+                background_data_df,
+            ) = await self._prepare_explanation_inputs(xai_record.inference_job_id)
 
             await asyncio.to_thread(
                 self.xai_repo.update_xai_result_sync,
@@ -420,6 +449,7 @@ class XAIExplanationHandler:
                 model_type_enum=model_type_enum_for_xai,
                 background_data=background_data_df,
                 feature_names=self.feature_names_for_xai,
+                model_key=self.model_key,
             )
 
             logger.info(
@@ -7,6 +7,7 @@ from app.main import celery_app  # Celery app for dispatching
 from celery import Task
 from celery.exceptions import Ignore, Reject
 
+from shared.core.config import settings
 from shared.repositories import (
     InferenceJobRepository,
     ModelRepository,
@@ -23,6 +24,9 @@ from ..factories.xai_strategy_factory import XAIStrategyFactory
 
 logger = logging.getLogger(__name__)
 
+XAI_GENERATION_TASK_NAME = "tasks.generate_explanation"
+XAI_BATCH_GENERATION_TASK_NAME = "tasks.generate_explanations"
+
 
 class XAIOrchestrationHandler:
     def __init__(
@@ -42,6 +46,93 @@ class XAIOrchestrationHandler:
             f"Initialized XAIOrchestrationHandler for Inference Job ID {inference_job_id}"
         )
 
+    async def _dispatch_single(
+        self,
+        xai_type: XAITypeEnum,
+        xai_result_db_id: int,
+        failed_dispatch_details: List[Dict[str, Any]],
+    ) -> bool:
+        """Sends one generation task for one XAIResult."""
+        try:
+            celery_task = celery_app.send_task(
+                XAI_GENERATION_TASK_NAME,
+                args=[xai_result_db_id],
+            )
+            if not celery_task or not celery_task.id:
+                raise RuntimeError("Celery send_task returned invalid task object.")
+            await asyncio.to_thread(
+                self.xai_repo.update_xai_task_id_sync,
+                xai_result_db_id,
+                celery_task.id,
+            )
+            logger.info(
+                f"Dispatched XAI generation task {celery_task.id} for XAIResult {xai_result_db_id} (Type: {xai_type.value})."
+            )
+            return True
+        except Exception as dispatch_err:
+            logger.error(
+                f"Failed to dispatch XAI generation task for XAIResult {xai_result_db_id} (Type: {xai_type.value}): {dispatch_err}",
+                exc_info=True,
+            )
+            failed_dispatch_details.append(
+                {
+                    "xai_result_id": xai_result_db_id,
+                    "type": xai_type.value,
+                    "error": str(dispatch_err),
+                }
+            )
+            await asyncio.to_thread(
+                self.xai_repo.update_xai_result_sync,
+                xai_result_db_id,
+                XAIStatusEnum.FAILED,
+                f"Task dispatch failed: {dispatch_err}",
+            )
+            return False
+
+    async def _dispatch_combined(
+        self,
+        xai_result_ids_by_type: Dict[XAITypeEnum, int],
+        failed_dispatch_details: List[Dict[str, Any]],
+    ) -> int:
+        """Sends one task that generates all given XAIResults in a single pass."""
+        xai_result_ids = list(xai_result_ids_by_type.values())
+        try:
+            celery_task = celery_app.send_task(
+                XAI_BATCH_GENERATION_TASK_NAME,
+                args=[xai_result_ids],
+            )
+            if not celery_task or not celery_task.id:
+                raise RuntimeError("Celery send_task returned invalid task object.")
+            await asyncio.to_thread(
+                self.xai_repo.update_xai_task_ids_sync,
+                xai_result_ids,
+                celery_task.id,
+            )
+            logger.info(
+                f"Dispatched combined XAI generation task {celery_task.id} for XAIResults {xai_result_ids} "
+                f"(Types: {[t.value for t in xai_result_ids_by_type]})."
+            )
+            return 1
+        except Exception as dispatch_err:
+            logger.error(
+                f"Failed to dispatch combined XAI generation task for XAIResults {xai_result_ids}: {dispatch_err}",
+                exc_info=True,
+            )
+            failed_dispatch_details.extend(
+                {
+                    "xai_result_id": xai_result_id,
+                    "type": xai_type.value,
+                    "error": str(dispatch_err),
+                }
+                for xai_type, xai_result_id in xai_result_ids_by_type.items()
+            )
+            await asyncio.to_thread(
+                self.xai_repo.mark_xai_results_failed_sync,
+                xai_result_ids,
+                f"Task dispatch failed: {dispatch_err}",
+            )
+            return 0
+
     async def process_orchestration(self) -> Dict[str, Any]:
         task_id_str = self.task.request.id if self.task else "N/A"
         logger.info(
@@ -117,16 +208,13 @@ class XAIOrchestrationHandler:
                     "failed_dispatch_details": [],
                 }
 
-            xai_generation_task_name = "tasks.generate_explanation"
-            xai_task_queue = "xai_queue"
-
+            xai_types_to_run: List[XAITypeEnum] = []
             for xai_type_to_run in supported_xai_types_for_this_model:
                 existing_xai_record_id = await asyncio.to_thread(
                     self.xai_repo.find_existing_xai_result_id_sync,
                     self.inference_job_id,
                     xai_type_to_run,
                 )
-                should_create_new = True
                 if existing_xai_record_id:
                     existing_xai_record = await asyncio.to_thread(
                         self.xai_repo.get_xai_result_sync, existing_xai_record_id
@@ -138,67 +226,42 @@ class XAIOrchestrationHandler:
                         logger.info(
                             f"XAIResult for type {xai_type_to_run.value} and job {self.inference_job_id} already exists with status {existing_xai_record.status.value} (ID: {existing_xai_record_id}). Skipping creation."
                         )
-                        should_create_new = False
+                        continue
                     elif existing_xai_record:
                         logger.info(
                             f"XAIResult for type {xai_type_to_run.value} and job {self.inference_job_id} exists but FAILED/REVOKED (ID: {existing_xai_record_id}). Will attempt to recreate."
                         )
+                xai_types_to_run.append(xai_type_to_run)
 
-                if should_create_new:
-                    xai_result_db_id = await asyncio.to_thread(
-                        self.xai_repo.create_pending_xai_result_sync,
+            # All pending records are created (or reset) in one transaction
+            xai_result_ids_by_type: Dict[XAITypeEnum, int] = {}
+            if xai_types_to_run:
+                try:
+                    xai_result_ids_by_type = await asyncio.to_thread(
+                        self.xai_repo.create_pending_xai_results_sync,
                         self.inference_job_id,
-                        xai_type_to_run,
+                        xai_types_to_run,
                     )
-                    if xai_result_db_id:
-                        try:
-                            celery_task = celery_app.send_task(
-                                xai_generation_task_name,
-                                args=[xai_result_db_id],
-                                queue=xai_task_queue,
-                            )
-                            if celery_task and celery_task.id:
-                                await asyncio.to_thread(
-                                    self.xai_repo.update_xai_task_id_sync,
-                                    xai_result_db_id,
-                                    celery_task.id,
-                                )
-                                dispatched_tasks_count += 1
-                                logger.info(
-                                    f"Dispatched XAI generation task {celery_task.id} for XAIResult {xai_result_db_id} (Type: {xai_type_to_run.value}) to queue '{xai_task_queue}'."
-                                )
-                            else:
-                                raise RuntimeError(
-                                    "Celery send_task returned invalid task object."
-                                )
-                        except Exception as dispatch_err:
-                            logger.error(
-                                f"Failed to dispatch XAI generation task for XAIResult {xai_result_db_id} (Type: {xai_type_to_run.value}): {dispatch_err}",
-                                exc_info=True,
-                            )
-                            failed_dispatch_details.append(
-                                {
-                                    "xai_result_id": xai_result_db_id,
-                                    "type": xai_type_to_run.value,
-                                    "error": str(dispatch_err),
-                                }
-                            )
-                            await asyncio.to_thread(
-                                self.xai_repo.update_xai_result_sync,
-                                xai_result_db_id,
-                                XAIStatusEnum.FAILED,
-                                f"Task dispatch failed: {dispatch_err}",
-                            )
-                    else:
-                        logger.error(
-                            f"Failed to create pending XAIResult record for type {xai_type_to_run.value} and job {self.inference_job_id}."
-                        )
-                        failed_dispatch_details.append(
-                            {
-                                "type": xai_type_to_run.value,
-                                "error": "DB record creation failed",
-                            }
-                        )
+                except Exception as create_err:
+                    logger.error(
+                        f"Failed to create pending XAIResult records for job {self.inference_job_id}: {create_err}",
+                        exc_info=True,
+                    )
+                    failed_dispatch_details.extend(
+                        {"type": xai_type.value, "error": "DB record creation failed"}
+                        for xai_type in xai_types_to_run
+                    )
+
+            if xai_result_ids_by_type and settings.ML_XAI_COMBINED_EXECUTION:
+                dispatched_tasks_count = await self._dispatch_combined(
+                    xai_result_ids_by_type, failed_dispatch_details
+                )
+            else:
+                for xai_type_to_run, xai_result_db_id in xai_result_ids_by_type.items():
+                    if await self._dispatch_single(
+                        xai_type_to_run, xai_result_db_id, failed_dispatch_details
+                    ):
+                        dispatched_tasks_count += 1
 
             overall_status = JobStatusEnum.SUCCESS
             summary_message = f"XAI orchestration complete for InferenceJob {self.inference_job_id}. Dispatched: {dispatched_tasks_count} XAI tasks. Failed to dispatch: {len(failed_dispatch_details)}."
@@ -1,11 +1,12 @@
 # worker/ml/services/hp_search_objective.py
 import logging
-from typing import Any, Dict, List  # Added List
+from typing import Any, Dict, List, Optional, Tuple  # Added List
 
 import numpy as np
 import optuna
 import pandas as pd
 from optuna.trial import Trial  # Explicit import of Trial
+from sklearn.base import clone
 from sklearn.metrics import (
     accuracy_score,
     f1_score,
@@ -14,7 +15,7 @@ from sklearn.metrics import (
     recall_score,
     roc_auc_score,
 )
-from sklearn.model_selection import StratifiedKFold, cross_val_score
+from sklearn.model_selection import StratifiedKFold
 
 from services.interfaces import IArtifactService
 from shared.schemas.enums import ModelTypeEnum, ObjectiveMetricEnum
@@ -36,9 +37,18 @@ class Objective:
         hp_space_config: List[HPSuggestion],
         base_job_config: Dict[str, Any],
         artifact_service: IArtifactService,
+        X_matrix: Optional[np.ndarray] = None,
     ):
         self.X = X
         self.y = y
+        # Every trial fits on the same contiguous float32 copy of X (a read-only
+        # memmap when the handler provides one) instead of slicing the DataFrame
+        self.X_matrix = (
+            X_matrix
+            if X_matrix is not None
+            else np.ascontiguousarray(X.to_numpy(dtype=np.float32))
+        )
+        self.y_values = y.to_numpy()
         self.model_type_enum = model_type_enum  # Store model type
         self.hp_space_config = hp_space_config
         self.base_job_config = base_job_config  # This is HPSearchConfig from DB
@@ -68,6 +78,8 @@ class Objective:
         # Random seed for CV split, not necessarily for model instantiation within trial
         self.cv_random_seed = base_job_config.get("random_seed", 42)
         self.scorer = self._create_scorer()
+        # Fold indices are fixed for the study, so they are computed once
+        self.cv_splits, self.cv_error = self._precompute_cv_splits()
 
         logger.debug(
             f"HP Search Objective initialized. Metric: {self.objective_metric_str}, "
@@ -75,6 +87,53 @@ class Objective:
             f"Model Type: {self.model_type_enum.value}"
         )
 
+    def _precompute_cv_splits(
+        self,
+    ) -> Tuple[Optional[List[Tuple[np.ndarray, np.ndarray]]], Optional[str]]:
+        """
+        Returns the (train, validation) row indices of each stratified fold, or
+        (None, reason) when CV cannot be performed on this target.
+        """
+        is_classification = (
+            pd.api.types.is_integer_dtype(self.y) and self.y.nunique() >= 2
+        )
+        if not is_classification:  # Regression or other task types
+            # For now, only classification targets are cross-validated, as
+            # defect prediction is typically classification
+            logger.warning(
+                "Target is not suitable for StratifiedKFold (not integer or single class). CV will not be performed."
+            )
+            return (
+                None,
+                "CV not performed for non-classification or problematic target.",
+            )
+
+        min_class_count = self.y.value_counts().min()
+        actual_cv_folds = min(self.cv_folds, min_class_count)
+        if actual_cv_folds < 2:
+            logger.warning(
+                f"Not enough samples in minority class for {self.cv_folds}-fold CV. Trials will be skipped."
+            )
+            return None, "Not enough samples for CV."
+        if actual_cv_folds < self.cv_folds:
+            logger.warning(
+                f"Reducing CV folds from {self.cv_folds} to {actual_cv_folds} due to class imbalance."
+            )
+
+        cv_splitter = StratifiedKFold(
+            n_splits=actual_cv_folds,
+            shuffle=True,
+            random_state=self.cv_random_seed,
+        )
+        index_dtype = np.int32 if len(self.y_values) < 2**31 else np.int64
+        splits = [
+            (train_idx.astype(index_dtype), val_idx.astype(index_dtype))
+            for train_idx, val_idx in cv_splitter.split(
+                np.zeros(len(self.y_values)), self.y_values
+            )
+        ]
+        return splits, None
+
     def _create_scorer(self):
         """Creates the scikit-learn scorer based on self.objective_metric_enum."""
         metric_enum = self.objective_metric_enum
@@ -202,6 +261,39 @@ class Objective:
             )
             raise optuna.TrialPruned(f"Optuna suggestion failed: {e}") from e
 
+    def _cross_validate_with_pruning(
+        self, trial: Trial, model_instance: Any
+    ) -> List[float]:
+        """
+        Runs the CV folds one at a time and reports the running mean score after
+        each fold (step = fold index), so the study's pruner can stop a weak
+        trial after its first folds. Folds run sequentially; estimators that
+        support it use all cores for each fit instead.
+        """
+        if model_instance.get_params().get("n_jobs", -1) is None:
+            model_instance = clone(model_instance).set_params(n_jobs=-1)
+
+        scores: List[float] = []
+        for fold, (train_idx, val_idx) in enumerate(self.cv_splits):
+            fold_model = clone(model_instance)
+            fold_model.fit(self.X_matrix[train_idx], self.y_values[train_idx])
+            scores.append(
+                float(
+                    self.scorer(
+                        fold_model, self.X_matrix[val_idx], self.y_values[val_idx]
+                    )
+                )
+            )
+
+            trial.report(float(np.mean(scores)), step=fold)
+            if trial.should_prune():
+                trial.set_user_attr("cv_scores", scores)
+                logger.info(
+                    f"Trial {trial.number}: Pruned by Optuna pruner after fold {fold + 1}/{len(self.cv_splits)}."
+                )
+                raise optuna.TrialPruned()
+        return scores
+
     def __call__(self, trial: Trial) -> float:
         """Executed for each Optuna trial."""
         logger.info(
@@ -240,68 +332,20 @@ class Objective:
                 f"Trial {trial.number}: Performing {self.cv_folds}-fold CV with {model_instance_for_cv.__class__.__name__}..."
             )
 
-            # Cross-validation logic
-            is_classification = (
-                pd.api.types.is_integer_dtype(self.y) and self.y.nunique() >= 2
-            )
-            cv_splitter = None
-            if is_classification:
-                min_class_count = self.y.value_counts().min()
-                actual_cv_folds = min(self.cv_folds, min_class_count)
-                if actual_cv_folds < 2:
-                    logger.warning(
-                        f"Trial {trial.number}: Not enough samples in minority class for {self.cv_folds}-fold CV. Skipping CV for this trial."
-                    )
-                    trial.set_user_attr("cv_error", "Not enough samples for CV.")
-                    return float(
-                        failed_value
-                    )  # Return failed_value if CV cannot be performed
-
-                if actual_cv_folds < self.cv_folds:
-                    logger.warning(
-                        f"Trial {trial.number}: Reducing CV folds from {self.cv_folds} to {actual_cv_folds} due to class imbalance."
-                    )
+            if self.cv_error:
+                trial.set_user_attr("cv_error", self.cv_error)
+                return float(
+                    failed_value
+                )  # Return failed_value if CV cannot be performed
 
-                cv_splitter = StratifiedKFold(
-                    n_splits=actual_cv_folds,
-                    shuffle=True,
-                    random_state=self.cv_random_seed,
-                )
-            elif not is_classification:  # Regression or other task types
-                logger.warning(
-                    f"Trial {trial.number}: Target is not suitable for StratifiedKFold (not integer or single class). Using standard KFold or adapt as needed."
-                )
-                # For non-classification, or if stratification isn't appropriate, use KFold or other suitable CV.
-                # from sklearn.model_selection import KFold
-                # cv_splitter = KFold(n_splits=self.cv_folds, shuffle=True, random_state=self.cv_random_seed)
-                # For now, let's raise if not classification, as defect prediction is typically classification
-                trial.set_user_attr(
-                    "cv_error",
-                    "CV not performed for non-classification or problematic target.",
-                )
-                return float(failed_value)
-
-            scores = cross_val_score(
-                estimator=model_instance_for_cv,  # Use the model instance
-                X=self.X,
-                y=self.y,
-                cv=cv_splitter,
-                scoring=self.scorer,
-                n_jobs=-1,  # Use all available cores for CV
-                error_score="raise",  # Raise error if a fold fails
-            )
+            scores = self._cross_validate_with_pruning(trial, model_instance_for_cv)
             metric_value = np.mean(scores)
-            trial.set_user_attr("cv_scores", scores.tolist())
+            trial.set_user_attr("cv_scores", scores)
             trial.set_user_attr(f"mean_cv_{self.objective_metric_str}", metric_value)
             logger.info(
-                f"Trial {trial.number}: CV Scores ({self.objective_metric_str}) = {scores.tolist()}, Mean = {metric_value:.4f}"
+                f"Trial {trial.number}: CV Scores ({self.objective_metric_str}) = {scores}, Mean = {metric_value:.4f}"
             )
 
-            trial.report(metric_value, step=0)  # Report after each trial for pruning
-            if trial.should_prune():
-                logger.info(f"Trial {trial.number}: Pruned by Optuna pruner.")
-                raise optuna.TrialPruned()
-
         except optuna.TrialPruned:
             raise  # Re-raise to let Optuna handle it
         except ValueError as ve:  # Catch specific errors like single class in fold
@@ -1,8 +1,9 @@
 # worker/ml/services/interfaces/i_artifact_service.py
 from abc import ABC, abstractmethod
-from typing import Any, Optional
+from typing import Any, ContextManager, List, Optional, Sequence
 
 import pandas as pd
+import pyarrow.parquet as pq
 
 
 class IArtifactService(ABC):
@@ -18,12 +19,32 @@ class IArtifactService(ABC):
         """Loads a Python object artifact."""
         pass
 
+    @abstractmethod
+    def load_cached_artifact(self, uri: str) -> Optional[Any]:
+        """Loads a Python object artifact through the in-process model cache."""
+        pass
+
+    @abstractmethod
+    def get_artifact_etag(self, uri: str) -> Optional[str]:
+        """Returns the artifact's current ETag, or None if it does not exist."""
+        pass
+
     @abstractmethod
     def delete_artifact(self, uri: str) -> bool:
         """Deletes an artifact."""
         pass
 
     @abstractmethod
-    def load_dataframe_artifact(self, uri: str) -> Optional[pd.DataFrame]:
-        """Loads a DataFrame artifact (e.g., from Parquet)."""
+    def load_dataframe_artifact(
+        self,
+        uri: str,
+        columns: Optional[Sequence[str]] = None,
+        filters: Optional[List[tuple]] = None,
+    ) -> Optional[pd.DataFrame]:
+        """Loads a DataFrame artifact (e.g., from Parquet), optionally projected/filtered."""
+        pass
+
+    @abstractmethod
+    def open_parquet_file(self, uri: str) -> ContextManager[Optional[pq.ParquetFile]]:
+        """Opens a Parquet artifact for row-group-wise reads, closing it on exit."""
         pass
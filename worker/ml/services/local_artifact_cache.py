@@ -0,0 +1,134 @@
+# worker/ml/services/local_artifact_cache.py
+import hashlib
+import logging
+import os
+import threading
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+from shared.core.config import settings
+
+logger = logging.getLogger(__name__)
+logger.setLevel(settings.LOG_LEVEL.upper())
+
+_TMP_MARKER = ".tmp-"
+
+
+class LocalArtifactCache:
+    """
+    On-disk cache of S3 objects shared by all worker processes on a host.
+
+    Files are addressed by a hash of (URI, ETag), so a re-uploaded object gets a
+    new entry and stale copies simply age out. Downloads land in a temporary
+    file and are renamed into place, which keeps concurrent processes from ever
+    reading a partial file. Entries are evicted least-recently-used (by mtime,
+    refreshed on every hit) once the directory exceeds `max_bytes`.
+    """
+
+    def __init__(self, root: Path, max_bytes: int):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def path_for(self, uri: str, etag: str, variant: str = "") -> Path:
+        digest = hashlib.sha256(f"{uri}\0{etag}\0{variant}".encode()).hexdigest()
+        suffix = "".join(Path(uri).suffixes[-1:])
+        return self.root / digest[:2] / f"{digest}{suffix}"
+
+    def get_path(
+        self,
+        uri: str,
+        etag: str,
+        fetch: Callable[[str], None],
+        variant: str = "",
+    ) -> Path:
+        """
+        Returns the local path of (uri, etag), calling `fetch(destination)` to
+        download the object on a miss. `variant` distinguishes derived copies of
+        the same object version (e.g. a column projection).
+        """
+        path = self.path_for(uri, etag, variant)
+        if path.exists():
+            try:
+                os.utime(path)  # Mark as recently used for eviction
+            except FileNotFoundError:
+                pass  # Evicted by another process in between; fetch again below
+            else:
+                with self._lock:
+                    self.hits += 1
+                logger.debug(f"Local artifact cache hit for {uri}: {path}")
+                return path
+
+        with self._lock:
+            self.misses += 1
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}{_TMP_MARKER}{uuid.uuid4().hex}")
+        try:
+            fetch(str(tmp_path))
+            os.replace(tmp_path, path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+        logger.info(
+            f"Local artifact cache miss for {uri}: stored {path.stat().st_size / 1e6:.1f} MB at {path}"
+        )
+        self._evict(keep=path)
+        return path
+
+    def _entries(self) -> List[Tuple[float, int, Path]]:
+        entries = []
+        for path in self.root.glob("*/*"):
+            if _TMP_MARKER in path.name:
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _evict(self, keep: Path):
+        entries = sorted(self._entries(), key=lambda e: e[0])
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                # Processes that already opened/mapped the file keep reading it
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+            with self._lock:
+                self.evictions += 1
+            logger.info(
+                f"Evicted {path.name} from local artifact cache ({size} bytes)."
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        entries = self._entries()
+        with self._lock:
+            return {
+                "entries": len(entries),
+                "bytes": sum(size for _, size, _ in entries),
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+local_artifact_cache = LocalArtifactCache(
+    root=settings.ML_ARTIFACT_CACHE_DIR,
+    max_bytes=settings.ML_ARTIFACT_CACHE_MAX_BYTES,
+)
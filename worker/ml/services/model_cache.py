@@ -0,0 +1,149 @@
+# worker/ml/services/model_cache.py
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, NamedTuple, Optional
+
+from shared.core.config import settings
+
+logger = logging.getLogger(__name__)
+logger.setLevel(settings.LOG_LEVEL.upper())
+
+
+class _CacheEntry(NamedTuple):
+    etag: str
+    obj: Any
+    size_bytes: int
+
+
+class ModelCache:
+    """
+    Per-process cache of deserialised model artifacts, keyed by artifact URI and
+    validated against the object's ETag: a re-uploaded artifact at the same URI
+    is reloaded. Entries are sized by their stored artifact's bytes and evicted
+    least-recently-used once the total exceeds `max_bytes`.
+
+    Cached objects are shared between jobs and must be treated as read-only.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.load_seconds_total = 0.0
+
+    def get_or_load(
+        self,
+        uri: str,
+        etag: str,
+        loader: Callable[[], Optional[Any]],
+        size_bytes: int,
+    ) -> Optional[Any]:
+        """
+        Returns the cached object for (uri, etag), calling `loader` on a miss.
+        `size_bytes` is the artifact's stored size, charged against the budget.
+        """
+        with self._lock:
+            entry = self._entries.get(uri)
+            if entry is not None and entry.etag == etag:
+                self._entries.move_to_end(uri)
+                self.hits += 1
+                logger.debug(f"Model cache hit for {uri}")
+                return entry.obj
+            if entry is not None:
+                logger.info(f"Model cache entry for {uri} is stale (ETag changed).")
+                self._remove(uri)
+            self.misses += 1
+
+            start = time.perf_counter()
+            obj = loader()
+            elapsed = time.perf_counter() - start
+            self.load_seconds_total += elapsed
+            if obj is None:
+                return None
+
+            logger.info(
+                f"Model cache miss for {uri}: loaded in {elapsed:.3f}s ({size_bytes / 1e6:.1f} MB stored)."
+            )
+            if self.max_bytes <= 0 or size_bytes > self.max_bytes:
+                logger.warning(
+                    f"Artifact {uri} ({size_bytes} bytes) exceeds the model cache budget; not cached."
+                )
+                return obj
+            self._entries[uri] = _CacheEntry(etag, obj, size_bytes)
+            self._current_bytes += size_bytes
+            self._evict()
+            return obj
+
+    def _remove(self, uri: str):
+        entry = self._entries.pop(uri, None)
+        if entry is not None:
+            self._current_bytes -= entry.size_bytes
+
+    def _evict(self):
+        while self._current_bytes > self.max_bytes and self._entries:
+            uri, entry = self._entries.popitem(last=False)
+            self._current_bytes -= entry.size_bytes
+            self.evictions += 1
+            logger.info(f"Evicted {uri} from model cache ({entry.size_bytes} bytes).")
+
+    def invalidate(self, uri: str):
+        with self._lock:
+            self._remove(uri)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._current_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss/eviction counters, load time and current occupancy."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "load_seconds_total": round(self.load_seconds_total, 4),
+                "load_seconds_avg": (
+                    round(self.load_seconds_total / self.misses, 4)
+                    if self.misses
+                    else 0.0
+                ),
+            }
+
+
+# One cache per worker process, shared by inference and XAI handlers
+model_cache = ModelCache(max_bytes=settings.ML_MODEL_CACHE_MAX_BYTES)
+
+
+def warm_up_model_cache(
+    model_ids: Iterable[int], model_repo: Any, artifact_service: Any
+) -> int:
+    """Loads the artifacts of the given MLModel IDs into the cache. Returns count loaded."""
+    loaded = 0
+    for model_id in model_ids:
+        try:
+            model_record = model_repo.get_by_id(model_id)
+            if not model_record or not model_record.s3_artifact_path:
+                logger.warning(
+                    f"Model cache warm-up: MLModel {model_id} has no artifact."
+                )
+                continue
+            if artifact_service.load_cached_artifact(model_record.s3_artifact_path):
+                loaded += 1
+        except Exception as e:
+            logger.error(
+                f"Model cache warm-up failed for MLModel {model_id}: {e}", exc_info=True
+            )
+    logger.info(f"Model cache warm-up loaded {loaded} model(s): {model_cache.stats()}")
+    return loaded
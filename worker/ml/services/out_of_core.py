@@ -0,0 +1,159 @@
+# worker/ml/services/out_of_core.py
+import logging
+from typing import Iterator, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from shared.core.config import settings
+
+from .feature_matrix import table_to_matrix
+
+logger = logging.getLogger(__name__)
+logger.setLevel(settings.LOG_LEVEL.upper())
+
+
+class ParquetTrainingData:
+    """
+    Training rows of a Parquet dataset, read one row group at a time through
+    Arrow so the full feature matrix is never held in memory.
+
+    A first pass over the target column drops rows without a label and holds
+    out a seeded random `test_size` share of the rows for evaluation. At most
+    `eval_max_rows` are held out; later held-out rows are trained on. Only the
+    per-row-group training masks and labels are kept after that pass.
+    """
+
+    def __init__(
+        self,
+        parquet_file: pq.ParquetFile,
+        feature_columns: Sequence[str],
+        target_column: str,
+        test_size: float = 0.2,
+        random_seed: int = 42,
+        eval_max_rows: int = 100_000,
+    ):
+        self.parquet_file = parquet_file
+        self.feature_columns = list(feature_columns)
+        self.target_column = target_column
+        schema = parquet_file.schema_arrow
+        missing = [
+            c for c in self.feature_columns + [target_column] if c not in schema.names
+        ]
+        if missing:
+            raise ValueError(f"Dataset missing required columns: {', '.join(missing)}")
+        target_type = schema.field(target_column).type
+        if not (
+            pa.types.is_boolean(target_type)
+            or pa.types.is_integer(target_type)
+            or pa.types.is_floating(target_type)
+        ):
+            raise TypeError(
+                f"Target column '{target_column}' must be numeric or boolean for out-of-core training."
+            )
+        label_dtype = np.float64 if pa.types.is_floating(target_type) else np.int64
+
+        self.num_row_groups = parquet_file.num_row_groups
+        self._train_masks: List[np.ndarray] = []
+        self._train_labels: List[np.ndarray] = []
+        eval_parts: List[np.ndarray] = []
+        eval_labels: List[np.ndarray] = []
+        eval_rows = 0
+        rng = np.random.default_rng(random_seed)
+        for group in range(self.num_row_groups):
+            target = parquet_file.read_row_group(group, columns=[target_column])
+            labels = pc.cast(target.column(0), pa.float64()).to_numpy()
+            valid = ~np.isnan(labels)
+            held_out = np.flatnonzero(valid & (rng.random(len(labels)) < test_size))
+            held_out = held_out[: max(eval_max_rows - eval_rows, 0)]
+            train_mask = valid
+            if len(held_out):
+                features = parquet_file.read_row_group(
+                    group, columns=self.feature_columns
+                )
+                eval_parts.append(
+                    table_to_matrix(features.take(held_out), self.feature_columns)
+                )
+                eval_labels.append(labels[held_out].astype(label_dtype))
+                eval_rows += len(held_out)
+                train_mask[held_out] = False
+            self._train_masks.append(train_mask)
+            self._train_labels.append(labels[train_mask].astype(label_dtype))
+
+        self.train_rows = int(sum(len(labels) for labels in self._train_labels))
+        if self.train_rows == 0:
+            raise ValueError("Dataset has no labelled rows to train on.")
+        self.classes = np.unique(
+            np.concatenate([np.unique(y) for y in self._train_labels])
+        )
+        self._eval_X = (
+            np.vstack(eval_parts)
+            if eval_parts
+            else np.empty((0, len(self.feature_columns)), dtype=np.float32)
+        )
+        self._eval_y = (
+            np.concatenate(eval_labels)
+            if eval_labels
+            else np.empty(0, dtype=label_dtype)
+        )
+        logger.info(
+            f"Out-of-core dataset: {self.num_row_groups} row groups, {self.train_rows} training rows, "
+            f"{len(self._eval_y)} held-out rows, {len(self.feature_columns)} features."
+        )
+
+    def train_group_sizes(self) -> List[int]:
+        return [len(labels) for labels in self._train_labels]
+
+    def train_labels(self) -> np.ndarray:
+        """Labels of all training rows, in row group order."""
+        return np.concatenate(self._train_labels)
+
+    def read_train_group(
+        self, group: int, dtype: type = np.float32
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Feature matrix and labels of the training rows of one row group."""
+        table = self.parquet_file.read_row_group(group, columns=self.feature_columns)
+        mask = self._train_masks[group]
+        if not mask.all():
+            table = table.filter(pa.array(mask))
+        return (
+            table_to_matrix(table, self.feature_columns, dtype),
+            self._train_labels[group],
+        )
+
+    def iter_train_groups(
+        self, dtype: type = np.float32
+    ) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        for group in range(self.num_row_groups):
+            if len(self._train_labels[group]):
+                yield self.read_train_group(group, dtype)
+
+    def eval_set(self) -> Tuple[pd.DataFrame, pd.Series]:
+        return (
+            pd.DataFrame(self._eval_X, columns=self.feature_columns),
+            pd.Series(self._eval_y, name=self.target_column),
+        )
+
+    def class_sample(self, rows_per_class: int = 50) -> Tuple[pd.DataFrame, pd.Series]:
+        """A few training rows of every class, e.g. to initialise model wrappers."""
+        parts, labels = [], []
+        needed = {label: rows_per_class for label in self.classes.tolist()}
+        for group in range(self.num_row_groups):
+            y = self._train_labels[group]
+            if not any(needed[label] and (y == label).any() for label in needed):
+                continue
+            X, y = self.read_train_group(group)
+            for label in needed:
+                take = np.flatnonzero(y == label)[: needed[label]]
+                needed[label] -= len(take)
+                parts.append(X[take])
+                labels.append(y[take])
+            if not any(needed.values()):
+                break
+        return (
+            pd.DataFrame(np.vstack(parts), columns=self.feature_columns),
+            pd.Series(np.concatenate(labels), name=self.target_column),
+        )
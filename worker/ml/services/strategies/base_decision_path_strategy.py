@@ -1,18 +1,108 @@
 # worker/ml/services/strategies/base_decision_path_strategy.py
 import logging
 from abc import abstractmethod
-from typing import Any, Optional  # Keep Any for model
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
 
-from shared.schemas.xai import (
+from shared.schemas.xai import (  # Import the Pydantic models for results
+    DecisionPathEdge,
+    DecisionPathNode,
     DecisionPathResultData,
-)  # Import the Pydantic model for results
+    InstanceDecisionPath,
+)
 
 from .base_xai_strategy import BaseXAIStrategy
 
 logger = logging.getLogger(__name__)
 
+# Split operators of a FlatTree node
+SPLIT_LT = 0  # value < threshold goes left
+SPLIT_LE = 1  # value <= threshold goes left
+SPLIT_IN = 2  # value in the node's categories goes left
+SPLIT_UNSUPPORTED = 3  # the path stops before the node
+
+PathSteps = Tuple[np.ndarray, np.ndarray]
+TreePaths = Tuple[
+    List[Tuple[List[DecisionPathNode], List[DecisionPathEdge]]], np.ndarray
+]
+
+
+class FlatTree(NamedTuple):
+    """
+    Array form of a dumped tree, used to route all instances through it at once.
+    Node 0 is the root and node i is a leaf when left[i] == -1. Label arrays
+    hold indices into `labels`.
+    """
+
+    column: np.ndarray  # Column of the routing matrix tested by each split
+    op: np.ndarray
+    threshold: np.ndarray
+    left: np.ndarray
+    right: np.ndarray
+    missing: np.ndarray  # Child taken when the value is NaN
+    true_label: np.ndarray
+    false_label: np.ndarray
+    missing_label: np.ndarray
+    labels: List[str]
+    categories: Dict[int, np.ndarray]  # Node -> categories of SPLIT_IN nodes
+
+
+def route_flat_tree(tree: FlatTree, X_values: np.ndarray) -> PathSteps:
+    """
+    Routes every row of X_values through the tree, one tree level at a time.
+
+    Returns the visited nodes and the incoming edge labels as two
+    (n_rows, depth) matrices padded with -1.
+    """
+    n_rows = X_values.shape[0]
+    rows = np.arange(n_rows)
+    current = np.zeros(n_rows, dtype=np.int64)
+    incoming = np.full(n_rows, -1, dtype=np.int64)
+    node_columns: List[np.ndarray] = []
+    label_columns: List[np.ndarray] = []
+
+    while len(tree.left):
+        node = np.maximum(current, 0)
+        active = (current >= 0) & (tree.op[node] != SPLIT_UNSUPPORTED)
+        if not active.any():
+            break
+        node_columns.append(np.where(active, current, -1))
+        label_columns.append(np.where(active, incoming, -1))
+
+        split = active & (tree.left[node] >= 0)
+        next_node = np.full(n_rows, -1, dtype=np.int64)
+        if split.any():
+            values = X_values[rows, np.maximum(tree.column[node], 0)]
+            is_missing = np.isnan(values)
+            goes_left = np.where(
+                tree.op[node] == SPLIT_LT,
+                values < tree.threshold[node],
+                values <= tree.threshold[node],
+            )
+            for category_node, categories in tree.categories.items():
+                at_node = split & (current == category_node)
+                goes_left[at_node] = np.isin(values[at_node], categories)
+
+            next_node = np.where(
+                is_missing,
+                tree.missing[node],
+                np.where(goes_left, tree.left[node], tree.right[node]),
+            )
+            next_node = np.where(split, next_node, -1)
+            incoming = np.where(
+                is_missing,
+                tree.missing_label[node],
+                np.where(goes_left, tree.true_label[node], tree.false_label[node]),
+            )
+        current = next_node
+
+    if not node_columns:
+        empty = np.empty((n_rows, 0), dtype=np.int64)
+        return empty, empty
+    return np.column_stack(node_columns), np.column_stack(label_columns)
+
 
 class BaseDecisionPathStrategy(BaseXAIStrategy):
     """
@@ -25,6 +115,82 @@ class BaseDecisionPathStrategy(BaseXAIStrategy):
         super().__init__(model, background_data)
         logger.debug(f"Initialized BaseDecisionPathStrategy: {self.__class__.__name__}")
 
+    @staticmethod
+    def _unique_paths(
+        steps: PathSteps,
+        make_node: Callable[[int], DecisionPathNode],
+        labels: Sequence[str],
+    ) -> TreePaths:
+        """
+        Builds the node and edge objects of each distinct path of one tree once.
+
+        Args:
+            steps: Visited nodes and incoming edge labels per instance, as
+                returned by route_flat_tree.
+            make_node: Builds the DecisionPathNode of a node index.
+            labels: Edge label strings indexed by the label steps.
+
+        Returns:
+            The distinct paths and, per instance, the index of its path.
+        """
+        node_steps, label_steps = steps
+        depth = node_steps.shape[1]
+        if depth == 0:
+            return [([], [])], np.zeros(len(node_steps), dtype=np.int64)
+        unique_steps, inverse = np.unique(
+            np.concatenate([node_steps, label_steps], axis=1),
+            axis=0,
+            return_inverse=True,
+        )
+        nodes: Dict[int, DecisionPathNode] = {}
+        paths = []
+        for row in unique_steps:
+            path_nodes = []
+            for node_index in row[:depth]:
+                if node_index < 0:
+                    break
+                if node_index not in nodes:
+                    nodes[node_index] = make_node(int(node_index))
+                path_nodes.append(nodes[node_index])
+            path_edges = [
+                DecisionPathEdge(
+                    source=path_nodes[j - 1].id,
+                    target=path_nodes[j].id,
+                    label=labels[row[depth + j]],
+                )
+                for j in range(1, len(path_nodes))
+            ]
+            paths.append((path_nodes, path_edges))
+        return paths, inverse.reshape(-1)
+
+    @staticmethod
+    def _collect_instance_paths(
+        identifiers_df: pd.DataFrame, tree_paths: List[TreePaths]
+    ) -> List[InstanceDecisionPath]:
+        """One InstanceDecisionPath per (instance, tree), instance-major."""
+        n_instances = len(identifiers_df)
+        files = identifiers_df.get("file")
+        class_names = identifiers_df.get("class_name")
+        files = files.tolist() if files is not None else [None] * n_instances
+        class_names = (
+            class_names.tolist() if class_names is not None else [None] * n_instances
+        )
+
+        instance_paths = []
+        for i in range(n_instances):
+            for paths, path_of_instance in tree_paths:
+                nodes, edges = paths[path_of_instance[i]]
+                if nodes:
+                    instance_paths.append(
+                        InstanceDecisionPath(
+                            file=files[i],
+                            class_name=class_names[i],
+                            nodes=nodes,
+                            edges=edges,
+                        )
+                    )
+        return instance_paths
+
     @abstractmethod
     def explain(
         self, X_inference: pd.DataFrame, identifiers_df: pd.DataFrame
@@ -1,23 +1,25 @@
 # worker/ml/services/strategies/base_strategy.py
 import logging
+import time
 from abc import ABC, abstractmethod
 from inspect import Parameter, signature
-from typing import Any, Dict, NamedTuple, Set, Type
+from typing import Any, Dict, NamedTuple, Optional, Set, Type
 
 import numpy as np
 import pandas as pd
-from sklearn.metrics import (
-    accuracy_score,
-    f1_score,
-    log_loss,
-    precision_score,
-    recall_score,
-    roc_auc_score,
-)
-from sklearn.utils.multiclass import type_of_target
 
-from services.interfaces import IArtifactService
+from shared.core.config import settings
 from shared.schemas.enums import ModelTypeEnum
+from shared.utils.xai_background import summarize_background
+
+from ..compiled_predictor import (
+    CompiledTreeEnsemble,
+    compile_tree_ensemble,
+    compiled_artifact_uri,
+)
+from ..explainer_cache import background_artifact_uri
+from ..interfaces import IArtifactService
+from ..out_of_core import ParquetTrainingData
 
 logger = logging.getLogger(__name__)
 
@@ -46,6 +48,8 @@ class BaseModelStrategy(ABC):
         self.job_config: Dict[str, Any] = job_config
         self.artifact_service: IArtifactService = artifact_service
         self.model: Any = None  # Holds the actual trained model object
+        # Optional array-based predictor used for inference when available
+        self.compiled_model: Optional[CompiledTreeEnsemble] = None
         self._initialize_model_internals()
         logger.debug(
             f"Initialized strategy: {self.__class__.__name__} for model type {self.model_type_enum.value}"
@@ -110,6 +114,18 @@ class BaseModelStrategy(ABC):
         pass
 
     def evaluate(self, X_test: pd.DataFrame, y_test: pd.Series) -> Dict[str, float]:
+        # scikit-learn is imported where it is used so that loading a strategy
+        # for inference doesn't pull in its metrics and model selection modules
+        from sklearn.metrics import (
+            accuracy_score,
+            f1_score,
+            log_loss,
+            precision_score,
+            recall_score,
+            roc_auc_score,
+        )
+        from sklearn.utils.multiclass import type_of_target
+
         if self.model is None:
             logger.error("Model is not available for evaluation (None).")
             raise RuntimeError("Model not trained or loaded for evaluation.")
@@ -238,6 +254,114 @@ class BaseModelStrategy(ABC):
                 "log_loss": str(float("inf")),
             }
 
+    def _continue_training(
+        self, parent_model: Any, X: pd.DataFrame, y: pd.Series, n_estimators: int
+    ) -> Any:
+        """
+        Returns a new model that extends `parent_model` with `n_estimators`
+        trees / boosting rounds fitted on X and y. `parent_model` comes from the
+        shared model cache and must not be modified. Subclasses override this
+        for the model types that support incremental training.
+        """
+        raise ValueError(
+            f"Incremental training is not supported for {self.model_type_enum.value}."
+        )
+
+    def train_incremental(
+        self, parent_model: Any, X: pd.DataFrame, y: pd.Series, n_estimators: int
+    ) -> TrainResult:
+        """
+        Continues training `parent_model` on new rows only, so the cost scales
+        with the size of X rather than with the full history. Like `train`,
+        eval_test_split_size of the rows are held out for evaluation.
+        """
+        from sklearn.model_selection import train_test_split
+
+        logger.info(
+            f"{self.__class__.__name__}: Continuing {self.model_type_enum.value} model "
+            f"with {n_estimators} estimators on X={X.shape}"
+        )
+        test_size = self.job_config.get("eval_test_split_size", 0.2)
+        random_state = self.job_config.get("random_seed", 42)
+        X_train, X_test, y_train, y_test = X, X.iloc[:0], y, y.iloc[:0]
+        if 0.0 < test_size < 1.0:
+            try:
+                X_train, X_test, y_train, y_test = train_test_split(
+                    X, y, test_size=test_size, random_state=random_state, stratify=y
+                )
+            except ValueError as e:
+                logger.warning(
+                    f"Stratified split failed ('{e}'). Falling back to non-stratified split."
+                )
+                X_train, X_test, y_train, y_test = train_test_split(
+                    X, y, test_size=test_size, random_state=random_state
+                )
+
+        parent_classes = getattr(parent_model, "classes_", None)
+        if parent_classes is not None:
+            missing_classes = set(np.asarray(parent_classes).tolist()) - set(
+                pd.unique(y_train).tolist()
+            )
+            if missing_classes:
+                raise ValueError(
+                    f"The new training rows contain no samples of class(es) {sorted(missing_classes)} "
+                    "of the parent model. Incremental training needs every class."
+                )
+
+        start_time = time.perf_counter()
+        self.model = self._continue_training(
+            parent_model, X_train, y_train, n_estimators
+        )
+        training_time_seconds = round(time.perf_counter() - start_time, 3)
+        logger.info(f"Incremental fitting complete in {training_time_seconds}s.")
+
+        metrics: Dict[str, Any] = {}
+        if not X_test.empty:
+            metrics = self.evaluate(X_test, y_test)
+        else:
+            logger.warning("No test set available for evaluation during training.")
+        metrics["training_time_seconds"] = training_time_seconds
+        metrics["incremental_training_rows"] = len(X_train)
+        return TrainResult(model=self.model, metrics=metrics)
+
+    def supports_out_of_core(self) -> bool:
+        """Whether `train_out_of_core` can train the configured model."""
+        return False
+
+    def _fit_out_of_core(self, data: ParquetTrainingData) -> Any:
+        """
+        Returns a model fitted on the training rows of `data`, reading them
+        one row group at a time. Subclasses override this for the model types
+        that can train from batches.
+        """
+        raise ValueError(
+            f"Out-of-core training is not supported for {self.model_type_enum.value}."
+        )
+
+    def train_out_of_core(self, data: ParquetTrainingData) -> TrainResult:
+        """
+        Trains on a dataset that is read from Parquet row groups instead of
+        being loaded into a DataFrame, then evaluates on its held-out rows.
+        """
+        logger.info(
+            f"{self.__class__.__name__}: Training {self.model_type_enum.value} model out of core "
+            f"on {data.train_rows} rows in {data.num_row_groups} row groups"
+        )
+        start_time = time.perf_counter()
+        self.model = self._fit_out_of_core(data)
+        training_time_seconds = round(time.perf_counter() - start_time, 3)
+        logger.info(f"Out-of-core fitting complete in {training_time_seconds}s.")
+
+        X_test, y_test = data.eval_set()
+        metrics: Dict[str, Any] = {}
+        if not X_test.empty:
+            metrics = self.evaluate(X_test, y_test)
+        else:
+            logger.warning("No test set available for evaluation during training.")
+        metrics["training_time_seconds"] = training_time_seconds
+        metrics["out_of_core_training_rows"] = data.train_rows
+        return TrainResult(model=self.model, metrics=metrics)
+
     def get_hyperparameter_space(self) -> Set[str]:
         """
         Returns the names of constructor arguments that look like
@@ -275,7 +399,8 @@ class BaseModelStrategy(ABC):
         logger.info(
             f"Strategy {self.__class__.__name__}: Loading model from {artifact_path}"
         )
-        self.model = self.artifact_service.load_artifact(artifact_path)
+        # Loaded models are shared through the process-wide model cache
+        self.model = self.artifact_service.load_cached_artifact(artifact_path)
         if self.model is None:
             raise IOError(f"Failed to load model from artifact path: {artifact_path}")
         logger.info(
@@ -293,3 +418,68 @@ class BaseModelStrategy(ABC):
             f"Strategy {self.__class__.__name__}: Saving model to {artifact_path}"
         )
         return self.artifact_service.save_artifact(self.model, artifact_path)
+
+    def save_compiled_model(
+        self, artifact_path: str, X_reference: pd.DataFrame
+    ) -> bool:
+        """
+        Compiles the fitted model into a CompiledTreeEnsemble (verified against
+        `X_reference`) and saves it next to the model artifact. Returns False if
+        the model type is not supported or parity/saving fails.
+        """
+        if self.model is None:
+            return False
+        compiled = compile_tree_ensemble(self.model, X_reference)
+        if compiled is None:
+            return False
+        compiled_uri = compiled_artifact_uri(artifact_path)
+        if not self.artifact_service.save_artifact(compiled, compiled_uri):
+            logger.warning(f"Failed to save compiled model to {compiled_uri}")
+            return False
+        self.compiled_model = compiled
+        logger.info(f"Compiled model saved to {compiled_uri}")
+        return True
+
+    def save_background_summary(
+        self,
+        artifact_path: str,
+        X_reference: pd.DataFrame,
+        y_reference: Optional[pd.Series] = None,
+    ) -> bool:
+        """
+        Saves a small summary of the training features next to the model
+        artifact, used as the SHAP/LIME background set when explaining it.
+        """
+        try:
+            background = summarize_background(
+                X_reference,
+                y_reference,
+                max_rows=settings.ML_XAI_BACKGROUND_ROWS,
+                method=settings.ML_XAI_BACKGROUND_METHOD,
+                random_state=self.job_config.get("random_seed", 42),
+            )
+        except Exception as e:
+            logger.warning(f"Could not summarize XAI background data: {e}")
+            return False
+        background_uri = background_artifact_uri(artifact_path)
+        if not self.artifact_service.save_artifact(background, background_uri):
+            logger.warning(f"Failed to save XAI background summary to {background_uri}")
+            return False
+        logger.info(
+            f"XAI background summary ({len(background)} rows) saved to {background_uri}"
+        )
+        return True
+
+    def load_compiled_model(self, artifact_path: str) -> bool:
+        """Loads the compiled predictor saved next to `artifact_path`, if there is one."""
+        compiled_uri = compiled_artifact_uri(artifact_path)
+        if self.artifact_service.get_artifact_etag(compiled_uri) is None:
+            return False
+        compiled = self.artifact_service.load_cached_artifact(compiled_uri)
+        if not isinstance(compiled, CompiledTreeEnsemble):
+            return False
+        self.compiled_model = compiled
+        logger.info(
+            f"Strategy {self.__class__.__name__}: Using compiled predictor from {compiled_uri}"
+        )
+        return True
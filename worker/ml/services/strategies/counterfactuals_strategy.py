@@ -1,6 +1,6 @@
 # worker/ml/services/strategies/counterfactuals_strategy.py
 import logging
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import pandas as pd
 
@@ -12,6 +12,7 @@ except ImportError:
     dice_ml = None
     DICE_AVAILABLE = False
 
+from shared.core.config import settings
 from shared.schemas.xai import (
     CounterfactualExample,
     CounterfactualResultData,
@@ -19,9 +20,90 @@ from shared.schemas.xai import (
 )
 
 from .base_xai_strategy import BaseXAIStrategy
+from .parallel_xai import instance_seed, map_instance_chunks
 
 logger = logging.getLogger(__name__)
 
+OUTCOME_COLUMN = "is_buggy"
+NUM_CFS_PER_INSTANCE = 3
+
+
+def _generate_counterfactuals_chunk(
+    positions: List[int],
+    model: Any,
+    dice_dataframe: pd.DataFrame,
+    X_query: pd.DataFrame,
+    sample_size: int,
+    base_seed: int,
+) -> List[Tuple[int, Optional[List[Tuple[Dict[str, Any], float]]]]]:
+    """
+    DiCE counterfactuals (desired class 0) for X_query rows at `positions`.
+    Runs in pool workers, so must stay top-level. The DiCE explainer is built
+    once per chunk and each query is seeded by its position.
+    Returns (position, [(cf features, P(class 0)), ...] or None).
+    """
+    feature_names = X_query.columns.tolist()
+    d = dice_ml.Data(
+        dataframe=dice_dataframe,
+        continuous_features=feature_names,  # Assuming all continuous for now
+        outcome_name=OUTCOME_COLUMN,
+    )
+    m = dice_ml.Model(model=model, backend="sklearn", model_type="classifier")
+    exp = dice_ml.Dice(d, m, method="random")
+
+    results = []
+    for position in positions:
+        # Query instance must NOT contain the outcome column
+        query_instance = X_query.iloc[[position]]
+        try:
+            dice_exp_results = exp.generate_counterfactuals(
+                query_instance,
+                total_CFs=NUM_CFS_PER_INSTANCE,
+                desired_class=0,
+                sample_size=sample_size,
+                random_seed=instance_seed(base_seed, position),
+            )
+            cf_frames = [
+                cf_example.final_cfs_df[feature_names]
+                for cf_example in (
+                    dice_exp_results.cf_examples_list if dice_exp_results else []
+                )
+                if cf_example.final_cfs_df is not None
+                and not cf_example.final_cfs_df.empty
+            ]
+            if not cf_frames:
+                logger.warning(f"DiCE returned no CF examples for instance {position}.")
+                results.append((position, None))
+                continue
+            cf_features = pd.concat(cf_frames, ignore_index=True)
+            # Probability of the desired class (0) under the original model, one call per instance
+            cf_probs = model.predict_proba(cf_features)[:, 0]
+            results.append(
+                (
+                    position,
+                    [
+                        (row, float(prob))
+                        for row, prob in zip(
+                            cf_features.to_dict(orient="records"), cf_probs
+                        )
+                    ],
+                )
+            )
+        except KeyError as ke:
+            # Catch the specific KeyError if it persists after naming consistency check
+            logger.error(
+                f"Counterfactual generation failed for instance {position} due to KeyError: {ke}. This might indicate DiCE expecting the outcome column in the query instance or a mismatch in feature names.",
+                exc_info=False,
+            )
+            results.append((position, None))
+        except Exception as cf_instance_err:
+            logger.error(
+                f"Counterfactual generation failed for instance {position}: {cf_instance_err}",
+                exc_info=True,
+            )
+            results.append((position, None))
+    return results
+
 
 class CounterfactualsStrategy(BaseXAIStrategy):
     """Generates Counterfactual Explanations using DiCE."""
@@ -56,15 +138,11 @@ class CounterfactualsStrategy(BaseXAIStrategy):
         try:
             # --- Prepare Data ---
             y_pred_inference = self.model.predict(X_inference)
-            # --- CONSISTENT OUTCOME NAME ---
-            # TODO:
-            # Get a consistent name for the outcome column
-            outcome_col_name = "is_buggy"  # Define consistently
+            outcome_col_name = OUTCOME_COLUMN
             data_for_dice = X_inference.copy()
             data_for_dice[outcome_col_name] = (
                 y_pred_inference  # Add prediction with this name
             )
-            # --- END CONSISTENT OUTCOME NAME ---
 
             # Determine background dataframe for DiCE
             dice_dataframe = self.background_data
@@ -87,98 +165,52 @@ class CounterfactualsStrategy(BaseXAIStrategy):
                     )  # Avoid modifying original background_data
                     dice_dataframe[outcome_col_name] = 0
 
-            # Define continuous features (assuming all for now)
-            continuous_features = feature_names
-
-            # Create DiCE Data object
-            d = dice_ml.Data(
-                dataframe=dice_dataframe,
-                continuous_features=continuous_features,
-                outcome_name=outcome_col_name,
-            )  # Use consistent name
-
-            # Create DiCE Model object
-            m = dice_ml.Model(
-                model=self.model, backend="sklearn", model_type="classifier"
-            )  # Assuming sklearn
-
-            # Initialize DiCE Explainer
-            exp = dice_ml.Dice(d, m, method="random")
-
             # Generate Counterfactuals only for instances predicted as 1 (defect-prone)
-            indices_to_explain = X_inference.index[y_pred_inference == 1]
+            positions_to_explain = [
+                i for i, pred in enumerate(y_pred_inference) if pred == 1
+            ]
 
-            if len(indices_to_explain) == 0:
+            if len(positions_to_explain) == 0:
                 # ... (handle no instances to explain) ...
                 return CounterfactualResultData(instance_counterfactuals=[])
 
             logger.info(
-                f"Attempting counterfactuals for {len(indices_to_explain)} instances..."
+                f"Attempting counterfactuals for {len(positions_to_explain)} instances..."
+            )
+            X_query = X_inference.iloc[positions_to_explain]
+            cf_results = map_instance_chunks(
+                _generate_counterfactuals_chunk,
+                len(X_query),
+                self.model,
+                dice_dataframe[feature_names + [outcome_col_name]],
+                X_query,
+                settings.ML_XAI_COUNTERFACTUAL_SAMPLE_SIZE,
+                settings.ML_XAI_RANDOM_SEED,
+                n_jobs=settings.ML_XAI_NUM_WORKERS,
             )
-            num_cfs_per_instance = 3
-
-            for i in indices_to_explain:
-                instance_id_row = identifiers_df.iloc[i]
-                # Query instance must NOT contain the outcome column
-                query_instance = X_inference.loc[[i]]  # Only features
 
-                try:
-                    # Generate CFs targeting class 0
-                    dice_exp_results = exp.generate_counterfactuals(
-                        query_instance, total_CFs=num_cfs_per_instance, desired_class=0
+            for query_position, cf_examples in cf_results:
+                if not cf_examples:
+                    logger.warning(
+                        f"No CF examples found for instance {query_position}."
                     )
-
-                    cf_examples_structured: List[CounterfactualExample] = []
-                    if dice_exp_results and dice_exp_results.cf_examples_list:
-                        for cf_example in dice_exp_results.cf_examples_list:
-                            cf_df = cf_example.final_cfs_df
-                            if cf_df is not None and not cf_df.empty:
-                                # Extract features (make sure these match model's expected features)
-                                cf_features_dict = cf_df.iloc[0][
-                                    feature_names
-                                ].to_dict()
-                                # Predict probability of desired class (0) using *original* model
-                                cf_prob_vector = self.model.predict_proba(
-                                    pd.DataFrame([cf_features_dict])
-                                )[0]
-                                cf_prob_desired_class = float(cf_prob_vector[0])
-
-                                cf_examples_structured.append(
-                                    CounterfactualExample(
-                                        features=cf_features_dict,
-                                        outcome_probability=round(
-                                            cf_prob_desired_class, 4
-                                        ),
-                                    )
-                                )
-                            else:
-                                logger.warning(
-                                    f"DiCE returned empty CF DataFrame instance {i}."
-                                )
-
-                    if cf_examples_structured:
-                        cf_instance_results.append(
-                            InstanceCounterfactualResult(
-                                file=instance_id_row.get("file"),
-                                class_name=instance_id_row.get("class_name"),
-                                counterfactuals=cf_examples_structured,
+                    continue
+                instance_id_row = identifiers_df.iloc[
+                    positions_to_explain[query_position]
+                ]
+                cf_instance_results.append(
+                    InstanceCounterfactualResult(
+                        file=instance_id_row.get("file"),
+                        class_name=instance_id_row.get("class_name"),
+                        counterfactuals=[
+                            CounterfactualExample(
+                                features=cf_features_dict,
+                                outcome_probability=round(cf_prob_desired_class, 4),
                             )
-                        )
-                    else:
-                        logger.warning(f"No CF examples found for instance {i}.")
-
-                except KeyError as ke:
-                    # Catch the specific KeyError if it persists after naming consistency check
-                    logger.error(
-                        f"Counterfactual generation failed for instance {i} due to KeyError: {ke}. This might indicate DiCE expecting the outcome column in the query instance or a mismatch in feature names.",
-                        exc_info=False,
-                    )
-                    # Skip this instance
-                except Exception as cf_instance_err:
-                    logger.error(
-                        f"Counterfactual generation failed for instance {i}: {cf_instance_err}",
-                        exc_info=True,
+                            for cf_features_dict, cf_prob_desired_class in cf_examples
+                        ],
                     )
+                )
 
             logger.info(
                 f"Finished generating counterfactuals. Found examples for {len(cf_instance_results)} instances."
@@ -25,9 +25,15 @@ class FeatureImportanceStrategy(BaseXAIStrategy):
     If not available or applicable, falls back to mean absolute SHAP values.
     """
 
-    def __init__(self, model: Any, background_data: Optional[pd.DataFrame] = None):
+    def __init__(
+        self,
+        model: Any,
+        background_data: Optional[pd.DataFrame] = None,
+        model_key: Optional[str] = None,
+    ):
         super().__init__(model, background_data)
-        # self.shap_strategy_instance: Optional[SHAPStrategy] = None # To lazy-load if needed
+        # Passed on to the SHAP fallback so it shares the explainer cache
+        self.model_key = model_key
 
     def _get_native_importances(
         self, feature_names: List[str]
@@ -119,72 +125,35 @@ class FeatureImportanceStrategy(BaseXAIStrategy):
 
         logger.info("Calculating SHAP-based feature importances as fallback...")
         try:
-            # Instantiate SHAPStrategy on demand
-            # if self.shap_strategy_instance is None:
-            #     self.shap_strategy_instance = SHAPStrategy(self.model, self.background_data)
-
-            # For encapsulation, let's create a temporary SHAPStrategy instance here.
-            # This ensures FeatureImportanceStrategy doesn't permanently hold a SHAPStrategy.
-            temp_shap_strategy = SHAPStrategy(self.model, self.background_data)
-
-            shap_result_data_container = temp_shap_strategy.explain(
-                X_inference, identifiers_df
-            )
-
-            if (
-                shap_result_data_container
-                and shap_result_data_container.instance_shap_values
-            ):
-                all_shap_values_for_positive_class = []
-                for (
-                    instance_shap_result
-                ) in shap_result_data_container.instance_shap_values:
-                    # Each `instance_shap_result.shap_values` is a List[FeatureSHAPValue]
-                    # We need the .value attribute from each FeatureSHAPValue object
-                    instance_s_values = [
-                        fsv.value for fsv in instance_shap_result.shap_values
-                    ]
-                    if len(instance_s_values) == len(
-                        feature_names
-                    ):  # Ensure correct number of features
-                        all_shap_values_for_positive_class.append(instance_s_values)
-                    else:
-                        logger.warning(
-                            f"SHAP values length mismatch for an instance. Expected {len(feature_names)}, got {len(instance_s_values)}"
-                        )
-
-                if not all_shap_values_for_positive_class:
-                    logger.error(
-                        "SHAP-based importance: No valid SHAP values collected from instances."
-                    )
-                    return None
-
-                # Calculate mean absolute SHAP values across all instances
-                mean_abs_shap = np.mean(
-                    np.abs(np.array(all_shap_values_for_positive_class)), axis=0
+            # Same (cached) SHAP pass as SHAPStrategy, on unrounded values
+            computed = SHAPStrategy(
+                self.model, self.background_data, model_key=self.model_key
+            ).compute_shap_values(X_inference)
+            if computed is None:
+                logger.error(
+                    "SHAP-based importance calculation failed: SHAPStrategy returned no SHAP values."
                 )
+                return None
 
-                if len(mean_abs_shap) != len(feature_names):
-                    logger.error(
-                        f"Mean absolute SHAP array length ({len(mean_abs_shap)}) mismatch with feature names ({len(feature_names)})."
-                    )
-                    return None
+            # Calculate mean absolute SHAP values across all instances
+            mean_abs_shap = np.mean(np.abs(computed.values), axis=0)
 
-                importance_list: List[FeatureImportanceValue] = [
-                    FeatureImportanceValue(
-                        feature=fn,
-                        importance=round(float(imp), 6),
-                    )
-                    for fn, imp in zip(feature_names, mean_abs_shap)
-                ]
-                importance_list.sort(key=lambda x: x.importance, reverse=True)
-                logger.info("Successfully calculated SHAP-based feature importances.")
-                return importance_list
-            else:
+            if len(mean_abs_shap) != len(feature_names):
                 logger.error(
-                    "SHAP-based importance calculation failed or returned no instance SHAP values from SHAPStrategy."
+                    f"Mean absolute SHAP array length ({len(mean_abs_shap)}) mismatch with feature names ({len(feature_names)})."
                 )
                 return None
+
+            importance_list: List[FeatureImportanceValue] = [
+                FeatureImportanceValue(
+                    feature=fn,
+                    importance=round(float(imp), 6),
+                )
+                for fn, imp in zip(feature_names, mean_abs_shap)
+            ]
+            importance_list.sort(key=lambda x: x.importance, reverse=True)
+            logger.info("Successfully calculated SHAP-based feature importances.")
+            return importance_list
         except Exception as shap_e:
             logger.error(
                 f"Error during SHAP-based fallback for feature importance: {shap_e}",
@@ -1,21 +1,31 @@
 # worker/ml/services/strategies/lightgbm_decision_path_strategy.py
 import logging
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import lightgbm as lgb  # type: ignore
+import numpy as np
 import pandas as pd
 
 from shared.schemas.xai import (
-    DecisionPathEdge,
     DecisionPathNode,
     DecisionPathResultData,
-    InstanceDecisionPath,
 )
 
-from .base_decision_path_strategy import BaseDecisionPathStrategy
+from .base_decision_path_strategy import (
+    SPLIT_IN,
+    SPLIT_LE,
+    SPLIT_UNSUPPORTED,
+    BaseDecisionPathStrategy,
+    FlatTree,
+    TreePaths,
+    route_flat_tree,
+)
 
 logger = logging.getLogger(__name__)
 
+# Edge labels of '<=' splits (condition true / false) and of '==' splits
+EDGE_LABELS = ["True", "False", "==", "!="]
+
 
 class LightGBMDecisionPathStrategy(BaseDecisionPathStrategy):
     def __init__(self, model: Any, background_data: Optional[pd.DataFrame] = None):
@@ -137,122 +147,145 @@ class LightGBMDecisionPathStrategy(BaseDecisionPathStrategy):
         traverse_node(tree_info.get("tree_structure", {}))
         return nodes, edges
 
-    def _trace_instance_path(
+    @staticmethod
+    def _split_categories(threshold: Any) -> Optional[np.ndarray]:
+        """Values of an '==' split; categorical thresholds look like '1||4||7'."""
+        try:
+            return np.array([float(v) for v in str(threshold).split("||")])
+        except ValueError:
+            return None
+
+    def _flatten_tree(
         self,
-        instance_series: pd.Series,
         tree_info: Dict[
             str, Any
         ],  # Parsed structure of a single tree from dump_model()
         feature_names: List[str],
         tree_id_prefix: str = "",  # To make node IDs unique across trees
-    ) -> Tuple[List[DecisionPathNode], List[DecisionPathEdge]]:
-
-        path_nodes_struct: List[DecisionPathNode] = []
-        path_edges_struct: List[DecisionPathEdge] = []
-
-        current_node_dict = tree_info.get("tree_structure")
-        parent_node_id_str = None
-
-        while current_node_dict:
-            node_id_str: Optional[str] = None
-            condition_str: Optional[str] = None
-            samples: Optional[int] = None
-            value_list: Optional[List[float]] = None
-            next_node_dict = None
-            edge_label_to_next = None
-
-            if "leaf_index" in current_node_dict:  # Leaf node
-                leaf_idx = int(current_node_dict["leaf_index"])
-                node_id_str = f"{tree_id_prefix}L{leaf_idx}"  # Unique leaf ID
-                condition_str = "Leaf"
-                samples = int(current_node_dict.get("leaf_count", 0))
-                leaf_value = current_node_dict.get("leaf_value")
-                if leaf_value is not None:
-                    value_list = [round(float(leaf_value), 4)]
-
-                next_node_dict = None  # End of path
-
-            elif "split_index" in current_node_dict:  # Split node
-                split_idx = int(current_node_dict["split_index"])
-                node_id_str = f"{tree_id_prefix}S{split_idx}"  # Unique split ID
-
-                feature_idx = int(current_node_dict["split_feature"])
-                feature_name = (
-                    feature_names[feature_idx]
-                    if 0 <= feature_idx < len(feature_names)
-                    else f"feature_{feature_idx}"
-                )
-
-                threshold = current_node_dict[
-                    "threshold"
-                ]  # Keep as original type for comparison
-                decision_type = current_node_dict.get("decision_type", "<=")
-
-                condition_str = (
-                    f"{feature_name} {decision_type} {round(float(threshold), 4)}"
+    ) -> Tuple[FlatTree, List[str], Callable[[int], DecisionPathNode]]:
+        """
+        Converts one tree of dump_model() to a FlatTree. Also returns the
+        feature tested by each routing column and a builder of path nodes.
+        """
+        dump_nodes: List[Dict[str, Any]] = []
+        children: List[Tuple[int, int]] = []
+        pending: List[Tuple[Dict[str, Any], int, bool]] = []
+        root = tree_info.get("tree_structure")
+        if root:
+            pending.append((root, -1, True))
+        while pending:
+            node_dict, parent, is_left_child = pending.pop()
+            i = len(dump_nodes)
+            dump_nodes.append(node_dict)
+            children.append((-1, -1))
+            if parent >= 0:
+                left, right = children[parent]
+                children[parent] = (i, right) if is_left_child else (left, i)
+            for key, child_is_left in (("right_child", False), ("left_child", True)):
+                if key in node_dict:
+                    pending.append((node_dict[key], i, child_is_left))
+
+        n_nodes = len(dump_nodes)
+        column = np.full(n_nodes, -1, dtype=np.int64)
+        op = np.full(n_nodes, SPLIT_LE)
+        threshold = np.full(n_nodes, np.nan)
+        left = np.array([c[0] for c in children], dtype=np.int64)
+        right = np.array([c[1] for c in children], dtype=np.int64)
+        true_label = np.zeros(n_nodes, dtype=np.int64)
+        categories: Dict[int, np.ndarray] = {}
+        feature_of_node: Dict[int, str] = {}
+        split_features: List[str] = []
+
+        for i, node_dict in enumerate(dump_nodes):
+            if "leaf_index" in node_dict:
+                left[i] = right[i] = -1
+                continue
+            if "split_index" not in node_dict:  # Should not happen
+                logger.error(f"Node with unknown structure: {node_dict}")
+                op[i] = SPLIT_UNSUPPORTED
+                continue
+
+            feature_idx = int(node_dict["split_feature"])
+            feature_name = (
+                feature_names[feature_idx]
+                if 0 <= feature_idx < len(feature_names)
+                else f"feature_{feature_idx}"
+            )
+            feature_of_node[i] = feature_name
+            if feature_name not in split_features:
+                split_features.append(feature_name)
+            column[i] = split_features.index(feature_name)
+
+            decision_type = node_dict.get("decision_type", "<=")
+            node_categories = (
+                self._split_categories(node_dict["threshold"])
+                if decision_type == "=="
+                else None
+            )
+            if decision_type == "<=":
+                threshold[i] = float(node_dict["threshold"])
+            elif node_categories is not None:
+                op[i] = SPLIT_IN
+                categories[i] = node_categories
+                true_label[i] = 2
+            else:
+                logger.warning(
+                    f"Unsupported decision type '{decision_type}' in LightGBM tree. Paths stop at this split."
                 )
-                samples = int(current_node_dict.get("internal_count", 0))
-
-                instance_value = instance_series.get(feature_name)
+                op[i] = SPLIT_UNSUPPORTED
 
-                # Handle missing values: LightGBM has a 'missing_type' and 'default_left'
-                goes_left = current_node_dict.get(
-                    "default_left", True
-                )  # Default behavior if missing
-                if pd.isna(instance_value):
-                    logger.debug(
-                        f"Instance has missing value for feature {feature_name}. Defaulting left: {goes_left}"
-                    )
-                    # Decision depends on 'default_left'
-                elif decision_type == "<=":
-                    goes_left = instance_value <= threshold
-                elif decision_type == "==":  # Exact match
-                    goes_left = instance_value == threshold
-                # Add other decision_types if LightGBM uses more (e.g., '>')
-                else:
-                    logger.warning(
-                        f"Unsupported decision type '{decision_type}' in LightGBM tree. Path may be incorrect."
-                    )
-                    # Fallback or error
-                    break
-
-                if goes_left:
-                    next_node_dict = current_node_dict.get("left_child")
-                    edge_label_to_next = (
-                        "True" if decision_type == "<=" else "=="
-                    )  # Adjust based on condition
-                else:
-                    next_node_dict = current_node_dict.get("right_child")
-                    edge_label_to_next = "False" if decision_type == "<=" else "!="
-
-            else:  # Should not happen
-                logger.error(f"Node with unknown structure: {current_node_dict}")
-                break
-
-            if node_id_str:
-                path_nodes_struct.append(
-                    DecisionPathNode(
-                        id=node_id_str,
-                        condition=condition_str,
-                        samples=samples,
-                        value=value_list,
-                    )
+        # Missing values follow 'default_left', except on splits without a
+        # missing type, where LightGBM reads them as 0.0
+        default_left = np.array(
+            [bool(node.get("default_left", True)) for node in dump_nodes], dtype=bool
+        )
+        for i, node_dict in enumerate(dump_nodes):
+            if node_dict.get("missing_type") == "None" and op[i] == SPLIT_LE:
+                default_left[i] = 0.0 <= threshold[i]
+            elif node_dict.get("missing_type") == "None" and op[i] == SPLIT_IN:
+                default_left[i] = 0.0 in categories[i]
+        false_label = true_label + 1
+
+        def make_node(i: int) -> DecisionPathNode:
+            node_dict = dump_nodes[i]
+            if "leaf_index" in node_dict:
+                leaf_value = node_dict.get("leaf_value")
+                return DecisionPathNode(
+                    id=f"{tree_id_prefix}L{int(node_dict['leaf_index'])}",
+                    condition="Leaf",
+                    samples=int(node_dict.get("leaf_count", 0)),
+                    value=(
+                        [round(float(leaf_value), 4)]
+                        if leaf_value is not None
+                        else None
+                    ),
                 )
-                if parent_node_id_str and edge_label_to_next:
-                    path_edges_struct.append(
-                        DecisionPathEdge(
-                            source=parent_node_id_str,
-                            target=node_id_str,
-                            label=edge_label_to_next,
-                        )
-                    )
-                parent_node_id_str = node_id_str
-
-            current_node_dict = next_node_dict
-            if not current_node_dict:  # Reached a leaf or end of traversal
-                break
+            decision_type = node_dict.get("decision_type", "<=")
+            try:
+                threshold_str = round(float(node_dict["threshold"]), 4)
+            except ValueError:  # Categorical split, e.g. '1||4'
+                threshold_str = node_dict["threshold"]
+            return DecisionPathNode(
+                id=f"{tree_id_prefix}S{int(node_dict['split_index'])}",
+                condition=f"{feature_of_node[i]} {decision_type} {threshold_str}",
+                samples=int(node_dict.get("internal_count", 0)),
+                value=None,
+            )
 
-        return path_nodes_struct, path_edges_struct
+        flat_tree = FlatTree(
+            column=column,
+            op=op,
+            threshold=threshold,
+            left=left,
+            right=right,
+            missing=np.where(default_left, left, right),
+            true_label=true_label,
+            false_label=false_label,
+            missing_label=np.where(default_left, true_label, false_label),
+            labels=EDGE_LABELS,
+            categories=categories,
+        )
+        return flat_tree, split_features, make_node
 
     def explain(
         self, X_inference: pd.DataFrame, identifiers_df: pd.DataFrame
@@ -289,35 +322,31 @@ class LightGBMDecisionPathStrategy(BaseDecisionPathStrategy):
                 else X_inference.columns.tolist()
             )  # Fallback to X_inference columns
 
-            instance_paths_result: List[InstanceDecisionPath] = []
-
             # Explain path for a limited number of trees (e.g., first one)
             num_trees_to_explain = min(
                 1, len(trees_info)
             )  # Change this to explain more trees
 
-            for i in range(len(X_inference)):
-                instance_series = X_inference.iloc[i]
-                instance_id_row = identifiers_df.iloc[i]
-
-                for tree_idx in range(num_trees_to_explain):
-                    single_tree_info = trees_info[tree_idx]
-                    tree_id_prefix = f"T{tree_idx}_"  # Prefix to distinguish nodes from different trees
-
-                    nodes, edges = self._trace_instance_path(
-                        instance_series, single_tree_info, feature_names, tree_id_prefix
+            tree_paths: List[TreePaths] = []
+            for tree_idx in range(num_trees_to_explain):
+                flat_tree, split_features, make_node = self._flatten_tree(
+                    trees_info[tree_idx], feature_names, f"T{tree_idx}_"
+                )  # Prefix to distinguish nodes from different trees
+                # Features absent from X_inference route as missing values
+                X_values = X_inference.reindex(columns=split_features).to_numpy(
+                    dtype=np.float64, na_value=np.nan
+                )
+                tree_paths.append(
+                    self._unique_paths(
+                        route_flat_tree(flat_tree, X_values),
+                        make_node,
+                        flat_tree.labels,
                     )
+                )
 
-                    if nodes:  # Only add if a path was successfully traced
-                        instance_paths_result.append(
-                            InstanceDecisionPath(
-                                file=instance_id_row.get("file"),
-                                class_name=instance_id_row.get("class_name"),
-                                nodes=nodes,
-                                edges=edges,
-                                # tree_index=tree_idx # Optional: if you want to distinguish paths
-                            )
-                        )
+            instance_paths_result = self._collect_instance_paths(
+                identifiers_df, tree_paths
+            )
 
             if not instance_paths_result:
                 logger.warning(
@@ -0,0 +1,65 @@
+# worker/ml/services/strategies/lightgbm_row_groups.py
+from typing import List, Optional, Tuple
+
+import lightgbm as lgb
+import numpy as np
+
+from ..out_of_core import ParquetTrainingData
+
+
+class DecodedGroup:
+    """
+    The one row group currently decoded, shared by all sequences of a dataset.
+    Decoding another group drops the previous one first.
+    """
+
+    def __init__(self, data: ParquetTrainingData):
+        self._data = data
+        self._group: Optional[int] = None
+        self._rows: Optional[np.ndarray] = None
+
+    def rows(self, group: int) -> np.ndarray:
+        if self._group != group:
+            self.clear()
+            self._rows, _ = self._data.read_train_group(group, dtype=np.float64)
+            self._group = group
+        return self._rows
+
+    def clear(self) -> None:
+        self._group = None
+        self._rows = None
+
+
+class RowGroupSequence(lgb.Sequence):
+    """
+    Training rows of one Parquet row group. LightGBM reads the sequences in
+    order, both when sampling rows for its histogram bins and when pushing
+    batches, so a shared DecodedGroup keeps a single group in memory.
+    """
+
+    def __init__(self, decoded: DecodedGroup, group: int, size: int):
+        self._decoded = decoded
+        self._group = group
+        self._size = size
+        self.batch_size = size
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, idx):
+        rows = self._decoded.rows(self._group)[idx]
+        # A single-row view would keep the whole group alive after it is dropped
+        return rows.copy() if isinstance(idx, (int, np.integer)) else rows
+
+
+def row_group_sequences(
+    data: ParquetTrainingData,
+) -> Tuple[List[RowGroupSequence], DecodedGroup]:
+    """One sequence per non-empty training row group, sharing one decoded group."""
+    decoded = DecodedGroup(data)
+    sequences = [
+        RowGroupSequence(decoded, group, size)
+        for group, size in enumerate(data.train_group_sizes())
+        if size
+    ]
+    return sequences, decoded
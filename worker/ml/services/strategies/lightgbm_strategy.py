@@ -1,19 +1,22 @@
 # worker/ml/services/strategies/lightgbm_strategy.py
 import logging
 import time
-from typing import Any, Dict, List, Optional, Type  # Added Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Type  # Added Optional
 
-import lightgbm as lgb  # Import LightGBM
 import pandas as pd
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import LabelEncoder
 
-from services.interfaces.i_artifact_service import IArtifactService
 from shared.schemas.enums import ModelTypeEnum
 from shared.schemas.ml_model_type_definition import HyperparameterDefinitionSchema
 
+from ..interfaces.i_artifact_service import IArtifactService
+from ..out_of_core import ParquetTrainingData
 from .base_strategy import BaseModelStrategy, TrainResult
 
+# LightGBM and scikit-learn are imported where they are used, so the model type
+# schemas can be discovered without loading either library
+if TYPE_CHECKING:
+    from sklearn.preprocessing import LabelEncoder
+
 logger = logging.getLogger(__name__)
 
 
@@ -28,7 +31,7 @@ class LightGBMStrategy(BaseModelStrategy):
         artifact_service: IArtifactService,
     ):
         super().__init__(model_type, model_config, job_config, artifact_service)
-        self.label_encoder: Optional[LabelEncoder] = None
+        self.label_encoder: Optional["LabelEncoder"] = None
 
     @staticmethod
     def get_supported_model_types_with_schemas() -> (
@@ -136,6 +139,8 @@ class LightGBMStrategy(BaseModelStrategy):
             logger.info("LightGBMStrategy: Defaulting 'objective' to 'binary'.")
 
     def _get_model_class(self) -> Type:
+        import lightgbm as lgb
+
         return lgb.LGBMClassifier
 
     def _get_model_instance(self) -> Any:
@@ -157,6 +162,10 @@ class LightGBMStrategy(BaseModelStrategy):
         return model_cls(**current_config)
 
     def train(self, X: pd.DataFrame, y: pd.Series) -> TrainResult:
+        import lightgbm as lgb
+        from sklearn.model_selection import train_test_split
+        from sklearn.preprocessing import LabelEncoder
+
         logger.info(
             f"LightGBMStrategy: Starting training for model type: {self.model_type_enum.value}"
         )
@@ -246,6 +255,57 @@ class LightGBMStrategy(BaseModelStrategy):
 
         return TrainResult(model=self.model, metrics=metrics)
 
+    def _continue_training(
+        self, parent_model: Any, X: pd.DataFrame, y: pd.Series, n_estimators: int
+    ) -> Any:
+        """Adds `n_estimators` boosting rounds to the parent's booster."""
+        model = self._get_model_class()(**parent_model.get_params())
+        model.set_params(n_estimators=n_estimators)
+        model.fit(X, y, init_model=parent_model.booster_)
+        return model
+
+    def supports_out_of_core(self) -> bool:
+        return True
+
+    def _fit_out_of_core(self, data: ParquetTrainingData) -> Any:
+        """
+        Builds the LightGBM Dataset from one Sequence per row group, trains a
+        booster and wraps it in an LGBMClassifier.
+        """
+        import lightgbm as lgb
+
+        from .lightgbm_row_groups import row_group_sequences
+
+        model = self._get_model_instance()
+        if len(data.classes) > 2:
+            model.set_params(objective="multiclass")
+        excluded = {"class_weight", "importance_type", "n_estimators"}
+        params = {
+            k: v
+            for k, v in model.get_params().items()
+            if v is not None and k not in excluded
+        }
+        if len(data.classes) > 2:
+            params["num_class"] = len(data.classes)
+        sequences, decoded = row_group_sequences(data)
+        train_set = lgb.Dataset(
+            sequences,
+            label=data.train_labels(),
+            feature_name=data.feature_columns,
+            params={"verbose": params.get("verbose", -1)},
+        ).construct()
+        decoded.clear()
+        booster = lgb.train(
+            params, train_set, num_boost_round=model.get_params()["n_estimators"]
+        )
+        # Fit the wrapper on a few rows to set classes_ and feature names, then
+        # swap in the booster trained on the full dataset
+        X_sample, y_sample = data.class_sample()
+        model.set_params(n_estimators=1).fit(X_sample, y_sample)
+        model._Booster = booster
+        model.set_params(n_estimators=booster.current_iteration())
+        return model
+
     def predict(self, data: pd.DataFrame) -> Dict[str, Any]:
         if self.model is None:
             raise RuntimeError(
@@ -1,7 +1,8 @@
 # worker/ml/services/strategies/lime_strategy.py
 import logging
-from typing import List, Optional, Tuple
+from typing import Any, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
 try:
@@ -10,12 +11,110 @@ try:
 except ImportError:
     lime = None  # Handle optional dependency
 
+from shared.core.config import settings
 from shared.schemas.xai import InstanceLIMEResult, LIMEResultData
 
 from .base_xai_strategy import BaseXAIStrategy
+from .parallel_xai import instance_seed, map_instance_chunks
 
 logger = logging.getLogger(__name__)
 
+CLASS_NAMES = ["clean", "defect-prone"]  # Assuming binary classification
+# Upper bound on perturbed rows sent to predict_proba in one call
+PREDICT_BATCH_ROWS = 200_000
+
+
+def _explain_lime_chunk(
+    positions: List[int],
+    model: Any,
+    background_values: np.ndarray,
+    X_values: np.ndarray,
+    feature_names: List[str],
+    num_features: int,
+    num_samples: int,
+    base_seed: int,
+) -> List[Tuple[int, Optional[List[Tuple[str, float]]]]]:
+    """
+    LIME explanations of X_values[positions] for the positive class. Runs in
+    pool workers, so must stay top-level. Builds one explainer per chunk,
+    draws the perturbations of a batch of instances first and predicts them
+    in one predict_proba call. Each instance is seeded by its position, so
+    results do not depend on how instances are split across workers.
+    """
+    explainer = lime.lime_tabular.LimeTabularExplainer(
+        training_data=background_values,
+        feature_names=feature_names,
+        class_names=CLASS_NAMES,
+        mode="classification",
+        random_state=np.random.RandomState(base_seed),
+    )
+    # LIME has no public hook for its perturbation sampler; without it every
+    # instance is predicted separately
+    draw_samples = getattr(explainer, "_LimeTabularExplainer__data_inverse", None)
+
+    def predict_proba(rows: np.ndarray) -> np.ndarray:
+        return model.predict_proba(pd.DataFrame(rows, columns=feature_names))
+
+    def explain_position(position: int, predict_fn, samples=None):
+        # The explainer, its discretizer and LimeBase share this RandomState
+        explainer.random_state.seed(instance_seed(base_seed, position))
+        if samples is not None:
+            explainer._LimeTabularExplainer__data_inverse = lambda row, n: samples
+        try:
+            explanation = explainer.explain_instance(
+                data_row=X_values[position],
+                predict_fn=predict_fn,
+                num_features=num_features,
+                num_samples=num_samples,
+                labels=(1,),  # Explain only the defect-prone class
+            )
+        finally:
+            explainer.__dict__.pop("_LimeTabularExplainer__data_inverse", None)
+        return [(f, round(float(w), 4)) for f, w in explanation.as_list(label=1)]
+
+    results: List[Tuple[int, Optional[List[Tuple[str, float]]]]] = []
+    batch_size = max(1, PREDICT_BATCH_ROWS // num_samples) if draw_samples else 1
+    for start in range(0, len(positions), batch_size):
+        batch = positions[start : start + batch_size]
+        try:
+            if draw_samples is None:
+                raise LookupError("LIME perturbation sampler not found")
+            samples = {}
+            for position in batch:
+                explainer.random_state.seed(instance_seed(base_seed, position))
+                samples[position] = draw_samples(X_values[position], num_samples)
+            probabilities = predict_proba(
+                np.vstack([inverse for _, inverse in samples.values()])
+            )
+            predicted = dict(
+                zip(batch, np.split(probabilities, len(batch)))
+            )  # num_samples rows per instance
+        except Exception as batch_err:
+            if draw_samples is not None:
+                logger.warning(
+                    f"Batched LIME sampling failed ({batch_err}); explaining instances one by one."
+                )
+            samples, predicted = {}, {}
+
+        for position in batch:
+            try:
+                if position in predicted:
+                    lime_explanation = explain_position(
+                        position,
+                        lambda rows, p=position: predicted[p],
+                        samples[position],
+                    )
+                else:
+                    lime_explanation = explain_position(position, predict_proba)
+                results.append((position, lime_explanation))
+            except Exception as instance_err:
+                logger.error(
+                    f"LIME explanation failed for instance index {position}: {instance_err}",
+                    exc_info=True,
+                )
+                results.append((position, None))
+    return results
+
 
 class LIMEStrategy(BaseXAIStrategy):
     """Generates LIME explanations."""
@@ -51,56 +150,40 @@ class LIMEStrategy(BaseXAIStrategy):
 
         logger.info(f"Generating LIME explanations for {len(X_inference)} instances...")
         feature_names = X_inference.columns.tolist()
-        class_names = ["clean", "defect-prone"]  # Assuming binary classification
 
         try:
-            # Create LIME explainer
             # Consider checking dtypes: LIME often works best with numerical data,
             # categorical features might need specific handling (e.g., one-hot encoding before LIME)
             # or specific parameters passed to LimeTabularExplainer.
-            explainer = lime.lime_tabular.LimeTabularExplainer(
-                training_data=self.background_data.values,  # Use numpy array
-                feature_names=feature_names,
-                class_names=class_names,
-                mode="classification",
-                random_state=42,  # For reproducibility
-            )
-
-            instance_results: List[InstanceLIMEResult] = []
             num_features_lime = min(
                 10, len(feature_names)
             )  # Limit features shown by LIME
 
-            for i in range(len(X_inference)):
-                instance_id_row = identifiers_df.iloc[i]
-                instance_features = X_inference.iloc[i].values
-
-                try:
-                    # Explain instance for the positive class (index 1)
-                    explanation = explainer.explain_instance(
-                        data_row=instance_features,
-                        predict_fn=self.model.predict_proba,
-                        num_features=num_features_lime,
-                        labels=(1,),  # Explain only the defect-prone class
-                    )
-                    # Extract explanation as list of (feature, weight) tuples
-                    lime_explanation: List[Tuple[str, float]] = [
-                        (f, round(float(w), 4)) for f, w in explanation.as_list(label=1)
-                    ]
-
-                    instance_results.append(
-                        InstanceLIMEResult(
-                            file=instance_id_row.get("file"),
-                            class_name=instance_id_row.get("class_name"),
-                            explanation=lime_explanation,
-                        )
-                    )
-                except Exception as instance_err:
-                    logger.error(
-                        f"LIME explanation failed for instance index {i}: {instance_err}",
-                        exc_info=True,
+            explanations = map_instance_chunks(
+                _explain_lime_chunk,
+                len(X_inference),
+                self.model,
+                self.background_data[feature_names].to_numpy(),
+                X_inference.to_numpy(),
+                feature_names,
+                num_features_lime,
+                settings.ML_XAI_LIME_NUM_SAMPLES,
+                settings.ML_XAI_RANDOM_SEED,
+                n_jobs=settings.ML_XAI_NUM_WORKERS,
+            )
+
+            instance_results: List[InstanceLIMEResult] = []
+            for position, lime_explanation in explanations:
+                if lime_explanation is None:
+                    continue
+                instance_id_row = identifiers_df.iloc[position]
+                instance_results.append(
+                    InstanceLIMEResult(
+                        file=instance_id_row.get("file"),
+                        class_name=instance_id_row.get("class_name"),
+                        explanation=lime_explanation,
                     )
-                    # Optionally append a placeholder or skip the instance
+                )
 
             if not instance_results:
                 logger.warning("LIME explanation generated no valid instance results.")
@@ -0,0 +1,58 @@
+# worker/ml/services/strategies/parallel_xai.py
+import logging
+from typing import Any, Callable, List, Sequence
+
+import numpy as np
+from joblib import Parallel, cpu_count, delayed, effective_n_jobs
+
+from shared.core.config import settings
+
+logger = logging.getLogger(__name__)
+logger.setLevel(settings.LOG_LEVEL.upper())
+
+# Below this many instances the pool start-up cost outweighs the parallel speed-up
+PARALLEL_MIN_INSTANCES = 8
+
+
+def instance_seed(base_seed: int, position: int) -> int:
+    """Seed of one instance; depends only on its position, not on scheduling."""
+    return (base_seed + position) % (2**32)
+
+
+def xai_worker_count(n_jobs: int) -> int:
+    """
+    Workers for one XAI task: joblib's `n_jobs`, capped to the task's share of
+    the cores (CPU quota aware) when CELERY_ML_XAI_CONCURRENCY tasks run side
+    by side.
+    """
+    share = max(1, cpu_count() // max(1, settings.CELERY_ML_XAI_CONCURRENCY))
+    return min(effective_n_jobs(n_jobs), share)
+
+
+def map_instance_chunks(
+    explain_chunk: Callable[..., List[Any]],
+    n_instances: int,
+    *args: Any,
+    n_jobs: int = -1,
+) -> List[Any]:
+    """
+    Calls `explain_chunk(positions, *args)` for contiguous chunks of instance
+    positions and returns the per-instance results in input order.
+
+    With several workers, there is one chunk per worker, so model and explainer
+    state are unpickled and built once per worker. NumPy arrays in `args` are
+    memory-mapped into the workers by joblib instead of being copied.
+    `explain_chunk` runs in pool workers and must be a top-level function.
+    """
+    if n_instances == 0:
+        return []
+    workers = min(xai_worker_count(n_jobs), n_instances)
+    if workers <= 1 or n_instances < PARALLEL_MIN_INSTANCES:
+        return explain_chunk(list(range(n_instances)), *args)
+
+    chunks: Sequence[np.ndarray] = np.array_split(np.arange(n_instances), workers)
+    logger.debug(f"Explaining {n_instances} instances over {workers} workers.")
+    chunk_results = Parallel(n_jobs=workers, max_nbytes="1M", mmap_mode="r")(
+        delayed(explain_chunk)(chunk.tolist(), *args) for chunk in chunks
+    )
+    return [result for chunk_result in chunk_results for result in chunk_result]
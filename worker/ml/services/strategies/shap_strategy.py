@@ -1,11 +1,12 @@
 # worker/ml/services/strategies/shap_strategy.py
 import logging
-from typing import Any, List, Optional
+from typing import Any, List, NamedTuple, Optional
 
 import numpy as np
 import pandas as pd
 import shap
 
+from services.explainer_cache import explainer_cache
 from shared.schemas.xai import FeatureSHAPValue, InstanceSHAPResult, SHAPResultData
 
 from .base_xai_strategy import BaseXAIStrategy
@@ -13,123 +14,163 @@ from .base_xai_strategy import BaseXAIStrategy
 logger = logging.getLogger(__name__)
 
 
+class ShapValues(NamedTuple):
+    values: np.ndarray  # (n_instances, n_features), for the positive class
+    expected_value: Any  # explainer.expected_value as returned by SHAP
+    explainer_type: str
+
+
 class SHAPStrategy(BaseXAIStrategy):
-    def explain(
-        self, X_inference: pd.DataFrame, identifiers_df: pd.DataFrame
-    ) -> Optional[SHAPResultData]:
-        if X_inference.empty:
-            logger.warning(
-                "SHAPStrategy: Input DataFrame is empty. No explanations generated."
-            )
-            return None
+    def __init__(
+        self,
+        model: Any,
+        background_data: Optional[pd.DataFrame] = None,
+        model_key: Optional[str] = None,
+    ):
+        super().__init__(model, background_data)
+        # Identifies the model version; enables the per-process explainer cache
+        self.model_key = model_key
 
-        logger.info(f"Generating SHAP explanations for {len(X_inference)} instances...")
-        feature_names = X_inference.columns.tolist()
+    @staticmethod
+    def _positive_class_values(
+        shap_values_raw: Any, X_inference: pd.DataFrame
+    ) -> Optional[np.ndarray]:
+        """Extracts the (n_instances, n_features) SHAP values of the positive class."""
+        if isinstance(shap_values_raw, list) and len(shap_values_raw) == 2:
+            return np.asarray(shap_values_raw[1])
+        if isinstance(shap_values_raw, np.ndarray):
+            if shap_values_raw.ndim == 2 and shap_values_raw.shape == X_inference.shape:
+                return shap_values_raw
+            if (
+                shap_values_raw.ndim == 3
+                and shap_values_raw.shape[:2] == X_inference.shape
+                and shap_values_raw.shape[2] == 2
+            ):
+                return shap_values_raw[:, :, 1]
+        return None
 
-        try:
-            explainer_type_used = "Unknown"
-            shap_values_pos_class: Optional[np.ndarray] = None
-            explainer_expected_value: Optional[Any] = None
+    def _get_explainer(
+        self, kind: str, background: Optional[pd.DataFrame], build
+    ) -> Any:
+        if self.model_key is None:
+            return build()
+        return explainer_cache.get_explainer(self.model_key, kind, background, build)
+
+    def compute_shap_values(self, X_inference: pd.DataFrame) -> Optional[ShapValues]:
+        """
+        SHAP values for X_inference. With a model_key, explainers and results
+        are reused from the per-process explainer cache.
+        """
+        if self.model_key is None:
+            return self._compute_shap_values(X_inference)
+        return explainer_cache.get_shap_values(
+            self.model_key,
+            X_inference,
+            self.background_data,
+            lambda: self._compute_shap_values(X_inference),
+        )
 
-            try:
-                explainer = shap.TreeExplainer(
+    def _compute_shap_values(self, X_inference: pd.DataFrame) -> Optional[ShapValues]:
+        feature_names = X_inference.columns.tolist()
+        explainer_type_used = "TreeExplainer"
+        try:
+            explainer = self._get_explainer(
+                "tree",
+                self.background_data,
+                lambda: shap.TreeExplainer(
                     self.model,
                     self.background_data,
                     feature_perturbation="tree_path_dependent",
+                ),
+            )
+            shap_values_pos_class = self._positive_class_values(
+                explainer.shap_values(X_inference), X_inference
+            )
+            if shap_values_pos_class is None:
+                raise ValueError(
+                    f"Unexpected SHAP values structure from {explainer_type_used}."
                 )
-                explainer_type_used = "TreeExplainer"
-                explainer_expected_value = explainer.expected_value
-
-                shap_values_raw = explainer.shap_values(X_inference)
-
-                if isinstance(shap_values_raw, list) and len(shap_values_raw) == 2:
-                    shap_values_pos_class = shap_values_raw[1]
-                    logger.info(
-                        f"SHAPStrategy ({explainer_type_used}): Extracted SHAP values for positive class from list output. Shape: {shap_values_pos_class.shape if shap_values_pos_class is not None else 'None'}"
-                    )
-                elif (
-                    isinstance(shap_values_raw, np.ndarray)
-                    and shap_values_raw.ndim == 2
-                    and shap_values_raw.shape == X_inference.shape
-                ):
-                    shap_values_pos_class = shap_values_raw
-                    logger.info(
-                        f"SHAPStrategy ({explainer_type_used}): Used 2D SHAP values array directly. Shape: {shap_values_pos_class.shape}"
-                    )
-                else:
-                    logger.warning(
-                        f"SHAPStrategy ({explainer_type_used}): Unexpected SHAP values structure. Type: {type(shap_values_raw)}, Shape: {getattr(shap_values_raw, 'shape', 'N/A')}."
-                    )
-                    raise ValueError(
-                        f"Unexpected SHAP values structure from {explainer_type_used}."
-                    )
+            logger.info(
+                f"SHAPStrategy ({explainer_type_used}): SHAP values for positive class. Shape: {shap_values_pos_class.shape}"
+            )
+            return ShapValues(
+                shap_values_pos_class, explainer.expected_value, explainer_type_used
+            )
+        except Exception as tree_explainer_err:
+            logger.warning(
+                f"SHAPStrategy: {explainer_type_used} failed ('{tree_explainer_err}'). Trying KernelExplainer (slower)."
+            )
 
-            except Exception as tree_explainer_err:
-                logger.warning(
-                    f"SHAPStrategy: {explainer_type_used} failed ('{tree_explainer_err}'). Trying KernelExplainer (slower)."
-                )
-                explainer_type_used = "KernelExplainer"
+        explainer_type_used = "KernelExplainer"
+        if not hasattr(self.model, "predict_proba"):
+            logger.error(
+                f"Model {type(self.model).__name__} needs predict_proba for KernelExplainer."
+            )
+            return None
 
-                current_background_data = self.background_data
-                if current_background_data is None or current_background_data.empty:
-                    logger.warning(
-                        "SHAPStrategy: KernelExplainer needs background data. Sampling from inference data."
-                    )
-                    current_background_data = shap.sample(
-                        X_inference, min(100, X_inference.shape[0])
-                    )
-                elif len(current_background_data) > 100:
-                    current_background_data = shap.sample(current_background_data, 100)
+        current_background_data = self.background_data
+        if current_background_data is None or current_background_data.empty:
+            logger.warning(
+                "SHAPStrategy: KernelExplainer needs background data. Sampling from inference data."
+            )
+            current_background_data = shap.sample(
+                X_inference, min(100, X_inference.shape[0]), random_state=0
+            )
+        elif len(current_background_data) > 100:
+            current_background_data = shap.sample(
+                current_background_data, 100, random_state=0
+            )
 
-                if not hasattr(self.model, "predict_proba"):
-                    logger.error(
-                        f"Model {type(self.model).__name__} needs predict_proba for KernelExplainer."
-                    )
-                    return None
+        model = self.model
 
-                def predict_proba_wrapper(X_np_array):
-                    X_df_wrapped = pd.DataFrame(X_np_array, columns=feature_names)
-                    return self.model.predict_proba(X_df_wrapped)
+        def predict_proba_wrapper(X_np_array):
+            X_df_wrapped = pd.DataFrame(X_np_array, columns=feature_names)
+            return model.predict_proba(X_df_wrapped)
 
-                explainer = shap.KernelExplainer(
-                    predict_proba_wrapper, current_background_data
-                )
-                explainer_expected_value = explainer.expected_value
+        explainer = self._get_explainer(
+            "kernel",
+            current_background_data,
+            lambda: shap.KernelExplainer(
+                predict_proba_wrapper, current_background_data
+            ),
+        )
+        shap_values_pos_class = self._positive_class_values(
+            explainer.shap_values(X_inference, nsamples="auto", l1_reg="auto"),
+            X_inference,
+        )
+        if shap_values_pos_class is None:
+            logger.error(
+                f"SHAPStrategy ({explainer_type_used}): Unexpected SHAP values structure."
+            )
+            return None
+        logger.info(
+            f"SHAPStrategy ({explainer_type_used}): SHAP values for positive class (P(1|x)). Shape: {shap_values_pos_class.shape}"
+        )
+        return ShapValues(
+            shap_values_pos_class, explainer.expected_value, explainer_type_used
+        )
 
-                shap_values_raw_kernel = explainer.shap_values(
-                    X_inference, nsamples="auto", l1_reg="auto"
-                )
+    def explain(
+        self, X_inference: pd.DataFrame, identifiers_df: pd.DataFrame
+    ) -> Optional[SHAPResultData]:
+        if X_inference.empty:
+            logger.warning(
+                "SHAPStrategy: Input DataFrame is empty. No explanations generated."
+            )
+            return None
 
-                if (
-                    isinstance(shap_values_raw_kernel, list)
-                    and len(shap_values_raw_kernel) == 2
-                ):
-                    shap_values_pos_class = shap_values_raw_kernel[1]
-                    logger.info(
-                        f"SHAPStrategy ({explainer_type_used}): Extracted SHAP values for positive class (P(1|x)) from list output. Shape: {shap_values_pos_class.shape if shap_values_pos_class is not None else 'None'}"
-                    )
-                elif (
-                    isinstance(shap_values_raw_kernel, np.ndarray)
-                    and shap_values_raw_kernel.ndim == 3
-                    and shap_values_raw_kernel.shape[0] == X_inference.shape[0]
-                    and shap_values_raw_kernel.shape[1] == X_inference.shape[1]
-                    and shap_values_raw_kernel.shape[2] == 2
-                ):
-                    shap_values_pos_class = shap_values_raw_kernel[:, :, 1]
-                    logger.info(
-                        f"SHAPStrategy ({explainer_type_used}): Extracted SHAP values for positive class from 3D array output. Shape: {shap_values_pos_class.shape if shap_values_pos_class is not None else 'None'}"
-                    )
-                else:
-                    logger.error(
-                        f"SHAPStrategy ({explainer_type_used}): Unexpected SHAP values structure. Type: {type(shap_values_raw_kernel)}, Shape: {getattr(shap_values_raw_kernel, 'shape', 'N/A')}"
-                    )
-                    return None
+        logger.info(f"Generating SHAP explanations for {len(X_inference)} instances...")
+        feature_names = X_inference.columns.tolist()
 
-            if shap_values_pos_class is None:
-                logger.error(
-                    f"SHAPStrategy ({explainer_type_used}): Failed to obtain SHAP values for the positive class."
-                )
+        try:
+            computed = self.compute_shap_values(X_inference)
+            if computed is None:
+                logger.error("SHAPStrategy: Failed to obtain SHAP values.")
                 return None
+            shap_values_pos_class, explainer_expected_value, explainer_type_used = (
+                computed
+            )
+
             if (
                 shap_values_pos_class.shape[0] != X_inference.shape[0]
                 or shap_values_pos_class.shape[1] != X_inference.shape[1]
@@ -210,7 +251,7 @@ class SHAPStrategy(BaseXAIStrategy):
                                 f"SHAPStrategy: Could not determine specific expected_value for positive class from structure: {explainer_expected_value}"
                             )
                     elif isinstance(
-                        explainer_expected_value, (float, np.float_, int, np.integer)
+                        explainer_expected_value, (float, np.floating, int, np.integer)
                     ):  # Added np.integer
                         base_value_float = float(
                             explainer_expected_value
@@ -1,7 +1,8 @@
 # worker/ml/services/strategies/sklearn_decision_path_strategy.py
 import logging
-from typing import Any, List, Optional  # Added Any
+from typing import Any, Callable, List, Optional  # Added Any
 
+import numpy as np
 import pandas as pd
 
 # Ensure necessary sklearn imports are here
@@ -13,17 +14,22 @@ from sklearn.ensemble import (
 from sklearn.tree import DecisionTreeClassifier, _tree  # For accessing tree structure
 
 from shared.schemas.xai import (
-    DecisionPathEdge,
     DecisionPathNode,
     DecisionPathResultData,
-    InstanceDecisionPath,
 )
 
 # Import the new base class
-from .base_decision_path_strategy import BaseDecisionPathStrategy
+from .base_decision_path_strategy import (
+    BaseDecisionPathStrategy,
+    PathSteps,
+    TreePaths,
+)
 
 logger = logging.getLogger(__name__)
 
+# Label of the edge into the left (condition true) and right child
+EDGE_LABELS = ["True", "False"]
+
 
 class SklearnDecisionPathStrategy(BaseDecisionPathStrategy):  # Inherit from new base
     """
@@ -50,6 +56,64 @@ class SklearnDecisionPathStrategy(BaseDecisionPathStrategy):  # Inherit from new
             # For now, let explain method handle it, but constructor check is good.
             # raise TypeError(f"Model type {type(self.model).__name__} not supported by SklearnDecisionPathStrategy.")
 
+    @staticmethod
+    def _tree_path_steps(estimator_tree: Any, X_inference: pd.DataFrame) -> PathSteps:
+        """
+        Decision paths of all instances through one tree, from a single
+        decision_path call, as (n_instances, depth) node and label matrices.
+        """
+        # Ensemble members are fitted without feature names
+        X_tree = (
+            X_inference
+            if hasattr(estimator_tree, "feature_names_in_")
+            else X_inference.to_numpy()
+        )
+        node_indicator = estimator_tree.decision_path(X_tree).tocsr()
+        path_lengths = np.diff(node_indicator.indptr)
+        n_instances = len(path_lengths)
+
+        node_steps = np.full((n_instances, path_lengths.max()), -1, dtype=np.int64)
+        rows = np.repeat(np.arange(n_instances), path_lengths)
+        depths = np.arange(node_indicator.nnz) - np.repeat(
+            node_indicator.indptr[:-1], path_lengths
+        )
+        node_steps[rows, depths] = node_indicator.indices
+
+        # Edge into each node: True when it is the left child of the previous one
+        label_steps = np.full_like(node_steps, -1)
+        parents, children = node_steps[:, :-1], node_steps[:, 1:]
+        is_left = children == estimator_tree.tree_.children_left[parents]
+        label_steps[:, 1:] = np.where(children >= 0, np.where(is_left, 0, 1), -1)
+        return node_steps, label_steps
+
+    @staticmethod
+    def _node_builder(
+        tree_: Any, feature_names: List[str]
+    ) -> Callable[[int], DecisionPathNode]:
+        """Builds DecisionPathNodes from the arrays of a fitted sklearn tree."""
+        is_leaf = tree_.children_left == tree_.children_right
+        thresholds = np.round(tree_.threshold, 4)
+        node_values = np.round(tree_.value[:, 0, :].astype(float), 4)
+
+        def make_node(node_id: int) -> DecisionPathNode:
+            condition_str = "Leaf"
+            if not is_leaf[node_id]:
+                feature_idx_at_node = tree_.feature[node_id]
+                feature_name_at_node = (
+                    feature_names[feature_idx_at_node]
+                    if 0 <= feature_idx_at_node < len(feature_names)
+                    else f"feature_{feature_idx_at_node}"
+                )
+                condition_str = f"{feature_name_at_node} <= {thresholds[node_id]}"
+            return DecisionPathNode(
+                id=str(node_id),  # Node ID as string
+                condition=condition_str,
+                samples=int(tree_.n_node_samples[node_id]),
+                value=node_values[node_id].tolist(),
+            )
+
+        return make_node
+
     def explain(
         self, X_inference: pd.DataFrame, identifiers_df: pd.DataFrame
     ) -> Optional[DecisionPathResultData]:
@@ -79,7 +143,6 @@ class SklearnDecisionPathStrategy(BaseDecisionPathStrategy):  # Inherit from new
             f"SklearnDecisionPathStrategy: Generating Decision Path explanations for {len(X_inference)} instances..."
         )
         feature_names = X_inference.columns.tolist()
-        instance_paths_result: List[InstanceDecisionPath] = []  # Corrected type name
 
         try:
             estimators = []
@@ -126,115 +189,37 @@ class SklearnDecisionPathStrategy(BaseDecisionPathStrategy):  # Inherit from new
                     instance_decision_paths=[]
                 )  # Return empty if no estimators
 
-            for i in range(len(X_inference)):
-                instance_id_row = identifiers_df.iloc[i]
-                instance_feature_vector = X_inference.iloc[[i]]
-
-                for tree_idx, estimator_tree in enumerate(estimators):
-                    # Ensure the estimator is a Decision Tree compatible type
-                    if not isinstance(estimator_tree, DecisionTreeClassifier) and not (
-                        hasattr(estimator_tree, "tree_")
-                        and isinstance(estimator_tree.tree_, _tree.Tree)
-                    ):  # GBC trees are DecisionTreeRegressor
-                        logger.warning(
-                            f"Estimator {tree_idx} is not a DecisionTreeClassifier or compatible tree. Type: {type(estimator_tree)}. Skipping."
-                        )
-                        continue
-
-                    tree_ = estimator_tree.tree_
-                    if tree_ is None:  # Should not happen if above check passes
-                        logger.warning(
-                            f"Estimator {tree_idx} has no 'tree_' attribute. Skipping."
-                        )
-                        continue
-
-                    feature_indices = (
-                        tree_.feature
-                    )  # Renamed from 'feature' to avoid conflict
-                    threshold_values = tree_.threshold  # Renamed
-
-                    try:
-                        node_indicator = estimator_tree.decision_path(
-                            instance_feature_vector
-                        )
-                        node_index_path = node_indicator.indices[
-                            node_indicator.indptr[0] : node_indicator.indptr[1]
-                        ]
-                    except Exception as path_err:
-                        logger.error(
-                            f"Failed to get decision path for instance {i}, tree {tree_idx}: {path_err}",
-                            exc_info=False,
-                        )
-                        continue
-
-                    path_nodes_struct: List[DecisionPathNode] = []
-                    path_edges_struct: List[DecisionPathEdge] = []
-
-                    for node_id_idx, current_node_id in enumerate(node_index_path):
-                        is_leaf = (
-                            tree_.children_left[current_node_id]
-                            == tree_.children_right[current_node_id]
-                        )
-
-                        condition_str = "Leaf"
-                        if not is_leaf:
-                            feature_idx_at_node = feature_indices[current_node_id]
-                            threshold_at_node = round(
-                                threshold_values[current_node_id], 4
-                            )
-                            feature_name_at_node = (
-                                feature_names[feature_idx_at_node]
-                                if feature_idx_at_node >= 0
-                                and feature_idx_at_node < len(feature_names)
-                                else f"feature_{feature_idx_at_node}"
-                            )
-                            condition_str = (
-                                f"{feature_name_at_node} <= {threshold_at_node}"
-                            )
-
-                        node_value_raw = (
-                            tree_.value[current_node_id][0]
-                            if tree_.value is not None
-                            and current_node_id < len(tree_.value)
-                            else []
-                        )
-                        node_value_list = [
-                            round(float(v), 4) for v in node_value_raw
-                        ]  # Store as float for probabilities/counts
-
-                        node_info = DecisionPathNode(
-                            id=str(current_node_id),  # Node ID as string
-                            condition=condition_str,
-                            samples=int(tree_.n_node_samples[current_node_id]),
-                            value=node_value_list,
-                        )
-                        path_nodes_struct.append(node_info)
-
-                        if node_id_idx > 0:
-                            prev_node_id = node_index_path[node_id_idx - 1]
-                            edge_label = (
-                                "True"
-                                if current_node_id == tree_.children_left[prev_node_id]
-                                else "False"
-                            )
-                            path_edges_struct.append(
-                                DecisionPathEdge(
-                                    source=str(prev_node_id),
-                                    target=str(current_node_id),
-                                    label=edge_label,
-                                )
-                            )
-
-                    # Add path for this instance/tree combination
-                    instance_paths_result.append(
-                        InstanceDecisionPath(
-                            file=instance_id_row.get("file"),  # type: ignore
-                            class_name=instance_id_row.get("class_name"),  # type: ignore
-                            nodes=path_nodes_struct,
-                            edges=path_edges_struct,
-                            # tree_index=tree_idx # Optional: if you want to distinguish paths from different trees in an ensemble
-                        )
+            tree_paths: List[TreePaths] = []
+            for tree_idx, estimator_tree in enumerate(estimators):
+                # Ensure the estimator is a Decision Tree compatible type
+                if not isinstance(estimator_tree, DecisionTreeClassifier) and not (
+                    hasattr(estimator_tree, "tree_")
+                    and isinstance(estimator_tree.tree_, _tree.Tree)
+                ):  # GBC trees are DecisionTreeRegressor
+                    logger.warning(
+                        f"Estimator {tree_idx} is not a DecisionTreeClassifier or compatible tree. Type: {type(estimator_tree)}. Skipping."
+                    )
+                    continue
+
+                try:
+                    steps = self._tree_path_steps(estimator_tree, X_inference)
+                except Exception as path_err:
+                    logger.error(
+                        f"Failed to get decision paths for tree {tree_idx}: {path_err}",
+                        exc_info=False,
+                    )
+                    continue
+                tree_paths.append(
+                    self._unique_paths(
+                        steps,
+                        self._node_builder(estimator_tree.tree_, feature_names),
+                        EDGE_LABELS,
                     )
+                )
+
+            instance_paths_result = self._collect_instance_paths(
+                identifiers_df, tree_paths
+            )
 
             if not instance_paths_result:
                 logger.warning(
@@ -1,28 +1,49 @@
 # worker/ml/services/strategies/sklearn_strategy.py
+import copy
+import importlib
 import logging
 import time
 from typing import Any, Dict, List, Type
 
+import numpy as np
 import pandas as pd
-from sklearn.ensemble import (
-    AdaBoostClassifier,
-    GradientBoostingClassifier,
-    RandomForestClassifier,
-)
-from sklearn.linear_model import LogisticRegression
-from sklearn.model_selection import train_test_split
-from sklearn.neighbors import KNeighborsClassifier
-from sklearn.svm import SVC
-from sklearn.tree import DecisionTreeClassifier
-
-from services.interfaces import IArtifactService
+
+from shared.core.config import settings
 from shared.schemas.enums import ModelTypeEnum
 from shared.schemas.ml_model_type_definition import HyperparameterDefinitionSchema
 
+from ..interfaces import IArtifactService
+from ..out_of_core import ParquetTrainingData
 from .base_strategy import BaseModelStrategy, TrainResult
 
 logger = logging.getLogger(__name__)
 
+# Estimator class of each model type as (module, class name). Estimators are
+# imported when a model is built, so the model type schemas below can be read
+# without loading scikit-learn.
+_ESTIMATOR_CLASSES = {
+    ModelTypeEnum.SKLEARN_RANDOMFOREST: ("sklearn.ensemble", "RandomForestClassifier"),
+    ModelTypeEnum.SKLEARN_LOGISTICREGRESSION: (
+        "sklearn.linear_model",
+        "LogisticRegression",
+    ),
+    ModelTypeEnum.SKLEARN_SVC: ("sklearn.svm", "SVC"),
+    ModelTypeEnum.SKLEARN_GRADIENTBOOSTINGCLASSIFIER: (
+        "sklearn.ensemble",
+        "GradientBoostingClassifier",
+    ),
+    ModelTypeEnum.SKLEARN_ADABOOSTCLASSIFIER: (
+        "sklearn.ensemble",
+        "AdaBoostClassifier",
+    ),
+    ModelTypeEnum.SKLEARN_DECISIONTREECLASSIFIER: (
+        "sklearn.tree",
+        "DecisionTreeClassifier",
+    ),
+    ModelTypeEnum.SKLEARN_KNNCLASSIFIER: ("sklearn.neighbors", "KNeighborsClassifier"),
+    ModelTypeEnum.SKLEARN_SGDCLASSIFIER: ("sklearn.linear_model", "SGDClassifier"),
+}
+
 
 class SklearnStrategy(BaseModelStrategy):
     """Execution strategy for scikit-learn based models."""
@@ -479,6 +500,53 @@ class SklearnStrategy(BaseModelStrategy):
             ),  # Can also be callable, simplify to string for UI.
         ]
 
+        # SGDClassifier Schema
+        sgd_schema = [
+            HyperparameterDefinitionSchema(
+                name="loss",
+                type="text_choice",
+                default_value="log_loss",
+                options=[
+                    {"value": "log_loss", "label": "Log Loss (logistic regression)"},
+                    {"value": "modified_huber", "label": "Modified Huber"},
+                ],
+                description="Loss function; both provide probability estimates.",
+            ),
+            HyperparameterDefinitionSchema(
+                name="penalty",
+                type="text_choice",
+                default_value="l2",
+                options=[
+                    {"value": "l2", "label": "L2"},
+                    {"value": "l1", "label": "L1"},
+                    {"value": "elasticnet", "label": "Elastic Net"},
+                ],
+                description="Regularization term.",
+            ),
+            HyperparameterDefinitionSchema(
+                name="alpha",
+                type="float",
+                default_value=0.0001,
+                description="Constant that multiplies the regularization term.",
+                range={"min": 1e-6, "max": 1.0},
+                log=True,
+            ),
+            HyperparameterDefinitionSchema(
+                name="l1_ratio",
+                type="float",
+                default_value=0.15,
+                description="Elastic Net mixing parameter (only used with penalty='elasticnet').",
+                range={"min": 0.0, "max": 1.0},
+            ),
+            HyperparameterDefinitionSchema(
+                name="max_iter",
+                type="integer",
+                default_value=1000,
+                description="Maximum number of passes over the training data (in-memory training).",
+                range={"min": 5, "max": 5000},
+            ),
+        ]
+
         return {
             ModelTypeEnum.SKLEARN_RANDOMFOREST: rf_schema,
             ModelTypeEnum.SKLEARN_LOGISTICREGRESSION: lr_schema,
@@ -487,6 +555,7 @@ class SklearnStrategy(BaseModelStrategy):
             ModelTypeEnum.SKLEARN_ADABOOSTCLASSIFIER: ada_schema,
             ModelTypeEnum.SKLEARN_DECISIONTREECLASSIFIER: dt_schema,
             ModelTypeEnum.SKLEARN_KNNCLASSIFIER: knn_schema,
+            ModelTypeEnum.SKLEARN_SGDCLASSIFIER: sgd_schema,
         }
 
     def _initialize_model_internals(self):
@@ -495,25 +564,12 @@ class SklearnStrategy(BaseModelStrategy):
 
     def _get_model_class(self) -> Type:
         """Return the estimator class corresponding to the self.model_type_enum."""
-        if self.model_type_enum == ModelTypeEnum.SKLEARN_RANDOMFOREST:
-            return RandomForestClassifier
-        elif self.model_type_enum == ModelTypeEnum.SKLEARN_LOGISTICREGRESSION:
-            return LogisticRegression
-        elif self.model_type_enum == ModelTypeEnum.SKLEARN_SVC:
-            return SVC
-        elif self.model_type_enum == ModelTypeEnum.SKLEARN_GRADIENTBOOSTINGCLASSIFIER:
-            return GradientBoostingClassifier
-        elif self.model_type_enum == ModelTypeEnum.SKLEARN_ADABOOSTCLASSIFIER:
-            return AdaBoostClassifier
-        elif self.model_type_enum == ModelTypeEnum.SKLEARN_DECISIONTREECLASSIFIER:
-            return DecisionTreeClassifier
-        elif self.model_type_enum == ModelTypeEnum.SKLEARN_KNNCLASSIFIER:
-            return KNeighborsClassifier
-        # Add other sklearn models here
-        else:
+        if self.model_type_enum not in _ESTIMATOR_CLASSES:
             raise ValueError(
                 f"Unsupported scikit-learn model type for SklearnStrategy: {self.model_type_enum.value}"
             )
+        module_name, class_name = _ESTIMATOR_CLASSES[self.model_type_enum]
+        return getattr(importlib.import_module(module_name), class_name)
 
     def _get_model_instance(self) -> Any:
         """
@@ -548,13 +604,18 @@ class SklearnStrategy(BaseModelStrategy):
 
         # Ensure random_state is set if the model supports it and it's not already in filtered_config
         # Also check if 'probability' is a param for SVC and set if not provided and model_type is SVC
-        if model_cls == SVC:
+        if self.model_type_enum == ModelTypeEnum.SKLEARN_SVC:
             if (
                 "probability" in valid_params_keys
                 and "probability" not in filtered_config
             ):
                 logger.info("Setting 'probability=True' by default for SVC model type.")
                 filtered_config["probability"] = True  # Needed for predict_proba
+        if (
+            self.model_type_enum == ModelTypeEnum.SKLEARN_SGDCLASSIFIER
+            and "loss" not in filtered_config
+        ):
+            filtered_config["loss"] = "log_loss"  # Needed for predict_proba
 
         if (
             "random_state" in valid_params_keys
@@ -569,6 +630,8 @@ class SklearnStrategy(BaseModelStrategy):
 
     def train(self, X: pd.DataFrame, y: pd.Series) -> TrainResult:
         """Trains a scikit-learn model with train/test split evaluation."""
+        from sklearn.model_selection import train_test_split
+
         logger.info(
             f"SklearnStrategy: Starting training for model type: {self.model_type_enum.value}"
         )
@@ -644,6 +707,52 @@ class SklearnStrategy(BaseModelStrategy):
 
         return TrainResult(model=self.model, metrics=metrics)
 
+    def _continue_training(
+        self, parent_model: Any, X: pd.DataFrame, y: pd.Series, n_estimators: int
+    ) -> Any:
+        """
+        Grows a copy of a random forest / gradient boosting parent with
+        `n_estimators` more trees via warm_start; the parent's trees are kept.
+        """
+        from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+
+        if not isinstance(
+            parent_model, (RandomForestClassifier, GradientBoostingClassifier)
+        ):
+            return super()._continue_training(parent_model, X, y, n_estimators)
+        model = copy.deepcopy(parent_model)
+        model.set_params(
+            warm_start=True, n_estimators=parent_model.n_estimators + n_estimators
+        )
+        model.fit(X, y)
+        model.set_params(warm_start=False)
+        return model
+
+    def supports_out_of_core(self) -> bool:
+        """Estimators with partial_fit can be trained one row group at a time."""
+        return hasattr(self._get_model_class(), "partial_fit")
+
+    def _fit_out_of_core(self, data: ParquetTrainingData) -> Any:
+        """
+        Runs ML_OUT_OF_CORE_EPOCHS passes of partial_fit over the row groups,
+        visiting them in a different seeded order on each pass.
+        """
+        if not self.supports_out_of_core():
+            return super()._fit_out_of_core(data)
+        model = self._get_model_instance()
+        rng = np.random.default_rng(self.job_config.get("random_seed", 42))
+        groups = [group for group, size in enumerate(data.train_group_sizes()) if size]
+        for epoch in range(settings.ML_OUT_OF_CORE_EPOCHS):
+            for group in rng.permutation(groups):
+                X, y = data.read_train_group(int(group))
+                model.partial_fit(
+                    pd.DataFrame(X, columns=data.feature_columns),
+                    y,
+                    classes=data.classes,
+                )
+            logger.debug(f"Out-of-core epoch {epoch + 1} complete.")
+        return model
+
     def predict(self, data: pd.DataFrame) -> Dict[str, Any]:
         """Generates predictions using the fitted scikit-learn model."""
         if self.model is None:
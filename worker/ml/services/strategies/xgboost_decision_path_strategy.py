@@ -2,22 +2,30 @@
 import json
 import logging
 import re  # For parsing conditions
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 import xgboost as xgb  # type: ignore
 
 from shared.schemas.xai import (
-    DecisionPathEdge,
     DecisionPathNode,
     DecisionPathResultData,
-    InstanceDecisionPath,
 )
 
-from .base_decision_path_strategy import BaseDecisionPathStrategy
+from .base_decision_path_strategy import (
+    SPLIT_LT,
+    BaseDecisionPathStrategy,
+    FlatTree,
+    TreePaths,
+    route_flat_tree,
+)
 
 logger = logging.getLogger(__name__)
 
+# Labels of the edge taken when the split condition holds, fails or is missing
+EDGE_LABELS = ["True (<)", "False (>=)", "Missing"]
+
 
 class XGBoostDecisionPathStrategy(BaseDecisionPathStrategy):
     def __init__(self, model: Any, background_data: Optional[pd.DataFrame] = None):
@@ -49,120 +57,90 @@ class XGBoostDecisionPathStrategy(BaseDecisionPathStrategy):
                 return f"{feature_name} {operator} {value_str}"
         return condition_str
 
-    def _trace_instance_path_for_tree(
+    @staticmethod
+    def _split_feature_name(split_feature_code: str, feature_names: List[str]) -> str:
+        feature_idx_match = re.match(r"f(\d+)", split_feature_code)
+        feature_idx = int(feature_idx_match.group(1)) if feature_idx_match else -1
+        return (
+            feature_names[feature_idx]
+            if 0 <= feature_idx < len(feature_names)
+            else split_feature_code
+        )
+
+    def _flatten_tree(
         self,
-        instance_series: pd.Series,
         tree_dump_json: Dict[str, Any],
         feature_names: List[str],
         tree_id_prefix: str = "",
-    ) -> Tuple[List[DecisionPathNode], List[DecisionPathEdge]]:
-
-        path_nodes_struct: List[DecisionPathNode] = []
-        path_edges_struct: List[DecisionPathEdge] = []
-
-        current_node_json = tree_dump_json
-        parent_node_id_str_for_edge = None
-        edge_label_to_current = None
-
-        while True:
-            node_id = int(current_node_json["nodeid"])
-            node_id_str = f"{tree_id_prefix}N{node_id}"
-
+    ) -> Tuple[FlatTree, List[str], Callable[[int], DecisionPathNode]]:
+        """
+        Converts the JSON dump of one tree to a FlatTree. Also returns the
+        feature tested by each routing column and a builder of path nodes.
+        """
+        dump_nodes: List[Dict[str, Any]] = []
+        pending = [tree_dump_json]
+        while pending:
+            node_json = pending.pop()
+            dump_nodes.append(node_json)
+            pending.extend(node_json.get("children", []))
+        index_of = {int(node["nodeid"]): i for i, node in enumerate(dump_nodes)}
+
+        n_nodes = len(dump_nodes)
+        column = np.full(n_nodes, -1, dtype=np.int64)
+        # XGBoost compares float32 values against float32 split conditions
+        threshold = np.full(n_nodes, np.nan, dtype=np.float32)
+        left = np.full(n_nodes, -1, dtype=np.int64)
+        right = np.full(n_nodes, -1, dtype=np.int64)
+        missing = np.full(n_nodes, -1, dtype=np.int64)
+        split_features: List[str] = []
+
+        for i, node_json in enumerate(dump_nodes):
+            if "leaf" in node_json:
+                continue
+            feature_name = self._split_feature_name(node_json["split"], feature_names)
+            if feature_name not in split_features:
+                split_features.append(feature_name)
+            column[i] = split_features.index(feature_name)
+            threshold[i] = float(node_json["split_condition"])
+            left[i] = index_of[int(node_json["yes"])]
+            right[i] = index_of[int(node_json["no"])]
+            missing[i] = index_of[int(node_json["missing"])]
+
+        def make_node(i: int) -> DecisionPathNode:
+            node_json = dump_nodes[i]
             samples: Optional[int] = None
-            if "cover" in current_node_json:
-                samples = int(round(current_node_json["cover"]))
-
-            if "leaf" in current_node_json:
-                leaf_value = round(float(current_node_json["leaf"]), 4)
-                path_nodes_struct.append(
-                    DecisionPathNode(
-                        id=node_id_str,
-                        condition="Leaf",
-                        samples=samples,
-                        value=[leaf_value],
-                    )
-                )
-                if parent_node_id_str_for_edge and edge_label_to_current:
-                    path_edges_struct.append(
-                        DecisionPathEdge(
-                            source=parent_node_id_str_for_edge,
-                            target=node_id_str,
-                            label=edge_label_to_current,
-                        )
-                    )
-                break
-            else:
-                split_feature_code = current_node_json["split"]
-                split_condition_value_raw = current_node_json["split_condition"]
-
-                feature_idx_match = re.match(r"f(\d+)", split_feature_code)
-                feature_idx = -1
-                if feature_idx_match:
-                    feature_idx = int(feature_idx_match.group(1))
-
-                feature_name = (
-                    feature_names[feature_idx]
-                    if 0 <= feature_idx < len(feature_names)
-                    else split_feature_code
+            if "cover" in node_json:
+                samples = int(round(node_json["cover"]))
+            node_id_str = f"{tree_id_prefix}N{int(node_json['nodeid'])}"
+            if "leaf" in node_json:
+                return DecisionPathNode(
+                    id=node_id_str,
+                    condition="Leaf",
+                    samples=samples,
+                    value=[round(float(node_json["leaf"]), 4)],
                 )
+            return DecisionPathNode(
+                id=node_id_str,
+                condition=f"{split_features[column[i]]} < {round(threshold[i], 4)}",
+                samples=samples,
+                value=None,
+            )
 
-                condition_str = (
-                    f"{feature_name} < {round(float(split_condition_value_raw), 4)}"
-                )
-
-                path_nodes_struct.append(
-                    DecisionPathNode(
-                        id=node_id_str,
-                        condition=condition_str,
-                        samples=samples,
-                        value=None,
-                    )
-                )
-
-                if parent_node_id_str_for_edge and edge_label_to_current:
-                    path_edges_struct.append(
-                        DecisionPathEdge(
-                            source=parent_node_id_str_for_edge,
-                            target=node_id_str,
-                            label=edge_label_to_current,
-                        )
-                    )
-
-                instance_value = instance_series.get(feature_name)
-
-                next_node_id_int: Optional[int] = None
-                edge_label_for_next_edge: Optional[str] = None
-
-                if pd.isna(instance_value):
-                    next_node_id_int = int(current_node_json["missing"])
-                    edge_label_for_next_edge = "Missing"
-                    logger.debug(
-                        f"Instance feature '{feature_name}' is NaN, taking 'missing' branch to node {next_node_id_int}"
-                    )
-                elif instance_value < float(split_condition_value_raw):
-                    next_node_id_int = int(current_node_json["yes"])
-                    edge_label_for_next_edge = "True (<)"
-                else:
-                    next_node_id_int = int(current_node_json["no"])
-                    edge_label_for_next_edge = "False (>=)"
-
-                parent_node_id_str_for_edge = node_id_str
-                edge_label_to_current = edge_label_for_next_edge
-
-                found_next = False
-                if "children" in current_node_json:
-                    for child_node_json in current_node_json.get("children", []):
-                        if child_node_json["nodeid"] == next_node_id_int:
-                            current_node_json = child_node_json
-                            found_next = True
-                            break
-                if not found_next:
-                    logger.error(
-                        f"Could not find child node with ID {next_node_id_int} in tree dump. Path tracing incomplete."
-                    )
-                    break
-
-        return path_nodes_struct, path_edges_struct
+        labels_of_node = np.zeros(n_nodes, dtype=np.int64)
+        flat_tree = FlatTree(
+            column=column,
+            op=np.full(n_nodes, SPLIT_LT),
+            threshold=threshold,
+            left=left,
+            right=right,
+            missing=missing,
+            true_label=labels_of_node,
+            false_label=labels_of_node + 1,
+            missing_label=labels_of_node + 2,
+            labels=EDGE_LABELS,
+            categories={},
+        )
+        return flat_tree, split_features, make_node
 
     def explain(
         self, X_inference: pd.DataFrame, identifiers_df: pd.DataFrame
@@ -237,8 +215,6 @@ class XGBoostDecisionPathStrategy(BaseDecisionPathStrategy):
                 logger.warning("No trees found in XGBoost model dump (get_dump).")
                 return DecisionPathResultData(instance_decision_paths=[])
 
-            instance_paths_result: List[InstanceDecisionPath] = []
-
             num_trees_available = len(all_tree_dumps_str_list)
             num_trees_to_explain = min(1, num_trees_available)  # Explain first tree
 
@@ -246,48 +222,40 @@ class XGBoostDecisionPathStrategy(BaseDecisionPathStrategy):
                 f"XGBoost model has {num_trees_available} trees available from dump. Explaining paths for the first {num_trees_to_explain} tree(s)."
             )
 
-            for i in range(len(X_inference)):
-                instance_series = X_inference.iloc[i]
-                instance_id_row = identifiers_df.iloc[i]
-
-                for tree_idx in range(num_trees_to_explain):
-                    if tree_idx >= len(all_tree_dumps_str_list):
-                        logger.warning(
-                            f"Requested tree_idx {tree_idx} is out of bounds for available tree dumps ({len(all_tree_dumps_str_list)})."
-                        )
-                        break
-                    try:
-                        single_tree_json_str = all_tree_dumps_str_list[tree_idx]
-                        single_tree_parsed_json = json.loads(single_tree_json_str)
-                        tree_id_prefix = f"T{tree_idx}_"
-
-                        nodes, edges = self._trace_instance_path_for_tree(
-                            instance_series,
-                            single_tree_parsed_json,
-                            feature_names,
-                            tree_id_prefix,
+            tree_paths: List[TreePaths] = []
+            for tree_idx in range(num_trees_to_explain):
+                try:
+                    single_tree_json_str = all_tree_dumps_str_list[tree_idx]
+                    single_tree_parsed_json = json.loads(single_tree_json_str)
+                    flat_tree, split_features, make_node = self._flatten_tree(
+                        single_tree_parsed_json, feature_names, f"T{tree_idx}_"
+                    )
+                    # Features absent from X_inference route as missing values
+                    X_values = X_inference.reindex(columns=split_features).to_numpy(
+                        dtype=np.float32, na_value=np.nan
+                    )
+                    tree_paths.append(
+                        self._unique_paths(
+                            route_flat_tree(flat_tree, X_values),
+                            make_node,
+                            flat_tree.labels,
                         )
+                    )
+                except json.JSONDecodeError as jde:
+                    logger.error(
+                        f"Failed to parse JSON for tree {tree_idx} dump: '{single_tree_json_str[:100]}...'. Error: {jde}"
+                    )
+                    continue
+                except Exception as tree_trace_err:
+                    logger.error(
+                        f"Error tracing paths for tree {tree_idx}: {tree_trace_err}",
+                        exc_info=True,
+                    )
+                    continue
 
-                        if nodes:
-                            instance_paths_result.append(
-                                InstanceDecisionPath(
-                                    file=instance_id_row.get("file"),
-                                    class_name=instance_id_row.get("class_name"),
-                                    nodes=nodes,
-                                    edges=edges,
-                                )
-                            )
-                    except json.JSONDecodeError as jde:
-                        logger.error(
-                            f"Failed to parse JSON for tree {tree_idx} dump: '{single_tree_json_str[:100]}...'. Error: {jde}"
-                        )
-                        continue
-                    except Exception as tree_trace_err:
-                        logger.error(
-                            f"Error tracing path for instance {i}, tree {tree_idx}: {tree_trace_err}",
-                            exc_info=True,
-                        )
-                        continue
+            instance_paths_result = self._collect_instance_paths(
+                identifiers_df, tree_paths
+            )
 
             if not instance_paths_result:
                 logger.warning(
@@ -0,0 +1,29 @@
+# worker/ml/services/strategies/xgboost_row_groups.py
+from typing import Callable
+
+import xgboost as xgb
+
+from ..out_of_core import ParquetTrainingData
+
+
+class RowGroupIter(xgb.DataIter):
+    """Feeds the training rows of a Parquet dataset to XGBoost one row group at a time."""
+
+    def __init__(self, data: ParquetTrainingData, cache_prefix: str):
+        self._data = data
+        self._groups = [
+            group for group, size in enumerate(data.train_group_sizes()) if size
+        ]
+        self._position = 0
+        super().__init__(cache_prefix=cache_prefix)
+
+    def next(self, input_data: Callable) -> bool:
+        if self._position == len(self._groups):
+            return False
+        X, y = self._data.read_train_group(self._groups[self._position])
+        input_data(data=X, label=y, feature_names=self._data.feature_columns)
+        self._position += 1
+        return True
+
+    def reset(self) -> None:
+        self._position = 0
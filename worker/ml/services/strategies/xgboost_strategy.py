@@ -1,21 +1,27 @@
 # worker/ml/services/strategies/xgboost_strategy.py
 import logging
+import tempfile
 import time
-from typing import Any, Dict, List, Optional, Type
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Type
 
+import numpy as np
 import pandas as pd
-import xgboost as xgb  # Import XGBoost
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import LabelEncoder  # For handling string labels if any
 
-from services.interfaces.i_artifact_service import IArtifactService
 from shared.schemas.enums import ModelTypeEnum
 from shared.schemas.ml_model_type_definition import (
     HyperparameterDefinitionSchema,
 )  # Though model_type is passed
 
+from ..interfaces.i_artifact_service import IArtifactService
+from ..out_of_core import ParquetTrainingData
 from .base_strategy import BaseModelStrategy, TrainResult
 
+# XGBoost and scikit-learn are imported where they are used, so the model type
+# schemas can be discovered without loading either library
+if TYPE_CHECKING:
+    from sklearn.preprocessing import LabelEncoder
+
 logger = logging.getLogger(__name__)
 
 
@@ -30,7 +36,7 @@ class XGBoostStrategy(BaseModelStrategy):
         artifact_service: IArtifactService,
     ):
         super().__init__(model_type, model_config, job_config, artifact_service)
-        self.label_encoder: Optional[LabelEncoder] = (
+        self.label_encoder: Optional["LabelEncoder"] = (
             None  # For target variable encoding
         )
 
@@ -131,6 +137,8 @@ class XGBoostStrategy(BaseModelStrategy):
 
     def _get_model_class(self) -> Type:
         """Return the XGBoost classifier class."""
+        import xgboost as xgb
+
         return xgb.XGBClassifier
 
     def _get_model_instance(self) -> Any:
@@ -171,6 +179,9 @@ class XGBoostStrategy(BaseModelStrategy):
         return model_cls(**current_config)
 
     def train(self, X: pd.DataFrame, y: pd.Series) -> TrainResult:
+        from sklearn.model_selection import train_test_split
+        from sklearn.preprocessing import LabelEncoder
+
         logger.info(
             f"XGBoostStrategy: Starting training for model type: {self.model_type_enum.value}"
         )
@@ -263,6 +274,53 @@ class XGBoostStrategy(BaseModelStrategy):
 
         return TrainResult(model=self.model, metrics=metrics)
 
+    def _continue_training(
+        self, parent_model: Any, X: pd.DataFrame, y: pd.Series, n_estimators: int
+    ) -> Any:
+        """Adds `n_estimators` boosting rounds to the parent's booster."""
+        model = self._get_model_class()(**parent_model.get_params())
+        model.set_params(n_estimators=n_estimators)
+        model.fit(X, y, xgb_model=parent_model.get_booster())
+        return model
+
+    def supports_out_of_core(self) -> bool:
+        return True
+
+    def _fit_out_of_core(self, data: ParquetTrainingData) -> Any:
+        """
+        Trains through an external-memory quantile DMatrix, which keeps the
+        row groups on local disk between boosting rounds, and wraps the
+        booster in an XGBClassifier.
+        """
+        import xgboost as xgb
+
+        from .xgboost_row_groups import RowGroupIter
+
+        if not np.array_equal(data.classes, np.arange(len(data.classes))):
+            raise ValueError(
+                f"Out-of-core XGBoost training needs labels 0..n-1, got {data.classes.tolist()}."
+            )
+        model = self._get_model_instance()
+        model.set_params(tree_method="hist")
+        params = {k: v for k, v in model.get_xgb_params().items() if v is not None}
+        params.pop("use_label_encoder", None)
+        if len(data.classes) > 2:
+            params["objective"] = "multi:softprob"
+            params["num_class"] = len(data.classes)
+        with tempfile.TemporaryDirectory(prefix="xgb-extmem-") as cache_dir:
+            dtrain = xgb.ExtMemQuantileDMatrix(
+                RowGroupIter(data, str(Path(cache_dir) / "cache")),
+                max_bin=params.get("max_bin", 256),
+            )
+            booster = xgb.train(
+                params,
+                dtrain,
+                num_boost_round=model.get_params()["n_estimators"] or 100,
+            )
+            del dtrain
+        model.load_model(bytearray(booster.save_raw("ubj")))
+        return model
+
     def predict(self, data: pd.DataFrame) -> Dict[str, Any]:
         if self.model is None:
             raise RuntimeError("XGBoost model is not fitted or loaded. Cannot predict.")